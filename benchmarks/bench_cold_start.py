@@ -0,0 +1,107 @@
+"""First Invocation Latency With And Without INIT Phase Warmup.
+
+Every run is a fresh Python process (a cold container): it imports a handler module (INIT phase),
+then times the first and second invocations of list_requests and get_request.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 15] [--requests 5000]
+
+Uses DATABASE_URL when set, otherwise a temporary SQLite database seeded with the bulk loader.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_BASE_ENV = {
+    "RUN_ENV": "local",
+    "STAGE": "bench",
+    "BASE_DOMAIN": "http://localhost:3000",
+    "MAX_USER_CREATED_REQUESTS": "20",
+    "MAX_USER_CREATED_FAVORITES": "100",
+}
+
+
+def _child() -> None:
+    """Measure one cold container."""
+    started = time.perf_counter()
+    from src.handlers.requests.get import get_request  # noqa: PLC0415
+    from src.handlers.requests.list import list_requests  # noqa: PLC0415
+
+    timings = {"init_ms": (time.perf_counter() - started) * 1000}
+    for name in ("first", "second"):
+        started = time.perf_counter()
+        response = list_requests({"queryStringParameters": {"limit": "20"}}, None)
+        timings[f"{name}_list_ms"] = (time.perf_counter() - started) * 1000
+        request_id = json.loads(response["body"])["requests"][0]["id"]
+        started = time.perf_counter()
+        get_request({"pathParameters": {"request_id": request_id}}, None)
+        timings[f"{name}_get_ms"] = (time.perf_counter() - started) * 1000
+    sys.stdout.write(json.dumps(timings))
+
+
+def _seed(requests_count: int) -> None:
+    from src.db.bulk import BulkLoader, generate_records  # noqa: PLC0415
+    from src.db.session import engine  # noqa: PLC0415
+    from src.models.base import Base  # noqa: PLC0415
+    from src.models.favorite import Favorite  # noqa: F401, PLC0415
+    from src.models.request import Request  # noqa: F401, PLC0415
+
+    Base.metadata.create_all(engine)
+    BulkLoader(engine).load(generate_records(requests_count, seed=1))
+
+
+def _run(env: dict[str, str], *args: str) -> str:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, __file__, *args],
+        env=env,
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    if args.child:
+        _child()
+        return
+    if args.seed:
+        _seed(args.requests)
+        return
+
+    env = {**os.environ, **_BASE_ENV}
+    if "DATABASE_URL" not in os.environ:
+        database_path = Path(tempfile.mkdtemp()) / "bench.db"
+        env["DATABASE_URL"] = f"sqlite:///{database_path}"
+        _run(env, "--seed", "--requests", str(args.requests))
+
+    for warmup in ("false", "true"):
+        runs = [
+            json.loads(_run({**env, "DB_WARMUP": warmup}, "--child").splitlines()[-1])
+            for _ in range(args.runs)
+        ]
+        sys.stdout.write(f"DB_WARMUP={warmup} (median of {args.runs} cold containers)\n")
+        for key in runs[0]:
+            median = statistics.median(run[key] for run in runs)
+            sys.stdout.write(f"  {key:<16} {median:8.2f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Due Date Windows: Index Range Seek vs Paging The Full Feed.
+
+Before due_after / due_before, a client looking for "requests due in the next N hours" had to page
+through the feed (ordered by due date, NULLS LAST) and filter on its side. This compares, for a
+few windows:
+- feed: pages of the unfiltered feed until past the end of the window (client side filtering)
+- window: pages of list_of_requests(due_after=..., due_before=...) (index range seek)
+
+Usage:
+    python benchmarks/bench_due_date_window.py [--requests 50000] [--page-size 50]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("RUN_ENV", "local")
+os.environ.setdefault("STAGE", "bench")
+os.environ.setdefault("BASE_DOMAIN", "http://localhost:3000")
+os.environ.setdefault("MAX_USER_CREATED_REQUESTS", "20")
+os.environ.setdefault("MAX_USER_CREATED_FAVORITES", "100")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}")
+
+from src.db.bulk import BulkLoader, generate_records  # noqa: E402
+from src.db.session import engine  # noqa: E402
+from src.models.base import Base  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401
+from src.repositories.request_repository import get_request_repository  # noqa: E402
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def _page_feed(page_size: int, before: datetime, after: datetime) -> tuple[int, int]:
+    """Client side filtering: return (pages fetched, matching requests)."""
+    repo = get_request_repository()
+    pages = found = 0
+    cursor = None
+    while True:
+        page = repo.list_of_requests(limit=page_size, cursor=cursor)
+        pages += 1
+        for request in page["requests"]:
+            if request.due_date and after <= _as_utc(request.due_date) < before:
+                found += 1
+        last = page["requests"][-1] if page["requests"] else None
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor or not last.due_date or _as_utc(last.due_date) >= before:
+            return pages, found
+
+
+def _page_window(page_size: int, before: datetime, after: datetime) -> tuple[int, int]:
+    repo = get_request_repository()
+    pages = found = 0
+    cursor = None
+    while True:
+        page = repo.list_of_requests(
+            limit=page_size,
+            cursor=cursor,
+            due_after=after,
+            due_before=before,
+        )
+        pages += 1
+        found += len(page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            return pages, found
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    now = datetime.now(UTC)
+    Base.metadata.create_all(engine)
+    BulkLoader(engine).load(generate_records(args.requests, seed=1, now=now))
+
+    windows = {
+        "next 48 hours": (now, now + timedelta(hours=48)),
+        "next 7 days": (now, now + timedelta(days=7)),
+        "days 30 to 32": (now + timedelta(days=30), now + timedelta(days=32)),
+    }
+    sys.stdout.write(f"{args.requests} requests, pages of {args.page_size}\n")
+    sys.stdout.write(f"{'window':<16}{'mode':<8}{'found':>8}{'pages':>8}{'time':>12}\n")
+    for name, (after, before) in windows.items():
+        for mode, walk in (("feed", _page_feed), ("window", _page_window)):
+            started = time.perf_counter()
+            pages, found = walk(args.page_size, before, after)
+            elapsed = time.perf_counter() - started
+            sys.stdout.write(
+                f"{name:<16}{mode:<8}{found:>8}{pages:>8}{elapsed * 1000:>10.1f}ms\n",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Fragment Cache: Serialization CPU Per List Page.
+
+Renders list_requests pages of already loaded requests (the database part is identical with or
+without the cache, it is left out):
+- dumps: to_dict() + json.dumps of the whole page (before the fragment cache)
+- cold: fragment cache misses (every request rendered once, then cached)
+- warm: fragment cache hits (fragments joined, no serialization)
+
+Usage:
+    python benchmarks/bench_fragment_cache.py [--requests 2000] [--page-size 50] [--rounds 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("RUN_ENV", "local")
+os.environ.setdefault("STAGE", "bench")
+os.environ.setdefault("BASE_DOMAIN", "http://localhost:3000")
+os.environ.setdefault("MAX_USER_CREATED_REQUESTS", "20")
+os.environ.setdefault("MAX_USER_CREATED_FAVORITES", "100")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}")
+
+from src.db.bulk import BulkLoader, generate_records  # noqa: E402
+from src.db.session import engine  # noqa: E402
+from src.lib.fragment_cache import FragmentCache  # noqa: E402
+from src.lib.metrics import metrics  # noqa: E402
+from src.models.base import Base  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401
+from src.repositories.request_repository import get_request_repository  # noqa: E402
+
+
+def _pages(page_size: int) -> list[list]:
+    repo = get_request_repository()
+    pages, cursor = [], None
+    while True:
+        page = repo.list_of_requests(limit=page_size, cursor=cursor)
+        pages.append(page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            return pages
+
+
+def _per_page_us(pages: list[list], render) -> float:  # noqa: ANN001
+    started = time.perf_counter()
+    for page in pages:
+        render(page)
+    return (time.perf_counter() - started) / len(pages) * 1e6
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    BulkLoader(engine).load(generate_records(args.requests, seed=1))
+    pages = _pages(args.page_size)
+
+    dumps = min(
+        _per_page_us(pages, lambda page: json.dumps([r.to_dict() for r in page]))
+        for _ in range(args.rounds)
+    )
+    cold = []
+    for _ in range(args.rounds):
+        cache = FragmentCache()
+        cold.append(_per_page_us(pages, cache.join))
+    metrics.reset()
+    warm = min(_per_page_us(pages, cache.join) for _ in range(args.rounds))
+    hits = metrics.get("fragment_cache.hit")
+
+    sys.stdout.write(f"{len(pages)} pages of {args.page_size} requests, per page:\n")
+    sys.stdout.write(f"  to_dict + json.dumps   {dumps:8.0f}us\n")
+    sys.stdout.write(f"  cache miss (render)    {min(cold):8.0f}us\n")
+    sys.stdout.write(f"  cache hit (join)       {warm:8.0f}us\n")
+    saved_per_page = metrics.get("fragment_cache.saved_us") / hits * args.page_size
+    sys.stdout.write(f"  saved (metric)         {saved_per_page:8.0f}us\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Feed Projection vs list_of_requests: List Endpoint Page Latency.
+
+Measures a full list_requests page, response body included:
+- orm: list_of_requests (feed ordering, cursor predicates, subtype joins) + to_dict + json.dumps
+- feed: list_feed (range read on request_feed.feed_key) + fragments joined into the body
+
+for the first page, a deep page (resumed from a cursor) and a due date window page.
+
+Usage:
+    python benchmarks/bench_request_feed.py [--requests 20000] [--page-size 50] [--rounds 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("RUN_ENV", "local")
+os.environ.setdefault("STAGE", "bench")
+os.environ.setdefault("BASE_DOMAIN", "http://localhost:3000")
+os.environ.setdefault("MAX_USER_CREATED_REQUESTS", "20")
+os.environ.setdefault("MAX_USER_CREATED_FAVORITES", "100")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}")
+
+from src.db.bulk import BulkLoader, generate_records  # noqa: E402
+from src.db.session import engine  # noqa: E402
+from src.models.base import Base  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401
+from src.repositories.request_repository import get_request_repository  # noqa: E402
+
+
+def _orm_page(**kwargs) -> str:  # noqa: ANN003
+    result = get_request_repository().list_of_requests(**kwargs)
+    return json.dumps({
+        "requests": [request.to_dict() for request in result["requests"]],
+        "pagination": result["pagination"],
+    })
+
+
+def _feed_page(**kwargs) -> str:  # noqa: ANN003
+    page = get_request_repository().list_feed(**kwargs)
+    return (
+        f'{{"requests": [{", ".join(page["fragments"])}], '
+        f'"pagination": {json.dumps(page["pagination"])}}}'
+    )
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    now = datetime.now(UTC)
+    Base.metadata.create_all(engine)
+    BulkLoader(engine).load(generate_records(args.requests, seed=1, now=now))
+
+    repo = get_request_repository()
+    deep_cursor = repo.list_of_requests(limit=args.requests // 2)["pagination"]["next_cursor"]
+    pages = {
+        "first page": {},
+        "deep page": {"cursor": deep_cursor},
+        "next 7 days": {"due_after": now, "due_before": now + timedelta(days=7)},
+    }
+    sys.stdout.write(f"{args.requests} requests, pages of {args.page_size}\n")
+    sys.stdout.write(f"{'page':<14}{'orm':>12}{'feed':>12}{'speedup':>10}\n")
+    for name, kwargs in pages.items():
+        timings = {}
+        for mode, render in (("orm", _orm_page), ("feed", _feed_page)):
+            render(limit=args.page_size, **kwargs)  # compile / warm the caches
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                render(limit=args.page_size, **kwargs)
+            timings[mode] = (time.perf_counter() - started) / args.rounds * 1e6
+        sys.stdout.write(
+            f"{name:<14}{timings['orm']:>10.0f}us{timings['feed']:>10.0f}us"
+            f"{timings['orm'] / timings['feed']:>9.1f}x\n",
+        )
+
+
+if __name__ == "__main__":
+    main()
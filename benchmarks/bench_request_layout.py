@@ -0,0 +1,117 @@
+"""Requests Storage Layouts: Joined (Subtype Tables) vs Single Table.
+
+For each layout, on a fresh database: creates requests through the repository (one session per
+request, as the create handler does), then times get_by_id and list_of_requests pages, and counts
+the stored rows.
+
+Usage:
+    python benchmarks/bench_request_layout.py [--requests 2000] [--iterations 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("RUN_ENV", "local")
+os.environ.setdefault("STAGE", "bench")
+os.environ.setdefault("BASE_DOMAIN", "http://localhost:3000")
+os.environ.setdefault("MAX_USER_CREATED_REQUESTS", "20")
+os.environ.setdefault("MAX_USER_CREATED_FAVORITES", "100")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}")
+
+from sqlalchemy import func, select  # noqa: E402
+
+from src.db.session import engine, get_db_session  # noqa: E402
+from src.models.base import Base  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401
+from src.models.layout import LAYOUTS, set_request_storage_layout  # noqa: E402
+from src.models.request import (  # noqa: E402
+    BuyAndDeliverRequest,
+    OnlineServiceRequest,
+    PickupAndDeliverRequest,
+    Request,
+)
+from src.repositories.request_repository import get_request_repository  # noqa: E402
+from src.schemas.request import RequestCreate, RequestType  # noqa: E402
+
+_INPUTS = (
+    {"type": RequestType.BUY_AND_DELIVER, "dropoff_latitude": 36.8, "dropoff_longitude": 10.1},
+    {
+        "type": RequestType.PICKUP_AND_DELIVER,
+        "pickup_latitude": 36.8,
+        "pickup_longitude": 10.1,
+        "dropoff_latitude": 35.8,
+        "dropoff_longitude": 10.6,
+    },
+    {"type": RequestType.ONLINE_SERVICE, "meetup_latitude": 36.8, "meetup_longitude": 10.1},
+)
+
+
+def _us_per_call(func_, iterations: int) -> float:  # noqa: ANN001
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func_()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def _run(layout: str, requests: int, iterations: int) -> dict[str, float]:
+    set_request_storage_layout(layout)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    repo = get_request_repository()
+    rng = random.Random(1)
+    inputs = [
+        RequestCreate(title=f"Request {i}", description="Benchmark", **rng.choice(_INPUTS))
+        for i in range(requests)
+    ]
+
+    started = time.perf_counter()
+    ids = [repo.create(uuid.uuid4(), input_request).id for input_request in inputs]
+    create_us = (time.perf_counter() - started) / requests * 1_000_000
+
+    with get_db_session() as db:
+        rows = sum(
+            db.scalar(select(func.count()).select_from(model))
+            for model in (
+                Request,
+                BuyAndDeliverRequest,
+                PickupAndDeliverRequest,
+                OnlineServiceRequest,
+            )
+        )
+    return {
+        "create": create_us,
+        "get_by_id": _us_per_call(lambda: repo.get_by_id(rng.choice(ids)).to_dict(), iterations),
+        "list (20)": _us_per_call(
+            lambda: [r.to_dict() for r in repo.list_of_requests(limit=20)["requests"]],
+            iterations,
+        ),
+        "rows": rows,
+    }
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = {layout: _run(layout, args.requests, args.iterations) for layout in LAYOUTS}
+    sys.stdout.write(f"{'':<12}" + "".join(f"{layout:>12}" for layout in LAYOUTS) + "\n")
+    for name in ("create", "get_by_id", "list (20)"):
+        sys.stdout.write(
+            f"{name:<12}" + "".join(f"{results[l][name]:>10.0f}us" for l in LAYOUTS) + "\n",  # noqa: E741
+        )
+    sys.stdout.write(f"{'rows':<12}" + "".join(f"{results[l]['rows']:>12}" for l in LAYOUTS) + "\n")  # noqa: E741
+
+
+if __name__ == "__main__":
+    main()
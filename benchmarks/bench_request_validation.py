@@ -0,0 +1,87 @@
+"""RequestCreate Validation: Model Validate vs Tagged Union validate_json.
+
+Validates request creation bodies (valid and invalid ones, of every type) the way the create
+handler used to, RequestCreate.model_validate(json.loads(body)), and through
+parse_request_create(body).
+
+Usage:
+    python benchmarks/bench_request_validation.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import ValidationError  # noqa: E402
+
+from src.schemas.request import RequestCreate, parse_request_create  # noqa: E402
+
+_DUE_DATE = (datetime.now(UTC) + timedelta(days=3)).isoformat()
+_BASE = {
+    "title": "iPhone 16 Pro wanted",
+    "description": "Bring it from Paris",
+    "due_date": _DUE_DATE,
+}
+PAYLOADS = {
+    "valid": [
+        {**_BASE, "type": "buy_and_deliver", "dropoff_latitude": 36.8, "dropoff_longitude": 10.1},
+        {
+            **_BASE,
+            "type": "pickup_and_deliver",
+            "pickup_latitude": 48.8,
+            "pickup_longitude": 2.3,
+            "dropoff_latitude": 36.8,
+            "dropoff_longitude": 10.1,
+        },
+        {**_BASE, "type": "online_service", "meetup_latitude": 36.8, "meetup_longitude": 10.1},
+    ],
+    "invalid": [
+        {**_BASE, "type": "buy_and_deliver"},  # missing location
+        {
+            **_BASE,
+            "type": "online_service",
+            "meetup_latitude": 36.8,
+            "meetup_longitude": 10.1,
+            "pickup_latitude": 1,  # location of another type
+        },
+        {**_BASE, "type": "pickup_and_deliver", "pickup_latitude": 91},  # out of range
+        {**_BASE, "type": "unknown"},
+    ],
+}
+
+
+def _model_validate(body: str) -> RequestCreate:
+    return RequestCreate.model_validate(json.loads(body))
+
+
+def _us_per_call(validate, bodies: list[str], iterations: int) -> float:  # noqa: ANN001
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for body in bodies:
+            try:
+                validate(body)
+            except ValidationError:
+                pass
+    return (time.perf_counter() - started) / (iterations * len(bodies)) * 1_000_000
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'payloads':<10} {'model_validate':>16} {'validate_json':>16} {'speedup':>8}")  # noqa: T201
+    for name, payloads in PAYLOADS.items():
+        bodies = [json.dumps(payload) for payload in payloads]
+        before = _us_per_call(_model_validate, bodies, args.iterations)
+        after = _us_per_call(parse_request_create, bodies, args.iterations)
+        print(f"{name:<10} {before:>13.2f}us {after:>13.2f}us {before / after:>7.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Per-Query CPU With And Without The Compiled Statement Cache.
+
+Runs the hot repository queries (get_by_id, list_of_requests) in a loop, once with the engine
+statement cache and once with an engine created with query_cache_size=0, which is how every query
+touching a GUID column behaved before GUID declared cache_ok.
+
+Usage:
+    python benchmarks/bench_statement_cache.py [--iterations 2000] [--requests 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("RUN_ENV", "local")
+os.environ.setdefault("STAGE", "bench")
+os.environ.setdefault("BASE_DOMAIN", "http://localhost:3000")
+os.environ.setdefault("MAX_USER_CREATED_REQUESTS", "20")
+os.environ.setdefault("MAX_USER_CREATED_FAVORITES", "100")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}")
+
+from sqlalchemy import create_engine, inspect, select  # noqa: E402
+
+from src.db import session as db_session  # noqa: E402
+from src.db.bulk import BulkLoader, generate_records  # noqa: E402
+from src.lib.metrics import metrics  # noqa: E402
+from src.models.base import Base  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401
+from src.models.request import Request  # noqa: E402
+from src.repositories.request_repository import get_request_repository  # noqa: E402
+
+
+def _cpu_per_call_us(func, iterations: int) -> float:  # noqa: ANN001
+    func()  # first call: connection + cache warmup
+    started = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = db_session.engine
+    if not inspect(engine).has_table("requests"):
+        Base.metadata.create_all(engine)
+        BulkLoader(engine).load(generate_records(args.requests, seed=1))
+    with engine.connect() as connection:
+        request_id = connection.execute(select(Request.id).limit(1)).scalar_one()
+    missing_id = uuid.uuid4()
+
+    request_repo = get_request_repository()
+    queries = {
+        "get_by_id (hit)": lambda: request_repo.get_by_id(request_id),
+        "get_by_id (miss)": lambda: request_repo.get_by_id(missing_id),
+        "list_of_requests": lambda: request_repo.list_of_requests(limit=20),
+    }
+    uncached_engine = create_engine(engine.url, query_cache_size=0)
+
+    results: dict[str, dict[str, float]] = {}
+    for mode, bind in (("cached", engine), ("uncached", uncached_engine)):
+        db_session.SessionLocal.configure(bind=bind)
+        for name, query in queries.items():
+            metrics.reset("db.statement_cache.")
+            results.setdefault(name, {})[mode] = _cpu_per_call_us(query, args.iterations)
+            results[name][f"{mode}_hits"] = metrics.get("db.statement_cache.hit")
+    db_session.SessionLocal.configure(bind=engine)
+
+    sys.stdout.write(f"{'query':<20}{'uncached':>12}{'cached':>12}{'saved':>12}{'hits':>8}\n")
+    for name, result in results.items():
+        saved = result["uncached"] - result["cached"]
+        sys.stdout.write(
+            f"{name:<20}{result['uncached']:>10.1f}us{result['cached']:>10.1f}us"
+            f"{saved:>10.1f}us{int(result['cached_hits']):>8}\n",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Primary Key Layout: Random vs Time-Ordered UUIDs, String vs Binary Storage.
+
+Inserts rows keyed by uuid4 or uuid7 ids, stored as CHAR(36) strings or 16 bytes, in a table
+with a secondary index on the id (like favorites.request_id), and reports insert throughput,
+database size and the CPU cost of decoding ids back to uuid.UUID through the GUID type.
+
+Usage:
+    python benchmarks/bench_uuid_storage.py [--rows 200000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("RUN_ENV", "local")
+os.environ.setdefault("STAGE", "bench")
+os.environ.setdefault("BASE_DOMAIN", "http://localhost:3000")
+os.environ.setdefault("MAX_USER_CREATED_REQUESTS", "20")
+os.environ.setdefault("MAX_USER_CREATED_FAVORITES", "100")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy.dialects import sqlite as sqlite_dialect  # noqa: E402
+
+from src.lib.ids import uuid7  # noqa: E402
+from src.models.types import GUID  # noqa: E402
+
+_VARIANTS = (
+    ("uuid4 string", uuid.uuid4, False),
+    ("uuid7 string", uuid7, False),
+    ("uuid7 binary", uuid7, True),
+)
+
+
+def _run(name: str, factory, binary: bool, rows: int, directory: Path) -> None:  # noqa: ANN001, FBT001
+    guid = GUID(binary=binary)
+    dialect = sqlite_dialect.dialect()
+    path = directory / f"{name.replace(' ', '_')}.db"
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE t (id CHAR(36) PRIMARY KEY, ref CHAR(36), payload TEXT)")
+    connection.execute("CREATE INDEX ix_t_ref ON t (ref)")
+
+    values = [guid.process_bind_param(factory(), dialect) for _ in range(rows)]
+    started = time.perf_counter()
+    for offset in range(0, rows, 1000):
+        batch = values[offset : offset + 1000]
+        connection.executemany("INSERT INTO t VALUES (?, ?, 'x')", [(v, v) for v in batch])
+        connection.commit()
+    insert_seconds = time.perf_counter() - started
+
+    size_mib = path.stat().st_size / 1024 / 1024
+    raw = [row[0] for row in connection.execute("SELECT id FROM t")]
+    started = time.process_time()
+    for value in raw:
+        guid.process_result_value(value, dialect)
+    decode_us = (time.process_time() - started) / len(raw) * 1_000_000
+    connection.close()
+
+    print(  # noqa: T201
+        f"{name:<14} insert {rows / insert_seconds:>9.0f} rows/s  "
+        f"size {size_mib:>7.1f} MiB  decode {decode_us:>5.2f} us/id"
+    )
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp())
+    for name, factory, binary in _VARIANTS:
+        _run(name, factory, binary, args.rows, directory)
+
+
+if __name__ == "__main__":
+    main()
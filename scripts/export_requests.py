@@ -0,0 +1,74 @@
+"""Streaming NDJSON Export CLI For Requests.
+
+Usage:
+    # Whole table to a file (or stdout with '-')
+    python scripts/export_requests.py -o requests.ndjson
+
+    # Filtered, resumed from a previous run
+    python scripts/export_requests.py --type online_service \
+        --created-after 2026-01-01T00:00:00+00:00 --resume-from <token> -o -
+
+    # Chunked objects in a local directory (same layout as the S3 export)
+    python scripts/export_requests.py --store-dir ./exports --prefix requests/2026-10-19
+
+The source database is the one configured through DATABASE_URL (see src/config.py), exports
+refuse to run with regional shards (DATABASE_SHARDS).
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.db.export import (  # noqa: E402
+    ExportFilters,
+    check_unsharded,
+    export_ndjson,
+    export_to_object_store,
+    iter_request_records,
+)
+from src.db.session import engine  # noqa: E402
+from src.lib.object_store import LocalObjectStore  # noqa: E402
+from src.schemas.request import RequestType  # noqa: E402
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--type", choices=[t.value for t in RequestType], default=None)
+    parser.add_argument("--created-after", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--created-before", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--resume-from", default=None, help="Resume token of a previous export")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows fetched per round trip")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-': stdout)")
+    parser.add_argument("--store-dir", default=None, help="Write chunk objects to this directory")
+    parser.add_argument("--prefix", default="exports/requests", help="Chunk objects key prefix")
+    parser.add_argument("--chunk-bytes", type=int, default=8 * 1024 * 1024)
+    args = parser.parse_args()
+    check_unsharded()
+
+    filters = ExportFilters(
+        request_type=RequestType(args.type) if args.type else None,
+        created_after=args.created_after,
+        created_before=args.created_before,
+    )
+    records = iter_request_records(engine, filters, args.resume_from, args.chunk_size)
+
+    if args.store_dir:
+        store = LocalObjectStore(args.store_dir)
+        report = export_to_object_store(records, store, args.prefix, args.chunk_bytes)
+    elif args.output == "-":
+        report = export_ndjson(records, sys.stdout)
+    else:
+        with Path(args.output).open("w", encoding="utf-8") as output:
+            report = export_ndjson(records, output)
+
+    sys.stderr.write(
+        f"Exported {report.records} records ({report.bytes_written} bytes), "
+        f"resume token: {report.resume_token}\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Requests Storage Layout Migration CLI.
+
+Usage:
+    python scripts/migrate_request_layout.py --to single   # then set REQUEST_STORAGE_LAYOUT=single
+    python scripts/migrate_request_layout.py --to joined   # after setting it back to joined
+
+The target database is the one configured through DATABASE_URL (see src/config.py).
+See src/db/request_layout.py for the switching procedure.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.db.request_layout import migrate_request_layout  # noqa: E402
+from src.db.session import engine  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401 # register all tables
+from src.models.layout import LAYOUTS  # noqa: E402
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--to", choices=LAYOUTS, required=True)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    report = migrate_request_layout(engine, args.to, args.batch_size)
+    for column in report.added_columns:
+        sys.stderr.write(f"requests.{column}: column added\n")
+    for request_type, count in report.moved.items():
+        sys.stderr.write(f"{request_type}: {count} requests moved\n")
+    sys.stderr.write(
+        f"Done: {report.total} requests moved to the {args.to} layout "
+        f"in {report.transactions} transactions\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
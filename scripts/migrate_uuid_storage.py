@@ -0,0 +1,36 @@
+"""UUID Storage Migration CLI (SQLite).
+
+Usage:
+    python scripts/migrate_uuid_storage.py --to binary   # then run with UUID_STORAGE=binary
+    python scripts/migrate_uuid_storage.py --to string   # back to CHAR(36)
+
+The target database is the one configured through DATABASE_URL (see src/config.py).
+See src/db/uuid_storage.py for Aurora DSQL.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.db.session import engine  # noqa: E402
+from src.db.uuid_storage import migrate_uuid_storage  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401 # register all tables
+from src.models.request import Request  # noqa: E402, F401
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--to", choices=["binary", "string"], required=True)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    report = migrate_uuid_storage(engine, args.to == "binary", args.batch_size)
+    for column, count in report.converted.items():
+        sys.stderr.write(f"{column}: {count} values converted\n")
+    sys.stderr.write(f"Done: {report.total} values converted to {args.to}\n")
+
+
+if __name__ == "__main__":
+    main()
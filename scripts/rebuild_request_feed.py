@@ -0,0 +1,57 @@
+"""Feed Projection Rebuild CLI.
+
+Usage:
+    python scripts/rebuild_request_feed.py [--batch-size 500] [--check]
+
+Creates the request_feed table if it does not exist yet, then re-renders the feed row of every
+request. With --check, only compares the projection with the requests and exits with status 1
+when they differ.
+The target database is the one configured through DATABASE_URL (see src/config.py).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.db.request_feed import (  # noqa: E402
+    FeedRebuildReport,
+    check_request_feed,
+    rebuild_request_feed,
+)
+from src.db.session import engine  # noqa: E402
+from src.models.request import RequestFeedEntry  # noqa: E402
+
+
+def _print_progress(report: FeedRebuildReport) -> None:
+    sys.stderr.write(f"{report.requests} requests projected\n")
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--check", action="store_true", help="only check the projection")
+    args = parser.parse_args()
+
+    if args.check:
+        report = check_request_feed(engine, args.batch_size)
+        sys.stderr.write(
+            f"{report.checked} requests checked: {report.missing} missing, {report.stale} stale, "
+            f"{report.orphaned} orphaned feed rows\n",
+        )
+        if not report.consistent:
+            sys.stderr.write(f"e.g. {', '.join(report.sample_ids)}\n")
+            sys.exit(1)
+        return
+
+    RequestFeedEntry.__table__.create(engine, checkfirst=True)
+    report = rebuild_request_feed(engine, args.batch_size, progress=_print_progress)
+    sys.stderr.write(
+        f"Done: {report.requests} requests, {report.removed} orphaned rows removed, "
+        f"{report.transactions} transactions\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
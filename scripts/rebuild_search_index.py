@@ -0,0 +1,39 @@
+"""Search Index Rebuild CLI.
+
+Usage:
+    python scripts/rebuild_search_index.py [--batch-size 100]
+
+Creates the request_search_tokens table if it does not exist yet, then re-indexes every request.
+The target database is the one configured through DATABASE_URL (see src/config.py).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.db.search_index import SearchIndexReport, rebuild_search_index  # noqa: E402
+from src.db.session import engine  # noqa: E402
+from src.models.request import RequestSearchToken  # noqa: E402
+
+
+def _print_progress(report: SearchIndexReport) -> None:
+    sys.stderr.write(f"{report.requests} requests indexed ({report.tokens} tokens)\n")
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    RequestSearchToken.__table__.create(engine, checkfirst=True)
+    report = rebuild_search_index(engine, args.batch_size, progress=_print_progress)
+    sys.stderr.write(
+        f"Done: {report.requests} requests, {report.tokens} tokens, "
+        f"{report.transactions} transactions\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Feed Stats Counters Reconciliation CLI.
+
+Usage:
+    python scripts/reconcile_request_stats.py
+
+Creates the request_counters table if it does not exist yet (SQL backend), then corrects every
+counter from the requests themselves and removes the expired day counters. Run it once after
+upgrading, it also runs daily (reconcileRequestStats function).
+The target backend is the configured one (REPOSITORY_BACKEND, see src/config.py).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import REPOSITORY_BACKEND  # noqa: E402
+from src.repositories.request_repository import get_request_repository  # noqa: E402
+
+
+def main() -> None:  # noqa: D103
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    if REPOSITORY_BACKEND != "dynamodb":
+        from src.db.session import engine  # noqa: PLC0415
+        from src.models.request import RequestCounter  # noqa: PLC0415
+
+        RequestCounter.__table__.create(engine, checkfirst=True)
+
+    report = get_request_repository().reconcile_stats()
+    sys.stderr.write(
+        f"{report.keys} counter keys: {report.corrected} corrected, "
+        f"{report.expired} expired removed\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
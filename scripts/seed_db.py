@@ -0,0 +1,113 @@
+"""Bulk Seeding / Loading CLI For Requests And Favorites.
+
+Usage:
+    # Generate NDJSON (to a file or stdout)
+    python scripts/seed_db.py generate --requests 1000000 --favorites 200000 -o data.ndjson
+
+    # Load NDJSON (file or '-' for stdin) into DATABASE_URL
+    python scripts/seed_db.py load data.ndjson --batch-size 2000
+
+    # Generate and load in one streaming pass
+    python scripts/seed_db.py seed --requests 1000000 --favorites 200000
+
+The target database is the one configured through DATABASE_URL (see src/config.py).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.db.bulk import (  # noqa: E402
+    DSQL_MAX_ROWS_PER_TRANSACTION,
+    BulkLoader,
+    generate_records,
+    print_progress,
+    read_ndjson,
+    write_ndjson,
+)
+
+
+def _add_generation_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--requests", type=int, required=True, help="Requests to generate")
+    parser.add_argument("--users", type=int, default=1000, help="Distinct request owners")
+    parser.add_argument("--favorites", type=int, default=0, help="Favorites to generate")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (reproducible data)")
+
+
+def _add_loading_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per INSERT/COPY")
+    parser.add_argument(
+        "--max-rows-per-transaction",
+        type=int,
+        default=DSQL_MAX_ROWS_PER_TRANSACTION,
+        help="Commit every N rows (Aurora DSQL transaction limit)",
+    )
+    parser.add_argument(
+        "--no-copy",
+        action="store_true",
+        help="Use multi-row INSERT instead of COPY on PostgreSQL",
+    )
+    parser.add_argument("--progress-every", type=int, default=10_000, help="Report every N records")
+
+
+def _build_loader(args: argparse.Namespace) -> BulkLoader:
+    # Imported here so that 'generate' does not need any database configuration
+    from src.db.session import engine  # noqa: PLC0415
+
+    return BulkLoader(
+        engine,
+        batch_size=args.batch_size,
+        max_rows_per_transaction=args.max_rows_per_transaction,
+        use_copy=False if args.no_copy else None,
+        progress=print_progress,
+        progress_every=args.progress_every,
+    )
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="Generate NDJSON records")
+    _add_generation_arguments(generate_parser)
+    generate_parser.add_argument("-o", "--output", default="-", help="Output file ('-': stdout)")
+
+    load_parser = subparsers.add_parser("load", help="Load NDJSON records into the database")
+    load_parser.add_argument("input", help="NDJSON file ('-': stdin)")
+    _add_loading_arguments(load_parser)
+
+    seed_parser = subparsers.add_parser("seed", help="Generate and load records in one pass")
+    _add_generation_arguments(seed_parser)
+    _add_loading_arguments(seed_parser)
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        records = generate_records(args.requests, args.users, args.favorites, args.seed)
+        if args.output == "-":
+            count = write_ndjson(records, sys.stdout)
+        else:
+            with Path(args.output).open("w", encoding="utf-8") as output:
+                count = write_ndjson(records, output)
+        sys.stderr.write(f"Generated {count} records\n")
+
+    elif args.command == "load":
+        loader = _build_loader(args)
+        if args.input == "-":
+            report = loader.load(read_ndjson(sys.stdin))
+        else:
+            with Path(args.input).open(encoding="utf-8") as ndjson_input:
+                report = loader.load(read_ndjson(ndjson_input))
+        sys.stderr.write(f"Done: {report.summary()}\n")
+
+    else:
+        loader = _build_loader(args)
+        records = generate_records(args.requests, args.users, args.favorites, args.seed)
+        report = loader.load(records)
+        sys.stderr.write(f"Done: {report.summary()}\n")
+
+
+if __name__ == "__main__":
+    main()
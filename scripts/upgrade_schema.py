@@ -0,0 +1,32 @@
+"""Schema Upgrade CLI.
+
+Usage:
+    python scripts/upgrade_schema.py
+
+Creates the missing tables and adds the missing nullable columns (e.g. requests.version) to the
+existing ones. Additive only: nothing is ever dropped or altered.
+The target database is the one configured through DATABASE_URL (see src/config.py).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.db.schema import upgrade_schema  # noqa: E402
+from src.db.session import engine  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401 # register all tables
+from src.models.request import Request  # noqa: E402, F401
+
+
+def main() -> None:  # noqa: D103
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    added = upgrade_schema(engine)
+    for table, columns in added.items():
+        sys.stderr.write(f"{table}: added {', '.join(columns)}\n")
+    sys.stderr.write("Schema up to date\n")
+
+
+if __name__ == "__main__":
+    main()
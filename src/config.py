@@ -19,6 +19,8 @@ if RUN_ENV == "cloud":
     secret = json.loads(secret_value["SecretString"])
 
     os.environ["DATABASE_URL"] = secret["DATABASE_URL"]
+    if secret.get("DATABASE_READ_URL"):
+        os.environ["DATABASE_READ_URL"] = secret["DATABASE_READ_URL"]
 
 elif RUN_ENV == "local":
     # running locally / tests
@@ -33,3 +35,98 @@ BASE_DOMAIN = os.environ["BASE_DOMAIN"]
 DATABASE_URL = os.environ["DATABASE_URL"]
 MAX_USER_CREATED_FAVORITES = int(os.environ["MAX_USER_CREATED_FAVORITES"])
 MAX_USER_CREATED_REQUESTS = int(os.environ["MAX_USER_CREATED_REQUESTS"])
+
+# Requests exports destination: S3 bucket, or a local directory stand-in (local runs / tests)
+EXPORT_BUCKET = os.environ.get("EXPORT_BUCKET")
+EXPORT_LOCAL_DIR = os.environ.get("EXPORT_LOCAL_DIR")
+
+# Opt-in: connect and prepare the hot queries during the Lambda INIT phase (see src/db/warmup.py)
+DB_WARMUP = os.environ.get("DB_WARMUP", "false").lower() == "true"
+
+# Pooled connections idle for longer than this are pinged before being used (see src/db/liveness.py)
+DB_PING_IDLE_SECONDS = float(os.environ.get("DB_PING_IDLE_SECONDS", "30"))
+
+# Optimistic concurrency conflicts (Aurora DSQL): attempts of a write transaction, and backoff
+# before the first retry (doubled for every next one, jittered), see src/db/transactions.py
+DB_CONFLICT_MAX_ATTEMPTS = int(os.environ.get("DB_CONFLICT_MAX_ATTEMPTS", "4"))
+DB_CONFLICT_BASE_DELAY_MS = float(os.environ.get("DB_CONFLICT_BASE_DELAY_MS", "20"))
+
+# Invocation time kept to answer once the database work is cut short by the deadline, and whether
+# statements get a statement_timeout (PostgreSQL / Aurora DSQL), see src/db/statement_deadline.py
+DEADLINE_RESERVE_MS = float(os.environ.get("DEADLINE_RESERVE_MS", "300"))
+DB_STATEMENT_TIMEOUT = os.environ.get("DB_STATEMENT_TIMEOUT", "true").lower() == "true"
+
+# Database circuit breaker (see src/lib/circuit_breaker.py): opened when failures and calls slower
+# than CIRCUIT_SLOW_CALL_MS reach CIRCUIT_FAILURE_RATE of the last calls, probed again after
+# CIRCUIT_OPEN_SECONDS
+CIRCUIT_BREAKER = os.environ.get("CIRCUIT_BREAKER", "true").lower() == "true"
+CIRCUIT_FAILURE_RATE = float(os.environ.get("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_SLOW_CALL_MS = float(os.environ.get("CIRCUIT_SLOW_CALL_MS", "2000"))
+CIRCUIT_OPEN_SECONDS = float(os.environ.get("CIRCUIT_OPEN_SECONDS", "10"))
+
+# Last known good responses of the read endpoints, served (marked stale) while the database is
+# unavailable (see src/lib/stale_responses.py): entries kept per container, age limit, and the
+# DynamoDB table sharing them between containers (empty: per container only)
+STALE_CACHE_SIZE = int(os.environ.get("STALE_CACHE_SIZE", "1000"))
+STALE_MAX_AGE_SECONDS = float(os.environ.get("STALE_MAX_AGE_SECONDS", "3600"))
+DYNAMODB_TABLE_STALE_RESPONSES = os.environ.get("DYNAMODB_TABLE_STALE_RESPONSES")
+
+# Local runs only: faults injected in the database statements, e.g. "error_rate=0.5,latency_ms=800"
+# (see src/db/fault_injection.py). Empty: none
+DB_FAULTS = os.environ.get("DB_FAULTS", "").strip()
+
+# Log the per-invocation metrics (statement cache hits, round trips, ...) as one JSON line
+LOG_INVOCATION_METRICS = os.environ.get("LOG_INVOCATION_METRICS", "false").lower() == "true"
+
+# psycopg: executions of the same SQL on a connection before it is prepared server side
+# ("none" disables prepared statements, e.g. behind a transaction pooler)
+_prepare_threshold = os.environ.get("DB_PREPARE_THRESHOLD", "1").lower()
+DB_PREPARE_THRESHOLD = None if _prepare_threshold == "none" else int(_prepare_threshold)
+
+# Requests storage layout: "joined" (one subtype table per type) or "single" (location columns
+# on requests), see src/models/layout.py
+REQUEST_STORAGE_LAYOUT = os.environ.get("REQUEST_STORAGE_LAYOUT", "joined").lower()
+
+# Reads endpoint (a replica, or a read only DSQL role), empty: reads go to DATABASE_URL. A user's
+# reads still go to DATABASE_URL for READ_YOUR_WRITES_SECONDS after they wrote (see
+# src/lib/read_your_writes.py)
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL", "").strip()
+READ_YOUR_WRITES_SECONDS = float(os.environ.get("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Regional shards of the requests (SQL backend): JSON list of regions with their database, the
+# main database (DATABASE_URL) being the shard of everything else, see src/db/shards.py.
+# Empty: no sharding
+DATABASE_SHARDS = os.environ.get("DATABASE_SHARDS", "").strip()
+
+# Repositories backend: "sql" (SQLAlchemy, DATABASE_URL) or "dynamodb" (DYNAMODB_TABLE_REQUESTS and
+# DYNAMODB_TABLE_FAVORITES tables, see src/db/dynamodb_tables.py)
+REPOSITORY_BACKEND = os.environ.get("REPOSITORY_BACKEND", "sql").lower()
+
+# Serve the public list endpoint from the request_feed projection (SQL backend only). The projection
+# is always maintained on writes: run scripts/rebuild_request_feed.py once before enabling it
+REQUEST_FEED_READS = os.environ.get("REQUEST_FEED_READS", "false").lower() == "true"
+
+# Rendered requests JSON kept per container, keyed by (id, version) (see src/lib/fragment_cache.py),
+# 0 disables the cache
+FRAGMENT_CACHE_SIZE = int(os.environ.get("FRAGMENT_CACHE_SIZE", "10000"))
+
+# Counters per feed facet key (see src/lib/request_stats.py): more shards, fewer concurrent writes
+# to the same counter, more rows to sum on reads
+REQUEST_COUNTER_SHARDS = int(os.environ.get("REQUEST_COUNTER_SHARDS", "8"))
+
+# Deep health check (GET /health?deep=true): dependency probes results are reused per container for
+# this long, so that frequent health polls never load the database
+HEALTH_PROBE_TTL_SECONDS = float(os.environ.get("HEALTH_PROBE_TTL_SECONDS", "15"))
+
+# UUID columns storage on non PostgreSQL dialects: "string" (CHAR(36)) or "binary" (16 bytes)
+UUID_BINARY_STORAGE = os.environ.get("UUID_STORAGE", "string").lower() == "binary"
+
+# Per-user rate limits: JSON object of route -> "<capacity>/<period_seconds>" ("default" applies
+# to routes without their own limit). Buckets are shared through DynamoDB when a table is
+# configured, kept in memory otherwise (see src/lib/rate_limit.py)
+RATE_LIMITS = os.environ.get(
+    "RATE_LIMITS",
+    '{"default": "120/60", "create_request": "10/60", "update_request": "30/60", '
+    '"create_favorite": "30/60"}',
+)
+DYNAMODB_TABLE_RATE_LIMITS = os.environ.get("DYNAMODB_TABLE_RATE_LIMITS")
@@ -0,0 +1,164 @@
+"""Async Session Manager For Application DB (SQLAlchemy asyncio).
+
+Same database as src/db/session.py, reached through async drivers so that independent queries of
+an invocation can run concurrently (asyncio.gather), each on its own pooled connection:
+- PostgreSQL: psycopg 3 async
+- Aurora DSQL: psycopg 3 async through the auroradsql dialect (see AuroraDSQLDialectAsync_psycopg)
+- SQLite (local runs and tests): aiosqlite
+
+The engine is created on first use, so handlers that stay synchronous never pay for it.
+"""
+
+import os
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any
+
+from aurora_dsql_sqlalchemy.base import AuroraDSQLDialect
+from sqlalchemy import URL, event
+from sqlalchemy.dialects import registry
+from sqlalchemy.dialects.postgresql.psycopg import PGDialectAsync_psycopg
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+from src.config import (
+    DATABASE_URL,
+    DB_PING_IDLE_SECONDS,
+    DB_PREPARE_THRESHOLD,
+    DB_STATEMENT_TIMEOUT,
+)
+from src.db.liveness import (
+    install_first_statement_retry,
+    install_idle_ping,
+    install_round_trip_metrics,
+)
+from src.db.statement_cache import install_statement_cache_metrics, psycopg_connect_args
+from src.db.statement_deadline import install_statement_deadline
+from src.lib.read_your_writes import get_read_your_writes
+
+
+class AuroraDSQLDialectAsync_psycopg(PGDialectAsync_psycopg, AuroraDSQLDialect):  # noqa: N801
+    """Async variant of aurora_dsql_sqlalchemy's psycopg dialect (which only ships a sync one).
+
+    Keeps the "auroradsql" dialect name, so that column types (GUID, Enum) are stored exactly as
+    with the sync engine.
+    """
+
+    supports_statement_cache = True
+
+    def __init__(self, **kwargs: Any) -> None:  # noqa: ANN401
+        # Same as the sync dialect: the hstore check uses a savepoint, which DSQL rejects
+        kwargs.setdefault("use_native_hstore", False)
+        super().__init__(**kwargs)
+
+    @classmethod
+    def get_async_dialect_cls(cls, url: URL) -> type:  # noqa: ARG003
+        return cls
+
+
+registry.register("auroradsql.psycopg_async", __name__, "AuroraDSQLDialectAsync_psycopg")
+
+
+def async_database_url(url: str | URL) -> URL:
+    """Map a (sync) database URL to its async driver."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+psycopg_async")
+    if backend == "auroradsql":
+        return url.set(drivername="auroradsql+psycopg_async")
+    exception_msg = f"No async driver configured for {backend}"
+    raise ValueError(exception_msg)
+
+
+class AsyncSyncSession(Session):
+    """Session class run under AsyncSession (event listeners attach to it)."""
+
+
+def create_async_db_engine(url: str | URL = DATABASE_URL) -> AsyncEngine:
+    """Create an async engine with the same connection handling as the sync one."""
+    url = async_database_url(url)
+    backend = url.get_backend_name()
+    if backend == "auroradsql":
+        from src.db.dsql_token import dsql_token_cache  # noqa: PLC0415
+
+        hostname, region, db_role = url.host, os.environ["AWS_REGION"], url.username
+        engine = create_async_engine(
+            url,
+            connect_args={"sslmode": "require", **psycopg_connect_args(DB_PREPARE_THRESHOLD)},
+            pool_recycle=600,  # Recycle connections after 10 minutes (tokens expire in 15)
+        )
+
+        @event.listens_for(engine.sync_engine, "do_connect")
+        def receive_do_connect(dialect, conn_rec, cargs, cparams):  # noqa: ANN001, ANN202, ARG001
+            cparams["password"] = dsql_token_cache.get_token(hostname, region, db_role)
+
+        @event.listens_for(engine.sync_engine, "checkin")
+        def receive_checkin(dbapi_connection, connection_record):  # noqa: ANN001, ANN202, ARG001
+            dsql_token_cache.refresh_due()
+
+    elif backend == "postgresql":
+        engine = create_async_engine(url, connect_args=psycopg_connect_args(DB_PREPARE_THRESHOLD))
+    else:
+        engine = create_async_engine(url)
+
+    install_idle_ping(engine.sync_engine, DB_PING_IDLE_SECONDS)
+    install_round_trip_metrics(engine.sync_engine)
+    install_statement_cache_metrics(engine.sync_engine)
+    install_statement_deadline(engine.sync_engine, DB_STATEMENT_TIMEOUT)
+    return engine
+
+
+install_first_statement_retry(AsyncSyncSession)
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Container wide async engine (created on first use)."""
+    global _async_engine, _async_session_factory  # noqa: PLW0603
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine,
+            expire_on_commit=False,
+            sync_session_class=AsyncSyncSession,
+        )
+    return _async_engine
+
+
+# NOTE: an AsyncSession must not be shared by concurrent coroutines: every repository call opens
+# its own session (and connection), which is what lets gather() run queries in parallel
+@asynccontextmanager
+async def get_async_db_session(write: bool = False) -> AsyncIterator[AsyncSession]:  # noqa: FBT001, FBT002
+    """Async counterpart of get_db_session: commit on exit, rollback on error.
+
+    Committed write sessions open the read-your-writes window of the current user, like the sync
+    ones (see open_session): the next reads of the user, sync or not, go to the writer.
+    """
+    get_async_engine()
+    session = _async_session_factory()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+    if write:
+        get_read_your_writes().record_write()
+
+
+def get_async_write_session() -> AbstractAsyncContextManager[AsyncSession]:
+    """Async session of a write (see get_async_db_session)."""
+    return get_async_db_session(write=True)
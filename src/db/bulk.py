@@ -0,0 +1,501 @@
+"""Bulk Generation And Loading Of Requests And Favorites.
+
+The ORM path (RequestRepository.create) flushes one request + one subtype row per session, which
+tops out at a few hundred rows per second. This module bypasses the ORM unit of work:
+- SQLite (and other dialects): multi-row INSERT ... VALUES statements through SQLAlchemy Core
+- PostgreSQL / Aurora DSQL: COPY ... FROM STDIN through the raw psycopg connection
+
+Records are plain dicts (one per NDJSON line) and are consumed as a stream, so memory usage only
+depends on the batch size and never on the input size.
+"""
+
+import json
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from functools import lru_cache
+from typing import IO, Any
+
+from sqlalchemy import Engine, Table, insert
+
+from src.db.request_counters import counter_upsert
+from src.lib.feed import feed_key
+from src.lib.ids import uuid7, uuid7_at
+from src.lib.request_stats import counter_keys, counter_shard
+from src.lib.search import token_weights
+from src.models.favorite import Favorite
+from src.models.layout import is_single_table
+from src.models.request import (
+    LOCATION_COLUMNS,
+    BuyAndDeliverRequest,
+    OnlineServiceRequest,
+    PickupAndDeliverRequest,
+    Request,
+    RequestFeedEntry,
+    RequestSearchToken,
+)
+from src.schemas.request import RequestType
+
+# Aurora DSQL limits the number of rows modified by a single transaction (3000 at the time of
+# writing). Every request costs two rows (requests + subtype table, one in the single table layout)
+# plus its search index rows and its feed projection row. Each flush also upserts the feed stats
+# counters of its requests (a few rows per due day).
+DSQL_MAX_ROWS_PER_TRANSACTION = 3000
+
+# SQLite caps the number of bound parameters per statement (999 before 3.32, 32766 since)
+_SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32) else 999
+
+_REQUESTS_TABLE: Table = Request.__table__
+_FAVORITES_TABLE: Table = Favorite.__table__
+_SEARCH_TOKENS_TABLE: Table = RequestSearchToken.__table__
+_REQUEST_FEED_TABLE: Table = RequestFeedEntry.__table__
+_SUBTYPE_TABLES: dict[RequestType, Table] = {
+    RequestType.BUY_AND_DELIVER: BuyAndDeliverRequest.__table__,
+    RequestType.PICKUP_AND_DELIVER: PickupAndDeliverRequest.__table__,
+    RequestType.ONLINE_SERVICE: OnlineServiceRequest.__table__,
+}
+# Flush order matters for databases enforcing foreign keys (requests first, favorites last)
+_TABLES_FLUSH_ORDER: list[Table] = [
+    _REQUESTS_TABLE,
+    *_SUBTYPE_TABLES.values(),
+    _SEARCH_TOKENS_TABLE,
+    _REQUEST_FEED_TABLE,
+    _FAVORITES_TABLE,
+]
+
+# Aurora DSQL dialect is PostgreSQL based and supports COPY FROM STDIN as well
+_COPY_DIALECTS = ("postgresql", "auroradsql")
+
+
+# -------------------------------
+# Generation
+# -------------------------------
+_ITEMS = (
+    "iPhone 16 Pro",
+    "MacBook Air",
+    "Perfume",
+    "Medicine box",
+    "Passport documents",
+    "Running shoes",
+    "Coffee machine",
+    "Books",
+    "Baby formula",
+    "Camera lens",
+    "Car spare parts",
+    "Olive oil",
+)
+_SERVICES = (
+    "Netflix subscription",
+    "Plane ticket",
+    "Concert tickets",
+    "Online course",
+    "Software license",
+    "Hotel booking",
+)
+# (latitude, longitude) of the main cities the marketplace operates in
+_CITIES = (
+    (36.8065, 10.1815),  # Tunis
+    (34.7406, 10.7603),  # Sfax
+    (35.8256, 10.6084),  # Sousse
+    (48.8566, 2.3522),  # Paris
+    (45.7640, 4.8357),  # Lyon
+    (43.2965, 5.3698),  # Marseille
+)
+
+
+def _random_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _time_ordered_uuid(rng: random.Random, created_at: datetime) -> uuid.UUID:
+    # Rows ids are UUIDv7 (see src/lib/ids.py), user ids (Cognito sub) are random UUIDs
+    return uuid7_at(int(created_at.timestamp() * 1000), rng.getrandbits(74))
+
+
+def _random_location(rng: random.Random) -> tuple[float, float]:
+    lat, lng = rng.choice(_CITIES)
+    # Spread points over ~20km around the city center
+    return round(lat + rng.uniform(-0.2, 0.2), 6), round(lng + rng.uniform(-0.2, 0.2), 6)
+
+
+def generate_records(
+    requests_count: int,
+    users_count: int = 1000,
+    favorites_count: int = 0,
+    seed: int | None = None,
+    now: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Generate realistic request and favorite records (NDJSON ready).
+
+    All requests are yielded first, then favorites pointing to already generated requests, so the
+    output can be streamed straight into BulkLoader.load() even with foreign keys enforced.
+    Favorites are unique per (user_id, request_id).
+    """
+    rng = random.Random(seed)  # noqa: S311 # not used for security
+    now = now or datetime.now(UTC)
+    user_ids = [_random_uuid(rng) for _ in range(max(users_count, 1))]
+    # Favorites need request ids, keep a bounded sample of them (reservoir sampling)
+    request_ids_sample: list[uuid.UUID] = []
+    sample_size = 10_000
+    request_types = list(RequestType)
+
+    for index in range(requests_count):
+        request_type = rng.choice(request_types)
+        created_at = now - timedelta(seconds=rng.randint(0, 90 * 24 * 3600))
+        due_date = None
+        if rng.random() < 0.7:  # noqa: PLR2004 # 70% of requests have a due date
+            due_date = now + timedelta(minutes=rng.randint(60, 60 * 24 * 60))
+
+        record: dict[str, Any] = {
+            "kind": "request",
+            "id": str(_time_ordered_uuid(rng, created_at)),
+            "user_id": str(rng.choice(user_ids)),
+            "type": request_type.value,
+            "due_date": due_date.isoformat() if due_date else None,
+            "created_at": created_at.isoformat(),
+        }
+        if request_type == RequestType.ONLINE_SERVICE:
+            service = rng.choice(_SERVICES)
+            record["title"] = f"Need {service}"
+            record["description"] = f"Looking for someone to pay {service.lower()} for me."
+            record["meetup_latitude"], record["meetup_longitude"] = _random_location(rng)
+        else:
+            item = rng.choice(_ITEMS)
+            record["title"] = f"{item} wanted"
+            record["description"] = f"Looking for someone able to bring {item.lower()}."
+            record["dropoff_latitude"], record["dropoff_longitude"] = _random_location(rng)
+            if request_type == RequestType.PICKUP_AND_DELIVER:
+                record["pickup_latitude"], record["pickup_longitude"] = _random_location(rng)
+        yield record
+
+        if len(request_ids_sample) < sample_size:
+            request_ids_sample.append(uuid.UUID(record["id"]))
+        else:
+            slot = rng.randint(0, index)
+            if slot < sample_size:
+                request_ids_sample[slot] = uuid.UUID(record["id"])
+
+    if not request_ids_sample:
+        return
+
+    favorites_count = min(favorites_count, len(user_ids) * len(request_ids_sample))
+    seen: set[tuple[uuid.UUID, uuid.UUID]] = set()
+    while len(seen) < favorites_count:
+        pair = (rng.choice(user_ids), rng.choice(request_ids_sample))
+        if pair in seen:
+            continue
+        seen.add(pair)
+        created_at = now - timedelta(seconds=rng.randint(0, 30 * 24 * 3600))
+        yield {
+            "kind": "favorite",
+            "id": str(_time_ordered_uuid(rng, created_at)),
+            "user_id": str(pair[0]),
+            "request_id": str(pair[1]),
+            "created_at": created_at.isoformat(),
+        }
+
+
+def read_ndjson(stream: IO[str]) -> Iterator[dict[str, Any]]:
+    """Stream records from an NDJSON text stream (blank lines are ignored)."""
+    for line_number, line in enumerate(stream, start=1):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        try:
+            yield json.loads(stripped)
+        except json.JSONDecodeError as e:
+            exception_msg = f"Invalid NDJSON at line {line_number}: {e.msg}"
+            raise ValueError(exception_msg) from e
+
+
+def write_ndjson(records: Iterable[dict[str, Any]], stream: IO[str]) -> int:
+    """Write records as NDJSON, return the number of written lines."""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, separators=(",", ":")))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+# -------------------------------
+# Records -> table rows
+# -------------------------------
+def _parse_datetime(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _request_rows(record: dict[str, Any]) -> list[tuple[Table, dict[str, Any]]]:
+    request_type = RequestType(record["type"])
+    request_id = uuid.UUID(record["id"]) if record.get("id") else uuid7()
+    request_row = {
+        "id": request_id,
+        "user_id": uuid.UUID(record["user_id"]),
+        "type": request_type,
+        "title": record["title"],
+        "description": record.get("description"),
+        "due_date": _parse_datetime(record.get("due_date")),
+        "created_at": _parse_datetime(record.get("created_at")) or datetime.now(UTC),
+        "version": 1,
+    }
+    index_rows = [
+        (_SEARCH_TOKENS_TABLE, {"token": token, "request_id": request_id, "weight": weight})
+        for token, weight in token_weights(request_row["title"], request_row["description"]).items()
+    ]
+    locations = {column: float(record[column]) for column in LOCATION_COLUMNS[request_type]}
+    # Transient request (locations on itself), only used to render the feed projection row
+    request = Request(**request_row, **locations)
+    index_rows.append(
+        (
+            _REQUEST_FEED_TABLE,
+            {
+                "request_id": request_id,
+                "feed_key": feed_key(request.due_date, request.created_at, request_id),
+                "type": request_type,
+                "fragment": request.to_json_fragment(),
+            },
+        ),
+    )
+    if is_single_table():
+        request_row.update(locations)
+        return [(_REQUESTS_TABLE, request_row), *index_rows]
+    subtype_row = {"request_id": request_id, **locations}
+    return [
+        (_REQUESTS_TABLE, request_row),
+        (_SUBTYPE_TABLES[request_type], subtype_row),
+        *index_rows,
+    ]
+
+
+def _favorite_rows(record: dict[str, Any]) -> list[tuple[Table, dict[str, Any]]]:
+    favorite_row = {
+        "id": uuid.UUID(record["id"]) if record.get("id") else uuid7(),
+        "user_id": uuid.UUID(record["user_id"]),
+        "request_id": uuid.UUID(record["request_id"]),
+        "created_at": _parse_datetime(record.get("created_at")) or datetime.now(UTC),
+    }
+    return [(_FAVORITES_TABLE, favorite_row)]
+
+
+def record_to_rows(record: dict[str, Any]) -> list[tuple[Table, dict[str, Any]]]:
+    """Convert one NDJSON record into the table rows it is stored as."""
+    kind = record.get("kind", "request")
+    if kind == "request":
+        return _request_rows(record)
+    if kind == "favorite":
+        return _favorite_rows(record)
+    exception_msg = f"Unknown record kind: {kind!r}"
+    raise ValueError(exception_msg)
+
+
+# -------------------------------
+# Loading
+# -------------------------------
+@dataclass
+class LoadReport:
+    """Progress and throughput of a bulk load."""
+
+    rows_per_table: dict[str, int] = field(default_factory=dict)
+    records: int = 0
+    transactions: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+
+    @property
+    def rows(self) -> int:
+        return sum(self.rows_per_table.values())
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Human readable one line summary."""
+        tables = ", ".join(f"{name}={count}" for name, count in self.rows_per_table.items())
+        return (
+            f"{self.records} records ({self.rows} rows: {tables}) in {self.elapsed:.2f}s "
+            f"over {self.transactions} transactions -> {self.records_per_second:,.0f} records/s"
+        )
+
+
+@lru_cache(maxsize=64)
+def _multi_values_sql(table: Table, rows_count: int, preparer: Any) -> str:  # noqa: ANN401
+    """Render (once per table / rows count) a qmark multi-row INSERT statement."""
+    columns = ", ".join(preparer.quote(column.name) for column in table.columns)
+    row_placeholders = f"({', '.join('?' * len(table.columns))})"
+    values = ", ".join([row_placeholders] * rows_count)
+    return f"INSERT INTO {preparer.format_table(table)} ({columns}) VALUES {values}"  # noqa: S608
+
+
+def _insert_multi_values(connection: Any, table: Table, rows: list[dict[str, Any]]) -> None:
+    """Insert rows with multi-row INSERT ... VALUES statements (bound parameters limit aware).
+
+    Compiling a multi-row insert() construct through SQLAlchemy costs more than executing it, so
+    the statement is rendered by hand and values go through the column types bind processors.
+    Only used with qmark paramstyle drivers (SQLite), other dialects use executemany.
+    """
+    dialect = connection.dialect
+    if dialect.paramstyle != "qmark":
+        connection.execute(insert(table), rows)
+        return
+
+    processors = [
+        (column.name, column.type.dialect_impl(dialect).bind_processor(dialect))
+        for column in table.columns
+    ]
+    rows_per_statement = max(1, _SQLITE_MAX_VARIABLES // len(processors))
+    for start in range(0, len(rows), rows_per_statement):
+        chunk = rows[start : start + rows_per_statement]
+        parameters = []
+        for row in chunk:
+            for name, processor in processors:
+                value = row.get(name)
+                parameters.append(processor(value) if processor else value)
+        sql = _multi_values_sql(table, len(chunk), dialect.identifier_preparer)
+        connection.exec_driver_sql(sql, tuple(parameters))
+
+
+def _copy_value(value: Any) -> Any:  # noqa: ANN401
+    # COPY bypasses SQLAlchemy types: SQLAlchemy Enum columns persist the enum name, not its value
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def _insert_copy(connection: Any, table: Table, rows: list[dict[str, Any]]) -> None:
+    """Insert rows using PostgreSQL COPY FROM STDIN (psycopg 3)."""
+    column_names = [column.name for column in table.columns]
+    copy_sql = f"COPY {table.name} ({', '.join(column_names)}) FROM STDIN"
+    dbapi_connection = connection.connection.driver_connection
+    with dbapi_connection.cursor() as cursor, cursor.copy(copy_sql) as copy:
+        for row in rows:
+            copy.write_row([_copy_value(row.get(name)) for name in column_names])
+
+
+class BulkLoader:
+    """Stream records into the database in batches.
+
+    - batch_size: number of rows buffered before being written (one statement / COPY per table)
+    - max_rows_per_transaction: rows written before committing; keeps every transaction under
+      Aurora DSQL limits. Each batch is committed on its own when it is larger than this.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 1000,
+        max_rows_per_transaction: int = DSQL_MAX_ROWS_PER_TRANSACTION,
+        use_copy: bool | None = None,
+        progress: Callable[[LoadReport], None] | None = None,
+        progress_every: int = 10_000,
+    ) -> None:
+        if batch_size <= 0 or max_rows_per_transaction <= 0:
+            exception_msg = "batch_size and max_rows_per_transaction must be positive"
+            raise ValueError(exception_msg)
+        self.engine = engine
+        self.batch_size = min(batch_size, max_rows_per_transaction)
+        self.max_rows_per_transaction = max_rows_per_transaction
+        self.use_copy = engine.dialect.name in _COPY_DIALECTS if use_copy is None else use_copy
+        self.progress = progress
+        self.progress_every = progress_every
+
+    def _write(self, connection: Any, buffers: dict[Table, list[dict[str, Any]]]) -> int:
+        written = 0
+        for table in _TABLES_FLUSH_ORDER:
+            rows = buffers.get(table)
+            if not rows:
+                continue
+            if self.use_copy:
+                _insert_copy(connection, table, rows)
+            else:
+                _insert_multi_values(connection, table, rows)
+            written += len(rows)
+
+        # Feed stats counters of the flushed requests, one upsert per flush
+        deltas: Counter = Counter()
+        for row in buffers.get(_REQUESTS_TABLE, []):
+            deltas.update(counter_keys(row["type"], row["due_date"]))
+        if deltas:
+            connection.execute(counter_upsert(connection.dialect.name, deltas, counter_shard()))
+            written += len(deltas)
+        return written
+
+    def load(self, records: Iterable[dict[str, Any]]) -> LoadReport:
+        """Load all records, return the load report."""
+        report = LoadReport()
+        buffers: dict[Table, list[dict[str, Any]]] = {}
+        buffered_rows = 0
+        last_progress = 0
+
+        connection = self.engine.connect()
+        transaction = connection.begin()
+        rows_in_transaction = 0
+        try:
+            for record in records:
+                rows = record_to_rows(record)
+                # A record's rows are never split across transactions
+                if rows_in_transaction + buffered_rows + len(rows) > self.max_rows_per_transaction:
+                    rows_in_transaction += self._flush(connection, buffers, report)
+                    buffered_rows = 0
+                    transaction.commit()
+                    report.transactions += 1
+                    transaction = connection.begin()
+                    rows_in_transaction = 0
+
+                for table, row in rows:
+                    buffers.setdefault(table, []).append(row)
+                buffered_rows += len(rows)
+                report.records += 1
+
+                if buffered_rows >= self.batch_size:
+                    rows_in_transaction += self._flush(connection, buffers, report)
+                    buffered_rows = 0
+
+                if self.progress and report.records - last_progress >= self.progress_every:
+                    last_progress = report.records
+                    self.progress(report)
+
+            self._flush(connection, buffers, report)
+            transaction.commit()
+            report.transactions += 1
+        except Exception:
+            transaction.rollback()
+            raise
+        finally:
+            connection.close()
+
+        report.finished_at = time.perf_counter()
+        if self.progress:
+            self.progress(report)
+        return report
+
+    def _flush(
+        self,
+        connection: Any,
+        buffers: dict[Table, list[dict[str, Any]]],
+        report: LoadReport,
+    ) -> int:
+        written = self._write(connection, buffers)
+        for table, rows in buffers.items():
+            report.rows_per_table[table.name] = report.rows_per_table.get(table.name, 0) + len(rows)
+        buffers.clear()
+        return written
+
+
+def print_progress(report: LoadReport) -> None:
+    """Progress callback writing the report summary to stderr."""
+    sys.stderr.write(f"{report.summary()}\n")
@@ -0,0 +1,141 @@
+"""Aurora DSQL IAM Authentication Tokens."""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from src.lib.metrics import metrics
+
+# IAM auth tokens are requested with this validity (DSQL default and what pool_recycle relies on)
+DSQL_TOKEN_TTL_SECONDS = 900
+# A cached token is not handed out anymore when it expires in less than this
+DSQL_TOKEN_SAFETY_MARGIN_SECONDS = 120
+# Tokens are renewed ahead of time (refresh_due) when they expire in less than this
+DSQL_TOKEN_REFRESH_AHEAD_SECONDS = 300
+
+
+def generate_dsql_token(client, hostname, region, db_role, expires_in=DSQL_TOKEN_TTL_SECONDS):  # noqa
+    """Generate IAM token for Aurora DSQL connection.
+
+    AWS provides two separate API methods:
+    - generate_db_connect_admin_auth_token: for predefined admin role
+    - generate_db_connect_auth_token: for custom database roles (role specified in connection URL)
+
+    Both methods have the same signature: (Hostname, Region, ExpiresIn)
+    The database role is NOT passed to token generation - it's in the connection URL username.
+    """
+    if db_role == "admin":
+        return client.generate_db_connect_admin_auth_token(hostname, region, expires_in)
+    else:
+        # For custom roles like app_user, use generate_db_connect_auth_token
+        # The role name is specified in the connection URL (username), not here
+        return client.generate_db_connect_auth_token(hostname, region, expires_in)
+
+
+@dataclass
+class _CachedToken:
+    token: str
+    expires_at: float
+
+
+class DsqlTokenCache:
+    """Cache of DSQL IAM tokens keyed by (hostname, region, db_role).
+
+    Signing a token is pure CPU work (SigV4) but it is on the connect hot path: every new physical
+    connection used to sign a new one. A token stays valid for DSQL_TOKEN_TTL_SECONDS so it is
+    reused for every connection until the safety margin before its expiry.
+    refresh_due() renews tokens getting close to expiry outside of the connect path: the engines
+    call it when a connection is checked back in to the pool, after the queries ran (see
+    src/db/session.py), so connects almost never have to sign.
+
+    Metrics: dsql_token.hit, dsql_token.miss (signed on the connect path), dsql_token.refresh
+    (signed ahead of time).
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[str], Any],
+        ttl_seconds: float = DSQL_TOKEN_TTL_SECONDS,
+        safety_margin_seconds: float = DSQL_TOKEN_SAFETY_MARGIN_SECONDS,
+        refresh_ahead_seconds: float = DSQL_TOKEN_REFRESH_AHEAD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if safety_margin_seconds >= ttl_seconds:
+            exception_msg = "safety_margin_seconds must be lower than ttl_seconds"
+            raise ValueError(exception_msg)
+        self._client_factory = client_factory
+        self._clients: dict[str, Any] = {}
+        self._tokens: dict[tuple[str, str, str], _CachedToken] = {}
+        self._lock = threading.Lock()
+        self.ttl_seconds = ttl_seconds
+        self.safety_margin_seconds = safety_margin_seconds
+        self.refresh_ahead_seconds = max(refresh_ahead_seconds, safety_margin_seconds)
+        self.clock = clock
+
+    def _client(self, region: str) -> Any:  # noqa: ANN401
+        # Clients are created lazily: containers never connecting never pay for boto3 setup
+        if region not in self._clients:
+            self._clients[region] = self._client_factory(region)
+        return self._clients[region]
+
+    def _sign(self, key: tuple[str, str, str]) -> _CachedToken:
+        hostname, region, db_role = key
+        now = self.clock()
+        client = self._client(region)
+        token = generate_dsql_token(client, hostname, region, db_role, self.ttl_seconds)
+        cached = _CachedToken(token=token, expires_at=now + self.ttl_seconds)
+        self._tokens[key] = cached
+        return cached
+
+    def get_token(self, hostname: str, region: str, db_role: str) -> str:
+        """Return a valid token, signing a new one only if the cached one is (nearly) expired."""
+        key = (hostname, region, db_role)
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached and cached.expires_at - self.clock() > self.safety_margin_seconds:
+                metrics.incr("dsql_token.hit")
+                return cached.token
+            metrics.incr("dsql_token.miss")
+            return self._sign(key).token
+
+    def refresh_due(self) -> int:
+        """Proactively renew cached tokens expiring within refresh_ahead_seconds.
+
+        Returns the number of renewed tokens.
+        """
+        refreshed = 0
+        with self._lock:
+            now = self.clock()
+            for key, cached in list(self._tokens.items()):
+                if cached.expires_at - now <= self.refresh_ahead_seconds:
+                    self._sign(key)
+                    refreshed += 1
+        metrics.incr("dsql_token.refresh", refreshed)
+        return refreshed
+
+    def sign(self, hostname: str, region: str, db_role: str) -> str:
+        """Sign a new token right away (it replaces the cached one), e.g. to probe signing."""
+        with self._lock:
+            return self._sign((hostname, region, db_role)).token
+
+    def seconds_to_expiry(self, hostname: str, region: str, db_role: str) -> float | None:
+        """Remaining validity of the cached token, None if there is none."""
+        cached = self._tokens.get((hostname, region, db_role))
+        return cached.expires_at - self.clock() if cached else None
+
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._tokens.clear()
+
+
+def _boto3_dsql_client(region: str) -> Any:  # noqa: ANN401
+    import boto3  # noqa: PLC0415 # only needed when connecting to Aurora DSQL
+
+    return boto3.client("dsql", region_name=region)
+
+
+# Container wide cache, shared by all engines
+dsql_token_cache = DsqlTokenCache(_boto3_dsql_client)
@@ -0,0 +1,99 @@
+"""DynamoDB Tables Layout (REPOSITORY_BACKEND=dynamodb).
+
+requests table, key id:
+- request items: the request attributes, locations included (one item per request)
+- quota items (id "quota#<user_id>"): number of requests created by a user, only updated with
+  conditional writes. They carry none of the indexes keys so they never show in the indexes
+- counter items (id "counter#<key>#<shard>"): feed stats counters (see src/lib/request_stats.py),
+  out of the indexes as well
+- GSI feed (feed_pk, feed_sk): every request in list_requests order. feed_pk is a constant and
+  feed_sk is "<due_date or ~>#<created_at>#<id>" with fixed width UTC dates, so that the
+  lexicographic order is due_date ASC NULLS LAST, created_at ASC, id ASC, and due date windows
+  are key ranges
+- GSI type_feed (type, feed_sk): the same, per type
+- GSI user (user_id, created_at): requests of a user
+
+favorites table, key id (a name based UUID of (user_id, request_id), see
+DynamoDBFavoriteRepository: creating the same favorite twice writes the same key):
+- GSI user (user_id, created_at): favorites of a user, most recent first
+- GSI request (request_id): favorites of a request (deleted with it)
+
+NOTE: The feed GSI partition holds every request: fine at the current scale (a GSI partition
+sustains 1000 writes/s), it would need write sharding (feed_pk "ALL#<n>") beyond.
+"""
+
+from typing import Any
+
+FEED_PK = "ALL"
+
+REQUESTS_TABLE_DEFINITION: dict[str, Any] = {
+    "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+    "AttributeDefinitions": [
+        {"AttributeName": "id", "AttributeType": "S"},
+        {"AttributeName": "feed_pk", "AttributeType": "S"},
+        {"AttributeName": "feed_sk", "AttributeType": "S"},
+        {"AttributeName": "type", "AttributeType": "S"},
+        {"AttributeName": "user_id", "AttributeType": "S"},
+        {"AttributeName": "created_at", "AttributeType": "S"},
+    ],
+    "GlobalSecondaryIndexes": [
+        {
+            "IndexName": "feed",
+            "KeySchema": [
+                {"AttributeName": "feed_pk", "KeyType": "HASH"},
+                {"AttributeName": "feed_sk", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+        {
+            "IndexName": "type_feed",
+            "KeySchema": [
+                {"AttributeName": "type", "KeyType": "HASH"},
+                {"AttributeName": "feed_sk", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+        {
+            "IndexName": "user",
+            "KeySchema": [
+                {"AttributeName": "user_id", "KeyType": "HASH"},
+                {"AttributeName": "created_at", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+    ],
+    "BillingMode": "PAY_PER_REQUEST",
+}
+
+FAVORITES_TABLE_DEFINITION: dict[str, Any] = {
+    "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+    "AttributeDefinitions": [
+        {"AttributeName": "id", "AttributeType": "S"},
+        {"AttributeName": "user_id", "AttributeType": "S"},
+        {"AttributeName": "request_id", "AttributeType": "S"},
+        {"AttributeName": "created_at", "AttributeType": "S"},
+    ],
+    "GlobalSecondaryIndexes": [
+        {
+            "IndexName": "user",
+            "KeySchema": [
+                {"AttributeName": "user_id", "KeyType": "HASH"},
+                {"AttributeName": "created_at", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+        {
+            "IndexName": "request",
+            "KeySchema": [{"AttributeName": "request_id", "KeyType": "HASH"}],
+            "Projection": {"ProjectionType": "KEYS_ONLY"},
+        },
+    ],
+    "BillingMode": "PAY_PER_REQUEST",
+}
+
+
+def create_tables(dynamodb: Any, requests_table_name: str, favorites_table_name: str) -> tuple:  # noqa: ANN401
+    """Create both tables (local runs and tests), return (requests table, favorites table)."""
+    requests = dynamodb.create_table(TableName=requests_table_name, **REQUESTS_TABLE_DEFINITION)
+    favorites = dynamodb.create_table(TableName=favorites_table_name, **FAVORITES_TABLE_DEFINITION)
+    return requests, favorites
@@ -0,0 +1,264 @@
+"""Streaming Export Of Requests (NDJSON).
+
+Rows are read in keyset batches and written one line at a time, so memory usage stays constant
+whatever the size of the requests table.
+
+The export walks the primary key index in order (keyset on requests.id): an export can be resumed
+from the last exported id, which is handed back to the caller as an opaque resume token.
+Every batch is read in its own short transaction, never one transaction for the whole export:
+Aurora DSQL bounds transactions to 5 minutes, and a failure only loses the batch being read.
+Exported records use the same format as src/db/bulk.py, so an export can be loaded back as is.
+
+NOTE: Only the main database is exported: exports refuse to run with regional shards
+(DATABASE_SHARDS, see src/db/shards.py), rather than report a partial export as completed.
+"""
+
+import base64
+import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import IO, Any
+from uuid import UUID
+
+from sqlalchemy import Engine, Select, func, select
+
+from src.config import DATABASE_SHARDS
+from src.lib.object_store import ObjectStore
+from src.models.request import (
+    BuyAndDeliverRequest,
+    OnlineServiceRequest,
+    PickupAndDeliverRequest,
+    Request,
+)
+from src.schemas.request import RequestType
+
+# NOTE: Locations come from the subtype tables (joined layout) or from requests itself (single
+# table layout), whichever is set: exports work with both, even halfway through a migration
+_SUBTYPE_COLUMNS = (
+    func.coalesce(BuyAndDeliverRequest.dropoff_latitude, Request.dropoff_latitude).label(
+        "bd_dropoff_latitude",
+    ),
+    func.coalesce(BuyAndDeliverRequest.dropoff_longitude, Request.dropoff_longitude).label(
+        "bd_dropoff_longitude",
+    ),
+    func.coalesce(PickupAndDeliverRequest.pickup_latitude, Request.pickup_latitude).label(
+        "pickup_latitude",
+    ),
+    func.coalesce(PickupAndDeliverRequest.pickup_longitude, Request.pickup_longitude).label(
+        "pickup_longitude",
+    ),
+    func.coalesce(PickupAndDeliverRequest.dropoff_latitude, Request.dropoff_latitude).label(
+        "pd_dropoff_latitude",
+    ),
+    func.coalesce(PickupAndDeliverRequest.dropoff_longitude, Request.dropoff_longitude).label(
+        "pd_dropoff_longitude",
+    ),
+    func.coalesce(OnlineServiceRequest.meetup_latitude, Request.meetup_latitude).label(
+        "meetup_latitude",
+    ),
+    func.coalesce(OnlineServiceRequest.meetup_longitude, Request.meetup_longitude).label(
+        "meetup_longitude",
+    ),
+)
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    """Filters applied to an export, all optional."""
+
+    request_type: RequestType | None = None
+    created_after: datetime | None = None  # inclusive
+    created_before: datetime | None = None  # exclusive
+
+
+def check_unsharded() -> None:
+    """Raise ValueError when requests are spread over regional shards (see the NOTE above)."""
+    if DATABASE_SHARDS:
+        exception_msg = "Exports read the main database only, they cannot run with DATABASE_SHARDS"
+        raise ValueError(exception_msg)
+
+
+def encode_resume_token(last_id: UUID) -> str:
+    """Encode the keyset position (last exported id) as an opaque token."""
+    return base64.urlsafe_b64encode(json.dumps({"id": str(last_id)}).encode()).decode()
+
+
+def decode_resume_token(token: str) -> UUID:
+    """Decode a resume token back to the last exported id."""
+    try:
+        return UUID(json.loads(base64.urlsafe_b64decode(token.encode()).decode())["id"])
+    except (ValueError, KeyError, TypeError, json.JSONDecodeError) as e:
+        exception_msg = "Invalid resume token"
+        raise ValueError(exception_msg) from e
+
+
+def build_export_query(filters: ExportFilters, after_id: UUID | None = None) -> Select:
+    """Build the keyset ordered export query (requests + all subtype columns)."""
+    query = (
+        select(
+            Request.id,
+            Request.user_id,
+            Request.type,
+            Request.title,
+            Request.description,
+            Request.due_date,
+            Request.created_at,
+            *_SUBTYPE_COLUMNS,
+        )
+        .outerjoin(BuyAndDeliverRequest, BuyAndDeliverRequest.request_id == Request.id)
+        .outerjoin(PickupAndDeliverRequest, PickupAndDeliverRequest.request_id == Request.id)
+        .outerjoin(OnlineServiceRequest, OnlineServiceRequest.request_id == Request.id)
+    )
+    if filters.request_type:
+        query = query.where(Request.type == filters.request_type)
+    if filters.created_after:
+        query = query.where(Request.created_at >= filters.created_after)
+    if filters.created_before:
+        query = query.where(Request.created_at < filters.created_before)
+    if after_id:
+        query = query.where(Request.id > after_id)
+    return query.order_by(Request.id)
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    if value is None:
+        return None
+    # Dates are always stored in UTC, but SQLite hands them back timezone naive
+    return (value if value.tzinfo else value.replace(tzinfo=UTC)).isoformat()
+
+
+def _row_to_record(row: Any) -> dict[str, Any]:  # noqa: ANN401
+    record: dict[str, Any] = {
+        "kind": "request",
+        "id": str(row.id),
+        "user_id": str(row.user_id),
+        "type": row.type.value,
+        "title": row.title,
+        "description": row.description,
+        "due_date": _isoformat(row.due_date),
+        "created_at": _isoformat(row.created_at),
+    }
+    if row.type == RequestType.BUY_AND_DELIVER:
+        record["dropoff_latitude"] = row.bd_dropoff_latitude
+        record["dropoff_longitude"] = row.bd_dropoff_longitude
+    elif row.type == RequestType.PICKUP_AND_DELIVER:
+        record["pickup_latitude"] = row.pickup_latitude
+        record["pickup_longitude"] = row.pickup_longitude
+        record["dropoff_latitude"] = row.pd_dropoff_latitude
+        record["dropoff_longitude"] = row.pd_dropoff_longitude
+    else:
+        record["meetup_latitude"] = row.meetup_latitude
+        record["meetup_longitude"] = row.meetup_longitude
+    return record
+
+
+def iter_request_records(
+    engine: Engine,
+    filters: ExportFilters | None = None,
+    resume_token: str | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """Stream request records in primary key order.
+
+    Fetches chunk_size rows at a time, after the last id of the previous batch, each batch in its
+    own transaction: no connection is held while the records are written.
+    """
+    filters = filters or ExportFilters()
+    after_id = decode_resume_token(resume_token) if resume_token else None
+    while True:
+        with engine.connect() as connection:
+            rows = connection.execute(build_export_query(filters, after_id).limit(chunk_size)).all()
+        for row in rows:
+            yield _row_to_record(row)
+        if len(rows) < chunk_size:
+            return
+        after_id = rows[-1].id
+
+
+@dataclass
+class ExportReport:
+    """Outcome of an export run."""
+
+    records: int = 0
+    bytes_written: int = 0
+    last_id: UUID | None = None  # keyset position of the last exported record
+    completed: bool = False
+
+    @property
+    def resume_token(self) -> str | None:
+        return encode_resume_token(self.last_id) if self.last_id else None
+
+
+def export_ndjson(
+    records: Iterator[dict[str, Any]],
+    stream: IO[str],
+    report: ExportReport | None = None,
+) -> ExportReport:
+    """Write all records as NDJSON lines to a text stream."""
+    report = report or ExportReport()
+    last_record = None
+    for record in records:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        stream.write(line)
+        report.records += 1
+        report.bytes_written += len(line)
+        last_record = record
+    if last_record:
+        report.last_id = UUID(last_record["id"])
+    report.completed = True
+    return report
+
+
+def export_to_object_store(  # noqa: PLR0913
+    records: Iterator[dict[str, Any]],
+    store: ObjectStore,
+    prefix: str,
+    chunk_bytes: int = 8 * 1024 * 1024,
+    should_stop: Callable[[], bool] | None = None,
+    report: ExportReport | None = None,
+) -> ExportReport:
+    """Write records as NDJSON chunk objects (<prefix>/part-00000.ndjson, ...).
+
+    A manifest (<prefix>/manifest.json) listing the parts and the resume token is rewritten after
+    every part, so an interrupted export can continue from where the last part stopped.
+    should_stop is checked after each part (e.g. Lambda remaining time): when it returns True the
+    export stops early and report.completed stays False.
+    """
+    report = report or ExportReport()
+    manifest_key = f"{prefix}/manifest.json"
+    manifest = store.get_json(manifest_key) or {"parts": [], "records": 0, "completed": False}
+
+    buffer: list[str] = []
+    buffered_bytes = 0
+    last_id = None
+
+    def _flush() -> None:
+        nonlocal buffer, buffered_bytes
+        part_key = f"{prefix}/part-{len(manifest['parts']):05d}.ndjson"
+        body = "".join(buffer).encode()
+        store.put_object(part_key, body, content_type="application/x-ndjson")
+        report.bytes_written += len(body)
+        report.last_id = last_id
+        manifest["parts"].append(part_key)
+        manifest["records"] += len(buffer)
+        manifest["resume_token"] = report.resume_token
+        store.put_json(manifest_key, manifest)
+        buffer, buffered_bytes = [], 0
+
+    for record in records:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        buffer.append(line)
+        buffered_bytes += len(line)
+        report.records += 1
+        last_id = UUID(record["id"])
+        if buffered_bytes >= chunk_bytes:
+            _flush()
+            if should_stop and should_stop():
+                return report
+
+    if buffer:
+        _flush()
+    manifest["completed"] = report.completed = True
+    store.put_json(manifest_key, manifest)
+    return report
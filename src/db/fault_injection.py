@@ -0,0 +1,71 @@
+"""Database Fault Injection (Local Runs).
+
+The degraded mode (circuit breaker, stale responses, load shedding) only kicks in when the
+database struggles, which never happens on a local SQLite file. Faults are injected in the
+statements instead, with DB_FAULTS (e.g. "error_rate=0.5,latency_ms=800"):
+- latency_ms: added before every statement
+- error_rate: share of the statements failing with an OperationalError of the driver
+
+The FaultInjector is mutable: tests (and a debugger) can turn faults on and off on a live engine.
+"""
+
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+
+@dataclass
+class FaultInjector:
+    """Faults of the statements of an engine."""
+
+    error_rate: float = 0.0
+    latency_seconds: float = 0.0
+    random: Callable[[], float] = field(default=random.random, repr=False)
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+
+    @classmethod
+    def parse(cls, value: str) -> "FaultInjector":
+        """Parse "error_rate=<0..1>,latency_ms=<ms>" (both optional)."""
+        injector = cls()
+        for setting in filter(None, (part.strip() for part in value.split(","))):
+            name, _, amount = setting.partition("=")
+            try:
+                if name == "error_rate":
+                    injector.error_rate = float(amount)
+                elif name == "latency_ms":
+                    injector.latency_seconds = float(amount) / 1000
+                else:
+                    raise ValueError  # noqa: TRY301
+            except ValueError as e:
+                exception_msg = (
+                    f"Invalid database fault: {setting} (expected error_rate or latency_ms)"
+                )
+                raise ValueError(exception_msg) from e
+        return injector
+
+    def before_statement(self, dbapi: Any) -> None:  # noqa: ANN401
+        """Delay the statement, then fail it (or not)."""
+        if self.latency_seconds > 0:
+            self.sleep(self.latency_seconds)
+        if self.error_rate > 0 and self.random() < self.error_rate:
+            exception_msg = "Injected database fault"
+            raise dbapi.OperationalError(exception_msg)
+
+
+def install_fault_injection(engine: Engine, injector: FaultInjector) -> None:
+    """Inject the faults of injector in the statements of engine."""
+    dbapi = engine.dialect.loaded_dbapi
+
+    # Raised from the dialect execution hooks, the driver errors are wrapped and handled by
+    # SQLAlchemy exactly like real ones (DBAPIError, handle_error events)
+    @event.listens_for(engine, "do_execute")
+    def _on_execute(cursor, statement, parameters, context):  # noqa: ANN001, ANN202, ARG001
+        injector.before_statement(dbapi)
+
+    @event.listens_for(engine, "do_executemany")
+    def _on_executemany(cursor, statement, parameters, context):  # noqa: ANN001, ANN202, ARG001
+        injector.before_statement(dbapi)
@@ -0,0 +1,126 @@
+"""Deep Health Check Dependency Probes.
+
+Each probe exercises one dependency of the request path and reports its latency:
+- database: connection checkout from the pool (a new connection when the pool is empty, with the
+  IAM token and TLS handshake) and a trivial query. Leaves a warm connection in the pool
+- database_reader: the same on the reads engine (DATABASE_READ_URL, skipped without one)
+- dsql_token: signing of a new Aurora DSQL IAM token (replaces the cached one)
+- secrets_manager: DescribeSecret of the database secret (deployed Lambdas only)
+- dynamodb: a GetItem of a missing key on the requests table (REPOSITORY_BACKEND=dynamodb)
+
+Results are cached per container for HEALTH_PROBE_TTL_SECONDS: health polls in between are
+answered from memory and never reach the dependencies.
+
+The endpoint is public: a failing probe only reports its status, the exception is logged.
+"""
+
+import logging
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.config import DATABASE_URL, HEALTH_PROBE_TTL_SECONDS, REPOSITORY_BACKEND, RUN_ENV
+
+OK = "ok"
+SKIPPED = "skipped"
+FAILED = "error"
+
+logger = logging.getLogger(__name__)
+
+_cached_report: dict[str, Any] | None = None
+_cached_at = 0.0
+
+
+def _ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def probe_database(reader: bool = False) -> dict[str, Any]:  # noqa: FBT001, FBT002
+    from sqlalchemy import text  # noqa: PLC0415
+
+    from src.db.session import engine, read_engine  # noqa: PLC0415
+
+    if reader and read_engine is engine:
+        return {"status": SKIPPED}
+    started = time.perf_counter()
+    with (read_engine if reader else engine).connect() as connection:
+        checkout_ms = _ms(started)
+        started = time.perf_counter()
+        connection.execute(text("SELECT 1")).scalar_one()
+        query_ms = _ms(started)
+    return {"status": OK, "checkout_ms": checkout_ms, "query_ms": query_ms}
+
+
+def probe_dsql_token() -> dict[str, Any]:
+    if "auroradsql" not in DATABASE_URL:
+        return {"status": SKIPPED}
+    from sqlalchemy.engine.url import make_url  # noqa: PLC0415
+
+    from src.db.dsql_token import dsql_token_cache  # noqa: PLC0415
+
+    url = make_url(DATABASE_URL)
+    started = time.perf_counter()
+    dsql_token_cache.sign(url.host, os.environ["AWS_REGION"], url.username)
+    return {"status": OK, "sign_ms": _ms(started)}
+
+
+def probe_secrets_manager() -> dict[str, Any]:
+    if RUN_ENV != "cloud":
+        return {"status": SKIPPED}
+    import boto3  # noqa: PLC0415
+
+    client = boto3.client("secretsmanager", region_name=os.environ["AWS_REGION"])
+    started = time.perf_counter()
+    client.describe_secret(SecretId=os.environ["DATABASE_SECRET_NAME"])
+    return {"status": OK, "describe_ms": _ms(started)}
+
+
+def probe_dynamodb() -> dict[str, Any]:
+    if REPOSITORY_BACKEND != "dynamodb":
+        return {"status": SKIPPED}
+    from src.lib.database import get_dynamodb_table_requests_connexion  # noqa: PLC0415
+
+    table = get_dynamodb_table_requests_connexion()
+    started = time.perf_counter()
+    table.get_item(Key={"id": "health#probe"})
+    return {"status": OK, "get_item_ms": _ms(started)}
+
+
+PROBES: dict[str, Callable[[], dict[str, Any]]] = {
+    "database": probe_database,
+    "database_reader": lambda: probe_database(reader=True),
+    "dsql_token": probe_dsql_token,
+    "secrets_manager": probe_secrets_manager,
+    "dynamodb": probe_dynamodb,
+}
+
+
+def run_probes() -> dict[str, Any]:
+    """Run every probe (a failing probe does not stop the others), return the report."""
+    probes = {}
+    for name, probe in PROBES.items():
+        started = time.perf_counter()
+        try:
+            probes[name] = probe()
+        except Exception:
+            # Never raised, nor returned: exception texts can hold hostnames, DSNs or SQL
+            logger.exception("Health probe %s failed after %sms", name, _ms(started))
+            probes[name] = {"status": FAILED}
+    healthy = all(result["status"] != FAILED for result in probes.values())
+    return {"status": "ok" if healthy else "degraded", "probes": probes}
+
+
+def deep_health(clock: Callable[[], float] = time.monotonic) -> dict[str, Any]:
+    """Probes report, run at most once per HEALTH_PROBE_TTL_SECONDS per container."""
+    global _cached_report, _cached_at  # noqa: PLW0603
+    now = clock()
+    if _cached_report is None or now - _cached_at >= HEALTH_PROBE_TTL_SECONDS:
+        _cached_report, _cached_at = run_probes(), now
+        return {**_cached_report, "cached": False, "age_seconds": 0.0}
+    return {**_cached_report, "cached": True, "age_seconds": round(now - _cached_at, 3)}
+
+
+def clear_cache() -> None:
+    global _cached_report  # noqa: PLW0603
+    _cached_report = None
@@ -0,0 +1,93 @@
+"""Connection Liveness Checks And Round Trips Metrics.
+
+pool_pre_ping pings (SELECT 1) every connection on every checkout. Each repository call opens its
+own session, so an invocation used to pay several extra round trips for nothing: the connection
+was used milliseconds before.
+
+Instead:
+- connections are only pinged on checkout when they sat idle in the pool for longer than a
+  threshold (e.g. the container was frozen between two invocations)
+- otherwise a dead connection surfaces as a disconnect error on the first statement: SQLAlchemy
+  invalidates it, and the first statement of the session is transparently retried on a fresh one,
+  unless the session already holds pending changes (the rollback would silently drop them)
+
+Metrics (src/lib/metrics.py): db.statement (cursor executions), db.ping, db.commit, db.retry.
+Their sum is the number of round trips paid by the database layer.
+"""
+
+import time
+from typing import Any
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+from src.lib.metrics import metrics
+
+_LAST_USED = "last_used_at"
+_FIRST_STATEMENT_DONE = "first_statement_done"
+
+
+def install_idle_ping(engine: Engine, idle_threshold_seconds: float) -> None:
+    """Ping pooled connections on checkout only if idle for more than idle_threshold_seconds."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(_dbapi_connection: Any, connection_record: Any) -> None:  # noqa: ANN401
+        connection_record.info[_LAST_USED] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(_dbapi_connection: Any, connection_record: Any) -> None:  # noqa: ANN401
+        connection_record.info[_LAST_USED] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(
+        dbapi_connection: Any,  # noqa: ANN401
+        connection_record: Any,  # noqa: ANN401
+        _connection_proxy: Any,  # noqa: ANN401
+    ) -> None:
+        last_used_at = connection_record.info.get(_LAST_USED, 0.0)
+        if time.monotonic() - last_used_at <= idle_threshold_seconds:
+            return
+        metrics.incr("db.ping")
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except engine.dialect.loaded_dbapi.Error as e:
+            # The pool discards the connection and checks out another one
+            raise exc.DisconnectionError from e
+        connection_record.info[_LAST_USED] = time.monotonic()
+
+
+def install_first_statement_retry(session_factory: sessionmaker | type[Session]) -> None:
+    """Retry once the first statement of a session when it failed on a dead connection.
+
+    Nothing ran in the session before that statement, so rolling back and replaying it on a
+    new connection is safe, as long as the session holds no pending ORM changes: the rollback
+    expunges them, and the replayed statement would commit without them (e.g. a request added
+    before a Core counters upsert). Those sessions get the disconnect error instead.
+    """
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _retry_first_statement(orm_execute_state: ORMExecuteState) -> Any:  # noqa: ANN401
+        session = orm_execute_state.session
+        if session.info.get(_FIRST_STATEMENT_DONE):
+            return None  # proceed as usual
+        session.info[_FIRST_STATEMENT_DONE] = True
+        try:
+            return orm_execute_state.invoke_statement()
+        except exc.DBAPIError as e:
+            if not e.connection_invalidated or session.new or session.dirty or session.deleted:
+                raise
+            metrics.incr("db.retry")
+            session.rollback()
+            return orm_execute_state.invoke_statement()
+
+
+def install_round_trip_metrics(engine: Engine) -> None:
+    """Count statements and commits sent to the database."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _on_execute(*_: Any) -> None:  # noqa: ANN401
+        metrics.incr("db.statement")
+
+    @event.listens_for(engine, "commit")
+    def _on_commit(*_: Any) -> None:  # noqa: ANN401
+        metrics.incr("db.commit")
@@ -0,0 +1,112 @@
+"""Feed Facets Counters Statements And Reconciliation (SQL backend).
+
+The request_counters rows (RequestCounter) are updated by the repositories in the same
+transactions as the requests: one multi-row upsert incrementing the keys of the request (see
+src/lib/request_stats.py) on a random shard.
+
+reconcile_request_counters recomputes the expected counts from the requests, and corrects every
+key by the difference (on shard 0) instead of rewriting it: concurrent increments on the other
+shards are never lost. Requests created / deleted during the run can leave an error of their
+count, corrected by the next run. Expired day keys are removed.
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+from typing import Any
+
+from sqlalchemy import Engine, Insert, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.config import REQUEST_COUNTER_SHARDS
+from src.lib.request_stats import (
+    NO_DUE_DATE_KEY,
+    TOTAL_KEY,
+    CounterReconcileReport,
+    counter_corrections,
+    counter_keys,
+    due_day,
+    due_key,
+    is_expired,
+    type_key,
+    utc_today,
+)
+from src.models.request import Request, RequestCounter
+
+_COUNTERS_TABLE = RequestCounter.__table__
+
+
+def request_counter_deltas(request: Any, delta: int, today: date | None = None) -> dict[str, int]:  # noqa: ANN401
+    """Counters increments of creating (delta 1) or deleting (delta -1) a request."""
+    return dict.fromkeys(counter_keys(request.type, request.due_date, today), delta)
+
+
+def counter_upsert(dialect_name: str, deltas: dict[str, int], shard: int) -> Insert:
+    """One statement adding deltas to the counters of a shard (rows are created on first use)."""
+    insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+    statement = insert(_COUNTERS_TABLE).values(
+        [{"key": key, "shard": shard, "count": delta} for key, delta in deltas.items()],
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[_COUNTERS_TABLE.c.key, _COUNTERS_TABLE.c.shard],
+        set_={"count": _COUNTERS_TABLE.c.count + statement.excluded["count"]},
+    )
+
+
+def read_counters(connection: Any, keys: Iterable[str] | None = None) -> dict[str, int]:  # noqa: ANN401
+    """Sum of the shards of every key (all keys when none given)."""
+    query = select(RequestCounter.key, func.sum(RequestCounter.count)).group_by(RequestCounter.key)
+    if keys is not None:
+        query = query.where(RequestCounter.key.in_(list(keys)))
+    return {key: int(count) for key, count in connection.execute(query)}
+
+
+def expected_counts(connection: Any, today: date) -> Counter:  # noqa: ANN401
+    """Counters computed from the requests themselves."""
+    expected: Counter = Counter()
+    by_type = select(Request.type, func.count()).group_by(Request.type)
+    for request_type, count in connection.execute(by_type):
+        expected[type_key(request_type)] = count
+        expected[TOTAL_KEY] += count
+    no_due_date = select(func.count()).select_from(Request).where(Request.due_date.is_(None))
+    expected[NO_DUE_DATE_KEY] = connection.execute(no_due_date).scalar_one()
+
+    # Only due dates still to come have a day key: streamed, bucketed per UTC day
+    upcoming = select(Request.due_date).where(
+        Request.due_date >= datetime(today.year, today.month, today.day, tzinfo=UTC),
+    )
+    for due_date in connection.execution_options(yield_per=1000).execute(upcoming).scalars():
+        expected[due_key(due_day(due_date))] += 1
+    return +expected  # zero counts dropped
+
+
+def reconcile_request_counters(engine: Engine, today: date | None = None) -> CounterReconcileReport:
+    """Correct the counters drift and remove the expired day keys, return the report."""
+    from src.db.bulk import DSQL_MAX_ROWS_PER_TRANSACTION  # noqa: PLC0415 # bulk writes counters
+
+    today = today or utc_today()
+    with engine.connect() as connection:
+        expected = expected_counts(connection, today)
+        current = read_counters(connection)
+        connection.rollback()
+
+    report = CounterReconcileReport(keys=len(expected.keys() | current.keys()))
+    corrections = counter_corrections(expected, current, today)
+    keys = list(corrections)
+    for start in range(0, len(keys), DSQL_MAX_ROWS_PER_TRANSACTION):
+        chunk_keys = keys[start : start + DSQL_MAX_ROWS_PER_TRANSACTION]
+        chunk = {key: corrections[key] for key in chunk_keys}
+        with engine.begin() as connection:
+            connection.execute(counter_upsert(engine.dialect.name, chunk, shard=0))
+        report.corrected += len(chunk)
+
+    expired = [key for key in current if is_expired(key, today)]
+    # Every key has up to REQUEST_COUNTER_SHARDS rows
+    step = max(1, DSQL_MAX_ROWS_PER_TRANSACTION // max(REQUEST_COUNTER_SHARDS, 1))
+    for start in range(0, len(expired), step):
+        with engine.begin() as connection:
+            connection.execute(
+                delete(RequestCounter).where(RequestCounter.key.in_(expired[start : start + step])),
+            )
+        report.expired += len(expired[start : start + step])
+    return report
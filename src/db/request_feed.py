@@ -0,0 +1,154 @@
+"""Feed Projection Rebuild And Consistency Check.
+
+The request_feed projection (RequestFeedEntry) is written by the repositories and the bulk loader
+in the same transactions as the requests. Rebuilding is needed once for requests written before
+the projection existed, or after a change of the rendered fragments (Request.to_dict).
+
+Both walk the requests in primary key order, a batch at a time, and render the expected feed rows
+from the requests themselves:
+- rebuild_request_feed replaces the feed rows of every batch in one transaction (under the Aurora
+  DSQL rows per transaction limit), then removes the rows of requests that no longer exist
+- check_request_feed only compares, and reports missing, stale and orphaned rows
+"""
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, delete, insert, select
+from sqlalchemy.orm import Session
+
+from src.db.bulk import DSQL_MAX_ROWS_PER_TRANSACTION
+from src.lib.feed import feed_key
+from src.models.request import Request, RequestFeedEntry
+from src.repositories.request_repository import request_load_options
+
+# Ids of inconsistent requests kept in a check report (the counts are always complete)
+MAX_REPORTED_IDS = 20
+
+
+@dataclass
+class FeedRebuildReport:
+    """Outcome of a rebuild."""
+
+    requests: int = 0
+    removed: int = 0  # feed rows of requests that no longer exist
+    transactions: int = 0
+
+
+@dataclass
+class FeedCheckReport:
+    """Outcome of a consistency check."""
+
+    checked: int = 0
+    missing: int = 0  # requests without feed row
+    stale: int = 0  # feed rows differing from their request (key, type or fragment)
+    orphaned: int = 0  # feed rows of requests that no longer exist
+    sample_ids: list[str] = field(default_factory=list)
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.missing or self.stale or self.orphaned)
+
+    def add_sample(self, request_id: Any) -> None:  # noqa: ANN401
+        if len(self.sample_ids) < MAX_REPORTED_IDS:
+            self.sample_ids.append(str(request_id))
+
+
+def _expected_row(request: Request) -> dict[str, Any]:
+    return {
+        "request_id": request.id,
+        "feed_key": feed_key(request.due_date, request.created_at, request.id),
+        "type": request.type,
+        "fragment": request.to_json_fragment(),
+    }
+
+
+def _request_batches(engine: Engine, batch_size: int) -> Iterator[list[Request]]:
+    """Requests (with their subtypes) in primary key order, one list per batch."""
+    last_id = None
+    while True:
+        with Session(engine) as session:
+            query = session.query(Request).options(*request_load_options()).order_by(Request.id)
+            if last_id is not None:
+                query = query.filter(Request.id > last_id)
+            requests = query.limit(batch_size).all()
+        if not requests:
+            return
+        yield requests
+        last_id = requests[-1].id
+
+
+def _orphaned_ids(connection: Any, limit: int, after: Any = None) -> list:  # noqa: ANN401
+    """Next feed rows (request ids) without request, in primary key order."""
+    feed = RequestFeedEntry.__table__
+    requests = Request.__table__
+    query = (
+        select(feed.c.request_id)
+        .select_from(feed.outerjoin(requests, requests.c.id == feed.c.request_id))
+        .where(requests.c.id.is_(None))
+    )
+    if after is not None:
+        query = query.where(feed.c.request_id > after)
+    return list(connection.execute(query.order_by(feed.c.request_id).limit(limit)).scalars())
+
+
+def rebuild_request_feed(
+    engine: Engine,
+    batch_size: int = 500,
+    progress: Callable[[FeedRebuildReport], None] | None = None,
+) -> FeedRebuildReport:
+    """Re-render the feed row of every request, return the rebuild report."""
+    # Each request deletes and inserts one row
+    batch_size = max(1, min(batch_size, DSQL_MAX_ROWS_PER_TRANSACTION // 2))
+    feed = RequestFeedEntry.__table__
+    report = FeedRebuildReport()
+    for requests in _request_batches(engine, batch_size):
+        rows = [_expected_row(request) for request in requests]
+        with engine.begin() as connection:
+            ids = [row["request_id"] for row in rows]
+            connection.execute(delete(feed).where(feed.c.request_id.in_(ids)))
+            connection.execute(insert(feed), rows)
+        report.requests += len(rows)
+        report.transactions += 1
+        if progress:
+            progress(report)
+
+    with engine.connect() as connection:
+        while True:
+            orphaned = _orphaned_ids(connection, batch_size)
+            connection.rollback()
+            if not orphaned:
+                return report
+            with connection.begin():
+                connection.execute(delete(feed).where(feed.c.request_id.in_(orphaned)))
+            report.removed += len(orphaned)
+            report.transactions += 1
+
+
+def check_request_feed(engine: Engine, batch_size: int = 500) -> FeedCheckReport:
+    """Compare the feed projection with the requests, return the check report."""
+    feed = RequestFeedEntry.__table__
+    report = FeedCheckReport()
+    with engine.connect() as connection:
+        for requests in _request_batches(engine, batch_size):
+            query = select(feed).where(feed.c.request_id.in_([r.id for r in requests]))
+            stored = {row.request_id: row._asdict() for row in connection.execute(query)}
+            connection.rollback()
+            for request in requests:
+                report.checked += 1
+                row = stored.get(request.id)
+                if row is None:
+                    report.missing += 1
+                    report.add_sample(request.id)
+                elif row != _expected_row(request):
+                    report.stale += 1
+                    report.add_sample(request.id)
+
+        last_id = None
+        while orphaned := _orphaned_ids(connection, batch_size, after=last_id):
+            report.orphaned += len(orphaned)
+            for request_id in orphaned:
+                report.add_sample(request_id)
+            last_id = orphaned[-1]
+    return report
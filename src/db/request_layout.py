@@ -0,0 +1,127 @@
+"""Requests Storage Layout Migration (joined <-> single table).
+
+Moves the location columns of existing requests between the subtype tables and the requests
+table (see src/models/layout.py), in batches of one transaction each (under the Aurora DSQL rows
+per transaction limit). Moved rows are removed from the source (subtype rows deleted, or request
+columns set back to NULL), so a migration is resumable and can be run again to pick up requests
+written in between.
+
+Requests in the joined layout are read correctly whatever layout they were written with, so:
+- joined -> single: migrate, switch REQUEST_STORAGE_LAYOUT to single, migrate again (stragglers)
+- single -> joined: switch REQUEST_STORAGE_LAYOUT to joined, then migrate
+"""
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, Table, bindparam, delete, insert, select, update
+
+from src.db.bulk import DSQL_MAX_ROWS_PER_TRANSACTION
+from src.db.schema import add_missing_columns
+from src.models.layout import LAYOUTS, SINGLE
+from src.models.request import (
+    LOCATION_COLUMNS,
+    BuyAndDeliverRequest,
+    OnlineServiceRequest,
+    PickupAndDeliverRequest,
+    Request,
+)
+from src.schemas.request import RequestType
+
+_SUBTYPE_TABLES: dict[RequestType, Table] = {
+    RequestType.BUY_AND_DELIVER: BuyAndDeliverRequest.__table__,
+    RequestType.PICKUP_AND_DELIVER: PickupAndDeliverRequest.__table__,
+    RequestType.ONLINE_SERVICE: OnlineServiceRequest.__table__,
+}
+
+
+@dataclass
+class LayoutMigrationReport:
+    """Moved requests per type."""
+
+    moved: dict[str, int] = field(default_factory=dict)
+    added_columns: list[str] = field(default_factory=list)
+    transactions: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.moved.values())
+
+
+def add_location_columns(engine: Engine) -> list[str]:
+    """Add the single table layout columns to an existing requests table, return added ones."""
+    names = dict.fromkeys(c for columns in LOCATION_COLUMNS.values() for c in columns)
+    return add_missing_columns(engine, Request.__table__, names)
+
+
+def migrate_request_layout(
+    engine: Engine,
+    to_layout: str,
+    batch_size: int = 1000,
+) -> LayoutMigrationReport:
+    """Move requests locations to the to_layout storage, return the migration report."""
+    if to_layout not in LAYOUTS:
+        exception_msg = f"Unknown layout: {to_layout} (expected one of {LAYOUTS})"
+        raise ValueError(exception_msg)
+    # Each moved request writes two rows (requests update + subtype insert or delete)
+    batch_size = max(1, min(batch_size, DSQL_MAX_ROWS_PER_TRANSACTION // 2))
+
+    report = LayoutMigrationReport(added_columns=add_location_columns(engine))
+    for request_type, subtype_table in _SUBTYPE_TABLES.items():
+        columns = LOCATION_COLUMNS[request_type]
+        move = _to_single_table if to_layout == SINGLE else _to_joined
+        report.moved[request_type.value] = move(engine, subtype_table, columns, batch_size, report)
+    return report
+
+
+def _to_single_table(engine, subtype_table, columns, batch_size, report) -> int:  # noqa: ANN001
+    requests = Request.__table__
+    set_locations = (
+        update(requests)
+        .where(requests.c.id == bindparam("request_id"))
+        .values({column: bindparam(column) for column in columns})
+    )
+    moved = 0
+    with engine.connect() as connection:
+        while True:
+            # Moved subtype rows are deleted: the first batch is always the next one
+            query = select(subtype_table.c.request_id, *(subtype_table.c[c] for c in columns))
+            rows = connection.execute(query.order_by(subtype_table.c.request_id).limit(batch_size))
+            rows = [row._asdict() for row in rows]
+            connection.rollback()
+            if not rows:
+                return moved
+            with connection.begin():
+                connection.execute(set_locations, rows)
+                ids = [row["request_id"] for row in rows]
+                connection.execute(delete(subtype_table).where(subtype_table.c.request_id.in_(ids)))
+            moved += len(rows)
+            report.transactions += 1
+
+
+def _to_joined(engine, subtype_table, columns, batch_size, report) -> int:  # noqa: ANN001
+    requests = Request.__table__
+    request_type = next(t for t, table in _SUBTYPE_TABLES.items() if table is subtype_table)
+    moved = 0
+    with engine.connect() as connection:
+        while True:
+            # Moved requests get their location columns back to NULL: never selected again
+            query = (
+                select(requests.c.id.label("request_id"), *(requests.c[c] for c in columns))
+                .where(requests.c.type == request_type, requests.c[columns[0]].is_not(None))
+                .order_by(requests.c.id)
+                .limit(batch_size)
+            )
+            rows = [row._asdict() for row in connection.execute(query)]
+            connection.rollback()
+            if not rows:
+                return moved
+            with connection.begin():
+                connection.execute(insert(subtype_table), rows)
+                ids = [row["request_id"] for row in rows]
+                connection.execute(
+                    update(requests)
+                    .where(requests.c.id.in_(ids))
+                    .values(dict.fromkeys(columns)),
+                )
+            moved += len(rows)
+            report.transactions += 1
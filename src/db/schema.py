@@ -0,0 +1,48 @@
+"""Additive Schema Upgrades.
+
+Aurora DSQL has no migration tooling in this project: new tables are created with
+create_all(checkfirst), and new nullable columns of existing tables are added with
+ALTER TABLE ... ADD COLUMN (without default nor constraint, as supported by DSQL).
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import Column, Engine, Table, inspect
+
+from src.models.base import Base
+
+
+def add_missing_columns(
+    engine: Engine,
+    table: Table,
+    names: Iterable[str] | None = None,
+) -> list[str]:
+    """Add the model columns (all, or names) missing from an existing table, return added ones."""
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    preparer = engine.dialect.identifier_preparer
+    added = []
+    with engine.begin() as connection:
+        for name in names if names is not None else table.columns.keys():
+            if name in existing:
+                continue
+            column: Column = table.c[name]
+            if not column.nullable:
+                exception_msg = f"{table.name}.{name} is not nullable, it can not be added in place"
+                raise ValueError(exception_msg)
+            connection.exec_driver_sql(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN "
+                f"{preparer.quote(name)} {column.type.compile(dialect=engine.dialect)}",
+            )
+            added.append(name)
+    return added
+
+
+def upgrade_schema(engine: Engine) -> dict[str, list[str]]:
+    """Create the missing tables and add the missing columns, return added columns per table."""
+    Base.metadata.create_all(engine, checkfirst=True)
+    added = {}
+    for table in Base.metadata.sorted_tables:
+        columns = add_missing_columns(engine, table)
+        if columns:
+            added[table.name] = columns
+    return added
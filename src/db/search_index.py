@@ -0,0 +1,83 @@
+"""Search Index Rebuild.
+
+Requests created through the repositories and the bulk loader are indexed as they are written.
+Rebuilding is needed once for requests written before the search index existed, or after a
+tokenization change (src/lib/search.py).
+
+Requests are walked in primary key order, a batch at a time: every batch deletes the index rows of
+its requests and inserts them again in one transaction, kept under the Aurora DSQL rows per
+transaction limit.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, delete, insert, select
+
+from src.db.bulk import DSQL_MAX_ROWS_PER_TRANSACTION
+from src.lib.search import token_weights
+from src.models.request import Request, RequestSearchToken
+
+
+@dataclass
+class SearchIndexReport:
+    """Outcome of a rebuild."""
+
+    requests: int = 0
+    tokens: int = 0
+    transactions: int = 0
+
+
+def rebuild_search_index(
+    engine: Engine,
+    batch_size: int = 100,
+    max_rows_per_transaction: int = DSQL_MAX_ROWS_PER_TRANSACTION,
+    progress: Callable[[SearchIndexReport], None] | None = None,
+) -> SearchIndexReport:
+    """Re-index every request, return the rebuild report."""
+    report = SearchIndexReport()
+    tokens_table = RequestSearchToken.__table__
+    last_id = None
+    with engine.connect() as connection:
+        while True:
+            query = select(Request.id, Request.title, Request.description).order_by(Request.id)
+            if last_id is not None:
+                query = query.where(Request.id > last_id)
+            requests = connection.execute(query.limit(batch_size)).all()
+            connection.rollback()  # end the read transaction, writes get their own ones
+            if not requests:
+                break
+
+            # Split the batch so that deletes + inserts of a transaction stay under the limit
+            pending: list = []
+            pending_rows = 0
+            for request in requests:
+                rows = [
+                    {"token": token, "request_id": request.id, "weight": weight}
+                    for token, weight in token_weights(request.title, request.description).items()
+                ]
+                if pending and pending_rows + len(rows) > max_rows_per_transaction // 2:
+                    _replace(connection, tokens_table, pending, report)
+                    pending, pending_rows = [], 0
+                pending.append((request.id, rows))
+                pending_rows += len(rows)
+            _replace(connection, tokens_table, pending, report)
+
+            last_id = requests[-1].id
+            if progress:
+                progress(report)
+    return report
+
+
+def _replace(connection, tokens_table, pending, report: SearchIndexReport) -> None:  # noqa: ANN001
+    if not pending:
+        return
+    request_ids = [request_id for request_id, _ in pending]
+    rows = [row for _, request_rows in pending for row in request_rows]
+    with connection.begin():
+        connection.execute(delete(tokens_table).where(tokens_table.c.request_id.in_(request_ids)))
+        if rows:
+            connection.execute(insert(tokens_table), rows)
+    report.requests += len(pending)
+    report.tokens += len(rows)
+    report.transactions += 1
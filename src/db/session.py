@@ -1,79 +1,102 @@
 """Session Manager For Application DB."""
 
 import os
+from collections.abc import Iterator
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.engine.url import make_url
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.config import (
+    DATABASE_READ_URL,
+    DATABASE_URL,
+    DB_FAULTS,
+    DB_PING_IDLE_SECONDS,
+    DB_PREPARE_THRESHOLD,
+    DB_STATEMENT_TIMEOUT,
+)
+from src.db.fault_injection import FaultInjector, install_fault_injection
+from src.db.liveness import (
+    install_first_statement_retry,
+    install_idle_ping,
+    install_round_trip_metrics,
+)
+from src.db.statement_cache import install_statement_cache_metrics, psycopg_connect_args
+from src.db.statement_deadline import install_statement_deadline
+from src.lib.read_your_writes import get_read_your_writes
+
+
+def create_app_engine(database_url: str) -> Engine:
+    """Engine of an application database (the main one, or a regional shard, see shards.py)."""
+    # For Aurora DSQL, every new connection needs a valid IAM token
+    if "auroradsql" in database_url:
+        from src.db.dsql_token import dsql_token_cache  # noqa: PLC0415
+
+        # Parse the connection URL once
+        url = make_url(database_url)
+        hostname = url.host
+        region = os.environ["AWS_REGION"]
+        db_role = url.username  # Extract role from DATABASE_URL (admin or app_user)
+
+        # NOTE: No token is generated here, the password is injected on connect below
+        engine = create_engine(
+            url,
+            connect_args={"sslmode": "require", **psycopg_connect_args(DB_PREPARE_THRESHOLD)},
+            pool_recycle=600,  # Recycle connections after 10 minutes (tokens expire in 15)
+        )
+
+        # Inject a token on each new physical connection
+        @event.listens_for(engine, "do_connect")
+        def receive_do_connect(dialect, conn_rec, cargs, cparams):  # noqa
+            """Use a cached IAM token (signed again only close to its expiry)."""
+            cparams["password"] = dsql_token_cache.get_token(hostname, region, db_role)
+
+        # Renew tokens close to expiry when a connection goes back to the pool, i.e. after the
+        # queries ran, so that the next connects find a fresh token
+        @event.listens_for(engine, "checkin")
+        def receive_checkin(dbapi_connection, connection_record):  # noqa
+            """Proactively refresh IAM tokens."""
+            dsql_token_cache.refresh_due()
 
-from src.config import DATABASE_URL
-
-
-def _generate_dsql_token(client, hostname, region, db_role):
-    """Generate IAM token for Aurora DSQL connection.
-
-    AWS provides two separate API methods:
-    - generate_db_connect_admin_auth_token: for predefined admin role
-    - generate_db_connect_auth_token: for custom database roles (role specified in connection URL)
-
-    Both methods have the same signature: (Hostname, Region, ExpiresIn)
-    The database role is NOT passed to token generation - it's in the connection URL username.
-    """
-    if db_role == "admin":
-        return client.generate_db_connect_admin_auth_token(hostname, region)
     else:
-        # For custom roles like app_user, use generate_db_connect_auth_token
-        # The role name is specified in the connection URL (username), not here
-        return client.generate_db_connect_auth_token(hostname, region)
-
-
-# For Aurora DSQL, we need to refresh IAM tokens on each connection
-if "auroradsql" in DATABASE_URL:
-    import boto3
-
-    # Parse the connection URL once
-    _url = make_url(DATABASE_URL)
-    _hostname = _url.host
-    _region = os.environ["AWS_REGION"]
-    _db_role = _url.username  # Extract role from DATABASE_URL (admin or app_user)
-    _dsql_client = boto3.client("dsql", region_name=_region)
-
-    # Generate initial token
-    _initial_token = _generate_dsql_token(_dsql_client, _hostname, _region, _db_role)
-    _auth_url = _url.set(password=_initial_token)
-
-    engine = create_engine(
-        _auth_url,
-        connect_args={"sslmode": "require"},
-        pool_pre_ping=True,
-        pool_recycle=600,  # Recycle connections after 10 minutes (tokens expire in 15)
-    )
-
-    # Refresh token on each checkout from pool
-    @event.listens_for(engine, "do_connect")
-    def receive_do_connect(dialect, conn_rec, cargs, cparams):
-        """Generate fresh IAM token for each new connection."""
-        token = _generate_dsql_token(_dsql_client, _hostname, _region, _db_role)
-        cparams["password"] = token
-
-else:
-    # Non-DSQL databases (SQLite for local dev)
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-        pool_pre_ping=True,
-    )
-
-SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+        # Non-DSQL databases (SQLite for local dev)
+        connect_args = {}
+        if "sqlite" in database_url:
+            connect_args = {"check_same_thread": False}
+        elif "psycopg" in database_url:
+            connect_args = psycopg_connect_args(DB_PREPARE_THRESHOLD)
+        engine = create_engine(database_url, connect_args=connect_args)
+
+    # NOTE: No pool_pre_ping: only connections idle for a while are pinged on checkout, dead ones
+    # are otherwise detected by the first statement of the session, which is then retried
+    # transparently
+    install_idle_ping(engine, DB_PING_IDLE_SECONDS)
+    install_round_trip_metrics(engine)
+    install_statement_cache_metrics(engine)
+    install_statement_deadline(engine, DB_STATEMENT_TIMEOUT)
+    if DB_FAULTS:
+        install_fault_injection(engine, FaultInjector.parse(DB_FAULTS))
+    return engine
+
+
+def create_session_factory(bind: Engine) -> sessionmaker:
+    session_factory = sessionmaker(bind=bind, expire_on_commit=False)
+    install_first_statement_retry(session_factory)
+    return session_factory
+
+
+engine = create_app_engine(DATABASE_URL)
+SessionLocal = create_session_factory(engine)
+# Reads engine: the writer itself unless DATABASE_READ_URL is set
+read_engine = create_app_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+ReadSessionLocal = create_session_factory(read_engine) if DATABASE_READ_URL else SessionLocal
 
 
-# NOTE: Aurora DSQL handles connection pooling automatically (no proxy needed)
-# IAM auth tokens auto-refresh via the do_connect event listener above
-# In case I go back to RDS, I need to use RDS proxy for connections pooling
 @contextmanager
-def get_db_session():  # noqa
-    session = SessionLocal()
+def session_scope(session_factory: sessionmaker) -> Iterator[Session]:
+    """Session of a factory: commit on exit, rollback on error."""
+    session = session_factory()
     try:
         yield session
         session.commit()
@@ -82,3 +105,32 @@ def get_db_session():  # noqa
         raise
     finally:
         session.close()
+
+
+@contextmanager
+def _write_session(writer: sessionmaker) -> Iterator[Session]:
+    with session_scope(writer) as session:
+        yield session
+    # Committed: the user's next reads go to the writer for a while
+    get_read_your_writes().record_write()
+
+
+def open_session(writer: sessionmaker, reader: sessionmaker, read_only: bool = False):  # noqa
+    """Session on the writer, or on the reader for read_only ones.
+
+    Read only sessions still go to the writer within the read-your-writes window of the current
+    user (see src/lib/read_your_writes.py).
+    """
+    if not read_only:
+        return _write_session(writer)
+    if reader is writer or get_read_your_writes().reads_from_writer():
+        return session_scope(writer)
+    return session_scope(reader)
+
+
+# NOTE: Aurora DSQL handles connection pooling automatically (no proxy needed)
+# IAM auth tokens are cached and injected via the do_connect event listener above
+# In case I go back to RDS, I need to use RDS proxy for connections pooling
+def get_db_session(read_only: bool = False):  # noqa
+    """Session of the main database, on its reader for read_only ones (see open_session)."""
+    return open_session(SessionLocal, ReadSessionLocal, read_only)
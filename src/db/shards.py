@@ -0,0 +1,202 @@
+"""Regional Shards Of The Requests.
+
+The marketplace is local: every request carries coordinates. With DATABASE_SHARDS set, requests
+are stored in regional databases:
+- shard 0 is the main database (DATABASE_URL): it takes the points outside every region, and
+  keeps the requests created before sharding
+- every DATABASE_SHARDS entry is a region (a polygon, or a grid cell) with its database, shards
+  1..n in list order. NOTE: Append only, shard indexes are stored in the requests ids
+
+DATABASE_SHARDS is a JSON list:
+    [{"name": "north", "url": "sqlite:///north.db", "polygon": [[lat, lng], [lat, lng], ...]},
+     {"name": "south", "url": "sqlite:///south.db", "cell": [south, west, north, east]}]
+An entry may also set "read_url", the reader of the shard (like DATABASE_READ_URL for the main
+database): its reads then go there, outside the read-your-writes window of the current user.
+
+Routing (see ShardedRequestRepository):
+- creations by the anchor point of the request (see anchor_point), the id carries the shard index
+  (see uuid7_shard)
+- reads, updates and deletes by id; ids created before sharding carry random bits instead of a
+  shard index: a miss on a regional shard is looked up again in the main database
+- lists by the regions a radius overlaps, all shards otherwise, the shards pages being merged
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import Engine
+
+from src.config import DATABASE_SHARDS
+from src.db.session import create_app_engine, engine, read_engine
+from src.lib.ids import MAX_SHARDS, uuid7_shard
+from src.models.request import LOCATION_COLUMNS
+from src.schemas.request import RequestCreate
+
+# Kilometers per degree of latitude (and of longitude at the equator)
+KM_PER_DEGREE = 111.32
+MAIN_SHARD_NAME = "main"
+
+
+@dataclass(frozen=True)
+class Region:
+    """Polygon of (latitude, longitude) vertices."""
+
+    vertices: tuple[tuple[float, float], ...]
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Region":
+        if "cell" in config:
+            south, west, north, east = (float(value) for value in config["cell"])
+            if south >= north or west >= east:
+                exception_msg = "cell must be [south, west, north, east]"
+                raise ValueError(exception_msg)
+            return cls(((south, west), (south, east), (north, east), (north, west)))
+        vertices = tuple((float(lat), float(lng)) for lat, lng in config.get("polygon") or ())
+        if len(vertices) < 3:  # noqa: PLR2004
+            exception_msg = "a region needs a polygon of at least 3 [lat, lng] vertices or a cell"
+            raise ValueError(exception_msg)
+        return cls(vertices)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """(south, west, north, east)."""
+        latitudes = [lat for lat, _ in self.vertices]
+        longitudes = [lng for _, lng in self.vertices]
+        return min(latitudes), min(longitudes), max(latitudes), max(longitudes)
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """Whether a point is inside the polygon (ray casting)."""
+        inside = False
+        previous_lat, previous_lng = self.vertices[-1]
+        for vertex_lat, vertex_lng in self.vertices:
+            if (vertex_lat > lat) != (previous_lat > lat):
+                crossing_lng = vertex_lng + (lat - vertex_lat) * (previous_lng - vertex_lng) / (
+                    previous_lat - vertex_lat
+                )
+                if lng < crossing_lng:
+                    inside = not inside
+            previous_lat, previous_lng = vertex_lat, vertex_lng
+        return inside
+
+    def may_overlap(self, lat: float, lng: float, radius_km: float) -> bool:
+        """Whether a circle may overlap the region (bounding boxes test: never a false negative)."""
+        lat_delta = radius_km / KM_PER_DEGREE
+        lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        south, west, north, east = self.bounds
+        return (
+            lat - lat_delta <= north
+            and lat + lat_delta >= south
+            and lng - lng_delta <= east
+            and lng + lng_delta >= west
+        )
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Database of a region (no region: the main database)."""
+
+    index: int
+    name: str
+    engine: Engine
+    region: Region | None = None
+    # Reads engine: the writer itself unless set
+    read_engine: Engine | None = None
+
+
+def anchor_point(input_request: RequestCreate) -> tuple[float, float]:
+    """Location routing a new request: dropoff, pickup or meetup, as per its type."""
+    lat_column, lng_column = LOCATION_COLUMNS[input_request.type][:2]
+    return getattr(input_request, lat_column), getattr(input_request, lng_column)
+
+
+class ShardRouter:
+    """Shard of a point, of a request id, or shards around a point."""
+
+    def __init__(self, shards: list[Shard]) -> None:
+        if not shards or shards[0].region is not None:
+            exception_msg = "the first shard must be the main database (without region)"
+            raise ValueError(exception_msg)
+        if len(shards) > MAX_SHARDS:
+            exception_msg = f"at most {MAX_SHARDS} shards"
+            raise ValueError(exception_msg)
+        self.shards = shards
+
+    @property
+    def main(self) -> Shard:
+        return self.shards[0]
+
+    def shard_for_point(self, lat: float, lng: float) -> Shard:
+        """First region containing the point, the main database otherwise."""
+        for shard in self.shards[1:]:
+            if shard.region.contains(lat, lng):
+                return shard
+        return self.main
+
+    def shard_for_id(self, request_id: UUID) -> Shard:
+        """Shard carried by the id (ids without a known shard index go to the main database)."""
+        index = uuid7_shard(request_id)
+        return self.shards[index] if index < len(self.shards) else self.main
+
+    def shards_near(self, lat: float, lng: float, radius_km: float) -> list[Shard]:
+        """Shards a circle may overlap: the main database, and the regions around."""
+        regions = [s for s in self.shards[1:] if s.region.may_overlap(lat, lng, radius_km)]
+        return [self.main, *regions]
+
+
+def parse_shards_config(value: str) -> list[dict]:
+    """Regional shards entries of DATABASE_SHARDS (validated)."""
+    try:
+        entries = json.loads(value)
+    except json.JSONDecodeError as e:
+        exception_msg = "DATABASE_SHARDS must be a JSON list"
+        raise ValueError(exception_msg) from e
+    if not isinstance(entries, list):
+        exception_msg = "DATABASE_SHARDS must be a JSON list"
+        raise ValueError(exception_msg)  # noqa: TRY004
+    names = {MAIN_SHARD_NAME}
+    for entry in entries:
+        if not entry.get("name") or not entry.get("url") or entry["name"] in names:
+            exception_msg = (
+                f"every shard needs a unique name (not {MAIN_SHARD_NAME}) and a url: {entry}"
+            )
+            raise ValueError(exception_msg)
+        names.add(entry["name"])
+    return entries
+
+
+def build_shard_router(
+    main_engine: Engine,
+    entries: list[dict],
+    main_read_engine: Engine | None = None,
+) -> ShardRouter:
+    """Router of the main database and of the regional shards entries."""
+    shards = [Shard(0, MAIN_SHARD_NAME, main_engine, read_engine=main_read_engine)]
+    for index, entry in enumerate(entries, start=1):
+        shard_read_engine = create_app_engine(entry["read_url"]) if entry.get("read_url") else None
+        shards.append(
+            Shard(
+                index,
+                entry["name"],
+                create_app_engine(entry["url"]),
+                Region.from_config(entry),
+                shard_read_engine,
+            ),
+        )
+    return ShardRouter(shards)
+
+
+_shard_router = None
+
+
+def get_shard_router() -> ShardRouter:
+    """Container wide router of DATABASE_SHARDS."""
+    global _shard_router  # noqa: PLW0603
+    if _shard_router is None:
+        _shard_router = build_shard_router(
+            engine,
+            parse_shards_config(DATABASE_SHARDS),
+            read_engine,
+        )
+    return _shard_router
@@ -0,0 +1,46 @@
+"""SQL Statement Reuse (compiled statements cache + server-side prepared statements).
+
+Two layers avoid redoing the same work for the same queries on a warm container:
+- SQLAlchemy compiled cache: the SQL string of a statement is generated once per engine, and then
+  looked up by the statement cache key. Custom types must declare cache_ok for this to work.
+- psycopg prepared statements: once the same SQL ran prepare_threshold times on a connection, it
+  is prepared server side and later executions skip parsing/planning.
+
+Metrics (src/lib/metrics.py): db.statement_cache.hit / .miss / .no_key / .disabled
+"""
+
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS, CACHING_DISABLED, NO_CACHE_KEY
+
+from src.lib.metrics import metrics
+
+_CACHE_HIT_METRICS = {
+    CACHE_HIT: "db.statement_cache.hit",
+    CACHE_MISS: "db.statement_cache.miss",
+    NO_CACHE_KEY: "db.statement_cache.no_key",  # e.g. a custom type without cache_ok
+    CACHING_DISABLED: "db.statement_cache.disabled",
+}
+
+
+def install_statement_cache_metrics(engine: Engine) -> None:
+    """Count compiled statement cache hits and misses."""
+
+    @event.listens_for(engine, "before_cursor_execute", named=True)
+    def _on_execute(**kwargs: Any) -> None:  # noqa: ANN401
+        context = kwargs["context"]
+        if context is None or context.compiled is None:
+            return  # textual SQL (exec_driver_sql / text())
+        name = _CACHE_HIT_METRICS.get(context.cache_hit)
+        if name:
+            metrics.incr(name)
+
+
+def psycopg_connect_args(prepare_threshold: int | None) -> dict[str, Any]:
+    """Connection arguments enabling psycopg server-side prepared statements.
+
+    prepare_threshold: number of executions of the same SQL on a connection before it gets
+    prepared (0: prepare on first execution, None: never prepare).
+    """
+    return {"prepare_threshold": prepare_threshold}
@@ -0,0 +1,132 @@
+"""Statements Bounded By The Invocation Deadline.
+
+A slow query used to run until the Lambda timeout killed the container: the caller got a gateway
+5xx, and the next invocations paid a cold start. Statements are bounded by the invocation
+deadline instead (see src/lib/deadline.py), minus DEADLINE_RESERVE_MS kept to answer:
+- PostgreSQL / Aurora DSQL: statement_timeout of the connection, set when a transaction begins
+- SQLite: a progress handler interrupts the statements running past the budget
+
+No transaction begins once the budget is spent, and a statement cancelled by the budget raises
+DeadlineExceededError: the handlers answer 503 with Retry-After, and the container survives.
+
+NOTE: statement_timeout is set at session level, in whole seconds (rounded down, milliseconds
+below one second), and only sent when it changes: the transactions of an invocation, and of the
+next invocations, mostly reuse the value already set on the pooled connection, without any extra
+round trip (SET LOCAL would cost one per transaction). A rolled back transaction reverts its SET:
+the value is forgotten on rollback.
+
+Metrics: db.statement_timeout_set (SET sent), db.deadline_exceeded.
+"""
+
+import math
+import sqlite3
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+from src.lib.deadline import DeadlineExceededError, budget_seconds
+from src.lib.metrics import metrics
+
+QUERY_CANCELED = "57014"
+# SQLite virtual machine instructions between two progress handler calls
+SQLITE_PROGRESS_STEPS = 1000
+_TIMEOUT_KEY = "statement_timeout_ms"
+
+
+def _deadline_exceeded() -> DeadlineExceededError:
+    metrics.incr("db.deadline_exceeded")
+    exception_msg = "The database did not answer in time, please retry"
+    return DeadlineExceededError(exception_msg)
+
+
+def statement_timeout_ms(budget: float | None) -> int:
+    """statement_timeout of a budget in seconds (0: no timeout), never above the budget.
+
+    Whole seconds, milliseconds below one second (at least 1ms: 0 would disable the timeout).
+    """
+    if budget is None:
+        return 0
+    if budget < 1:
+        return max(1, math.floor(budget * 1000))
+    return math.floor(budget) * 1000
+
+
+def _is_cancellation(error: BaseException) -> bool:
+    if isinstance(error, sqlite3.OperationalError):
+        return "interrupted" in str(error)
+    sqlstate = getattr(error, "sqlstate", None) or getattr(error, "pgcode", None)
+    return sqlstate == QUERY_CANCELED
+
+
+def _refuse_past_deadline(connection: Any) -> None:  # noqa: ANN401, ARG001
+    """Begin listener: no transaction begins once the budget is spent."""
+    budget = budget_seconds()
+    if budget is not None and budget <= 0:
+        raise _deadline_exceeded()
+
+
+def _set_statement_timeout(connection: Any) -> None:  # noqa: ANN401
+    """Begin listener: refuse past the deadline, otherwise bound the statements by the budget."""
+    _refuse_past_deadline(connection)
+    timeout_ms = statement_timeout_ms(budget_seconds())
+    info = connection.connection.info
+    if info.get(_TIMEOUT_KEY, 0) == timeout_ms:
+        return
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SET statement_timeout = {timeout_ms}")
+    finally:
+        cursor.close()
+    info[_TIMEOUT_KEY] = timeout_ms
+    metrics.incr("db.statement_timeout_set")
+
+
+def _forget_timeout_on_rollback(connection: Any) -> None:  # noqa: ANN401
+    connection.connection.info.pop(_TIMEOUT_KEY, None)
+
+
+def _forget_timeout_on_reset(
+    dbapi_connection: Any,  # noqa: ANN401, ARG001
+    connection_record: Any,  # noqa: ANN401
+    reset_state: Any,  # noqa: ANN401
+) -> None:
+    # Transactions left open are rolled back by the pool when the connection is returned
+    if reset_state.transaction_was_reset:
+        connection_record.info.pop(_TIMEOUT_KEY, None)
+
+
+def _cancellation_to_deadline(context: Any) -> Exception | None:  # noqa: ANN401
+    """handle_error listener: statements cancelled by the budget raise DeadlineExceededError."""
+    if _is_cancellation(context.original_exception):
+        return _deadline_exceeded()
+    return None
+
+
+def _install_progress_handler(dbapi_connection: Any, connection_record: Any) -> None:  # noqa: ANN401, ARG001
+    # Async drivers (aiosqlite) do not expose the progress handler
+    if hasattr(dbapi_connection, "set_progress_handler"):
+        dbapi_connection.set_progress_handler(_past_budget, SQLITE_PROGRESS_STEPS)
+
+
+def install_statement_deadline(engine: Engine, statement_timeout: bool = True) -> None:  # noqa: FBT001, FBT002
+    """Bound the statements of an engine by the invocation deadline.
+
+    statement_timeout: whether to set it (PostgreSQL), otherwise only the transactions beginning
+    past the deadline are refused.
+    """
+    sqlite = engine.dialect.name == "sqlite"
+    if sqlite or not statement_timeout:
+        event.listen(engine, "begin", _refuse_past_deadline)
+    else:
+        event.listen(engine, "begin", _set_statement_timeout)
+        event.listen(engine, "rollback", _forget_timeout_on_rollback)
+        event.listen(engine, "reset", _forget_timeout_on_reset)
+    event.listen(engine, "handle_error", _cancellation_to_deadline)
+    if sqlite:
+        event.listen(engine, "connect", _install_progress_handler)
+
+
+def _past_budget() -> int:
+    """SQLite progress handler: a non zero value interrupts the statement."""
+    budget = budget_seconds()
+    return int(budget is not None and budget <= 0)
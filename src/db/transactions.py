@@ -0,0 +1,149 @@
+"""Transactions Retried On Optimistic Concurrency Conflicts.
+
+Aurora DSQL uses optimistic concurrency: conflicting transactions are not blocked, one of them is
+aborted at commit with SQLSTATE 40001 (error codes OC000 for data conflicts, OC001 for catalog
+ones). Such a failure means "try again": nothing of the transaction was applied.
+
+run_transaction runs a unit of work (a function of the session) in its own transaction, and runs
+it again from the start on a conflict, after a jittered exponential backoff. The work must build
+everything it writes from what it reads in its session (never from a previous attempt): a replay
+is then the same transaction on fresh data, e.g. an idempotent favorite creation finds the
+favorite created by the concurrent transaction and returns it.
+
+run_async_transaction is the same for the async repositories (see src/db/async_session.py).
+
+Retries are bounded by DB_CONFLICT_MAX_ATTEMPTS and by the invocation time left (see
+src/lib/deadline.py): no retry is started unless its backoff leaves RETRY_TIME_RESERVE_SECONDS to
+run it and answer. Exhausted retries raise TransactionConflictError (409 in the handlers).
+
+Metrics: db.transaction (units of work), db.conflict (conflicts), db.conflict_retry (attempts
+replayed), db.conflict_exhausted (units of work given up).
+"""
+
+import random
+from asyncio import sleep as async_sleep
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from dataclasses import dataclass
+from time import sleep
+from typing import TypeVar
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.lib.deadline import remaining_seconds
+from src.lib.metrics import metrics
+
+T = TypeVar("T")
+
+SERIALIZATION_FAILURE = "40001"
+# Aurora DSQL optimistic concurrency error codes (in the error message)
+DSQL_CONFLICT_CODES = ("OC000", "OC001")
+# Time left to run the retried transaction and answer, below which no retry is started
+RETRY_TIME_RESERVE_SECONDS = 1.0
+
+
+class TransactionConflictError(Exception):
+    """A transaction kept conflicting with concurrent ones."""
+
+    # Error response (see error_from)
+    status_code = 409
+    retry_after_seconds = 1
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Attempts of a unit of work, with full jitter exponential backoff between them."""
+
+    max_attempts: int = 4
+    base_delay_seconds: float = 0.02
+    max_delay_seconds: float = 0.5
+
+    def delay(self, retry: int) -> float:
+        """Backoff before retry number retry (1 for the first one)."""
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (retry - 1))
+        return random.uniform(0, ceiling)  # noqa: S311 # not used for security
+
+
+def is_conflict(error: BaseException) -> bool:
+    """Whether a database error is a serialization failure (the transaction can be retried)."""
+    if not isinstance(error, exc.DBAPIError):
+        return False
+    original = error.orig
+    sqlstate = getattr(original, "sqlstate", None) or getattr(original, "pgcode", None)
+    if sqlstate == SERIALIZATION_FAILURE:
+        return True
+    return any(code in str(original) for code in DSQL_CONFLICT_CODES)
+
+
+_default_policy = None
+
+
+def default_retry_policy() -> RetryPolicy:
+    """Policy of DB_CONFLICT_MAX_ATTEMPTS and DB_CONFLICT_BASE_DELAY_MS."""
+    global _default_policy  # noqa: PLW0603
+    if _default_policy is None:
+        from src.config import DB_CONFLICT_BASE_DELAY_MS, DB_CONFLICT_MAX_ATTEMPTS  # noqa: PLC0415
+
+        _default_policy = RetryPolicy(
+            max_attempts=max(DB_CONFLICT_MAX_ATTEMPTS, 1),
+            base_delay_seconds=DB_CONFLICT_BASE_DELAY_MS / 1000,
+        )
+    return _default_policy
+
+
+def _retry_delay(conflict: exc.DBAPIError, attempt: int, policy: RetryPolicy) -> float:
+    """Backoff before replaying a conflicting attempt (TransactionConflictError: no retry left)."""
+    metrics.incr("db.conflict")
+    delay = policy.delay(attempt)
+    remaining = remaining_seconds()
+    out_of_time = remaining is not None and remaining - delay < RETRY_TIME_RESERVE_SECONDS
+    if attempt >= policy.max_attempts or out_of_time:
+        metrics.incr("db.conflict_exhausted")
+        exception_msg = "Conflicting concurrent update, please retry"
+        raise TransactionConflictError(exception_msg) from conflict
+    metrics.incr("db.conflict_retry")
+    return delay
+
+
+def run_transaction(
+    open_session: Callable[[], AbstractContextManager[Session]],
+    work: Callable[[Session], T],
+    policy: RetryPolicy | None = None,
+) -> T:
+    """Result of work run in a session of open_session (committed on exit), retried on conflicts."""
+    policy = policy or default_retry_policy()
+    metrics.incr("db.transaction")
+    attempt = 1
+    while True:
+        try:
+            with open_session() as db:
+                return work(db)
+        except exc.DBAPIError as e:
+            if not is_conflict(e):
+                raise
+            delay = _retry_delay(e, attempt, policy)
+        sleep(delay)
+        attempt += 1
+
+
+async def run_async_transaction(
+    open_session: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+    work: Callable[[AsyncSession], Awaitable[T]],
+    policy: RetryPolicy | None = None,
+) -> T:
+    """Async counterpart of run_transaction: work awaited in a session, retried on conflicts."""
+    policy = policy or default_retry_policy()
+    metrics.incr("db.transaction")
+    attempt = 1
+    while True:
+        try:
+            async with open_session() as db:
+                return await work(db)
+        except exc.DBAPIError as e:
+            if not is_conflict(e):
+                raise
+            delay = _retry_delay(e, attempt, policy)
+        await async_sleep(delay)
+        attempt += 1
@@ -0,0 +1,109 @@
+"""UUID Columns Storage Migration (CHAR(36) strings <-> 16 bytes binary).
+
+SQLite is dynamically typed: a column declared CHAR(36) can hold 16 bytes BLOBs, so converting
+is an in-place UPDATE of every GUID column, done in small batches, resumable (only values still
+in the source representation are selected) and idempotent.
+
+Aurora DSQL cannot ALTER a column type: migrate by exporting (scripts/export_requests.py), then
+recreating the tables with UUID_STORAGE=binary and loading the export back (scripts/seed_db.py).
+Native PostgreSQL always uses its UUID type and needs no migration.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.pool import NullPool
+
+from src.models.base import Base
+from src.models.types import GUID
+
+
+@dataclass
+class UuidMigrationReport:
+    """Converted values per table.column."""
+
+    converted: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.converted.values())
+
+
+def guid_columns() -> list[tuple[str, str]]:
+    """All (table, column) pairs using the GUID type."""
+    return [
+        (table.name, column.name)
+        for table in Base.metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, GUID)
+    ]
+
+
+def _migration_engine(engine: Engine) -> Engine:
+    """Engine on the same database whose connections do not enforce foreign keys.
+
+    Referencing and referenced columns are converted one after the other. PRAGMA foreign_keys is a
+    no-op inside a transaction, so it is set on connect, before any BEGIN, on connections of their
+    own: the pooled connections of the application engine keep their setting.
+    """
+    migration_engine = create_engine(engine.url, poolclass=NullPool)
+
+    @event.listens_for(migration_engine, "connect")
+    def _foreign_keys_off(dbapi_connection: Any, _connection_record: Any) -> None:  # noqa: ANN401
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = OFF")
+        cursor.close()
+
+    return migration_engine
+
+
+def migrate_uuid_storage(
+    engine: Engine,
+    to_binary: bool = True,
+    batch_size: int = 1000,
+) -> UuidMigrationReport:
+    """Convert every GUID column of every table to binary (or back to strings)."""
+    if engine.dialect.name != "sqlite":
+        exception_msg = (
+            f"In-place UUID storage migration is only supported on SQLite, not on "
+            f"{engine.dialect.name}: export, recreate the tables and load the data back instead"
+        )
+        raise ValueError(exception_msg)
+
+    source_type = "text" if to_binary else "blob"
+    report = UuidMigrationReport()
+    migration_engine = _migration_engine(engine)
+    with migration_engine.connect() as connection:
+        for table, column in guid_columns():
+            select_batch = text(
+                f'SELECT rowid, "{column}" FROM "{table}" '  # noqa: S608 # names from metadata
+                f'WHERE typeof("{column}") = :source_type LIMIT :batch_size',
+            )
+            update = text(f'UPDATE "{table}" SET "{column}" = :value WHERE rowid = :rowid')  # noqa: S608
+            converted = 0
+            while True:
+                rows = connection.execute(
+                    select_batch,
+                    {"source_type": source_type, "batch_size": batch_size},
+                ).all()
+                if not rows:
+                    break
+                connection.execute(
+                    update,
+                    [
+                        {
+                            "rowid": rowid,
+                            "value": uuid.UUID(value).bytes
+                            if to_binary
+                            else str(uuid.UUID(bytes=value)),
+                        }
+                        for rowid, value in rows
+                    ],
+                )
+                connection.commit()
+                converted += len(rows)
+            report.converted[f"{table}.{column}"] = converted
+    migration_engine.dispose()
+    return report
@@ -0,0 +1,100 @@
+"""Lambda INIT Phase Database Warmup.
+
+Lambda runs the INIT phase (module imports) with boosted CPU and outside of the billed/awaited
+request path. Without warmup, the first invocation of every container pays for:
+- the TCP + TLS handshake and IAM authentication to Aurora DSQL (plus dialect initialization)
+- the mappers configuration and SQLAlchemy compilation of the hot queries
+
+warm_up() does all of it ahead of time: it opens one pooled connection (kept in the pool) and runs
+the hot repository queries once, so their compiled form lands in the engine statement cache.
+"""
+
+import json
+import logging
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from src.config import DB_WARMUP, REPOSITORY_BACKEND
+
+logger = logging.getLogger(__name__)
+
+# Id that can never exist (UUIDs are never all zeros), used to prepare lookup queries
+_WARMUP_ID = uuid.UUID(int=0)
+
+
+@dataclass
+class WarmupReport:
+    """Duration of each warmup step (milliseconds)."""
+
+    steps_ms: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.steps_ms.values())
+
+
+class _Step:
+    def __init__(self, report: WarmupReport, name: str) -> None:
+        self.report = report
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        self.report.steps_ms[self.name] = round((time.perf_counter() - self.started_at) * 1000, 3)
+
+
+def warm_up() -> WarmupReport:
+    """Open a pooled connection and prepare the hot queries."""
+    # Imported here so that importing this module alone stays cheap
+    from src.db.session import engine  # noqa: PLC0415
+    from src.repositories.request_repository import get_request_repository  # noqa: PLC0415
+
+    report = WarmupReport()
+    with _Step(report, "configure_mappers"):
+        configure_mappers()
+
+    # The connection goes back to the pool on exit and is reused by the first invocation
+    # (DynamoDB repositories have no database connection: their first calls open the HTTPS one)
+    if REPOSITORY_BACKEND != "dynamodb":
+        with _Step(report, "connect"), engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    request_repo = get_request_repository()
+    with _Step(report, "get_by_id"):
+        request_repo.get_by_id(_WARMUP_ID)
+    with _Step(report, "list_of_requests"):
+        request_repo.list_of_requests()
+    with _Step(report, "get_user_requests"):
+        request_repo.get_user_requests(_WARMUP_ID)
+    return report
+
+
+_init_report: WarmupReport | None = None
+
+
+def warm_up_on_init() -> WarmupReport | None:
+    """Run warm_up() once per container when DB_WARMUP is enabled.
+
+    Meant to be called at handler module import (INIT phase). Never raises: a failing warmup
+    only means the first invocation pays the usual cold path.
+    """
+    global _init_report  # noqa: PLW0603
+    if not DB_WARMUP or _init_report is not None:
+        return _init_report
+    try:
+        _init_report = warm_up()
+    except Exception as e:
+        logger.exception("Database warmup failed")
+        _init_report = WarmupReport(error=repr(e))
+    sys.stdout.write(
+        json.dumps({"warmup": _init_report.steps_ms, "warmup_error": _init_report.error}) + "\n",
+    )
+    return _init_report
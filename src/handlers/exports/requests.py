@@ -0,0 +1,70 @@
+"""Requests Export Handler."""
+
+from contextlib import closing
+from datetime import UTC, datetime
+from typing import Any
+
+from src.config import EXPORT_BUCKET, EXPORT_LOCAL_DIR
+from src.db.export import (
+    ExportFilters,
+    check_unsharded,
+    export_to_object_store,
+    iter_request_records,
+)
+from src.db.session import engine
+from src.lib.object_store import LocalObjectStore, ObjectStore, S3ObjectStore
+from src.schemas.request import RequestType
+
+# Stop writing new parts when less than this remains before the Lambda timeout
+_SAFETY_MARGIN_MS = 60_000
+
+
+def _get_store() -> ObjectStore:
+    if EXPORT_LOCAL_DIR:
+        return LocalObjectStore(EXPORT_LOCAL_DIR)
+    if not EXPORT_BUCKET:
+        exception_msg = "EXPORT_BUCKET (or EXPORT_LOCAL_DIR) must be set to export requests"
+        raise ValueError(exception_msg)
+    return S3ObjectStore(EXPORT_BUCKET)
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def export_requests(event, context) -> dict[str, Any]:  # noqa: ANN001
+    """Export requests as NDJSON chunk objects.
+
+    Invoked directly (console, Step Functions, schedule), not through the HTTP API. Event fields
+    (all optional): type, created_after, created_before, prefix, resume_from.
+    When the Lambda is about to time out the export stops cleanly and the response carries
+    completed=false and the prefix/resume_from values to re-invoke it with.
+    Invoked again with the prefix of an interrupted export (a failure included) and without
+    resume_from, the export resumes from the last part written (the manifest resume_token).
+    """
+    check_unsharded()
+    event = event or {}
+    filters = ExportFilters(
+        request_type=RequestType(event["type"]) if event.get("type") else None,
+        created_after=_parse_datetime(event.get("created_after")),
+        created_before=_parse_datetime(event.get("created_before")),
+    )
+    prefix = event.get("prefix") or f"exports/requests/{datetime.now(UTC):%Y%m%dT%H%M%SZ}"
+
+    def _should_stop() -> bool:
+        return context is not None and context.get_remaining_time_in_millis() < _SAFETY_MARGIN_MS
+
+    store = _get_store()
+    manifest = store.get_json(f"{prefix}/manifest.json") or {}
+    resume_from = event.get("resume_from") or manifest.get("resume_token")
+    records = iter_request_records(engine, filters, resume_token=resume_from)
+    with closing(records):
+        report = export_to_object_store(records, store, prefix, should_stop=_should_stop)
+
+    return {
+        "prefix": prefix,
+        "records": report.records,
+        "bytes_written": report.bytes_written,
+        "completed": report.completed,
+        "resume_from": report.resume_token or resume_from,
+    }
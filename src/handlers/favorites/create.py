@@ -1,16 +1,24 @@
 """Favorite Creation Handler."""
 
+import asyncio
 import json
 from uuid import UUID
 
-from src.lib.responses import error, success
-from src.repositories.favorite_repository import get_favorite_repository
-from src.repositories.request_repository import get_request_repository
+from src.db.warmup import warm_up_on_init
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error, error_from, success
+from src.repositories.async_favorite_repository import get_async_favorite_repository
+from src.repositories.async_request_repository import get_async_request_repository
 
+warm_up_on_init()
 
-def create_favorite(event, _):  # noqa
-    favorite_repo = get_favorite_repository()
-    request_repo = get_request_repository()
+
+@lambda_handler
+@rate_limited("create_favorite")
+async def create_favorite(event, _):  # noqa
+    favorite_repo = get_async_favorite_repository()
+    request_repo = get_async_request_repository()
 
     # TODO: Put a limit on favorite items per user maybe 100
     try:
@@ -21,13 +29,19 @@ def create_favorite(event, _):  # noqa
         body = json.loads(event.get("body", "{}"))
 
         request_id = UUID(body.get("request_id"))
-        request = request_repo.get_by_id(request_id=request_id)
+
+        # NOTE: Both lookups are independent, they run concurrently (one connection each)
+        request, favorite = await asyncio.gather(
+            request_repo.get_by_id(request_id=request_id),
+            favorite_repo.get_user_favorite(user_id=user_id, request_id=request_id),
+        )
 
         if not request:
             return error("Request not found", 404)
 
         # Add favorite (repository handles idempotance)
-        favorite = favorite_repo.create(user_id=user_id, request_id=request_id)
+        if not favorite:
+            favorite = await favorite_repo.create(user_id=user_id, request_id=request_id)
 
         return success(
             {
@@ -37,4 +51,4 @@ def create_favorite(event, _):  # noqa
         )
 
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
@@ -2,10 +2,17 @@
 
 from uuid import UUID
 
-from src.lib.responses import error, success
+from src.db.warmup import warm_up_on_init
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error, error_from, success
 from src.repositories.favorite_repository import get_favorite_repository
 
+warm_up_on_init()
 
+
+@lambda_handler
+@rate_limited("delete_favorite")
 def delete_favorite(event, _):  # noqa
     favorite_repo = get_favorite_repository()
     try:
@@ -36,4 +43,4 @@ def delete_favorite(event, _):  # noqa
             },
         )
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
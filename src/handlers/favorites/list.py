@@ -2,10 +2,19 @@
 
 from uuid import UUID
 
-from src.lib.responses import error, success
+from src.db.warmup import warm_up_on_init
+from src.lib.fields import parse_fields
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error_from, success
+from src.models.favorite import FAVORITE_FIELDS
 from src.repositories.favorite_repository import get_favorite_repository
 
+warm_up_on_init()
 
+
+@lambda_handler
+@rate_limited("list_user_favorites")
 def list_user_favorites(event, _):  # noqa
     favorite_repo = get_favorite_repository()
 
@@ -14,13 +23,15 @@ def list_user_favorites(event, _):  # noqa
         claims = event["requestContext"]["authorizer"]["jwt"]["claims"]
         user_id = UUID(claims["sub"])
 
-        favorites = favorite_repo.list_user_favorites(user_id=user_id)
+        query_params = event.get("queryStringParameters") or {}
+        fields = parse_fields(query_params.get("fields"), FAVORITE_FIELDS)
+        favorites = favorite_repo.list_user_favorites(user_id=user_id, fields=fields)
         return success(
             {
-                "favorites": [fav.to_dict() for fav in favorites],
+                "favorites": [fav.to_dict(fields) for fav in favorites],
                 "user_id": str(user_id),
                 "total": len(favorites),
             }
         )
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
@@ -1,14 +1,35 @@
-"""Health Check Module."""
+"""Health Check Module.
+
+NOTE: Nothing heavy is imported at module level (no src.config, SQLAlchemy or boto3): the shallow
+check answers without loading the application at all. The deep check imports what it probes.
+"""
 
 import json
 from typing import Any
 
 
-def health_check(event, context) -> dict[str, Any]:  # noqa: ANN001, ARG001
-    """Check Lambda Functions Dummy."""
-    # TODO: Change this to real health check
+def _response(status_code: int, body: dict[str, Any]) -> dict[str, Any]:
     return {
-        "statusCode": 200,
+        "statusCode": status_code,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps({"status": "ok", "message": "Service is healthy"}),
+        "body": json.dumps(body),
     }
+
+
+def health_check(event, context) -> dict[str, Any]:  # noqa: ANN001, ARG001
+    """Check Lambda Functions.
+
+    - shallow (default): the Lambda runs
+    - deep (?deep=true): dependency probes latencies (see src/db/health.py), 503 when one fails.
+      Also warms the container up (database connection in the pool, fresh DSQL token)
+    """
+    query_params = (event or {}).get("queryStringParameters") or {}
+    if query_params.get("deep", "").lower() not in ("1", "true"):
+        return _response(200, {"status": "ok", "message": "Service is healthy"})
+
+    from src.db.health import deep_health  # noqa: PLC0415 # deep mode only
+
+    report = deep_health()
+    if report["status"] != "ok":
+        return _response(503, {"message": "Service is degraded", **report})
+    return _response(200, {"message": "Service is healthy", **report})
@@ -0,0 +1,133 @@
+"""Home Handler.
+
+Opening the app used to cost three calls (the user's requests, their favorites and the first feed
+page), each paying its own invocation, session and connection checkout. GET /v0/me/home answers
+all three sections at once, each with its own limit and cursor:
+- sections: comma separated sections to return (default: requests,favorites,feed), so that a
+  client paging one section does not fetch the others again
+- <section>_limit, <section>_cursor: page of a section (the cursors of the section pagination)
+
+The sections queries are independent: they are awaited concurrently on the async repositories
+(asyncio.gather, as in create_favorite), one pooled connection each.
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+from src.config import REPOSITORY_BACKEND, REQUEST_FEED_READS
+from src.db.warmup import warm_up_on_init
+from src.lib.fragment_cache import render_requests
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error_from, success_json
+from src.lib.stale_responses import degradable
+from src.repositories.async_favorite_repository import get_async_favorite_repository
+from src.repositories.async_request_repository import get_async_request_repository
+
+warm_up_on_init()
+
+SECTIONS = ("requests", "favorites", "feed")
+DEFAULT_SECTION_LIMITS = {"requests": 10, "favorites": 10, "feed": 20}
+MAX_SECTION_LIMIT = 100
+
+
+def _sections(query_params: dict) -> tuple[str, ...]:
+    value = query_params.get("sections")
+    if value is None:
+        return SECTIONS
+    sections = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if not sections or not set(sections) <= set(SECTIONS):
+        exception_msg = f"sections must be among {', '.join(SECTIONS)}"
+        raise ValueError(exception_msg)
+    return sections
+
+
+def _section_limit(query_params: dict, section: str) -> int:
+    value = query_params.get(f"{section}_limit")
+    if value is None:
+        return DEFAULT_SECTION_LIMITS[section]
+    limit = int(value)
+    if not 0 < limit <= MAX_SECTION_LIMIT:
+        exception_msg = f"{section}_limit must be between 1 and {MAX_SECTION_LIMIT}"
+        raise ValueError(exception_msg)
+    return limit
+
+
+async def _requests_section(user_id: UUID, limit: int, cursor: str | None) -> str:
+    page = await get_async_request_repository().page_of_user_requests(
+        user_id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return (
+        f'{{"requests": {render_requests(page["requests"])}, '
+        f'"pagination": {json.dumps(page["pagination"])}}}'
+    )
+
+
+async def _favorites_section(user_id: UUID, limit: int, cursor: str | None) -> str:
+    page = await get_async_favorite_repository().page_of_user_favorites(
+        user_id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return json.dumps(
+        {
+            "favorites": [favorite.to_dict() for favorite in page["favorites"]],
+            "pagination": page["pagination"],
+        },
+    )
+
+
+async def _feed_section(user_id: UUID, limit: int, cursor: str | None) -> str:  # noqa: ARG001
+    # Same page as GET /v0/requests without filters
+    if REQUEST_FEED_READS and REPOSITORY_BACKEND == "sql":
+        page = await get_async_request_repository().list_feed(limit=limit, cursor=cursor)
+        requests = f"[{', '.join(page['fragments'])}]"
+    else:
+        page = await get_async_request_repository().list_of_requests(limit=limit, cursor=cursor)
+        requests = render_requests(page["requests"])
+    return f'{{"requests": {requests}, "pagination": {json.dumps(page["pagination"])}}}'
+
+
+SECTION_RENDERERS: dict[str, Callable[[UUID, int, str | None], Awaitable[str]]] = {
+    "requests": _requests_section,
+    "favorites": _favorites_section,
+    "feed": _feed_section,
+}
+
+
+@lambda_handler
+@rate_limited("get_home")
+@degradable("get_home")
+async def get_home(event, _):  # noqa
+    try:
+        # HTTP API JWT authorizer structure: requestContext.authorizer.jwt.claims
+        claims = event["requestContext"]["authorizer"]["jwt"]["claims"]
+        user_id = UUID(claims["sub"])
+
+        query_params = event.get("queryStringParameters") or {}
+        sections = _sections(query_params)
+        limits = [_section_limit(query_params, section) for section in sections]
+        # Every section runs to completion (a failing one does not leave the others running on
+        # their connections), the first error is then raised
+        rendered = await asyncio.gather(
+            *(
+                SECTION_RENDERERS[section](user_id, limit, query_params.get(f"{section}_cursor"))
+                for section, limit in zip(sections, limits, strict=True)
+            ),
+            return_exceptions=True,
+        )
+        for section_json in rendered:
+            if isinstance(section_json, BaseException):
+                raise section_json
+
+        body = ", ".join(
+            f"{json.dumps(section)}: {section_json}"
+            for section, section_json in zip(sections, rendered, strict=True)
+        )
+        return success_json(f'{{"user_id": {json.dumps(str(user_id))}, {body}}}')
+    except Exception as e:
+        return error_from(e)
@@ -1,14 +1,20 @@
 """Request Creation Handler."""
 
-import json
 from uuid import UUID
 
 from src.config import BASE_DOMAIN, MAX_USER_CREATED_REQUESTS
-from src.lib.responses import error, success
+from src.db.warmup import warm_up_on_init
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error_from, success
 from src.repositories.request_repository import get_request_repository
-from src.schemas.request import RequestCreate
+from src.schemas.request import RequestCreate, parse_request_create
 
+warm_up_on_init()
 
+
+@lambda_handler
+@rate_limited("create_request")
 def create_request(event, _):  # noqa
     request_repo = get_request_repository()
     try:
@@ -21,13 +27,12 @@ def create_request(event, _):  # noqa
             exception_msg = "Too many requests created"
             raise Exception(exception_msg)  # noqa: TRY301
 
-        body = json.loads(event.get("body", "{}"))
-
         # NOTE: Validation could have been outside of Lambda, at API Gateway level,
         # for faster error response and no Lambda execution time on schema validation failure,
         # but I need dynamic cross attributes check which is not possible in API Gateway.
         # Only static stuff is supported for now in API Gateway
-        input_request: RequestCreate = RequestCreate.model_validate(body)
+        # The raw body is validated as is (no json.loads): see parse_request_create
+        input_request: RequestCreate = parse_request_create(event.get("body", "{}"))
 
         request = request_repo.create(
             user_id=user_id,  # already UUID from line 17
@@ -45,4 +50,4 @@ def create_request(event, _):  # noqa
             extra_headers={"Location": f"{BASE_DOMAIN}/requests/{request.id}"},
         )
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
@@ -2,10 +2,17 @@
 
 from uuid import UUID
 
-from src.lib.responses import error, success
+from src.db.warmup import warm_up_on_init
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error, error_from, success
 from src.repositories.request_repository import get_request_repository
 
+warm_up_on_init()
 
+
+@lambda_handler
+@rate_limited("delete_request")
 def delete_request(event, _):  # noqa
     request_repo = get_request_repository()
     try:
@@ -39,4 +46,4 @@ def delete_request(event, _):  # noqa
             status_code=204,
         )
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
@@ -2,19 +2,31 @@
 
 from uuid import UUID
 
-from src.lib.responses import error, success
+from src.db.warmup import warm_up_on_init
+from src.lib.fields import parse_fields
+from src.lib.fragment_cache import render_request
+from src.lib.handler import lambda_handler
+from src.lib.responses import error, error_from, success_json
+from src.lib.stale_responses import degradable
+from src.models.request import REQUEST_FIELDS
 from src.repositories.request_repository import get_request_repository
 
+warm_up_on_init()
 
+
+@lambda_handler
+@degradable("get_request")
 def get_request(event, _):  # noqa
     request_repo = get_request_repository()
     try:
         request_id = UUID(event.get("pathParameters", {}).get("request_id"))
-        request = request_repo.get_by_id(request_id=request_id)
+        query_params = event.get("queryStringParameters") or {}
+        fields = parse_fields(query_params.get("fields"), REQUEST_FIELDS)
+        request = request_repo.get_by_id(request_id=request_id, fields=fields)
 
         if not request:
             return error("Request not found", 404)
 
-        return success({"request": request.to_dict()})
+        return success_json(f'{{"request": {render_request(request, fields)}}}')
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
@@ -1,9 +1,67 @@
 """Requests List Handler."""
 
-from src.lib.responses import error, success
+import json
+from datetime import UTC, datetime, timedelta
+
+from src.config import REPOSITORY_BACKEND, REQUEST_FEED_READS
+from src.db.warmup import warm_up_on_init
+from src.lib.fields import parse_fields
+from src.lib.fragment_cache import render_requests
+from src.lib.handler import lambda_handler
+from src.lib.responses import error_from, success_json
+from src.lib.stale_responses import degradable
+from src.models.request import REQUEST_FIELDS
 from src.repositories.request_repository import get_request_repository
 
+warm_up_on_init()
+
+# "Expiring soon" windows are limited to 30 days
+MAX_EXPIRING_WITHIN_HOURS = 24 * 30
+
+
+def _parse_due_date_param(name: str, value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    try:
+        # NOTE: a "+" left unencoded in a query string is decoded as a space
+        parsed = datetime.fromisoformat(value.replace(" ", "+"))
+    except ValueError as e:
+        exception_msg = f"{name} must be an ISO 8601 datetime"
+        raise ValueError(exception_msg) from e
+    if parsed.tzinfo is None:
+        exception_msg = f"{name} must be timezone-aware (UTC)"
+        raise ValueError(exception_msg)
+    return parsed
+
+
+def _due_date_window(query_params: dict) -> tuple[datetime | None, datetime | None]:
+    """Due date window from due_after / due_before, or from expiring_within (hours from now)."""
+    due_after = _parse_due_date_param("due_after", query_params.get("due_after"))
+    due_before = _parse_due_date_param("due_before", query_params.get("due_before"))
+    expiring_within = query_params.get("expiring_within")
+    if expiring_within is None:
+        return due_after, due_before
 
+    if due_after or due_before:
+        exception_msg = "expiring_within cannot be combined with due_after / due_before"
+        raise ValueError(exception_msg)
+    hours = int(expiring_within)
+    if not 0 < hours <= MAX_EXPIRING_WITHIN_HOURS:
+        exception_msg = f"expiring_within must be between 1 and {MAX_EXPIRING_WITHIN_HOURS} hours"
+        raise ValueError(exception_msg)
+    # NOTE: The window moves with time between pages, the keyset cursor still resumes right
+    # after the last returned request
+    now = datetime.now(UTC)
+    return now, now + timedelta(hours=hours)
+
+
+def _is_search(event: dict) -> bool:
+    return bool((event.get("queryStringParameters") or {}).get("q"))
+
+
+@lambda_handler
+# Searches are shed while the database is unavailable, the feed is served stale
+@degradable("list_requests", low_priority=_is_search)
 def list_requests(event, _):  # noqa
     request_repo = get_request_repository()
     try:
@@ -12,23 +70,52 @@ def list_requests(event, _):  # noqa
         cursor = query_params.get("cursor")
         limit = int(query_params.get("limit", 20))
         request_type = query_params.get("type")
+        search_query = query_params.get("q")
+        due_after, due_before = _due_date_window(query_params)
+        fields = parse_fields(query_params.get("fields"), REQUEST_FIELDS)
 
-        # Get paginated results
-        result = request_repo.list_of_requests(
-            request_type=request_type,
-            limit=limit,
-            cursor=cursor,
-        )
-
-        # Convert requests to dicts for JSON response
-        requests_data = [req.to_dict() for req in result["requests"]]
+        # Get paginated results (ranked search results when a search query is given)
+        if not search_query and not fields and REQUEST_FEED_READS and REPOSITORY_BACKEND == "sql":
+            # Pre-rendered requests: the body is assembled without any per-request serialization
+            # (whole requests only, sparse fieldsets are read from the requests table)
+            page = request_repo.list_feed(
+                request_type=request_type,
+                limit=limit,
+                cursor=cursor,
+                due_after=due_after,
+                due_before=due_before,
+            )
+            return success_json(
+                f'{{"requests": [{", ".join(page["fragments"])}], '
+                f'"pagination": {json.dumps(page["pagination"])}}}',
+            )
+        if search_query:
+            result = request_repo.search_requests(
+                query=search_query,
+                request_type=request_type,
+                limit=limit,
+                cursor=cursor,
+                due_after=due_after,
+                due_before=due_before,
+                fields=fields,
+            )
+        else:
+            result = request_repo.list_of_requests(
+                request_type=request_type,
+                limit=limit,
+                cursor=cursor,
+                due_after=due_after,
+                due_before=due_before,
+                fields=fields,
+            )
 
-        return success({
-            "requests": requests_data,
-            "pagination": result["pagination"],
-        })
+        # Rendered requests are cached per (id, version): only new or updated ones are serialized
+        return success_json(
+            f'{{"requests": {render_requests(result["requests"], fields)}, '
+            f'"pagination": {json.dumps(result["pagination"])}}}',
+        )
 
     # TODO: need to hide backend errors to the end user, or at least send
     # a default "an error has occured", maybe identified with number
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
@@ -1,11 +1,22 @@
 """User Requests List Handler."""
 
+import json
 from uuid import UUID
 
-from src.lib.responses import error, success
+from src.db.warmup import warm_up_on_init
+from src.lib.fields import parse_fields
+from src.lib.fragment_cache import render_requests
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error_from, success_json
+from src.models.request import REQUEST_FIELDS
 from src.repositories.request_repository import get_request_repository
 
+warm_up_on_init()
 
+
+@lambda_handler
+@rate_limited("list_user_requests")
 def list_user_requests(event, _):  # noqa
     request_repo = get_request_repository()
 
@@ -16,13 +27,12 @@ def list_user_requests(event, _):  # noqa
         # which also the same behaviour as a user who exists but that still didnt create requests
         # Simply return an error with value 'user do not exist'. or maybe this is useless...
         user_id = UUID(event.get("pathParameters", {}).get("user_id"))
-        requests = request_repo.get_user_requests(user_id=user_id)
-        return success(
-            {
-                "requests": [req.to_dict() for req in requests],
-                "user_id": str(user_id),
-                "total": len(requests),
-            },
+        query_params = event.get("queryStringParameters") or {}
+        fields = parse_fields(query_params.get("fields"), REQUEST_FIELDS)
+        requests = request_repo.get_user_requests(user_id=user_id, fields=fields)
+        return success_json(
+            f'{{"requests": {render_requests(requests, fields)}, '
+            f'"user_id": {json.dumps(str(user_id))}, "total": {len(requests)}}}',
         )
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
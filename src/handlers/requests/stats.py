@@ -0,0 +1,28 @@
+"""Requests Stats Handler."""
+
+from src.db.warmup import warm_up_on_init
+from src.lib.handler import lambda_handler
+from src.lib.responses import error_from, success
+from src.lib.stale_responses import degradable
+from src.repositories.request_repository import get_request_repository
+
+warm_up_on_init()
+
+
+@lambda_handler
+@degradable("get_request_stats", low_priority=True)
+def get_request_stats(event, _):  # noqa
+    """Feed header counts: total, per type and per due date bucket (today, this week, no date)."""
+    try:
+        return success({"stats": get_request_repository().get_stats()})
+    except Exception as e:
+        return error_from(e)
+
+
+def reconcile_request_stats(event, _) -> dict:  # noqa: ANN001, ARG001
+    """Correct the stats counters drift and remove the expired day counters.
+
+    Invoked by a daily schedule (right after the UTC day changes), not through the HTTP API.
+    """
+    report = get_request_repository().reconcile_stats()
+    return {"keys": report.keys, "corrected": report.corrected, "expired": report.expired}
@@ -3,11 +3,18 @@
 import json
 from uuid import UUID
 
-from src.lib.responses import error, success
+from src.db.warmup import warm_up_on_init
+from src.lib.handler import lambda_handler
+from src.lib.rate_limit import rate_limited
+from src.lib.responses import error, error_from, success
 from src.repositories.request_repository import get_request_repository
 from src.schemas.request import RequestUpdate
 
+warm_up_on_init()
 
+
+@lambda_handler
+@rate_limited("update_request")
 def update_request(event, _):  # noqa
     request_repo = get_request_repository()
     try:
@@ -41,4 +48,4 @@ def update_request(event, _):  # noqa
         )
 
     except Exception as e:
-        return error(str(e))
+        return error_from(e)
@@ -0,0 +1,258 @@
+"""Circuit Breaker Around The Database.
+
+When the database latency spikes, every invocation used to wait on it until its own timeout: the
+waiting invocations pile up, and the account concurrency is exhausted by calls doomed to fail.
+The repositories calls go through a circuit breaker instead (see
+src/repositories/circuit_breaking_repository.py):
+- closed: calls go through, their outcomes are kept over a sliding window of the last calls; the
+  circuit opens when failures (database errors, deadline exceeded) and slow calls reach
+  failure_rate of the window
+- open: calls are rejected right away with CircuitOpenError (503), for open_seconds
+- half-open: then a few probe calls go through (the others are still rejected); the circuit closes
+  once they all succeed, and opens again as soon as one fails
+
+A Lambda container handles one invocation at a time, so every container decides on its own
+outcomes, without any coordination: each container that sees the database struggle stops sending
+it calls, and probes it again on its own schedule.
+
+Metrics: circuit.failure, circuit.slow, circuit.rejected, circuit.probe, and the transitions
+circuit.opened, circuit.half_opened, circuit.closed.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from botocore.exceptions import BotoCoreError, ClientError
+from sqlalchemy import exc
+
+from src.db.transactions import is_conflict
+from src.lib.deadline import DeadlineExceededError
+from src.lib.metrics import metrics
+
+T = TypeVar("T")
+
+# DynamoDB errors telling the table is overloaded (the other client errors are the call's own)
+DYNAMODB_OVERLOAD_CODES = frozenset(
+    {
+        "InternalServerError",
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "ServiceUnavailable",
+        "ThrottlingException",
+    },
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class DependencyUnavailableError(Exception):
+    """The database failed to answer (answered 503, see error_from)."""
+
+    status_code = 503
+    retry_after_seconds = 1
+
+
+class CircuitOpenError(DependencyUnavailableError):
+    """The call was rejected without reaching the database: its circuit is open."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after_seconds = max(1, math.ceil(retry_after))
+
+
+def is_dependency_failure(error: BaseException) -> bool:
+    """Whether an error tells the database is struggling (not that the call itself is wrong).
+
+    Repositories may wrap the driver errors (raise ... from e): their causes are looked at too.
+    Constraint violations and concurrency conflicts are answers of the database.
+    """
+    cause: BaseException | None = error
+    while cause is not None:
+        if isinstance(cause, exc.IntegrityError | exc.DataError) or is_conflict(cause):
+            return False
+        if isinstance(cause, ClientError):
+            return cause.response.get("Error", {}).get("Code") in DYNAMODB_OVERLOAD_CODES
+        if isinstance(cause, exc.DBAPIError | DeadlineExceededError | TimeoutError | BotoCoreError):
+            return True
+        cause = cause.__cause__
+    return False
+
+
+class CircuitBreaker:
+    """Circuit of a dependency, opened on failures and slow calls over the last window_size calls.
+
+    The failure rate is only assessed once min_calls outcomes are known, so that a couple of
+    errors right after a cold start do not open the circuit.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 2.0,
+        open_seconds: float = 10.0,
+        window_size: int = 20,
+        min_calls: int = 10,
+        half_open_probes: int = 1,
+        is_failure: Callable[[BaseException], bool] = is_dependency_failure,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.min_calls = min(min_calls, window_size)
+        self.half_open_probes = half_open_probes
+        self.is_failure = is_failure
+        self.clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window_size)  # True: failed or slow
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0  # probe calls started since the circuit went half-open
+        self._probes_succeeded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._half_open_when_due()
+            return self._state
+
+    def allows(self) -> bool:
+        """Whether a call would go through now (without starting one)."""
+        with self._lock:
+            self._half_open_when_due()
+            return self._state == CLOSED or (
+                self._state == HALF_OPEN and self._probes < self.half_open_probes
+            )
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets calls through again (0 when it does now)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - self.clock())
+
+    def call(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:  # noqa: ANN401
+        """Result of function(*args, **kwargs), unless the circuit rejects the call."""
+        probe = self._start_call()
+        started = self.clock()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            failed = self.is_failure(e)
+            self._record(failed=failed, elapsed=self.clock() - started, probe=probe)
+            raise
+        self._record(failed=False, elapsed=self.clock() - started, probe=probe)
+        return result
+
+    async def call_async(
+        self,
+        function: Callable[..., Awaitable[T]],
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> T:
+        """Awaited result of function(*args, **kwargs), unless the circuit rejects the call."""
+        probe = self._start_call()
+        started = self.clock()
+        try:
+            result = await function(*args, **kwargs)
+        except Exception as e:
+            failed = self.is_failure(e)
+            self._record(failed=failed, elapsed=self.clock() - started, probe=probe)
+            raise
+        self._record(failed=False, elapsed=self.clock() - started, probe=probe)
+        return result
+
+    def reset(self) -> None:
+        """Close the circuit and forget the outcomes."""
+        with self._lock:
+            self._close()
+
+    def _start_call(self) -> bool:
+        """Let a call through (returns whether it is a probe), or raise CircuitOpenError."""
+        with self._lock:
+            self._half_open_when_due()
+            if self._state == CLOSED:
+                return False
+            if self._state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                metrics.incr("circuit.probe")
+                return True
+            retry_after = (
+                self._opened_at + self.open_seconds - self.clock()
+                if self._state == OPEN
+                else self.open_seconds  # probes in flight: their outcome is not known yet
+            )
+        metrics.incr("circuit.rejected")
+        exception_msg = "The database is unavailable, please retry"
+        raise CircuitOpenError(exception_msg, retry_after)
+
+    def _record(self, failed: bool, elapsed: float, probe: bool) -> None:  # noqa: FBT001
+        slow = not failed and elapsed >= self.slow_call_seconds
+        if failed:
+            metrics.incr("circuit.failure")
+        elif slow:
+            metrics.incr("circuit.slow")
+        with self._lock:
+            if probe:
+                if self._state != HALF_OPEN:
+                    return  # another probe already settled the circuit
+                if failed or slow:
+                    self._open()
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self._close()
+                return
+            if self._state != CLOSED:
+                return  # a call started before the circuit opened
+            self._outcomes.append(failed or slow)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and sum(self._outcomes) >= self.failure_rate * len(self._outcomes)
+            ):
+                self._open()
+
+    def _half_open_when_due(self) -> None:
+        if self._state == OPEN and self.clock() >= self._opened_at + self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = self._probes_succeeded = 0
+            metrics.incr("circuit.half_opened")
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+        metrics.incr("circuit.opened")
+
+    def _close(self) -> None:
+        if self._state != CLOSED:
+            metrics.incr("circuit.closed")
+        self._state = CLOSED
+        self._outcomes.clear()
+
+
+_circuit_breaker = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Container wide circuit breaker of the database (CIRCUIT_* settings)."""
+    global _circuit_breaker  # noqa: PLW0603
+    if _circuit_breaker is None:
+        from src.config import (  # noqa: PLC0415
+            CIRCUIT_FAILURE_RATE,
+            CIRCUIT_OPEN_SECONDS,
+            CIRCUIT_SLOW_CALL_MS,
+        )
+
+        _circuit_breaker = CircuitBreaker(
+            failure_rate=CIRCUIT_FAILURE_RATE,
+            slow_call_seconds=CIRCUIT_SLOW_CALL_MS / 1000,
+            open_seconds=CIRCUIT_OPEN_SECONDS,
+        )
+    return _circuit_breaker
@@ -0,0 +1,23 @@
+"""Concurrent Calls On Threads.
+
+Independent blocking calls (database queries on their own pooled connections, DynamoDB calls)
+are run on threads, so that the invocation waits for the slowest one instead of their sum.
+Every thread runs in a copy of the caller's context: context variables (e.g. the current user of
+the read-your-writes window, see src/lib/read_your_writes.py) are seen by the calls too.
+"""
+
+import contextvars
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def run_concurrently(calls: Sequence[Callable[[], T]]) -> list[T]:
+    """Results of calls, in order (the first error raised is raised once all calls are done)."""
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, call) for call in calls]
+    return [future.result() for future in futures]
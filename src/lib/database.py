@@ -15,3 +15,15 @@ def get_dynamodb_table_favorites_connexion():  # noqa
     dynamodb = boto3.resource("dynamodb")
     table_name = os.environ.get("DYNAMODB_TABLE_FAVORITES")
     return dynamodb.Table(table_name)
+
+
+def get_dynamodb_table_rate_limits_connexion():  # noqa
+    dynamodb = boto3.resource("dynamodb")
+    table_name = os.environ.get("DYNAMODB_TABLE_RATE_LIMITS")
+    return dynamodb.Table(table_name)
+
+
+def get_dynamodb_table_stale_responses_connexion():  # noqa
+    dynamodb = boto3.resource("dynamodb")
+    table_name = os.environ.get("DYNAMODB_TABLE_STALE_RESPONSES")
+    return dynamodb.Table(table_name)
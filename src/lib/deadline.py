@@ -0,0 +1,48 @@
+"""Invocation Deadline.
+
+The Lambda context tells how long the invocation may still run (get_remaining_time_in_millis).
+lambda_handler records the deadline at the start of every invocation, so that code deep in the
+call stack (the transactions retries, see src/db/transactions.py, the statements timeouts, see
+src/db/statement_deadline.py) can tell how much time is left without threading the context
+through every call.
+
+A container handles one invocation at a time: the deadline is process wide (not a context
+variable), so that threads of the invocation (shards fan-out, driver threads) see it too.
+Calls outside of an invocation (tests, scripts) have no deadline.
+"""
+
+import time
+from typing import Any
+
+_deadline: float | None = None
+_budget_deadline: float | None = None  # the deadline minus DEADLINE_RESERVE_MS
+
+
+class DeadlineExceededError(Exception):
+    """The invocation ran out of time for the database work (answered 503, see error_from)."""
+
+    status_code = 503
+    retry_after_seconds = 1
+
+
+def start_deadline(context: Any) -> None:  # noqa: ANN401
+    """Record the deadline of the invocation of a Lambda context (None: no deadline)."""
+    global _deadline, _budget_deadline  # noqa: PLW0603
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if get_remaining is None:
+        _deadline = _budget_deadline = None
+        return
+    from src.config import DEADLINE_RESERVE_MS  # noqa: PLC0415
+
+    _deadline = time.monotonic() + get_remaining() / 1000
+    _budget_deadline = _deadline - DEADLINE_RESERVE_MS / 1000
+
+
+def remaining_seconds() -> float | None:
+    """Time left before the deadline (negative once passed), None without deadline."""
+    return None if _deadline is None else _deadline - time.monotonic()
+
+
+def budget_seconds() -> float | None:
+    """Time left for database work: the time left minus DEADLINE_RESERVE_MS kept to answer."""
+    return None if _budget_deadline is None else _budget_deadline - time.monotonic()
@@ -0,0 +1,44 @@
+"""Feed Sort Keys.
+
+The public feed order (due_date ASC NULLS LAST, created_at ASC, id ASC) encoded as one string:
+"<due_date or ~>#<created_at>#<id>" with fixed width UTC dates. Comparing keys as strings
+compares the three columns in feed order, so that:
+- a page is a range read on a single string index (no NULLS LAST handling, no OR predicates)
+- a due date window is a key range: "<date>#..." keys sort after "<date>", and before "~"
+
+Used by the request_feed projection (SQL) and by the DynamoDB feed indexes.
+"""
+
+from datetime import UTC, datetime
+from uuid import UUID
+
+# Fixed width UTC dates: lexicographic order is chronological order
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+# Sorts after any date: requests without due date come last in the feed
+NO_DUE_DATE = "~"
+# Sorts after any id: a key ending with it is past every request of the same dates
+AFTER_ALL_IDS = "~"
+FEED_KEY_LENGTH = 100
+
+
+def format_date(value: datetime) -> str:
+    """Fixed width UTC string of a date (naive dates are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).strftime(DATE_FORMAT)
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, DATE_FORMAT).replace(tzinfo=UTC)
+
+
+def feed_key(due_date: datetime | None, created_at: datetime, request_id: UUID | str) -> str:
+    """Sort key of a request in the feed."""
+    due = format_date(due_date) if due_date else NO_DUE_DATE
+    return f"{due}#{format_date(created_at)}#{request_id}"
+
+
+def parse_feed_key(key: str) -> tuple[datetime | None, datetime, UUID]:
+    """(due_date, created_at, id) of a feed key."""
+    due, created, request_id = key.split("#")
+    return (None if due == NO_DUE_DATE else parse_date(due)), parse_date(created), UUID(request_id)
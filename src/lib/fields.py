@@ -0,0 +1,29 @@
+"""Sparse Fieldsets (fields= query parameter).
+
+Clients listing requests for a map only need a few fields: fields=id,type,title,meetup_latitude
+restricts the responses to them. The same names drive the columns the repositories load (see
+request_load_options), so that unrequested columns (e.g. 500 characters descriptions) are
+neither read, transferred nor encoded.
+"""
+
+from collections.abc import Sequence
+
+# fields=a,b,c: no more names than this
+MAX_FIELDS = 32
+
+
+def parse_fields(value: str | None, allowed: Sequence[str]) -> tuple[str, ...] | None:
+    """Requested fields, in allow-list order (None: no fields parameter, every field)."""
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",", MAX_FIELDS) if name.strip()}
+    if not requested:
+        exception_msg = "fields must list at least one field"
+        raise ValueError(exception_msg)
+    unknown = requested.difference(allowed)
+    if unknown:
+        exception_msg = (
+            f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(allowed)})"
+        )
+        raise ValueError(exception_msg)
+    return tuple(name for name in allowed if name in requested)
@@ -0,0 +1,142 @@
+"""Serialized Requests Fragment Cache.
+
+Responses listing requests used to run to_dict() + json.dumps for every request of every call,
+even when nothing changed. Requests are rendered once per (id, version) instead, and the response
+bodies are assembled by joining the cached JSON fragments.
+
+The version is a column of the request, incremented by every repository update: a request
+updated by another container is loaded with a new version and rendered again, so the cache never
+serves a stale rendering. Local writes also invalidate their entries right away (see the
+repositories), which only frees memory.
+
+Sparse renderings (fields=, see src/lib/fields.py) are not cached: render_request(s) serialize
+them directly.
+
+Metrics: fragment_cache.hit, fragment_cache.miss, fragment_cache.render_us (serialization time
+spent on misses) and fragment_cache.saved_us (serialization time saved by hits, at the average
+cost of a miss), per invocation.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from src.lib.metrics import metrics
+
+
+def request_version(request: Any) -> int:  # noqa: ANN401
+    # Requests written before versions existed have none
+    return request.version or 0
+
+
+class FragmentCache:
+    """LRU cache of rendered requests JSON, keyed by (id, version).
+
+    Only one version of a request is kept: caching a newer one drops the previous one.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[UUID, int], str] = OrderedDict()
+        self._versions: dict[UUID, int] = {}  # cached version of every request
+        self._lock = threading.Lock()
+        self._render_ns = 0
+        self._renders = 0
+
+    @property
+    def average_render_us(self) -> float:
+        return self._render_ns / self._renders / 1000 if self._renders else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def fragment(self, request: Any) -> str:  # noqa: ANN401
+        """JSON of request.to_dict(), rendered once per (id, version)."""
+        return self.fragments([request])[0]
+
+    def join(self, requests: list[Any]) -> str:
+        """JSON array of requests."""
+        return f"[{', '.join(self.fragments(requests))}]"
+
+    def fragments(self, requests: list[Any]) -> list[str]:
+        """Fragments of requests, in order (one lock round per lookup and store, not per item)."""
+        keys = [(request.id, request_version(request)) for request in requests]
+        with self._lock:
+            fragments = [self._entries.get(key) for key in keys]
+            for key, fragment in zip(keys, fragments, strict=True):
+                if fragment is not None:
+                    self._entries.move_to_end(key)
+        hits = sum(fragment is not None for fragment in fragments)
+        if hits:
+            metrics.incr("fragment_cache.hit", hits)
+            metrics.incr("fragment_cache.saved_us", hits * self.average_render_us)
+        if hits == len(requests):
+            return fragments
+
+        started = time.perf_counter_ns()
+        rendered = {}
+        for index, fragment in enumerate(fragments):
+            if fragment is None:
+                fragments[index] = rendered[keys[index]] = requests[index].to_json_fragment()
+        elapsed = time.perf_counter_ns() - started
+        metrics.incr("fragment_cache.miss", len(rendered))
+        metrics.incr("fragment_cache.render_us", elapsed / 1000)
+        if self.max_entries > 0:
+            self._store(rendered, elapsed)
+        return fragments
+
+    def _store(self, rendered: dict[tuple[UUID, int], str], elapsed_ns: int) -> None:
+        with self._lock:
+            self._render_ns += elapsed_ns
+            self._renders += len(rendered)
+            for (request_id, version), fragment in rendered.items():
+                previous = self._versions.get(request_id)
+                if previous is not None and previous != version:
+                    self._entries.pop((request_id, previous), None)
+                self._versions[request_id] = version
+                self._entries[request_id, version] = fragment
+            while len(self._entries) > self.max_entries:
+                (evicted_id, _), _ = self._entries.popitem(last=False)
+                del self._versions[evicted_id]
+
+    def invalidate(self, request_id: UUID) -> None:
+        """Drop the cached rendering of a request."""
+        with self._lock:
+            version = self._versions.pop(request_id, None)
+            if version is not None:
+                self._entries.pop((request_id, version), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+_fragment_cache = None
+
+
+def get_fragment_cache() -> FragmentCache:
+    """Container wide fragment cache (FRAGMENT_CACHE_SIZE entries, 0 disables it)."""
+    global _fragment_cache  # noqa: PLW0603
+    if _fragment_cache is None:
+        from src.config import FRAGMENT_CACHE_SIZE  # noqa: PLC0415
+
+        _fragment_cache = FragmentCache(FRAGMENT_CACHE_SIZE)
+    return _fragment_cache
+
+
+def render_request(request: Any, fields: tuple[str, ...] | None = None) -> str:  # noqa: ANN401
+    """JSON of a request response: its cached fragment, or its sparse fieldset."""
+    if fields is None:
+        return get_fragment_cache().fragment(request)
+    return json.dumps(request.to_dict(fields))
+
+
+def render_requests(requests: list[Any], fields: tuple[str, ...] | None = None) -> str:
+    """JSON array of requests responses (see render_request)."""
+    if fields is None:
+        return get_fragment_cache().join(requests)
+    return json.dumps([request.to_dict(fields) for request in requests])
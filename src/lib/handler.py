@@ -0,0 +1,57 @@
+"""Lambda Handlers Common Wrapper."""
+
+import asyncio
+import functools
+import inspect
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from src.config import LOG_INVOCATION_METRICS
+from src.lib.deadline import start_deadline
+from src.lib.metrics import metrics
+from src.lib.read_your_writes import bind_user, user_of
+from src.lib.warmup import is_warmup_event, warmup_response
+
+_event_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_async(coroutine: Coroutine) -> Any:  # noqa: ANN401
+    """Run a coroutine on the container event loop.
+
+    One loop is kept for the container lifetime (not asyncio.run, which creates and closes a loop
+    every time): pooled async connections are bound to the loop that opened them.
+    """
+    global _event_loop  # noqa: PLW0603
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop.run_until_complete(coroutine)
+
+
+def lambda_handler(handler: Callable) -> Callable:
+    """Wrap an API handler.
+
+    - keep-warm pings are answered immediately, without running any handler logic
+    - metrics are reset at the start of every invocation (per-invocation counters), and logged at
+      the end when LOG_INVOCATION_METRICS is enabled
+    - async handlers (async def) are run on the container event loop
+    - the caller is bound as the current user, for the read-your-writes window of the reads
+    - the invocation deadline is recorded from the context (see src/lib/deadline.py)
+    """
+
+    @functools.wraps(handler)
+    def wrapper(event, context):  # noqa: ANN001, ANN202
+        if is_warmup_event(event):
+            return warmup_response()
+        metrics.reset()
+        bind_user(user_of(event))
+        start_deadline(context)
+        try:
+            response = handler(event, context)
+            if inspect.isawaitable(response):
+                response = run_async(response)
+            return response
+        finally:
+            if LOG_INVOCATION_METRICS:
+                metrics.log()
+
+    return wrapper
@@ -0,0 +1,75 @@
+"""Identifiers Generation."""
+
+import os
+import threading
+import time
+import uuid
+
+_UUID7_LOCK = threading.Lock()
+_last_timestamp_ms = 0
+_last_counter = 0
+_COUNTER_MAX = 0xFFF  # 12 bits of rand_a
+# Regional shard index (see src/db/shards.py): the 8 upper bits of rand_b
+SHARD_BITS = 8
+MAX_SHARDS = 1 << SHARD_BITS
+_SHARD_SHIFT = 62 - SHARD_BITS
+
+
+def uuid7(shard: int | None = None) -> uuid.UUID:
+    """Generate a time-ordered UUID (version 7, RFC 9562).
+
+    Layout: 48 bits unix timestamp (ms) | version (7) | 12 bits counter | variant | 62 random bits.
+    The 12 bits after the version are a counter, randomly seeded every millisecond and incremented
+    within the same millisecond, so ids generated by one container are strictly increasing.
+
+    New rows get ids increasing with time: inserts land at the end of the primary key index
+    instead of at random positions, and ids can serve as a creation order tiebreaker.
+
+    With a shard, the id carries it in place of random bits (see uuid7_shard): 54 random bits are
+    left, the ordering is unchanged.
+    """
+    global _last_timestamp_ms, _last_counter  # noqa: PLW0603
+    random_bits = int.from_bytes(os.urandom(10), "big")
+    if shard is not None:
+        if not 0 <= shard < MAX_SHARDS:
+            exception_msg = f"shard must be between 0 and {MAX_SHARDS - 1}"
+            raise ValueError(exception_msg)
+        random_bits = random_bits & ~((MAX_SHARDS - 1) << _SHARD_SHIFT) | shard << _SHARD_SHIFT
+    with _UUID7_LOCK:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _last_timestamp_ms:
+            # Seed the counter in the lower half so that it rarely overflows within one ms
+            counter = random_bits >> 69  # 11 random bits
+        else:
+            timestamp_ms = _last_timestamp_ms
+            counter = _last_counter + 1
+            if counter > _COUNTER_MAX:  # counter exhausted: borrow the next millisecond
+                timestamp_ms += 1
+                counter = random_bits >> 69
+        _last_timestamp_ms, _last_counter = timestamp_ms, counter
+
+    return _build_uuid7(timestamp_ms, counter, random_bits)
+
+
+def _build_uuid7(timestamp_ms: int, rand_a: int, rand_b: int) -> uuid.UUID:
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= (rand_a & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= rand_b & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
+
+def uuid7_at(timestamp_ms: int, random_bits: int) -> uuid.UUID:
+    """Build a UUIDv7 for a given time from caller provided random bits (e.g. seeded data)."""
+    return _build_uuid7(timestamp_ms, random_bits >> 62, random_bits)
+
+
+def uuid7_timestamp_ms(value: uuid.UUID) -> int:
+    """Unix timestamp (ms) embedded in a UUIDv7."""
+    return value.int >> 80
+
+
+def uuid7_shard(value: uuid.UUID) -> int:
+    """Shard index carried by a UUIDv7 generated with one (random for the others)."""
+    return (value.int >> _SHARD_SHIFT) & (MAX_SHARDS - 1)
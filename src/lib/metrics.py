@@ -0,0 +1,46 @@
+"""In-Container Metrics.
+
+Simple process wide counters, used to observe what the hot paths actually do (cache hits, round
+trips, retries, ...) in tests, benchmarks and logs. A Lambda container handles one invocation at
+a time, so counters can be reset at the start of an invocation to get per-invocation values.
+"""
+
+import json
+import sys
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """Named counters."""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment counter name by value."""
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> float:
+        """Return the current value of a counter (0 if never incremented)."""
+        return self._counters.get(name, 0)
+
+    def snapshot(self, prefix: str = "") -> dict[str, float]:
+        """Return a copy of all counters, optionally only those starting with prefix."""
+        with self._lock:
+            return {k: v for k, v in self._counters.items() if k.startswith(prefix)}
+
+    def reset(self, prefix: str = "") -> None:
+        """Reset all counters, optionally only those starting with prefix."""
+        with self._lock:
+            for name in [k for k in self._counters if k.startswith(prefix)]:
+                del self._counters[name]
+
+    def log(self, prefix: str = "") -> None:
+        """Write counters as one JSON line to stdout (picked up by CloudWatch Logs)."""
+        sys.stdout.write(json.dumps({"metrics": self.snapshot(prefix)}) + "\n")
+
+
+metrics = Metrics()
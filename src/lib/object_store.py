@@ -0,0 +1,73 @@
+"""Object Storage (S3 compatible) Clients."""
+
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+
+class ObjectStore(ABC):
+    """Minimal object storage interface (the subset of S3 the application needs)."""
+
+    @abstractmethod
+    def put_object(self, key: str, body: bytes, content_type: str | None = None) -> None:
+        """Store body under key (overwrites)."""
+
+    @abstractmethod
+    def get_object(self, key: str) -> bytes | None:
+        """Return the object stored under key, None if it does not exist."""
+
+    def put_json(self, key: str, data: dict[str, Any]) -> None:
+        """Store a JSON document."""
+        self.put_object(key, json.dumps(data).encode(), content_type="application/json")
+
+    def get_json(self, key: str) -> dict[str, Any] | None:
+        """Load a JSON document, None if it does not exist."""
+        body = self.get_object(key)
+        return json.loads(body) if body is not None else None
+
+
+class S3ObjectStore(ObjectStore):
+    """Amazon S3 (or any S3 compatible endpoint) bucket."""
+
+    def __init__(self, bucket: str, client: Any = None) -> None:  # noqa: ANN401
+        if client is None:
+            import boto3  # noqa: PLC0415 # only loaded by the functions that need it
+
+            client = boto3.client("s3")
+        self.bucket = bucket
+        self.client = client
+
+    def put_object(self, key: str, body: bytes, content_type: str | None = None) -> None:
+        extra = {"ContentType": content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=body, **extra)
+
+    def get_object(self, key: str) -> bytes | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read()
+
+
+class LocalObjectStore(ObjectStore):
+    """Local directory stand-in for S3 (local runs and tests)."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            exception_msg = f"Invalid object key: {key}"
+            raise ValueError(exception_msg)
+        return path
+
+    def put_object(self, key: str, body: bytes, content_type: str | None = None) -> None:  # noqa: ARG002
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+
+    def get_object(self, key: str) -> bytes | None:
+        path = self._path(key)
+        return path.read_bytes() if path.exists() else None
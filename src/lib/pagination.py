@@ -0,0 +1,53 @@
+"""Newest First Pages.
+
+A user's own requests and favorites are listed newest first, by (created_at DESC, id DESC): the
+id tiebreaker keeps items sharing a creation date from being skipped or repeated across pages.
+Cursors are the keyset position of the last item of a page (base64 JSON, like the feed cursors).
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+from uuid import UUID
+
+T = TypeVar("T")
+
+
+def encode_recency_cursor(created_at: datetime, item_id: UUID) -> str:
+    cursor_json = json.dumps({"created_at": created_at.isoformat(), "id": str(item_id)})
+    return base64.b64encode(cursor_json.encode()).decode()
+
+
+def decode_recency_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        cursor_data = json.loads(base64.b64decode(cursor.encode()).decode())
+        return datetime.fromisoformat(cursor_data["created_at"]), UUID(cursor_data["id"])
+    except (ValueError, KeyError, TypeError, json.JSONDecodeError) as e:
+        exception_msg = "Invalid cursor"
+        raise ValueError(exception_msg) from e
+
+
+def recency_page(items: Sequence[T], limit: int) -> tuple[list[T], dict[str, Any]]:
+    """Page of the first limit items of limit + 1 fetched ones, and its pagination."""
+    has_more = len(items) > limit
+    page = list(items[:limit])
+    next_cursor = None
+    if has_more and page:
+        next_cursor = encode_recency_cursor(page[-1].created_at, page[-1].id)
+    return page, {"next_cursor": next_cursor, "has_more": has_more, "limit": limit}
+
+
+def newest_first(
+    items: Sequence[T],
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[T], dict[str, Any]]:
+    """Page of items sorted in memory (backends without a keyset query, e.g. DynamoDB)."""
+    ordered = sorted(items, key=lambda item: (item.created_at, str(item.id)), reverse=True)
+    if cursor:
+        created_at, item_id = decode_recency_cursor(cursor)
+        position = (created_at, str(item_id))
+        ordered = [item for item in ordered if (item.created_at, str(item.id)) < position]
+    return recency_page(ordered, limit)
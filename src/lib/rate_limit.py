@@ -0,0 +1,281 @@
+"""Per-User Rate Limiting (Token Buckets).
+
+HTTP API only offers global throttling, so per-user limits are enforced in Lambda: one token
+bucket per (route, Cognito sub), with capacity and refill rate configured per route.
+
+The buckets live in a shared store (DynamoDB, or in memory for local runs and tests), but checking
+the shared store on every call would add a round trip to every request. Instead each container
+keeps a local bucket per (route, user) that leases a few tokens at a time from the shared bucket:
+- most checks are served from the local lease, without any round trip
+- when the shared bucket is empty the rejection is remembered locally until tokens are expected
+  back, so an abusive client is rejected without reaching DynamoDB (nor the database)
+
+Leased tokens not used by a container are lost for the others, so leases are kept small compared
+to the bucket capacity (1/10th by default): the limit can be under-granted, never over-granted.
+
+The shared store is called outside of the local buckets lock (other users' checks never wait on
+a round trip), and a failing store lets the call through: the limiter fails open rather than
+failing every limited route.
+
+Metrics: rate_limit.local (served from the local lease), rate_limit.store (shared store
+round trip), rate_limit.store_error (failed round trip, call allowed), rate_limit.rejected.
+"""
+
+import functools
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from src.lib.metrics import metrics
+from src.lib.responses import error
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket parameters: burst of capacity calls, refilled at capacity per period."""
+
+    capacity: int
+    period_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+    @property
+    def lease_size(self) -> int:
+        """Tokens moved from the shared bucket to a local bucket at once."""
+        return max(1, self.capacity // 10)
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse "<capacity>/<period_seconds>", e.g. "10/60" for 10 calls per minute."""
+        try:
+            capacity, period = value.split("/")
+            rate_limit = cls(int(capacity), float(period))
+        except ValueError as e:
+            exception_msg = f"Invalid rate limit: {value} (expected <capacity>/<period_seconds>)"
+            raise ValueError(exception_msg) from e
+        if rate_limit.capacity < 1 or rate_limit.period_seconds <= 0:
+            exception_msg = f"Invalid rate limit: {value} (capacity and period must be positive)"
+            raise ValueError(exception_msg)
+        return rate_limit
+
+
+@dataclass(frozen=True)
+class Grant:
+    """Outcome of a shared store acquisition."""
+
+    tokens: int  # granted tokens, 0 when the bucket is empty
+    retry_after: float = 0.0  # seconds until the next token, when nothing was granted
+
+
+def _refill(tokens: float, updated_at: float, now: float, rate_limit: RateLimit) -> float:
+    elapsed = max(0.0, now - updated_at)
+    return min(float(rate_limit.capacity), tokens + elapsed * rate_limit.refill_per_second)
+
+
+def _take(available: float, requested: int, rate_limit: RateLimit) -> tuple[int, float, float]:
+    """Return (granted tokens, tokens left, retry after) for a refilled bucket."""
+    granted = min(requested, int(available))
+    if granted:
+        return granted, available - granted, 0.0
+    return 0, available, (1 - available) / rate_limit.refill_per_second
+
+
+class RateLimitStore(ABC):
+    """Shared token buckets."""
+
+    @abstractmethod
+    def acquire(self, key: str, rate_limit: RateLimit, requested: int, now: float) -> Grant:
+        """Take up to requested tokens (at least one, or none) from the bucket key."""
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Process local buckets (local runs and tests)."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate_limit: RateLimit, requested: int, now: float) -> Grant:
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(rate_limit.capacity), now))
+            available = _refill(tokens, updated_at, now, rate_limit)
+            granted, left, retry_after = _take(available, requested, rate_limit)
+            self._buckets[key] = (left, now)
+        return Grant(granted, retry_after)
+
+
+class DynamoDBRateLimitStore(RateLimitStore):
+    """Buckets stored as DynamoDB items {pk, tokens, updated_at, expires_at}.
+
+    Read then conditional write on updated_at (optimistic concurrency): concurrent containers
+    draining the same bucket retry on conflict instead of granting the same tokens twice.
+    expires_at can be used as the table TTL attribute: a bucket left alone long enough to be full
+    again carries no information.
+    """
+
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, table: Any) -> None:  # noqa: ANN401
+        self.table = table
+
+    def acquire(self, key: str, rate_limit: RateLimit, requested: int, now: float) -> Grant:
+        for _ in range(self.MAX_ATTEMPTS):
+            item = self.table.get_item(Key={"pk": key}, ConsistentRead=True).get("Item")
+            if item:
+                previous = item["updated_at"]
+                available = _refill(float(item["tokens"]), float(previous), now, rate_limit)
+                condition: dict[str, Any] = {
+                    "ConditionExpression": "updated_at = :previous",
+                    "ExpressionAttributeValues": {":previous": previous},
+                }
+            else:
+                available = float(rate_limit.capacity)
+                condition = {"ConditionExpression": "attribute_not_exists(pk)"}
+            granted, left, retry_after = _take(available, requested, rate_limit)
+            try:
+                self.table.put_item(
+                    Item={
+                        "pk": key,
+                        "tokens": Decimal(str(round(left, 6))),
+                        "updated_at": Decimal(str(round(now, 6))),
+                        "expires_at": int(now + rate_limit.period_seconds) + 1,
+                    },
+                    **condition,
+                )
+            except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+                continue  # another container updated the bucket in between, read it again
+            return Grant(granted, retry_after)
+        exception_msg = f"Rate limit bucket {key} is too contended"
+        raise RuntimeError(exception_msg)
+
+
+@dataclass
+class _LocalBucket:
+    tokens: int = 0  # leased from the shared bucket, not used yet
+    rejected_until: float = 0.0
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class RateLimiter:
+    """Token buckets per (route, user), checked locally first then against the shared store."""
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        limits: dict[str, RateLimit],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.limits = limits
+        self.clock = clock
+        self._local: dict[str, _LocalBucket] = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, route: str) -> RateLimit | None:
+        """Rate limit of a route (falls back on the "default" one, None if there is neither)."""
+        return self.limits.get(route, self.limits.get("default"))
+
+    def check(self, route: str, user_id: str) -> RateLimitDecision:
+        """Consume one token of the (route, user) bucket."""
+        rate_limit = self.limit_for(route)
+        if rate_limit is None:
+            return RateLimitDecision(allowed=True)
+        key = f"{route}#{user_id}"
+        now = self.clock()
+        with self._lock:
+            local = self._local.setdefault(key, _LocalBucket())
+            if local.tokens > 0:
+                local.tokens -= 1
+                metrics.incr("rate_limit.local")
+                return RateLimitDecision(allowed=True)
+            if now < local.rejected_until:
+                metrics.incr("rate_limit.local")
+                metrics.incr("rate_limit.rejected")
+                return RateLimitDecision(allowed=False, retry_after=local.rejected_until - now)
+
+        metrics.incr("rate_limit.store")
+        try:
+            grant = self.store.acquire(key, rate_limit, rate_limit.lease_size, now)
+        except Exception:  # noqa: BLE001 # fail open: the limiter must never fail the call
+            metrics.incr("rate_limit.store_error")
+            return RateLimitDecision(allowed=True)
+        with self._lock:
+            if not grant.tokens:
+                local.rejected_until = max(local.rejected_until, now + grant.retry_after)
+                metrics.incr("rate_limit.rejected")
+                return RateLimitDecision(allowed=False, retry_after=grant.retry_after)
+            # Added: concurrent checks of the same bucket may each have leased tokens
+            local.tokens += grant.tokens - 1
+            return RateLimitDecision(allowed=True)
+
+    def clear(self) -> None:
+        """Drop the local buckets (leased tokens are lost)."""
+        with self._lock:
+            self._local.clear()
+
+
+def parse_rate_limits(value: str) -> dict[str, RateLimit]:
+    """Parse a JSON object of route -> "<capacity>/<period_seconds>"."""
+    return {route: RateLimit.parse(spec) for route, spec in json.loads(value).items()}
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Container wide rate limiter (DynamoDB store if a table is configured, else in memory)."""
+    global _rate_limiter  # noqa: PLW0603
+    if _rate_limiter is None:
+        from src.config import DYNAMODB_TABLE_RATE_LIMITS, RATE_LIMITS  # noqa: PLC0415
+
+        if DYNAMODB_TABLE_RATE_LIMITS:
+            from src.lib.database import get_dynamodb_table_rate_limits_connexion  # noqa: PLC0415
+
+            store = DynamoDBRateLimitStore(get_dynamodb_table_rate_limits_connexion())
+        else:
+            store = InMemoryRateLimitStore()
+        _rate_limiter = RateLimiter(store, parse_rate_limits(RATE_LIMITS))
+    return _rate_limiter
+
+
+def rate_limited(route: str) -> Callable:
+    """Reject calls over the route per-user limit with 429 Too Many Requests.
+
+    Users are identified by the Cognito sub of the JWT authorizer claims, anonymous calls are
+    not limited here (public routes only have the API Gateway global throttling).
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(event, context):  # noqa: ANN001, ANN202
+            try:
+                user_id = event["requestContext"]["authorizer"]["jwt"]["claims"]["sub"]
+            except (KeyError, TypeError):
+                return handler(event, context)
+            decision = get_rate_limiter().check(route, user_id)
+            if not decision.allowed:
+                retry_after = max(1, int(decision.retry_after + 0.999))
+                return error(
+                    "Rate limit exceeded",
+                    status_code=429,
+                    extra_headers={"Retry-After": str(retry_after)},
+                )
+            return handler(event, context)
+
+        return wrapper
+
+    return decorator
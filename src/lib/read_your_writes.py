@@ -0,0 +1,88 @@
+"""Read-Your-Writes Window.
+
+With a read engine (DATABASE_READ_URL, see src/db/session.py), reads may lag behind the writer
+(replica lag, or a read only endpoint). A user who just created, updated or deleted something
+expects to see it on the next call: for READ_YOUR_WRITES_SECONDS after a write, the reads of that
+user are sent to the writer.
+
+The user of the current invocation is bound by lambda_handler (JWT authorizer claims). Anonymous
+calls never write, their reads always go to the reader.
+
+NOTE: Writes are remembered per container: a user's next call served by another container reads
+from the reader (the window only covers calls landing on a warm container that wrote).
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+_current_user: ContextVar[str | None] = ContextVar("current_user", default=None)
+
+
+def user_of(event: Any) -> str | None:  # noqa: ANN401
+    """Cognito sub of an API Gateway event, None for anonymous calls."""
+    try:
+        return event["requestContext"]["authorizer"]["jwt"]["claims"]["sub"]
+    except (KeyError, TypeError):
+        return None
+
+
+def bind_user(user_id: str | None) -> None:
+    """Set the user of the current invocation."""
+    _current_user.set(user_id)
+
+
+def current_user() -> str | None:
+    return _current_user.get()
+
+
+class ReadYourWrites:
+    """Last write time per user, kept for the window only."""
+
+    def __init__(self, window_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self._last_writes: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record_write(self) -> None:
+        """Open the window of the current user."""
+        user_id = current_user()
+        if user_id is None or self.window_seconds <= 0:
+            return
+        now = self.clock()
+        with self._lock:
+            self._last_writes[user_id] = now
+            # Bounded by the users who wrote within the window
+            expired = [
+                user for user, at in self._last_writes.items() if now - at >= self.window_seconds
+            ]
+            for user in expired:
+                del self._last_writes[user]
+
+    def reads_from_writer(self) -> bool:
+        """Whether the current user wrote within the window."""
+        user_id = current_user()
+        if user_id is None:
+            return False
+        written_at = self._last_writes.get(user_id)
+        return written_at is not None and self.clock() - written_at < self.window_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last_writes.clear()
+
+
+_read_your_writes = None
+
+
+def get_read_your_writes() -> ReadYourWrites:
+    """Container wide window (READ_YOUR_WRITES_SECONDS)."""
+    global _read_your_writes  # noqa: PLW0603
+    if _read_your_writes is None:
+        from src.config import READ_YOUR_WRITES_SECONDS  # noqa: PLC0415
+
+        _read_your_writes = ReadYourWrites(READ_YOUR_WRITES_SECONDS)
+    return _read_your_writes
@@ -0,0 +1,130 @@
+"""Feed Facets Counters.
+
+GET /v0/requests/stats answers from counters maintained by the repositories writes, never from
+COUNT(*) over the requests. Every request counts once under each of its keys:
+- "total"
+- "type:<request type>"
+- "due:<YYYY-MM-DD>" (UTC day of its due date) or "due:none"
+
+Due date buckets relative to now (today, this week) are sums of day keys: counters never need
+to be moved as time passes. Day keys only matter until their day is over, they expire then: the
+writes skip them and the reconciliation removes them.
+
+Each key is split in REQUEST_COUNTER_SHARDS counters (rows / items), a write increments one of
+them at random and a read sums them all: concurrent creations rarely update the same counter,
+which avoids the optimistic concurrency conflicts a single hot row gets on Aurora DSQL.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from src.schemas.request import RequestType
+
+COUNTER_KEY_LENGTH = 32
+TOTAL_KEY = "total"
+NO_DUE_DATE_KEY = "due:none"
+# Days of the "this_week" bucket, today included
+WEEK_DAYS = 7
+
+
+def type_key(request_type: RequestType) -> str:
+    return f"type:{request_type.value}"
+
+
+def due_key(day: date) -> str:
+    return f"due:{day.isoformat()}"
+
+
+def utc_today() -> date:
+    return datetime.now(UTC).date()
+
+
+def due_day(due_date: datetime) -> date:
+    """UTC day of a due date (naive dates are taken as UTC)."""
+    if due_date.tzinfo is None:
+        return due_date.date()
+    return due_date.astimezone(UTC).date()
+
+
+def is_expired(key: str, today: date | None = None) -> bool:
+    """Whether a key is the one of a day already over."""
+    return key.startswith("due:") and key != NO_DUE_DATE_KEY and key < due_key(today or utc_today())
+
+
+def counter_keys(
+    request_type: RequestType,
+    due_date: datetime | None,
+    today: date | None = None,
+) -> list[str]:
+    """Counter keys of a request (the day key is left out once expired)."""
+    keys = [TOTAL_KEY, type_key(request_type)]
+    if due_date is None:
+        keys.append(NO_DUE_DATE_KEY)
+    elif (day := due_day(due_date)) >= (today or utc_today()):
+        keys.append(due_key(day))
+    return keys
+
+
+def counter_shard() -> int:
+    """Counter shard written by the current increment."""
+    from src.config import REQUEST_COUNTER_SHARDS  # noqa: PLC0415
+
+    return random.randrange(max(REQUEST_COUNTER_SHARDS, 1))  # noqa: S311 # not used for security
+
+
+def stats_keys(today: date | None = None) -> list[str]:
+    """Counter keys read to answer the stats."""
+    today = today or utc_today()
+    return [
+        TOTAL_KEY,
+        *(type_key(request_type) for request_type in RequestType),
+        NO_DUE_DATE_KEY,
+        *(due_key(today + timedelta(days=offset)) for offset in range(WEEK_DAYS)),
+    ]
+
+
+def stats_from_counts(counts: dict[str, int], today: date | None = None) -> dict[str, Any]:
+    """Stats response of the counters sums (missing keys count 0).
+
+    Requests overdue (due before today) only count in total and by_type.
+    """
+    today = today or utc_today()
+    week = [counts.get(due_key(today + timedelta(days=offset)), 0) for offset in range(WEEK_DAYS)]
+    return {
+        "total": counts.get(TOTAL_KEY, 0),
+        "by_type": {
+            request_type.value: counts.get(type_key(request_type), 0)
+            for request_type in RequestType
+        },
+        "by_due_date": {
+            "today": week[0],
+            "this_week": sum(week),
+            "no_date": counts.get(NO_DUE_DATE_KEY, 0),
+        },
+        "as_of": today.isoformat(),
+    }
+
+
+@dataclass
+class CounterReconcileReport:
+    """Outcome of a counters reconciliation."""
+
+    keys: int = 0  # keys expected or found
+    corrected: int = 0  # keys whose sum differed from the requests
+    expired: int = 0  # day keys removed
+
+
+def counter_corrections(
+    expected: dict[str, int],
+    current: dict[str, int],
+    today: date | None = None,
+) -> dict[str, int]:
+    """Increments bringing the current counters sums to the expected ones (expired keys aside)."""
+    corrections = {}
+    for key in expected.keys() | current.keys():
+        delta = expected.get(key, 0) - current.get(key, 0)
+        if delta and not is_expired(key, today):
+            corrections[key] = delta
+    return dict(sorted(corrections.items()))
@@ -17,13 +17,41 @@ def success(
     }
 
 
+def success_json(
+    body: str,
+    extra_headers: dict[str, str] | None = None,
+    status_code: int = 200,
+) -> dict[str, Any]:
+    """Wrap an already serialized JSON body."""
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", **(extra_headers or {})},
+        "body": body,
+    }
+
+
 def error(
-    message: dict[str, Any],
+    message: str | dict[str, Any],
     status_code: int = 400,
+    extra_headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """Wrap error object."""
     return {
         "statusCode": status_code,
-        "headers": {"Content-Type": "application/json"},
+        "headers": {"Content-Type": "application/json", **(extra_headers or {})},
         "body": json.dumps({"error": message}),
     }
+
+
+def error_from(exception: Exception) -> dict[str, Any]:
+    """Error response of an exception raised while handling a call.
+
+    400 unless the exception tells otherwise: a status_code attribute, and a retry_after_seconds
+    one for errors worth retrying (e.g. TransactionConflictError).
+    """
+    retry_after = getattr(exception, "retry_after_seconds", None)
+    return error(
+        str(exception),
+        status_code=getattr(exception, "status_code", 400),
+        extra_headers={"Retry-After": str(retry_after)} if retry_after is not None else None,
+    )
@@ -0,0 +1,68 @@
+"""Search Text Tokenization.
+
+Shared by the search index maintenance (what is stored) and the search queries (what is looked
+up), so both sides always agree on tokens:
+- lower cased, accents removed (e.g. "Café" and "cafe" match)
+- split on anything that is not a letter or a digit
+- tokens shorter than 2 characters and common stop words (English / French) are dropped
+- tokens are truncated to MAX_TOKEN_LENGTH characters
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+MAX_TOKEN_LENGTH = 32
+# Search queries are AND queries over at most this many distinct tokens
+MAX_QUERY_TOKENS = 8
+# Title words weigh more than description words in the ranking
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+# Max stored weight per (token, request), keeps a word repeated many times from dominating
+MAX_TOKEN_WEIGHT = 20
+
+_WORD_RE = re.compile(r"\w+")
+_STOP_WORDS = frozenset(
+    # English
+    "a an and are as at be by for from has have in is it its my of on or that the this to was "
+    "with need needs i me you your we our please "
+    # French
+    "au aux avec ce ces dans de des du en est et il je la le les leur ma mes mon ne nous on ou "
+    "par pas pour qui sa se ses son sur un une vous".split(),
+)
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into normalized search tokens (in order, duplicates kept)."""
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text.casefold())
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+    tokens = []
+    for word in _WORD_RE.findall(normalized):
+        token = word.replace("_", "")[:MAX_TOKEN_LENGTH]
+        if len(token) >= 2 and token not in _STOP_WORDS:  # noqa: PLR2004
+            tokens.append(token)
+    return tokens
+
+
+def token_weights(title: str | None, description: str | None) -> dict[str, int]:
+    """Weight of every distinct token of a request (what the search index stores)."""
+    weights: Counter[str] = Counter()
+    for token in tokenize(title):
+        weights[token] += TITLE_WEIGHT
+    for token in tokenize(description):
+        weights[token] += DESCRIPTION_WEIGHT
+    return {token: min(weight, MAX_TOKEN_WEIGHT) for token, weight in weights.items()}
+
+
+def query_tokens(query: str, max_tokens: int = MAX_QUERY_TOKENS) -> list[str]:
+    """Distinct tokens of a search query, in order."""
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        exception_msg = "Search query must contain at least one word of 2 characters or more"
+        raise ValueError(exception_msg)
+    if len(tokens) > max_tokens:
+        exception_msg = f"Search query can contain at most {max_tokens} words"
+        raise ValueError(exception_msg)
+    return tokens
@@ -0,0 +1,282 @@
+"""Stale Responses And Load Shedding Of The Read Endpoints.
+
+While the database is unavailable (its circuit is open, or it failed the call, see
+src/lib/circuit_breaker.py), the read endpoints used to answer errors, although most of what they
+serve changes slowly. They answer with their last known good response instead, marked stale:
+- every 200 response of a read endpoint is kept, per (route, caller, path and query parameters):
+  the reads of a user are never served to another one
+- while the circuit is open, the calls are answered from there without running the handler, the
+  half-open probes revalidate the database in the meantime (stale-while-revalidate)
+- calls failing with a 5xx are answered from there as well
+
+Stale responses carry the headers Warning: 110 - "Response is Stale" and Age (seconds since the
+response was produced). Without any stale response the call is answered 503 with Retry-After.
+
+Low priority reads (search, stats, ...) are shed while the circuit does not let calls through:
+answered 503 right away, neither running the handler nor serving stale responses, which keeps the
+probes and the stale responses for the calls that matter.
+
+Responses are kept per container (STALE_CACHE_SIZE entries, LRU), and shared through DynamoDB
+when a table is configured (DYNAMODB_TABLE_STALE_RESPONSES): a container that never served a route
+can still answer it stale. Writing every response to the table would add a round trip to most
+reads (keys are per caller and parameters, they rarely repeat), so a container shares at most one
+response per route every share_interval_seconds, whatever the number of keys: the other ones are
+only kept per container. The table is only read when the container has no stale response of its
+own.
+
+Metrics: stale.stored, stale.served, stale.miss, stale.shared_write, stale.shared_read,
+stale.shared_error, degraded.shed.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from src.lib.circuit_breaker import get_circuit_breaker
+from src.lib.metrics import metrics
+from src.lib.read_your_writes import user_of
+from src.lib.responses import error
+
+STALE_WARNING = '110 - "Response is Stale"'
+# DynamoDB items are limited to 400 KB: bigger responses are only kept per container
+MAX_SHARED_BODY_BYTES = 350_000
+
+
+@dataclass(frozen=True)
+class StaleResponse:
+    """A good response kept to be served stale."""
+
+    body: str
+    headers: dict[str, str]
+    stored_at: float  # epoch seconds
+
+
+class StaleResponseStore(ABC):
+    """Stale responses shared between containers."""
+
+    @abstractmethod
+    def get(self, key: str) -> StaleResponse | None:
+        """Response stored under key, if any."""
+
+    @abstractmethod
+    def put(self, key: str, response: StaleResponse, expires_at: float) -> None:
+        """Store a response under key, until expires_at (epoch seconds)."""
+
+
+class InMemoryStaleResponseStore(StaleResponseStore):
+    """Process local store (local runs and tests)."""
+
+    def __init__(self) -> None:
+        self._responses: dict[str, StaleResponse] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> StaleResponse | None:
+        with self._lock:
+            return self._responses.get(key)
+
+    def put(self, key: str, response: StaleResponse, expires_at: float) -> None:  # noqa: ARG002
+        with self._lock:
+            self._responses[key] = response
+
+
+class DynamoDBStaleResponseStore(StaleResponseStore):
+    """Responses stored as DynamoDB items {pk, body, headers, stored_at, expires_at}.
+
+    expires_at can be used as the table TTL attribute: older responses are never served.
+    """
+
+    def __init__(self, table: Any) -> None:  # noqa: ANN401
+        self.table = table
+
+    def get(self, key: str) -> StaleResponse | None:
+        item = self.table.get_item(Key={"pk": key}).get("Item")
+        if not item:
+            return None
+        return StaleResponse(item["body"], json.loads(item["headers"]), float(item["stored_at"]))
+
+    def put(self, key: str, response: StaleResponse, expires_at: float) -> None:
+        self.table.put_item(
+            Item={
+                "pk": key,
+                "body": response.body,
+                "headers": json.dumps(response.headers),
+                "stored_at": Decimal(str(round(response.stored_at, 3))),
+                "expires_at": math.ceil(expires_at),
+            },
+        )
+
+
+class StaleResponseCache:
+    """Last good responses, kept per container (LRU) in front of an optional shared store."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        max_entries: int = 1000,
+        max_age_seconds: float = 3600,
+        store: StaleResponseStore | None = None,
+        share_interval_seconds: float = 60,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.store = store
+        self.share_interval_seconds = share_interval_seconds
+        self.clock = clock
+        self._entries: OrderedDict[str, StaleResponse] = OrderedDict()
+        self._shared_at: dict[str, float] = {}  # last time a route wrote to the store
+        self._lock = threading.Lock()
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        """Keep a good response (a handler response dict), shared if its route may write."""
+        now = self.clock()
+        stale = StaleResponse(response["body"], dict(response.get("headers") or {}), now)
+        route = key.partition("#")[0]  # see response_key
+        with self._lock:
+            self._entries[key] = stale
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            share = (
+                self.store is not None
+                and len(stale.body) <= MAX_SHARED_BODY_BYTES
+                and now - self._shared_at.get(route, -math.inf) >= self.share_interval_seconds
+            )
+            if share:
+                self._shared_at[route] = now
+        metrics.incr("stale.stored")
+        if share:
+            try:
+                self.store.put(key, stale, now + self.max_age_seconds)
+                metrics.incr("stale.shared_write")
+            except Exception:  # noqa: BLE001 # keeping a response must never fail the call
+                metrics.incr("stale.shared_error")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Kept response of key, marked stale (None if there is none, or it is too old)."""
+        now = self.clock()
+        with self._lock:
+            stale = self._entries.get(key)
+        if stale is None and self.store is not None:
+            try:
+                stale = self.store.get(key)
+                metrics.incr("stale.shared_read")
+            except Exception:  # noqa: BLE001 # the caller answers 503 instead
+                metrics.incr("stale.shared_error")
+        if stale is None or now - stale.stored_at > self.max_age_seconds:
+            metrics.incr("stale.miss")
+            return None
+        metrics.incr("stale.served")
+        age = max(0, int(now - stale.stored_at))
+        return {
+            "statusCode": 200,
+            "headers": {**stale.headers, "Warning": STALE_WARNING, "Age": str(age)},
+            "body": stale.body,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._shared_at.clear()
+
+
+_stale_response_cache = None
+
+
+def get_stale_response_cache() -> StaleResponseCache:
+    """Container wide stale responses (shared through DynamoDB if a table is configured)."""
+    global _stale_response_cache  # noqa: PLW0603
+    if _stale_response_cache is None:
+        from src.config import (  # noqa: PLC0415
+            DYNAMODB_TABLE_STALE_RESPONSES,
+            STALE_CACHE_SIZE,
+            STALE_MAX_AGE_SECONDS,
+        )
+
+        store = None
+        if DYNAMODB_TABLE_STALE_RESPONSES:
+            from src.lib.database import get_dynamodb_table_stale_responses_connexion  # noqa: PLC0415
+
+            store = DynamoDBStaleResponseStore(get_dynamodb_table_stale_responses_connexion())
+        _stale_response_cache = StaleResponseCache(STALE_CACHE_SIZE, STALE_MAX_AGE_SECONDS, store)
+    return _stale_response_cache
+
+
+def response_key(route: str, event: dict) -> str:
+    """Key of the response of a call: its route, caller, path and query parameters."""
+    parameters = json.dumps(
+        [
+            user_of(event),
+            event.get("pathParameters") or {},
+            event.get("queryStringParameters") or {},
+        ],
+        sort_keys=True,
+    )
+    return f"{route}#{hashlib.sha256(parameters.encode()).hexdigest()[:32]}"
+
+
+def _unavailable(retry_after: float) -> dict[str, Any]:
+    return error(
+        "The database is unavailable, please retry",
+        status_code=503,
+        extra_headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _keep_or_replace(route: str, event: dict, response: dict[str, Any]) -> dict[str, Any]:
+    """Keep a good response, replace a 5xx one by the stale response if any."""
+    status_code = response.get("statusCode", 200)
+    if status_code == 200:  # noqa: PLR2004
+        get_stale_response_cache().put(response_key(route, event), response)
+    elif status_code >= 500:  # noqa: PLR2004
+        return get_stale_response_cache().get(response_key(route, event)) or response
+    return response
+
+
+async def _keep_or_replace_async(
+    route: str,
+    event: dict,
+    response: Awaitable[dict[str, Any]],
+) -> dict[str, Any]:
+    return _keep_or_replace(route, event, await response)
+
+
+def degradable(route: str, low_priority: Callable[[dict], bool] | bool = False) -> Callable:  # noqa: FBT001, FBT002
+    """Serve a read endpoint stale while the database is unavailable, or shed it (low priority).
+
+    low_priority: whether the calls (or the call of an event) are shed rather than served stale.
+    Async handlers are supported (see lambda_handler).
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(event, context):  # noqa: ANN001, ANN202
+            breaker = get_circuit_breaker()
+            shed = low_priority(event) if callable(low_priority) else low_priority
+            if not breaker.allows():
+                if shed:
+                    metrics.incr("degraded.shed")
+                    return _unavailable(breaker.retry_after())
+                stale = get_stale_response_cache().get(response_key(route, event))
+                return stale or _unavailable(breaker.retry_after())
+
+            response = handler(event, context)
+            if shed:
+                return response
+            if inspect.isawaitable(response):
+                return _keep_or_replace_async(route, event, response)
+            return _keep_or_replace(route, event, response)
+
+        return wrapper
+
+    return decorator
+
@@ -0,0 +1,23 @@
+"""Scheduled Warmup Events Handling."""
+
+import json
+from typing import Any
+
+# serverless-plugin-warmup default payload source, and EventBridge scheduled rules
+_WARMUP_SOURCES = ("serverless-plugin-warmup", "aws.events")
+
+
+def is_warmup_event(event: Any) -> bool:  # noqa: ANN401
+    """Whether the event is a keep-warm ping rather than an API call."""
+    if not isinstance(event, dict):
+        return False
+    return event.get("source") in _WARMUP_SOURCES or event.get("warmup") is True
+
+
+def warmup_response() -> dict[str, Any]:
+    """Response to keep-warm pings."""
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps({"warmup": True}),
+    }
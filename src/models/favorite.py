@@ -1,14 +1,18 @@
 """Favorite SQLAlchemy Model definition."""
 
-import uuid
 from datetime import UTC, datetime
 
 from sqlalchemy import Column, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
+from src.lib.ids import uuid7
+
 from .base import Base
 from .types import GUID
 
+# Fields of a favorite response, i.e. the allow-list of sparse fieldsets (fields=)
+FAVORITE_FIELDS: tuple[str, ...] = ("id", "user_id", "request_id", "created_at")
+
 
 class Favorite(Base):
     """Favorite Table Definition."""
@@ -17,7 +21,7 @@ class Favorite(Base):
     __allow_unmapped__ = True
     __table_args__ = (UniqueConstraint("user_id", "request_id", name="uq_favorite_user_request"),)
 
-    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid7)
     user_id = Column(GUID(), nullable=False)
     request_id = Column(
         GUID(),
@@ -38,10 +42,12 @@ class Favorite(Base):
 
     # TODO: not sure if we should return requests here, or should we let the client do a GET for
     # how many requests there are might be too much (even though favorites number is limited)
-    def to_dict(self) -> dict[str, str]:
-        return {
-            "id": str(self.id),
-            "user_id": str(self.user_id),
-            "request_id": str(self.request_id),
-            "created_at": self.created_at.isoformat(),
-        }
+    def to_dict(self, fields: tuple[str, ...] | None = None) -> dict[str, str]:
+        """Response dict of the favorite, restricted to fields (FAVORITE_FIELDS names) if given."""
+        if fields is None:
+            fields = FAVORITE_FIELDS
+        data = {}
+        for name in fields:
+            value = getattr(self, name)
+            data[name] = value.isoformat() if name == "created_at" else str(value)
+        return data
@@ -0,0 +1,43 @@
+"""Requests Storage Layout.
+
+- joined (default): common columns on requests, location columns on one subtype table per type
+  (buy_and_deliver_requests, ...): every read joins, every create inserts two rows
+- single: location columns stored on requests itself (nullable, only those of the request type
+  are set): one row per request, no join
+
+The layout is read from the REQUEST_STORAGE_LAYOUT setting. Reads work whatever layout a row was
+written with (Request.to_dict falls back on the requests columns when no subtype row is loaded),
+so switching is: migrate (scripts/migrate_request_layout.py), then change the setting.
+"""
+
+from src.config import REQUEST_STORAGE_LAYOUT
+
+JOINED = "joined"
+SINGLE = "single"
+LAYOUTS = (JOINED, SINGLE)
+
+
+def _validate(layout: str) -> str:
+    if layout not in LAYOUTS:
+        exception_msg = f"REQUEST_STORAGE_LAYOUT: {layout} is not valid. It can only be {LAYOUTS}"
+        raise ValueError(exception_msg)
+    return layout
+
+
+_layout = _validate(REQUEST_STORAGE_LAYOUT)
+
+
+def request_storage_layout() -> str:
+    """Layout new requests are written with and read with."""
+    return _layout
+
+
+def is_single_table() -> bool:
+    """Whether requests are stored in the single table layout."""
+    return _layout == SINGLE
+
+
+def set_request_storage_layout(layout: str) -> None:
+    """Switch layout at runtime (tests and benchmarks, production uses the setting)."""
+    global _layout  # noqa: PLW0603
+    _layout = _validate(layout)
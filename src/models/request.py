@@ -1,6 +1,6 @@
 """Request SQLAlchemy Model definition."""
 
-import uuid
+import json
 from datetime import UTC, datetime
 
 from sqlalchemy import (
@@ -9,15 +9,50 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
     String,
+    Text,
 )
 from sqlalchemy.orm import relationship
 
+from src.lib.feed import FEED_KEY_LENGTH, feed_key
+from src.lib.ids import uuid7
+from src.lib.request_stats import COUNTER_KEY_LENGTH
+from src.lib.search import MAX_TOKEN_LENGTH, token_weights
 from src.schemas.request import RequestType
 
 from .base import Base
 from .types import GUID
 
+# Location columns of every request type (same names on requests and on the subtype tables)
+LOCATION_COLUMNS: dict[RequestType, tuple[str, ...]] = {
+    RequestType.BUY_AND_DELIVER: ("dropoff_latitude", "dropoff_longitude"),
+    RequestType.PICKUP_AND_DELIVER: (
+        "pickup_latitude",
+        "pickup_longitude",
+        "dropoff_latitude",
+        "dropoff_longitude",
+    ),
+    RequestType.ONLINE_SERVICE: ("meetup_latitude", "meetup_longitude"),
+}
+# Every location column once, in the order responses list them
+ALL_LOCATION_COLUMNS: tuple[str, ...] = tuple(
+    dict.fromkeys(column for columns in LOCATION_COLUMNS.values() for column in columns),
+)
+# Fields of a request response, i.e. the allow-list of sparse fieldsets (fields=)
+REQUEST_FIELDS: tuple[str, ...] = (
+    "id",
+    "user_id",
+    "type",
+    "title",
+    "description",
+    "due_date",
+    "created_at",
+    *ALL_LOCATION_COLUMNS,
+)
+
 
 # TODO: Add fragile field, item size and weight
 class Request(Base):
@@ -25,9 +60,15 @@ class Request(Base):
 
     __tablename__ = "requests"
     __allow_unmapped__ = True  # This is to keep my annotations for type hints for now
+    # NOTE: Both indexes follow the feed order (due_date, created_at, id): due date windows are
+    # range seeks returning rows already in order, all types or per type
+    __table_args__ = (
+        Index("ix_requests_due_date", "due_date", "created_at", "id"),
+        Index("ix_requests_type_due_date", "type", "due_date", "created_at", "id"),
+    )
 
     # default value is Python side generated and not DB Side
-    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid7)
     user_id = Column(GUID(), nullable=False)
 
     type: "RequestType" = Column(Enum(RequestType), nullable=False)
@@ -38,6 +79,18 @@ class Request(Base):
     created_at: "datetime" = Column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
+    # Incremented by every update: (id, version) identifies a rendering of the request (see
+    # src/lib/fragment_cache.py). NULL for requests written before versions existed, read as 0
+    version = Column(Integer, nullable=True, default=1)
+
+    # Single table layout only (see src/models/layout.py): locations of the request type, NULL
+    # otherwise. Always NULL in the joined layout, where they live in the subtype tables
+    pickup_latitude = Column(Float, nullable=True)
+    pickup_longitude = Column(Float, nullable=True)
+    dropoff_latitude = Column(Float, nullable=True)
+    dropoff_longitude = Column(Float, nullable=True)
+    meetup_latitude = Column(Float, nullable=True)
+    meetup_longitude = Column(Float, nullable=True)
 
     # Relationships for easy access
     # NOTE: SQLAlchemy cascade used in place of DB-level CASCADE due to Aurora DSQL
@@ -65,8 +118,58 @@ class Request(Base):
         back_populates="request",
         cascade="all, delete",
     )
+    # NOTE: Write only: never loaded with the request, the repository replaces / deletes the
+    # tokens with bulk statements (see index_search_tokens)
+    search_tokens: list["RequestSearchToken"] = relationship(
+        "RequestSearchToken",
+        lazy="noload",
+        cascade="save-update",
+    )
+    # NOTE: Write only as well: the feed projection is read on its own (see RequestFeedEntry)
+    feed_entry: "RequestFeedEntry" = relationship(
+        "RequestFeedEntry",
+        uselist=False,
+        lazy="noload",
+        cascade="save-update",
+    )
+
+    def index_search_tokens(self) -> None:
+        """Attach the search index rows of a new request (inserted with it on flush)."""
+        self.search_tokens = [
+            RequestSearchToken(token=token, weight=weight)
+            for token, weight in token_weights(self.title, self.description).items()
+        ]
+
+    def index_feed_entry(self) -> None:
+        """Attach the feed projection row of a new request (id and created_at must be set)."""
+        self.feed_entry = RequestFeedEntry(
+            feed_key=feed_key(self.due_date, self.created_at, self.id),
+            type=self.type,
+            fragment=self.to_json_fragment(),
+        )
+
+    def to_json_fragment(self) -> str:
+        """JSON of to_dict(), as stored in the feed projection.
+
+        Dates are rendered as UTC whatever the driver returns (SQLite returns naive datetimes),
+        so that the fragment of a request does not depend on where it was loaded from.
+        """
+        data = self.to_dict()
+        for name in ("due_date", "created_at"):
+            value = getattr(self, name)
+            if value is not None and value.tzinfo is None:
+                data[name] = value.replace(tzinfo=UTC).isoformat()
+        return json.dumps(data)
+
+    def to_dict(self, fields: tuple[str, ...] | None = None) -> dict[str, str]:
+        """Response dict of the request, restricted to fields (REQUEST_FIELDS names) if given.
+
+        A sparse dict only reads the requested attributes (others may not be loaded), location
+        fields are left out of requests of the other types.
+        """
+        if fields is not None:
+            return self._sparse_dict(fields)
 
-    def to_dict(self) -> dict[str, str]:
         tmp_due_date = None
         if self.due_date:
             tmp_due_date = self.due_date.isoformat()
@@ -86,7 +189,39 @@ class Request(Base):
             data.update(self.pickup_and_deliver.to_dict())
         elif self.online_service:
             data.update(self.online_service.to_dict())
+        else:
+            # Single table layout: no subtype row, locations are on the request itself
+            data.update(
+                {column: getattr(self, column) for column in LOCATION_COLUMNS[self.type]},
+            )
+
+        return data
 
+    def _sparse_dict(self, fields: tuple[str, ...]) -> dict[str, str]:
+        data = {}
+        subtype = None
+        for name in fields:
+            if name in ALL_LOCATION_COLUMNS:
+                if name not in LOCATION_COLUMNS[self.type]:
+                    continue
+                if subtype is None:
+                    # Single table layout: no subtype row, locations are on the request itself
+                    subtype = (
+                        self.buy_and_deliver
+                        or self.pickup_and_deliver
+                        or self.online_service
+                        or self
+                    )
+                data[name] = getattr(subtype, name)
+                continue
+            value = getattr(self, name)
+            if name in ("id", "user_id"):
+                value = str(value)
+            elif name == "type":
+                value = value.value
+            elif name in ("due_date", "created_at") and value is not None:
+                value = value.isoformat()
+            data[name] = value
         return data
 
 
@@ -159,3 +294,63 @@ class OnlineServiceRequest(Base):
             "meetup_latitude": self.meetup_latitude,
             "meetup_longitude": self.meetup_longitude,
         }
+
+
+class RequestSearchToken(Base):
+    """Search inverted index: one row per (token, request) with the token weight.
+
+    Application maintained (Aurora DSQL supports neither tsvector / GIN indexes nor extensions
+    like pg_trgm), portable across all dialects. The primary key (token, request_id) is the
+    lookup index.
+    """
+
+    __tablename__ = "request_search_tokens"
+    __table_args__ = (Index("ix_request_search_tokens_request_id", "request_id"),)
+
+    token = Column(String(MAX_TOKEN_LENGTH), primary_key=True)
+    request_id = Column(
+        GUID(),
+        ForeignKey("requests.id", ondelete="CASCADE"),  # NOTE: Not enforced by DSQL
+        primary_key=True,
+    )
+    weight = Column(SmallInteger, nullable=False)
+
+
+class RequestFeedEntry(Base):
+    """Feed projection: one row per request with its feed sort key and pre-rendered JSON.
+
+    Denormalized copy of the requests, maintained by the repositories in the same transaction as
+    the request itself (scripts/rebuild_request_feed.py rebuilds and checks it). A feed page is a
+    range read on the feed_key index (or on (type, feed_key)), with no join, and its response
+    body is the fragments joined together (see src/lib/feed.py for the key format).
+    """
+
+    __tablename__ = "request_feed"
+    __table_args__ = (
+        Index("ix_request_feed_feed_key", "feed_key", unique=True),
+        Index("ix_request_feed_type_feed_key", "type", "feed_key"),
+    )
+
+    request_id = Column(
+        GUID(),
+        ForeignKey("requests.id", ondelete="CASCADE"),  # NOTE: Not enforced by DSQL
+        primary_key=True,
+    )
+    feed_key = Column(String(FEED_KEY_LENGTH), nullable=False)
+    type: "RequestType" = Column(Enum(RequestType), nullable=False)
+    fragment = Column(Text, nullable=False)
+
+
+class RequestCounter(Base):
+    """Feed facets counters: one row per (key, shard), see src/lib/request_stats.py.
+
+    Updated with upserts in the same transactions as the requests (create / delete), a key is
+    the sum of its shards. scripts/reconcile_request_stats.py corrects the drift and removes the
+    expired day keys.
+    """
+
+    __tablename__ = "request_counters"
+
+    key = Column(String(COUNTER_KEY_LENGTH), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
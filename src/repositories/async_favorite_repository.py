@@ -0,0 +1,113 @@
+"""Async Favorite Repository."""
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import desc, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import REPOSITORY_BACKEND
+from src.db.async_session import get_async_db_session, get_async_write_session
+from src.db.transactions import run_async_transaction
+from src.lib.pagination import recency_page
+from src.models.favorite import Favorite
+from src.repositories.favorite_repository import user_favorites_query
+from src.repositories.interfaces import AsyncFavoriteRepositoryInterface
+
+_async_favorite_repo_instance = None
+
+
+def get_async_favorite_repository() -> AsyncFavoriteRepositoryInterface:
+    """Get an async favorite repository instance (of the configured REPOSITORY_BACKEND).
+
+    Behind the database circuit breaker, as the synchronous one.
+    """
+    global _async_favorite_repo_instance  # noqa: PLW0603
+    if _async_favorite_repo_instance is None:
+        if REPOSITORY_BACKEND == "dynamodb":
+            # No asyncio driver: the synchronous repository runs in threads
+            from src.repositories.favorite_repository import get_favorite_repository  # noqa: PLC0415
+            from src.repositories.threaded_repositories import ThreadedAsyncFavoriteRepository  # noqa: PLC0415
+
+            _async_favorite_repo_instance = ThreadedAsyncFavoriteRepository(
+                get_favorite_repository(),
+            )
+        else:
+            from src.repositories.circuit_breaking_repository import (  # noqa: PLC0415
+                with_circuit_breaker,
+            )
+
+            _async_favorite_repo_instance = with_circuit_breaker(AsyncFavoriteRepository())
+    return _async_favorite_repo_instance
+
+
+class AsyncFavoriteRepository(AsyncFavoriteRepositoryInterface):
+    """Favorites Repository on SQLAlchemy asyncio, same behaviour as FavoriteRepository."""
+
+    async def create(self, user_id: UUID, request_id: UUID) -> Favorite:
+        """Create Favorite for User (idempotent).
+
+        Inserts directly and falls back on the existing favorite when the (user_id, request_id)
+        unique constraint rejects it: callers usually looked it up already (concurrently with
+        the request, see get_user_favorite), so the insert path needs a single round trip.
+        Replayed on optimistic concurrency conflicts (see run_async_transaction).
+        """
+
+        async def work(db: AsyncSession) -> Favorite:
+            favorite = Favorite(user_id=user_id, request_id=request_id)
+            db.add(favorite)
+            return favorite
+
+        try:
+            return await run_async_transaction(get_async_write_session, work)
+        except IntegrityError:
+            existing = await self.get_user_favorite(user_id, request_id)
+            if existing is None:
+                raise
+            return existing
+
+    async def get_by_id(self, favorite_id: UUID) -> Favorite | None:
+        async with get_async_db_session() as db:
+            return await db.get(Favorite, favorite_id)
+
+    async def delete(self, favorite_id: UUID) -> bool:
+        async def work(db: AsyncSession) -> bool:
+            favorite = await db.get(Favorite, favorite_id)
+            if not favorite:  # Already removed
+                return True
+            await db.delete(favorite)
+            return True
+
+        return await run_async_transaction(get_async_write_session, work)
+
+    async def get_user_favorite(self, user_id: UUID, request_id: UUID) -> Favorite | None:
+        async with get_async_db_session() as db:
+            result = await db.execute(
+                select(Favorite)
+                .where(Favorite.user_id == user_id, Favorite.request_id == request_id)
+                .limit(1),
+            )
+            return result.scalars().first()
+
+    async def list_user_favorites(self, user_id: UUID) -> list[Favorite]:
+        async with get_async_db_session() as db:
+            result = await db.execute(
+                select(Favorite)
+                .where(Favorite.user_id == user_id)
+                .order_by(desc(Favorite.created_at)),
+            )
+            return list(result.scalars().all())
+
+    async def page_of_user_favorites(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """Page of the favorites of a user, newest first (see user_favorites_query)."""
+        async with get_async_db_session() as db:
+            result = await db.execute(user_favorites_query(user_id, limit + 1, cursor))
+            rows = result.scalars().all()
+        favorites, pagination = recency_page(rows, limit)
+        return {"favorites": favorites, "pagination": pagination}
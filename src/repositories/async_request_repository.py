@@ -0,0 +1,187 @@
+"""Async Request Repository."""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import DATABASE_SHARDS, REPOSITORY_BACKEND
+from src.db.async_session import get_async_db_session, get_async_write_session
+from src.db.transactions import run_async_transaction
+from src.lib.fragment_cache import get_fragment_cache, request_version
+from src.lib.pagination import recency_page
+from src.models.request import Request
+from src.repositories.interfaces import AsyncRequestRepositoryInterface
+from src.repositories.request_repository import (
+    RequestCursorMixin,
+    build_request,
+    build_search_tokens,
+    delete_feed_entry,
+    delete_search_tokens,
+    refresh_feed_entry,
+    request_load_options,
+    update_counters,
+    user_requests_query,
+)
+from src.schemas.request import RequestCreate, RequestUpdate
+
+_async_request_repo_instance = None
+
+
+def get_async_request_repository() -> AsyncRequestRepositoryInterface:
+    """Get an async request repository instance (of the configured REPOSITORY_BACKEND).
+
+    Behind the database circuit breaker, as the synchronous one.
+    """
+    global _async_request_repo_instance  # noqa: PLW0603
+    if _async_request_repo_instance is None:
+        if REPOSITORY_BACKEND == "dynamodb" or DATABASE_SHARDS:
+            # No asyncio driver, or requests spread over regional shards (see src/db/shards.py):
+            # the synchronous repository runs in threads
+            from src.repositories.request_repository import get_request_repository  # noqa: PLC0415
+            from src.repositories.threaded_repositories import ThreadedAsyncRequestRepository  # noqa: PLC0415
+
+            _async_request_repo_instance = ThreadedAsyncRequestRepository(get_request_repository())
+        else:
+            from src.repositories.circuit_breaking_repository import (  # noqa: PLC0415
+                with_circuit_breaker,
+            )
+
+            _async_request_repo_instance = with_circuit_breaker(AsyncRequestRepository())
+    return _async_request_repo_instance
+
+
+class AsyncRequestRepository(RequestCursorMixin, AsyncRequestRepositoryInterface):
+    """Request Repository on SQLAlchemy asyncio, same behaviour as RequestRepository.
+
+    Every method opens its own session, so independent calls can be awaited concurrently:
+        request, favorites = await asyncio.gather(repo.get_by_id(...), ...)
+    Writes are replayed on optimistic concurrency conflicts (see run_async_transaction).
+    """
+
+    async def create(self, user_id: UUID, input_request: RequestCreate) -> Request:
+        async def work(db: AsyncSession) -> Request:
+            request = build_request(user_id, input_request)
+            db.add(request)
+            await db.execute(update_counters(db, request, 1))
+            return request
+
+        return await run_async_transaction(get_async_write_session, work)
+
+    async def get_by_id(self, request_id: UUID) -> Request | None:
+        async with get_async_db_session() as db:
+            result = await db.execute(
+                select(Request)
+                .options(*request_load_options())
+                .where(Request.id == request_id)
+                .limit(1),
+            )
+            return result.scalars().first()
+
+    async def get_user_requests(self, user_id: UUID) -> list[Request]:
+        async with get_async_db_session() as db:
+            result = await db.execute(
+                select(Request).options(*request_load_options()).where(Request.user_id == user_id),
+            )
+            return list(result.scalars().all())
+
+    async def page_of_user_requests(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """Page of the requests of a user, newest first (see user_requests_query)."""
+        async with get_async_db_session() as db:
+            result = await db.execute(user_requests_query(user_id, limit + 1, cursor))
+            rows = result.scalars().all()
+        requests, pagination = recency_page(rows, limit)
+        return {"requests": requests, "pagination": pagination}
+
+    async def list_of_requests(  # noqa: PLR0913
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+    ) -> dict[str, Any]:
+        """List Requests in pagination mode (see RequestRepository.list_of_requests)."""
+        async with get_async_db_session() as db:
+            query = select(Request).options(*request_load_options())
+            if request_type:
+                query = query.where(Request.type == request_type)
+            query, windowed = self._apply_due_date_window(query, due_after, due_before)
+            if cursor:
+                query = self._apply_cursor_filter(query, self._decode_cursor(cursor), windowed)
+            query = query.order_by(*self._feed_order(windowed))
+
+            requests = list((await db.execute(query.limit(limit + 1))).scalars().all())
+            has_more = len(requests) > limit
+            if has_more:
+                requests = requests[:-1]
+
+            next_cursor = None
+            if has_more and requests:
+                next_cursor = self._generate_next_cursor(requests[-1])
+
+            return {
+                "requests": requests,
+                "pagination": {
+                    "next_cursor": next_cursor,
+                    "has_more": has_more,
+                    "limit": limit,
+                },
+            }
+
+    async def list_feed(
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+    ) -> dict[str, Any]:
+        """Read the page of list_of_requests from the feed projection (see list_feed)."""
+        query = self._feed_rows_query(request_type, limit + 1, cursor, due_after, due_before)
+        async with get_async_db_session() as db:
+            rows = (await db.execute(query)).all()
+        return self._feed_page(rows, limit)
+
+    async def update(self, request_id: UUID, request_update: RequestUpdate) -> Request:
+        async def work(db: AsyncSession) -> Request:
+            request = await db.get(Request, request_id, options=request_load_options())
+            if not request:
+                exception_msg = "Workflow should not be happening"
+                raise Exception(exception_msg)
+
+            changes = request_update.model_dump(exclude_unset=True)
+            for attr, value in changes.items():
+                setattr(request, attr, value)
+            request.version = request_version(request) + 1
+            get_fragment_cache().invalidate(request.id)
+
+            if changes.keys() & {"title", "description"}:
+                await db.execute(delete_search_tokens(request.id))
+                db.add_all(build_search_tokens(request))
+            await db.execute(refresh_feed_entry(request))
+            return request
+
+        return await run_async_transaction(get_async_write_session, work)
+
+    async def delete(self, request_id: UUID) -> bool:
+        async def work(db: AsyncSession) -> bool:
+            request = await db.get(Request, request_id, options=request_load_options())
+            if not request:
+                return True
+            # Cascades (subtype, favorites) are loaded and deleted by the ORM, as in the sync one
+            await db.execute(delete_search_tokens(request.id))
+            await db.execute(delete_feed_entry(request.id))
+            await db.execute(update_counters(db, request, -1))
+            await db.delete(request)
+            get_fragment_cache().invalidate(request.id)
+            return True
+
+        return await run_async_transaction(get_async_write_session, work)
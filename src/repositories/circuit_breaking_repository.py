@@ -0,0 +1,77 @@
+"""Repositories Behind The Database Circuit Breaker.
+
+Wraps any repository: its public methods, async ones included, are called through the circuit
+breaker (see src/lib/circuit_breaker.py), and the database failures they raise become
+DependencyUnavailableError, answered 503 with Retry-After by the handlers (see error_from), which
+the read endpoints answer with their last known good response instead (see
+src/lib/stale_responses.py).
+"""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any, NoReturn
+
+from src.config import CIRCUIT_BREAKER
+from src.lib.circuit_breaker import (
+    CircuitBreaker,
+    DependencyUnavailableError,
+    get_circuit_breaker,
+    is_dependency_failure,
+)
+from src.lib.deadline import DeadlineExceededError
+
+
+class CircuitBreakingRepository:
+    """Repository whose public methods go through a circuit breaker."""
+
+    def __init__(self, repository: Any, breaker: CircuitBreaker) -> None:  # noqa: ANN401
+        self._repository = repository
+        self._breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        attribute = getattr(self._repository, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        guarded = self._guard(attribute)
+        # Wrapped once: the next lookups find it on the instance
+        setattr(self, name, guarded)
+        return guarded
+
+    def _guard(self, method: Callable) -> Callable:
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def guarded_async(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                try:
+                    return await self._breaker.call_async(method, *args, **kwargs)
+                except Exception as e:  # noqa: BLE001 # raised again, see _raise_unavailable
+                    _raise_unavailable(e)
+
+            return guarded_async
+
+        @functools.wraps(method)
+        def guarded(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            try:
+                return self._breaker.call(method, *args, **kwargs)
+            except Exception as e:  # noqa: BLE001 # raised again, see _raise_unavailable
+                _raise_unavailable(e)
+
+        return guarded
+
+
+def _raise_unavailable(error: Exception) -> NoReturn:
+    """Raise a database failure as DependencyUnavailableError, any other error as is."""
+    if isinstance(error, DependencyUnavailableError | DeadlineExceededError):
+        raise error
+    if not is_dependency_failure(error):
+        raise error
+    exception_msg = "The database is unavailable, please retry"
+    raise DependencyUnavailableError(exception_msg) from error
+
+
+def with_circuit_breaker(repository: Any) -> Any:  # noqa: ANN401
+    """Repository behind the database circuit breaker, unless CIRCUIT_BREAKER is disabled."""
+    if not CIRCUIT_BREAKER:
+        return repository
+    return CircuitBreakingRepository(repository, get_circuit_breaker())
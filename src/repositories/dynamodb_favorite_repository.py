@@ -0,0 +1,98 @@
+"""DynamoDB Favorite Repository (REPOSITORY_BACKEND=dynamodb).
+
+A favorite id is a name based UUID of (user_id, request_id): the (user, request) uniqueness is the
+table key itself, so
+- create is a single conditional PutItem, idempotent even under concurrent calls
+- get_user_favorite is a GetItem, without any index
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID, uuid5
+
+from boto3.dynamodb.conditions import Key
+
+from src.lib.feed import format_date, parse_date
+from src.models.favorite import Favorite
+from src.repositories.dynamodb_request_repository import query_all
+from src.repositories.interfaces import FavoriteRepositoryInterface
+
+# NOTE: Never change it, existing favorites ids are derived from it
+FAVORITE_ID_NAMESPACE = UUID("6f0c6f2e-3a55-4c1b-9a0e-7d1a6a7c2b90")
+
+
+def favorite_id(user_id: UUID, request_id: UUID) -> UUID:
+    """Id of the favorite of a user for a request."""
+    return uuid5(FAVORITE_ID_NAMESPACE, f"{user_id}:{request_id}")
+
+
+def item_to_favorite(item: dict[str, Any]) -> Favorite:
+    """Transient Favorite of a DynamoDB item."""
+    return Favorite(
+        id=UUID(item["id"]),
+        user_id=UUID(item["user_id"]),
+        request_id=UUID(item["request_id"]),
+        created_at=parse_date(item["created_at"]),
+    )
+
+
+class DynamoDBFavoriteRepository(FavoriteRepositoryInterface):
+    """Favorites Repository on DynamoDB, same behaviour as FavoriteRepository."""
+
+    def __init__(self, table: Any = None) -> None:  # noqa: ANN401
+        if table is None:
+            from src.lib.database import get_dynamodb_table_favorites_connexion  # noqa: PLC0415
+
+            table = get_dynamodb_table_favorites_connexion()
+        self.table = table
+
+    def create(self, user_id: UUID, request_id: UUID) -> Favorite:
+        """Create Favorite for User (idempotent): an existing favorite is returned as is."""
+        favorite = Favorite(
+            id=favorite_id(user_id, request_id),
+            user_id=user_id,
+            request_id=request_id,
+            created_at=datetime.now(UTC),
+        )
+        try:
+            self.table.put_item(
+                Item={
+                    "id": str(favorite.id),
+                    "user_id": str(user_id),
+                    "request_id": str(request_id),
+                    "created_at": format_date(favorite.created_at),
+                },
+                ConditionExpression="attribute_not_exists(id)",
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            existing = self.get_by_id(favorite.id)
+            if existing is None:  # Deleted in between
+                raise
+            return existing
+        return favorite
+
+    def get_by_id(self, favorite_id: UUID) -> Favorite | None:
+        item = self.table.get_item(Key={"id": str(favorite_id)}, ConsistentRead=True).get("Item")
+        return item_to_favorite(item) if item else None
+
+    def get_user_favorite(self, user_id: UUID, request_id: UUID) -> Favorite | None:
+        return self.get_by_id(favorite_id(user_id, request_id))
+
+    def delete(self, favorite_id: UUID) -> bool:
+        """Delete a Favorite by its ID (idempotent)."""
+        self.table.delete_item(Key={"id": str(favorite_id)})
+        return True
+
+    def list_user_favorites(
+        self,
+        user_id: UUID,
+        fields: tuple[str, ...] | None = None,  # noqa: ARG002
+    ) -> list[Favorite]:
+        """List a User's Favorites, most recent first."""
+        items = query_all(
+            self.table,
+            IndexName="user",
+            KeyConditionExpression=Key("user_id").eq(str(user_id)),
+            ScanIndexForward=False,
+        )
+        return [item_to_favorite(item) for item in items]
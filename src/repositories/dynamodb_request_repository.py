@@ -0,0 +1,469 @@
+"""DynamoDB Request Repository (REPOSITORY_BACKEND=dynamodb).
+
+Same contract as the SQLAlchemy RequestRepository, on the tables described in
+src/db/dynamodb_tables.py:
+- get_by_id is a GetItem (single digit milliseconds, no connection to open)
+- list_of_requests / get_user_requests are Query calls on the feed and user GSIs, already in order
+- create enforces MAX_USER_CREATED_REQUESTS atomically: the quota item update and the request put
+  are one transaction, so concurrent creations can not go over the limit
+- the feed stats counters items are updated in the create / delete transactions as well
+
+Results are transient Request objects (never attached to a session): locations are set on the
+request itself, as in the single table layout, and to_dict() reads them from there.
+
+NOTE: Sparse fieldsets (fields=) only apply to the responses: items are always read whole, a
+read costs capacity units per item size whatever the ProjectionExpression.
+
+NOTE: Full-text search is not supported by this backend (no inverted index): search_requests
+raises, the API answers 400 for q= queries.
+"""
+
+from collections import Counter
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from boto3.dynamodb.conditions import Key
+
+from src.config import MAX_USER_CREATED_REQUESTS, REQUEST_COUNTER_SHARDS
+from src.db.dynamodb_tables import FEED_PK
+from src.lib.feed import NO_DUE_DATE, feed_key, format_date, parse_date
+from src.lib.fragment_cache import get_fragment_cache
+from src.lib.ids import uuid7
+from src.lib.request_stats import (
+    CounterReconcileReport,
+    counter_corrections,
+    counter_keys,
+    counter_shard,
+    is_expired,
+    stats_from_counts,
+    stats_keys,
+    utc_today,
+)
+from src.models.request import LOCATION_COLUMNS, Request
+from src.repositories.interfaces import RequestRepositoryInterface
+from src.repositories.request_repository import RequestCursorMixin
+from src.schemas.request import LocationFilter, RequestCreate, RequestType, RequestUpdate
+
+QUOTA_KEY_PREFIX = "quota#"
+COUNTER_KEY_PREFIX = "counter#"
+# BatchGetItem reads up to 100 keys per call
+_BATCH_GET_MAX_KEYS = 100
+
+
+def counter_item_id(key: str, shard: int) -> str:
+    return f"{COUNTER_KEY_PREFIX}{key}#{shard}"
+
+
+def counter_item_key(item_id: str) -> str:
+    """Counter key of a counter item id."""
+    return item_id.removeprefix(COUNTER_KEY_PREFIX).rsplit("#", 1)[0]
+
+
+def request_to_item(request: Request) -> dict[str, Any]:
+    """DynamoDB item of a request (None attributes are left out)."""
+    item: dict[str, Any] = {
+        "id": str(request.id),
+        "user_id": str(request.user_id),
+        "type": request.type.value,
+        "title": request.title,
+        "description": request.description,
+        "due_date": format_date(request.due_date) if request.due_date else None,
+        "created_at": format_date(request.created_at),
+        "version": request.version,
+        "feed_pk": FEED_PK,
+        "feed_sk": feed_key(request.due_date, request.created_at, request.id),
+    }
+    for column in LOCATION_COLUMNS[request.type]:
+        # Decimal from the float repr: DynamoDB numbers are exact, floats are not accepted
+        item[column] = Decimal(repr(getattr(request, column)))
+    return {name: value for name, value in item.items() if value is not None}
+
+
+def item_to_request(item: dict[str, Any]) -> Request:
+    """Transient Request of a DynamoDB item."""
+    request_type = RequestType(item["type"])
+    request = Request(
+        id=UUID(item["id"]),
+        user_id=UUID(item["user_id"]),
+        type=request_type,
+        title=item["title"],
+        description=item.get("description"),
+        due_date=parse_date(item["due_date"]) if item.get("due_date") else None,
+        created_at=parse_date(item["created_at"]),
+        version=int(item.get("version", 0)),
+    )
+    for column in LOCATION_COLUMNS[request_type]:
+        setattr(request, column, float(item[column]))
+    return request
+
+
+def query_all(table: Any, **kwargs: Any) -> Iterator[dict[str, Any]]:  # noqa: ANN401
+    """Items of a Query, following LastEvaluatedKey over the 1 MB pages."""
+    while True:
+        response = table.query(**kwargs)
+        yield from response["Items"]
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def scan_all(table: Any, **kwargs: Any) -> Iterator[dict[str, Any]]:  # noqa: ANN401
+    """Items of a Scan, following LastEvaluatedKey over the 1 MB pages."""
+    while True:
+        response = table.scan(**kwargs)
+        yield from response["Items"]
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+class DynamoDBRequestRepository(RequestCursorMixin, RequestRepositoryInterface):
+    """Request Repository on DynamoDB, same behaviour as RequestRepository."""
+
+    def __init__(self, table: Any = None, favorites_table: Any = None) -> None:  # noqa: ANN401
+        if table is None or favorites_table is None:
+            from src.lib.database import (  # noqa: PLC0415
+                get_dynamodb_table_favorites_connexion,
+                get_dynamodb_table_requests_connexion,
+            )
+
+            table = table or get_dynamodb_table_requests_connexion()
+            favorites_table = favorites_table or get_dynamodb_table_favorites_connexion()
+        self.table = table
+        self.favorites_table = favorites_table
+        # NOTE: The client of a resource takes (and returns) plain Python values, as the resource
+        self.client = table.meta.client
+
+    def create(self, user_id: UUID, input_request: RequestCreate) -> Request:
+        request = Request(
+            id=uuid7(),
+            user_id=user_id,
+            type=input_request.type,
+            title=input_request.title,
+            description=input_request.description,
+            due_date=input_request.due_date,
+            created_at=datetime.now(UTC),
+            version=1,
+        )
+        for column in LOCATION_COLUMNS[input_request.type]:
+            setattr(request, column, getattr(input_request, column))
+
+        try:
+            self.client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Update": {
+                            "TableName": self.table.name,
+                            "Key": {"id": f"{QUOTA_KEY_PREFIX}{user_id}"},
+                            "UpdateExpression": "ADD requests_count :one",
+                            "ConditionExpression": (
+                                "attribute_not_exists(requests_count) OR requests_count < :max"
+                            ),
+                            "ExpressionAttributeValues": {
+                                ":one": 1,
+                                ":max": MAX_USER_CREATED_REQUESTS,
+                            },
+                        },
+                    },
+                    {
+                        "Put": {
+                            "TableName": self.table.name,
+                            "Item": request_to_item(request),
+                            "ConditionExpression": "attribute_not_exists(id)",
+                        },
+                    },
+                    *self._counter_updates(request.type, request.due_date, 1),
+                ],
+            )
+        except self.client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get("CancellationReasons", [])
+            if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                exception_msg = "Too many requests created"
+                raise Exception(exception_msg) from e  # noqa: TRY002
+            raise
+        return request
+
+    def get_by_id(self, request_id: UUID, fields: tuple[str, ...] | None = None) -> Request | None:  # noqa: ARG002
+        item = self.table.get_item(Key={"id": str(request_id)}).get("Item")
+        return item_to_request(item) if item else None
+
+    def get_user_requests(
+        self,
+        user_id: UUID,
+        fields: tuple[str, ...] | None = None,  # noqa: ARG002
+    ) -> list[Request]:
+        items = query_all(
+            self.table,
+            IndexName="user",
+            KeyConditionExpression=Key("user_id").eq(str(user_id)),
+        )
+        return [item_to_request(item) for item in items]
+
+    def get_batch_from_due_date(self, start_due_date: datetime, limit: int = 20) -> list[Request]:
+        return self.list_of_requests(limit=limit, due_after=start_due_date)["requests"]
+
+    def list_of_requests(  # noqa: PLR0913
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        fields: tuple[str, ...] | None = None,  # noqa: ARG002
+        near: LocationFilter | None = None,  # noqa: ARG002
+    ) -> dict[str, Any]:
+        """List Requests in pagination mode (see RequestRepository.list_of_requests).
+
+        One Query on the feed GSI (or type_feed for a type): items come sorted by feed_sk, a due
+        date window is a feed_sk range and the cursor is the ExclusiveStartKey.
+        """
+        try:
+            if request_type:
+                index, partition = "type_feed", Key("type").eq(RequestType(request_type).value)
+                start_key = {"type": RequestType(request_type).value}
+            else:
+                index, partition = "feed", Key("feed_pk").eq(FEED_PK)
+                start_key = {"feed_pk": FEED_PK}
+
+            kwargs: dict[str, Any] = {
+                "IndexName": index,
+                "KeyConditionExpression": self._feed_key_condition(
+                    partition,
+                    due_after,
+                    due_before,
+                ),
+                "Limit": limit + 1,  # one extra item to check if there's more
+            }
+            if cursor:
+                cursor_data = self._decode_cursor(cursor)
+                if cursor_data["id"] is None:
+                    # Cursors without id are older than this backend
+                    exception_msg = "Invalid cursor"
+                    raise ValueError(exception_msg)  # noqa: TRY301
+                sort_key = feed_key(
+                    cursor_data["due_date"],
+                    cursor_data["created_at"],
+                    cursor_data["id"],
+                )
+                kwargs["ExclusiveStartKey"] = {
+                    **start_key,
+                    "feed_sk": sort_key,
+                    "id": str(cursor_data["id"]),
+                }
+
+            items = []
+            for item in query_all(self.table, **kwargs):
+                items.append(item)
+                if len(items) > limit:
+                    break
+            requests = [item_to_request(item) for item in items]
+
+            has_more = len(requests) > limit
+            if has_more:
+                requests = requests[:-1]
+
+            next_cursor = None
+            if has_more and requests:
+                next_cursor = self._generate_next_cursor(requests[-1])
+
+            return {
+                "requests": requests,
+                "pagination": {
+                    "next_cursor": next_cursor,
+                    "has_more": has_more,
+                    "limit": limit,
+                },
+            }
+
+        except Exception as e:
+            exception_msg = f"Error listing requests: {e!r}"
+            raise Exception(exception_msg) from e  # noqa: TRY002
+
+    def _feed_key_condition(self, partition, due_after, due_before):  # noqa
+        """Feed sort key range of a due date window (due_after inclusive, due_before exclusive).
+
+        "<due>#..." sort keys are after "<due>" itself, and before "~" (no due date).
+        """
+        if due_after and due_before and due_after >= due_before:
+            exception_msg = "due_after must be before due_before"
+            raise ValueError(exception_msg)
+        if due_after:
+            upper = format_date(due_before) if due_before else NO_DUE_DATE
+            return partition & Key("feed_sk").between(format_date(due_after), upper)
+        if due_before:
+            return partition & Key("feed_sk").lt(format_date(due_before))
+        return partition
+
+    def search_requests(self, query: str, **kwargs: Any) -> dict[str, Any]:  # noqa: ANN401, ARG002
+        exception_msg = "Search is not supported by the DynamoDB repository backend"
+        raise ValueError(exception_msg)
+
+    def update(self, request_id: UUID, request_update: RequestUpdate) -> Request:
+        changes = request_update.model_dump(exclude_unset=True)
+        assignments = [f"#{attr} = :{attr}" for attr in changes]
+        assignments.append("#version = if_not_exists(#version, :zero) + :one")
+        try:
+            response = self.table.update_item(
+                Key={"id": str(request_id)},
+                UpdateExpression="SET " + ", ".join(assignments),
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeNames={f"#{attr}": attr for attr in [*changes, "version"]},
+                ExpressionAttributeValues={
+                    **{f":{attr}": value for attr, value in changes.items()},
+                    ":zero": 0,
+                    ":one": 1,
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except self.client.exceptions.ConditionalCheckFailedException as e:
+            exception_msg = "Workflow should not be happening"
+            raise Exception(exception_msg) from e  # noqa: TRY002
+        get_fragment_cache().invalidate(request_id)
+        return item_to_request(response["Attributes"])
+
+    def delete(self, request_id: UUID) -> bool:
+        item = self.table.get_item(Key={"id": str(request_id)}).get("Item")
+        if not item:
+            return True
+        get_fragment_cache().invalidate(request_id)
+        due_date = parse_date(item["due_date"]) if item.get("due_date") else None
+        counter_updates = self._counter_updates(RequestType(item["type"]), due_date, -1)
+
+        # NOTE: No cascade in DynamoDB: favorites of the request are deleted first, a favorite
+        # created in between is left behind, as with the SQLAlchemy cascade on Aurora DSQL
+        favorite_keys = query_all(
+            self.favorites_table,
+            IndexName="request",
+            KeyConditionExpression=Key("request_id").eq(str(request_id)),
+        )
+        with self.favorites_table.batch_writer() as batch:
+            for key in favorite_keys:
+                batch.delete_item(Key={"id": key["id"]})
+
+        try:
+            self.client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Delete": {
+                            "TableName": self.table.name,
+                            "Key": {"id": str(request_id)},
+                            "ConditionExpression": "attribute_exists(id)",
+                        },
+                    },
+                    {
+                        "Update": {
+                            "TableName": self.table.name,
+                            "Key": {"id": f"{QUOTA_KEY_PREFIX}{item['user_id']}"},
+                            "UpdateExpression": "ADD requests_count :minus_one",
+                            "ConditionExpression": "requests_count > :zero",
+                            "ExpressionAttributeValues": {
+                                ":minus_one": -1,
+                                ":zero": 0,
+                            },
+                        },
+                    },
+                    *counter_updates,
+                ],
+            )
+        except self.client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get("CancellationReasons", [])
+            if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                return True  # Deleted concurrently
+            if len(reasons) > 1 and reasons[1].get("Code") == "ConditionalCheckFailed":
+                # Request written without quota item (e.g. imported): delete it alone
+                self.client.transact_write_items(
+                    TransactItems=[
+                        {"Delete": {"TableName": self.table.name, "Key": {"id": str(request_id)}}},
+                        *counter_updates,
+                    ],
+                )
+                return True
+            raise
+        return True
+
+    def _counter_updates(self, request_type, due_date, delta) -> list[dict[str, Any]]:  # noqa: ANN001
+        """Transaction items adding delta to the counters of a request, on a random shard."""
+        shard = counter_shard()
+        return [
+            {
+                "Update": {
+                    "TableName": self.table.name,
+                    "Key": {"id": counter_item_id(key, shard)},
+                    "UpdateExpression": "ADD #count :delta",
+                    "ExpressionAttributeNames": {"#count": "count"},
+                    "ExpressionAttributeValues": {":delta": delta},
+                },
+            }
+            for key in counter_keys(request_type, due_date)
+        ]
+
+    def _read_counters(self, keys: list[str]) -> dict[str, int]:
+        """Sum of the shards of every key."""
+        ids = [
+            counter_item_id(key, shard) for key in keys for shard in range(REQUEST_COUNTER_SHARDS)
+        ]
+        counts = dict.fromkeys(keys, 0)
+        for start in range(0, len(ids), _BATCH_GET_MAX_KEYS):
+            request_items = {
+                self.table.name: {
+                    "Keys": [
+                        {"id": item_id} for item_id in ids[start : start + _BATCH_GET_MAX_KEYS]
+                    ],
+                    "ProjectionExpression": "id, #count",
+                    "ExpressionAttributeNames": {"#count": "count"},
+                },
+            }
+            while request_items:
+                response = self.client.batch_get_item(RequestItems=request_items)
+                for item in response["Responses"].get(self.table.name, []):
+                    counts[counter_item_key(item["id"])] += int(item["count"])
+                request_items = response.get("UnprocessedKeys")
+        return counts
+
+    def get_stats(self) -> dict[str, Any]:
+        """Feed facets counts (see RequestRepository.get_stats)."""
+        today = utc_today()
+        return stats_from_counts(self._read_counters(stats_keys(today)), today)
+
+    def reconcile_stats(self) -> CounterReconcileReport:
+        """Correct the counters from a scan of the requests (see reconcile_request_counters).
+
+        Corrections go to shard 0 and expired day counters are deleted.
+        """
+        today = utc_today()
+        expected: Counter = Counter()
+        current: Counter = Counter()
+        expired_ids = []
+        items = scan_all(
+            self.table,
+            ProjectionExpression="id, #type, due_date, #count",
+            ExpressionAttributeNames={"#type": "type", "#count": "count"},
+        )
+        for item in items:
+            if item["id"].startswith(COUNTER_KEY_PREFIX):
+                key = counter_item_key(item["id"])
+                current[key] += int(item.get("count", 0))
+                if is_expired(key, today):
+                    expired_ids.append(item["id"])
+            elif "type" in item:  # quota items have no type
+                due_date = parse_date(item["due_date"]) if item.get("due_date") else None
+                for key in counter_keys(RequestType(item["type"]), due_date, today):
+                    expected[key] += 1
+
+        report = CounterReconcileReport(keys=len(expected.keys() | current.keys()))
+        for key, delta in counter_corrections(expected, current, today).items():
+            self.table.update_item(
+                Key={"id": counter_item_id(key, 0)},
+                UpdateExpression="ADD #count :delta",
+                ExpressionAttributeNames={"#count": "count"},
+                ExpressionAttributeValues={":delta": delta},
+            )
+            report.corrected += 1
+        with self.table.batch_writer() as batch:
+            for item_id in expired_ids:
+                batch.delete_item(Key={"id": item_id})
+        report.expired = len({counter_item_key(item_id) for item_id in expired_ids})
+        return report
@@ -1,24 +1,65 @@
 """Request Repository."""
 
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import desc
+from sqlalchemy import Select, and_, desc, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
 
+from src.config import REPOSITORY_BACKEND
 from src.db.session import get_db_session
+from src.db.transactions import run_transaction
+from src.lib.pagination import decode_recency_cursor, recency_page
 from src.models.favorite import Favorite
 from src.repositories.interfaces import FavoriteRepositoryInterface
 
 _favorite_repo_instance = None
 
 
-def get_favorite_repository() -> "FavoriteRepository":
-    """Get a request repository instance."""
+def get_favorite_repository() -> FavoriteRepositoryInterface:
+    """Get a favorite repository instance (of the configured REPOSITORY_BACKEND).
+
+    Behind the database circuit breaker (see src/repositories/circuit_breaking_repository.py).
+    """
     global _favorite_repo_instance  # noqa: PLW0603
     if _favorite_repo_instance is None:
-        _favorite_repo_instance = FavoriteRepository()
+        from src.repositories.circuit_breaking_repository import with_circuit_breaker  # noqa: PLC0415
+
+        if REPOSITORY_BACKEND == "dynamodb":
+            from src.repositories.dynamodb_favorite_repository import (  # noqa: PLC0415
+                DynamoDBFavoriteRepository,
+            )
+
+            repository = DynamoDBFavoriteRepository()
+        else:
+            repository = FavoriteRepository()
+        _favorite_repo_instance = with_circuit_breaker(repository)
     return _favorite_repo_instance
 
 
+def user_favorites_query(
+    user_id: UUID,
+    limit: int,
+    cursor: str | None,
+    fields: tuple[str, ...] | None = None,
+) -> Select:
+    """Next limit favorites of a user after a cursor, newest first (keyset on created_at, id)."""
+    query = select(Favorite).where(Favorite.user_id == user_id)
+    if fields is not None:
+        names = dict.fromkeys(("id", "created_at", *fields))
+        query = query.options(load_only(*(getattr(Favorite, name) for name in names)))
+    if cursor:
+        created_at, favorite_id = decode_recency_cursor(cursor)
+        query = query.where(
+            or_(
+                Favorite.created_at < created_at,
+                and_(Favorite.created_at == created_at, Favorite.id < favorite_id),
+            ),
+        )
+    return query.order_by(desc(Favorite.created_at), desc(Favorite.id)).limit(limit)
+
+
 class FavoriteRepository(FavoriteRepositoryInterface):
     """Favorites Repository containing all necessary methods.
 
@@ -33,13 +74,10 @@ class FavoriteRepository(FavoriteRepositoryInterface):
         Add a favorite for user -> request. If the favorite already exists,
         return the existing Favorite object (idempotent).
         """
-        with get_db_session() as db:
-            # Check existing first to provide idempotency and avoid IntegrityError
-            existing = (
-                db.query(Favorite)
-                .filter(Favorite.user_id == user_id, Favorite.request_id == request_id)
-                .first()
-            )
+        def work(db: Session) -> Favorite:
+            # Check existing first to provide idempotency and avoid IntegrityError (a replay after
+            # a conflict with a concurrent creation finds it too)
+            existing = self._get_user_favorite(db, user_id, request_id)
             if existing:
                 return existing
 
@@ -47,8 +85,29 @@ class FavoriteRepository(FavoriteRepositoryInterface):
             db.add(favorite)
             return favorite
 
+        try:
+            return run_transaction(get_db_session, work)
+        except IntegrityError:
+            # Lost the race against a concurrent creation of the same favorite (unique constraint)
+            with get_db_session() as db:
+                existing = self._get_user_favorite(db, user_id, request_id)
+            if existing is None:
+                raise
+            return existing
+
+    def get_user_favorite(self, user_id: UUID, request_id: UUID) -> Favorite | None:
+        with get_db_session(read_only=True) as db:
+            return self._get_user_favorite(db, user_id, request_id)
+
+    def _get_user_favorite(self, db, user_id: UUID, request_id: UUID) -> Favorite | None:  # noqa
+        return (
+            db.query(Favorite)
+            .filter(Favorite.user_id == user_id, Favorite.request_id == request_id)
+            .first()
+        )
+
     def get_by_id(self, favorite_id: UUID) -> Favorite | None:
-        with get_db_session() as db:
+        with get_db_session(read_only=True) as db:
             return db.query(Favorite).filter(Favorite.id == favorite_id).first()
 
     def delete(self, favorite_id: UUID) -> bool:
@@ -56,24 +115,49 @@ class FavoriteRepository(FavoriteRepositoryInterface):
 
         Returns Boolean whether a row was deleted or not (idempotent).
         """
-        with get_db_session() as db:
+        def work(db: Session) -> bool:
             favorite = db.query(Favorite).filter(Favorite.id == favorite_id).first()
             if not favorite:  # Already removed
                 return True
             db.delete(favorite)
             return True
 
-    def list_user_favorites(self, user_id: UUID) -> list[Favorite]:
+        return run_transaction(get_db_session, work)
+
+    def list_user_favorites(
+        self,
+        user_id: UUID,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[Favorite]:
         """List a User's Favorites.
 
         Return all favorites for a user, ordered by created_at DESC (most recent first).
         This intentionally returns the Favorite objects (with .request relationship available
         if your model defines it as eager/joined).
+        With fields (sparse fieldset), only their columns are loaded.
         """
-        with get_db_session() as db:
+        with get_db_session(read_only=True) as db:
+            query = db.query(Favorite)
+            if fields is not None:
+                columns = [getattr(Favorite, name) for name in dict.fromkeys(("id", *fields))]
+                query = query.options(load_only(*columns))
             return (
-                db.query(Favorite)
+                query
                 .filter(Favorite.user_id == user_id)
                 .order_by(desc(Favorite.created_at))
                 .all()
             )
+
+    def page_of_user_favorites(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        """Page of the favorites of a user, newest first (see user_favorites_query)."""
+        with get_db_session(read_only=True) as db:
+            query = user_favorites_query(user_id, limit + 1, cursor, fields)
+            rows = db.execute(query).scalars().all()
+        favorites, pagination = recency_page(rows, limit)
+        return {"favorites": favorites, "pagination": pagination}
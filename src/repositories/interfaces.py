@@ -5,9 +5,11 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+from src.lib.pagination import newest_first
+from src.lib.request_stats import CounterReconcileReport
 from src.models.favorite import Favorite
 from src.models.request import Request
-from src.schemas.request import RequestCreate
+from src.schemas.request import LocationFilter, RequestCreate
 
 
 # FIXME: For every method should return whether Request or Union of sub types
@@ -17,13 +19,31 @@ class RequestRepositoryInterface(ABC):  # noqa: D101
         """Create a new request with its specific subtype."""
 
     @abstractmethod
-    def get_by_id(self, request_id: UUID) -> Request | None:
-        """Get a request by its ID."""
+    def get_by_id(self, request_id: UUID, fields: tuple[str, ...] | None = None) -> Request | None:
+        """Get a request by its ID (fields: sparse fieldset, see src/lib/fields.py)."""
 
     @abstractmethod
-    def get_user_requests(self, user_id: UUID) -> list[Request]:
+    def get_user_requests(
+        self,
+        user_id: UUID,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[Request]:
         """Get requests of a user."""
 
+    def page_of_user_requests(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        """Page of the requests of a user, newest first (see src/lib/pagination.py).
+
+        Default: paged in memory over get_user_requests (users own few requests).
+        """
+        requests, pagination = newest_first(self.get_user_requests(user_id, fields), limit, cursor)
+        return {"requests": requests, "pagination": pagination}
+
     # TODO: @abstractmethod
     def get_batch_from_last_item(
         self,
@@ -32,10 +52,28 @@ class RequestRepositoryInterface(ABC):  # noqa: D101
     ) -> list[Request]:
         """Get a batch of requests with pagination."""
 
-    # TODO: @abstractmethod
+    @abstractmethod
     def get_batch_from_due_date(self, start_due_date: datetime, limit: int = 20) -> list[Request]:
         """Get a batch of requests starting from specific due date."""
 
+    @abstractmethod
+    def list_of_requests(  # noqa: PLR0913
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        near: LocationFilter | None = None,
+    ) -> dict[str, Any]:
+        """Page of the requests, earliest due date first (see RequestRepository).
+
+        near is a locality hint, not a filter: a sharded backend only reads the shards around it
+        (see src/db/shards.py), the others ignore it. Internal callers only: the public list
+        endpoint never sets it, since results would then depend on the deployment.
+        """
+
     @abstractmethod
     def update(self, request_id: UUID, data: dict[str, Any]) -> Request | None:
         """Update request fields."""
@@ -44,6 +82,14 @@ class RequestRepositoryInterface(ABC):  # noqa: D101
     def delete(self, request_id: UUID) -> bool:
         """Delete a request by ID."""
 
+    @abstractmethod
+    def get_stats(self) -> dict[str, Any]:
+        """Feed facets counts, read from the maintained counters."""
+
+    @abstractmethod
+    def reconcile_stats(self) -> CounterReconcileReport:
+        """Correct the counters from the requests themselves."""
+
 
 class FavoriteRepositoryInterface(ABC):
     """Interface for managing user favorites."""
@@ -61,5 +107,104 @@ class FavoriteRepositoryInterface(ABC):
         """Delete a favorite by its ID."""
 
     @abstractmethod
-    def list_user_favorites(self, user_id: UUID) -> list[Favorite]:
+    def get_user_favorite(self, user_id: UUID, request_id: UUID) -> Favorite | None:
+        """Get the favorite of a user for a request, if any."""
+
+    @abstractmethod
+    def list_user_favorites(
+        self,
+        user_id: UUID,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[Favorite]:
+        """List all favorites for a given user with no pagination."""
+
+    def page_of_user_favorites(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        """Page of the favorites of a user, newest first (see src/lib/pagination.py).
+
+        Default: paged in memory over list_user_favorites.
+        """
+        favorites, pagination = newest_first(
+            self.list_user_favorites(user_id, fields),
+            limit,
+            cursor,
+        )
+        return {"favorites": favorites, "pagination": pagination}
+
+
+# NOTE: Async variants (SQLAlchemy asyncio), same contracts, awaitable methods
+class AsyncRequestRepositoryInterface(ABC):  # noqa: D101
+    @abstractmethod
+    async def create(self, user_id: UUID, request_data: RequestCreate) -> Request:
+        """Create a new request with its specific subtype."""
+
+    @abstractmethod
+    async def get_by_id(self, request_id: UUID) -> Request | None:
+        """Get a request by its ID."""
+
+    @abstractmethod
+    async def get_user_requests(self, user_id: UUID) -> list[Request]:
+        """Get requests of a user."""
+
+    async def page_of_user_requests(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """Page of the requests of a user, newest first (see src/lib/pagination.py).
+
+        Default: paged in memory over get_user_requests.
+        """
+        requests, pagination = newest_first(await self.get_user_requests(user_id), limit, cursor)
+        return {"requests": requests, "pagination": pagination}
+
+    @abstractmethod
+    async def update(self, request_id: UUID, data: dict[str, Any]) -> Request | None:
+        """Update request fields."""
+
+    @abstractmethod
+    async def delete(self, request_id: UUID) -> bool:
+        """Delete a request by ID."""
+
+
+class AsyncFavoriteRepositoryInterface(ABC):
+    """Interface for managing user favorites (async)."""
+
+    @abstractmethod
+    async def create(self, user_id: UUID, request_id: UUID) -> Favorite:
+        """Create a new favorite for a user (idempotent)."""
+
+    @abstractmethod
+    async def get_by_id(self, favorite_id: UUID) -> Favorite | None:
+        """Get a favorite by its ID."""
+
+    @abstractmethod
+    async def delete(self, favorite_id: UUID) -> bool:
+        """Delete a favorite by its ID."""
+
+    @abstractmethod
+    async def get_user_favorite(self, user_id: UUID, request_id: UUID) -> Favorite | None:
+        """Get the favorite of a user for a request, if any."""
+
+    @abstractmethod
+    async def list_user_favorites(self, user_id: UUID) -> list[Favorite]:
         """List all favorites for a given user with no pagination."""
+
+    async def page_of_user_favorites(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """Page of the favorites of a user, newest first (see src/lib/pagination.py).
+
+        Default: paged in memory over list_user_favorites.
+        """
+        favorites, pagination = newest_first(await self.list_user_favorites(user_id), limit, cursor)
+        return {"favorites": favorites, "pagination": pagination}
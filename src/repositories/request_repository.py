@@ -2,21 +2,64 @@
 
 import base64
 import json
-from datetime import datetime
-from typing import Any
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, TypeVar
 from uuid import UUID
 
-from sqlalchemy import and_, asc, or_
-
-from src.db.session import get_db_session
+from sqlalchemy import (
+    Delete,
+    Engine,
+    Insert,
+    Select,
+    Update,
+    and_,
+    asc,
+    delete,
+    desc,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session, load_only, noload
+
+from src.config import DATABASE_SHARDS, REPOSITORY_BACKEND
+from src.db.request_counters import (
+    counter_upsert,
+    read_counters,
+    reconcile_request_counters,
+    request_counter_deltas,
+)
+from src.db.session import create_session_factory, engine, get_db_session, open_session
+from src.db.transactions import run_transaction
+from src.lib.feed import AFTER_ALL_IDS, NO_DUE_DATE, feed_key, format_date, parse_feed_key
+from src.lib.fragment_cache import get_fragment_cache, request_version
+from src.lib.ids import uuid7
+from src.lib.pagination import decode_recency_cursor, recency_page
+from src.lib.request_stats import (
+    CounterReconcileReport,
+    counter_shard,
+    stats_from_counts,
+    stats_keys,
+    utc_today,
+)
+from src.lib.search import query_tokens, token_weights
+from src.models.layout import is_single_table
 from src.models.request import (
+    ALL_LOCATION_COLUMNS,
+    LOCATION_COLUMNS,
     BuyAndDeliverRequest,
     OnlineServiceRequest,
     PickupAndDeliverRequest,
     Request,
+    RequestFeedEntry,
+    RequestSearchToken,
 )
 from src.repositories.interfaces import RequestRepositoryInterface
-from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+from src.schemas.request import LocationFilter, RequestCreate, RequestType, RequestUpdate
+
+T = TypeVar("T")
 
 _request_repo_instance = None
 
@@ -29,56 +72,395 @@ _request_repo_instance = None
 # Actually, get_db_session, for now creates a new session for every call, so we are safe.
 # I am keeping this in case I move out from Lambda to something like FlaskAPI/FastAPI, where I can
 # reuse long running sessions. AWS Lambda are short lived/running environments.
-def get_request_repository() -> "RequestRepository":
-    """Get a request repository instance."""
+def get_request_repository() -> RequestRepositoryInterface:
+    """Get a request repository instance (of the configured REPOSITORY_BACKEND).
+
+    Behind the database circuit breaker (see src/repositories/circuit_breaking_repository.py).
+    """
     global _request_repo_instance  # noqa: PLW0603
     if _request_repo_instance is None:
-        _request_repo_instance = RequestRepository()
+        from src.repositories.circuit_breaking_repository import with_circuit_breaker  # noqa: PLC0415
+
+        if REPOSITORY_BACKEND == "dynamodb":
+            from src.repositories.dynamodb_request_repository import (  # noqa: PLC0415
+                DynamoDBRequestRepository,
+            )
+
+            repository = DynamoDBRequestRepository()
+        elif DATABASE_SHARDS:
+            from src.db.shards import get_shard_router  # noqa: PLC0415
+            from src.repositories.sharded_request_repository import (  # noqa: PLC0415
+                ShardedRequestRepository,
+            )
+
+            repository = ShardedRequestRepository(get_shard_router())
+        else:
+            repository = RequestRepository()
+        _request_repo_instance = with_circuit_breaker(repository)
     return _request_repo_instance
 
 
-class RequestRepository(RequestRepositoryInterface):
-    """Request Repository containing all necessary methods."""
+# Columns loaded by every sparse query: identity, type (locations) and the keyset cursor
+_SPARSE_REQUIRED_COLUMNS = ("id", "type", "due_date", "created_at")
+
+
+def request_load_options(fields: tuple[str, ...] | None = None) -> tuple:
+    """Loader options of Request queries for the configured storage layout.
+
+    Subtypes are always eager loaded with a JOIN in the joined layout; the single table layout
+    has no subtype rows, so the joins are skipped.
+    With fields (sparse fieldsets, see src/lib/fields.py) only their columns are loaded, and the
+    subtypes are not joined when no location field is requested.
+    """
+    single_table = is_single_table()
+    options: tuple = ()
+    if single_table or (fields is not None and not set(fields).intersection(ALL_LOCATION_COLUMNS)):
+        options = (
+            noload(Request.buy_and_deliver),
+            noload(Request.pickup_and_deliver),
+            noload(Request.online_service),
+        )
+    if fields is not None:
+        columns = dict.fromkeys((*_SPARSE_REQUIRED_COLUMNS, *fields))
+        if not single_table:
+            columns = [name for name in columns if name not in ALL_LOCATION_COLUMNS]
+        options = (*options, load_only(*(getattr(Request, name) for name in columns)))
+    return options
+
+
+def build_request(
+    user_id: UUID,
+    input_request: RequestCreate,
+    request_id: UUID | None = None,
+) -> Request:
+    """Build a new Request with its specific subtype (not added to any session)."""
+    request = Request(
+        # Set ahead of the flush defaults: the feed projection row renders them
+        id=request_id or uuid7(),
+        created_at=datetime.now(UTC),
+        user_id=user_id,
+        type=input_request.type,
+        title=input_request.title,
+        description=input_request.description,
+        due_date=input_request.due_date,
+    )
+
+    if is_single_table() and input_request.type in LOCATION_COLUMNS:
+        # Single table layout: one row, locations on the request itself
+        for column in LOCATION_COLUMNS[input_request.type]:
+            setattr(request, column, getattr(input_request, column))
+
+    elif input_request.type == RequestType.BUY_AND_DELIVER:
+        subtype = BuyAndDeliverRequest(
+            request_id=request.id,
+            dropoff_latitude=input_request.dropoff_latitude,
+            dropoff_longitude=input_request.dropoff_longitude,
+        )
+        request.buy_and_deliver = subtype
+
+    elif input_request.type == RequestType.PICKUP_AND_DELIVER:
+        subtype = PickupAndDeliverRequest(
+            request_id=request.id,
+            pickup_latitude=input_request.pickup_latitude,
+            pickup_longitude=input_request.pickup_longitude,
+            dropoff_latitude=input_request.dropoff_latitude,
+            dropoff_longitude=input_request.dropoff_longitude,
+        )
+        request.pickup_and_deliver = subtype
+
+    elif input_request.type == RequestType.ONLINE_SERVICE:
+        subtype = OnlineServiceRequest(
+            request_id=request.id,
+            meetup_latitude=input_request.meetup_latitude,
+            meetup_longitude=input_request.meetup_longitude,
+        )
+        request.online_service = subtype
+
+    else:
+        exception_msg = "New request type was added but not integrated here"
+        raise ValueError(exception_msg)
+
+    request.index_search_tokens()
+    request.index_feed_entry()
+    return request
+
+
+def delete_search_tokens(request_id: UUID) -> Delete:
+    """Statement removing a request from the search index."""
+    return delete(RequestSearchToken).where(RequestSearchToken.request_id == request_id)
+
+
+def build_search_tokens(request: Request) -> list[RequestSearchToken]:
+    """Search index rows of an existing request (after its title / description changed)."""
+    return [
+        RequestSearchToken(request_id=request.id, token=token, weight=weight)
+        for token, weight in token_weights(request.title, request.description).items()
+    ]
+
+
+def delete_feed_entry(request_id: UUID) -> Delete:
+    """Statement removing a request from the feed projection."""
+    return delete(RequestFeedEntry).where(RequestFeedEntry.request_id == request_id)
+
+
+def refresh_feed_entry(request: Request) -> Update:
+    """Statement re-rendering the feed fragment of an updated request (sort key unchanged)."""
+    return (
+        update(RequestFeedEntry)
+        .where(RequestFeedEntry.request_id == request.id)
+        .values(fragment=request.to_json_fragment())
+    )
+
+
+def update_counters(db: Any, request: Request, delta: int) -> Insert:  # noqa: ANN401
+    """Statement counting a created (delta 1) or deleted (delta -1) request in the feed stats."""
+    return counter_upsert(
+        db.get_bind().dialect.name,
+        request_counter_deltas(request, delta),
+        counter_shard(),
+    )
+
+
+def search_matches(tokens: list[str]):  # noqa
+    """Subquery of (request_id, score) of requests containing all tokens.
+
+    The score is the sum of the tokens weights (title words weigh more than description ones).
+    """
+    return (
+        select(
+            RequestSearchToken.request_id.label("request_id"),
+            func.sum(RequestSearchToken.weight).label("score"),
+        )
+        .where(RequestSearchToken.token.in_(tokens))
+        .group_by(RequestSearchToken.request_id)
+        .having(func.count() == len(tokens))
+        .subquery("search_matches")
+    )
+
+
+def user_requests_query(
+    user_id: UUID,
+    limit: int,
+    cursor: str | None,
+    fields: tuple[str, ...] | None = None,
+) -> Select:
+    """Next limit requests of a user after a cursor, newest first (keyset on created_at, id)."""
+    query = select(Request).options(*request_load_options(fields)).where(Request.user_id == user_id)
+    if cursor:
+        created_at, request_id = decode_recency_cursor(cursor)
+        query = query.where(
+            or_(
+                Request.created_at < created_at,
+                and_(Request.created_at == created_at, Request.id < request_id),
+            ),
+        )
+    return query.order_by(desc(Request.created_at), desc(Request.id)).limit(limit)
+
+
+class RequestCursorMixin:
+    """Keyset cursors of list_of_requests (shared by the sync and async repositories)."""
 
-    def create(self, user_id: "UUID", input_request: "RequestCreate") -> Request:
-        with get_db_session() as db:
-            request = Request(
-                user_id=user_id,
-                type=input_request.type,
-                title=input_request.title,
-                description=input_request.description,
-                due_date=input_request.due_date,
+    def _generate_next_cursor(self, last_request: Request) -> str:
+        """Generate Next Cursor For List Pagination.
+
+        Generate cursor from the last request in the current page.
+        """
+        return self._encode_cursor(last_request.due_date, last_request.created_at, last_request.id)
+
+    def _encode_cursor(
+        self,
+        due_date: datetime | None,
+        created_at: datetime,
+        request_id: UUID,
+    ) -> str:
+        cursor_data = {
+            "due_date": due_date.isoformat() if due_date else None,
+            "created_at": created_at.isoformat(),
+            "id": str(request_id),
+        }
+
+        cursor_json = json.dumps(cursor_data)
+        return base64.b64encode(cursor_json.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> dict[str, Any]:
+        """Decode and parse cursor data."""
+        try:
+            cursor_json = base64.b64decode(cursor.encode()).decode()
+            cursor_data: dict = json.loads(cursor_json)
+
+            # Parse dates back to datetime objects
+            if cursor_data.get("due_date"):
+                cursor_data["due_date"] = datetime.fromisoformat(cursor_data["due_date"])
+            cursor_data["created_at"] = datetime.fromisoformat(cursor_data["created_at"])
+            # Cursors generated before the id tiebreaker was added do not carry it
+            cursor_data["id"] = UUID(cursor_data["id"]) if cursor_data.get("id") else None
+
+            return cursor_data
+        except (ValueError, KeyError, json.JSONDecodeError) as e:
+            exception_msg = "Invalid cursor"
+            raise ValueError(exception_msg) from e
+
+    def _generate_search_cursor(self, score: int, last_request: Request) -> str:
+        """Keyset cursor of search results: (score DESC, id DESC)."""
+        cursor_json = json.dumps({"score": int(score), "id": str(last_request.id)})
+        return base64.b64encode(cursor_json.encode()).decode()
+
+    def _decode_search_cursor(self, cursor: str) -> tuple[int, UUID]:
+        try:
+            cursor_data = json.loads(base64.b64decode(cursor.encode()).decode())
+            return int(cursor_data["score"]), UUID(cursor_data["id"])
+        except (ValueError, KeyError, TypeError, json.JSONDecodeError) as e:
+            exception_msg = "Invalid cursor"
+            raise ValueError(exception_msg) from e
+
+    def _feed_rows_query(
+        self,
+        request_type: str | None,
+        limit: int,
+        cursor: str | None,
+        due_after: datetime | None,
+        due_before: datetime | None,
+    ) -> Select:
+        """Next limit (feed_key, fragment) rows of the feed after a cursor (see list_feed)."""
+        if due_after and due_before and due_after >= due_before:
+            exception_msg = "due_after must be before due_before"
+            raise ValueError(exception_msg)
+        query = select(RequestFeedEntry.feed_key, RequestFeedEntry.fragment)
+        if request_type:
+            query = query.where(RequestFeedEntry.type == request_type)
+        if due_after:
+            # "~" keys (no due date) are after every date: excluded by the upper bound
+            query = query.where(
+                RequestFeedEntry.feed_key >= format_date(due_after),
+                RequestFeedEntry.feed_key < NO_DUE_DATE,
+            )
+        if due_before:
+            query = query.where(RequestFeedEntry.feed_key < format_date(due_before))
+        if cursor:
+            cursor_data = self._decode_cursor(cursor)
+            # Legacy cursors without id skip the requests sharing their dates, as in
+            # list_of_requests
+            last_key = feed_key(
+                cursor_data["due_date"],
+                cursor_data["created_at"],
+                cursor_data["id"] or AFTER_ALL_IDS,
             )
+            query = query.where(RequestFeedEntry.feed_key > last_key)
+        return query.order_by(RequestFeedEntry.feed_key).limit(limit)
+
+    def _feed_page(self, rows: list, limit: int) -> dict[str, Any]:
+        """list_feed page of the first limit rows of limit + 1 fetched ones."""
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = self._encode_cursor(*parse_feed_key(rows[-1].feed_key))
+        return {
+            "fragments": [row.fragment for row in rows],
+            "pagination": {
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "limit": limit,
+            },
+        }
 
-            if input_request.type == RequestType.BUY_AND_DELIVER:
-                subtype = BuyAndDeliverRequest(
-                    request_id=request.id,
-                    dropoff_latitude=input_request.dropoff_latitude,
-                    dropoff_longitude=input_request.dropoff_longitude,
-                )
-                request.buy_and_deliver = subtype
-
-            elif input_request.type == RequestType.PICKUP_AND_DELIVER:
-                subtype = PickupAndDeliverRequest(
-                    request_id=request.id,
-                    pickup_latitude=input_request.pickup_latitude,
-                    pickup_longitude=input_request.pickup_longitude,
-                    dropoff_latitude=input_request.dropoff_latitude,
-                    dropoff_longitude=input_request.dropoff_longitude,
-                )
-                request.pickup_and_deliver = subtype
+    def _apply_due_date_window(self, query, due_after, due_before):  # noqa
+        """Filter on a due date window, return (query, whether a window applies)."""
+        if due_after and due_before and due_after >= due_before:
+            exception_msg = "due_after must be before due_before"
+            raise ValueError(exception_msg)
+        if due_after:
+            query = query.filter(Request.due_date >= due_after)
+        if due_before:
+            query = query.filter(Request.due_date < due_before)
+        return query, bool(due_after or due_before)
+
+    def _feed_order(self, windowed: bool) -> tuple:  # noqa: FBT001
+        """Order by (due_date NULLS LAST, created_at, id).
+
+        Inside a due date window there is no NULL due date: NULLS LAST is left out, so that
+        databases sorting NULLs first in indexes (SQLite) read the index in order instead of
+        sorting the whole window.
+        """
+        due_date = asc(Request.due_date) if windowed else asc(Request.due_date).nulls_last()
+        return (
+            due_date,  # Earlier due_dates first, NULLs last
+            asc(Request.created_at),  # Older requests first for same due_date AND for NULL ones
+            asc(Request.id),  # Unique tiebreaker (UUIDv7: creation ordered too)
+        )
+
+    def _apply_cursor_filter(self, query, cursor_data, windowed=False):  # noqa
+        """Apply cursor filter on (due_date NULLS LAST, created_at, id)."""
+        due_date = cursor_data["due_date"]
+        created_at = cursor_data["created_at"]
+        last_id = cursor_data["id"]
+
+        # Same created_at: only requests with a greater id come after (legacy cursors without id
+        # keep the previous behaviour and skip them)
+        after_created_at = Request.created_at > created_at
+        if last_id is not None:
+            after_created_at = or_(
+                after_created_at,
+                and_(Request.created_at == created_at, Request.id > last_id),
+            )
 
-            elif input_request.type == RequestType.ONLINE_SERVICE:
-                subtype = OnlineServiceRequest(
-                    request_id=request.id,
-                    meetup_latitude=input_request.meetup_latitude,
-                    meetup_longitude=input_request.meetup_longitude,
-                )
-                request.online_service = subtype
+        if due_date and windowed:
+            # No NULL due date in a window: the redundant lower bound lets the next page start
+            # with a seek on the due_date index right at the cursor position
+            query = query.filter(Request.due_date >= due_date)
 
-            else:
-                exception_msg = "New request type was added but not integrated here"
-                raise ValueError(exception_msg)
+        if due_date:
+            # Case 1: due_date is not NULL in cursor
+            condition = or_(
+                # Requests with later due_date (should come after)
+                Request.due_date > due_date,
+                # Requests with same due_date but created after (should come after)
+                and_(Request.due_date == due_date, after_created_at),
+                # Requests with NULL due_date (these come last)
+                Request.due_date.is_(None),
+            )
+        else:
+            # Case 2: cursor had NULL due_date (we're in the NULL section)
+            condition = and_(Request.due_date.is_(None), after_created_at)
+
+        return query.filter(condition)
+
+
+class RequestRepository(RequestCursorMixin, RequestRepositoryInterface):
+    """Request Repository containing all necessary methods.
+
+    Works on the main database, or on the database of a regional shard given its engine, index and
+    reader (see src/db/shards.py): ids of the requests it creates then carry the shard index.
+    """
+
+    def __init__(
+        self,
+        shard_engine: Engine | None = None,
+        shard: int | None = None,
+        shard_read_engine: Engine | None = None,
+    ) -> None:
+        self.engine = shard_engine
+        self.shard = shard
+        self._session_factory = self._read_session_factory = None
+        if shard_engine is not None:
+            self._session_factory = create_session_factory(shard_engine)
+            self._read_session_factory = self._session_factory
+            if shard_read_engine is not None and shard_read_engine is not shard_engine:
+                self._read_session_factory = create_session_factory(shard_read_engine)
+
+    def _session(self, read_only: bool = False):  # noqa
+        """Session of the repository database (read_only: of its reader, see open_session)."""
+        if self._session_factory is None:
+            return get_db_session(read_only=read_only)
+        return open_session(self._session_factory, self._read_session_factory, read_only)
+
+    def _transaction(self, work: Callable[[Session], T]) -> T:
+        """Result of a unit of work on the writer, replayed on conflicts (see run_transaction)."""
+        return run_transaction(self._session, work)
+
+    def create(self, user_id: "UUID", input_request: "RequestCreate") -> Request:
+        def work(db: Session) -> Request:
+            request = build_request(user_id, input_request, uuid7(self.shard))
 
             # NOTE: we are still inside of a context manager block
             # So still no commit. The commit happends automatically
@@ -86,54 +468,93 @@ class RequestRepository(RequestRepositoryInterface):
 
             # SINGLE OPERATION - cascade handles everything
             db.add(request)
+            db.execute(update_counters(db, request, 1))
             return request
 
-    def get_by_id(self, request_id: UUID) -> Request | None:
-        with get_db_session() as db:
-            return db.query(Request).filter(Request.id == request_id).first()
+        return self._transaction(work)
+
+    def get_by_id(self, request_id: UUID, fields: tuple[str, ...] | None = None) -> Request | None:
+        with self._session(read_only=True) as db:
+            return (
+                db.query(Request)
+                .options(*request_load_options(fields))
+                .filter(Request.id == request_id)
+                .first()
+            )
+
+    def get_user_requests(
+        self,
+        user_id: UUID,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[Request]:
+        with self._session(read_only=True) as db:
+            return (
+                db.query(Request)
+                .options(*request_load_options(fields))
+                .filter(Request.user_id == user_id)
+                .all()
+            )
+
+    def page_of_user_requests(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        """Page of the requests of a user, newest first (see user_requests_query)."""
+        with self._session(read_only=True) as db:
+            query = user_requests_query(user_id, limit + 1, cursor, fields)
+            rows = db.execute(query).scalars().all()
+        requests, pagination = recency_page(rows, limit)
+        return {"requests": requests, "pagination": pagination}
 
-    def get_user_requests(self, user_id: UUID) -> list[Request]:
-        with get_db_session() as db:
-            return db.query(Request).filter(Request.user_id == user_id).all()
+    def get_batch_from_due_date(self, start_due_date: datetime, limit: int = 20) -> list[Request]:
+        return self.list_of_requests(limit=limit, due_after=start_due_date)["requests"]
 
-    # FIXME: The list is not working properly, and has a bug when create_at and due_date are
-    # the same in two requests. This is expected as they are necessarly unique (though it is
-    # a possible rare case due to millisecond precision on both attributes)
-    def list_of_requests(
+    def list_of_requests(  # noqa: PLR0913
         self,
         request_type: str | None = None,
         limit: int = 20,
         cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        near: LocationFilter | None = None,  # noqa: ARG002
     ) -> dict[str, Any]:
         """List Requests in pagination mode.
 
         Fetch paginated requests with proper cursor-based pagination.
         Earlier due dates show first, later due dates show after.
         Requests without due_date come last, ordered by created_at ASC (oldest first).
-        Uses only date fields for ordering (UUIDs are random).
+        The id is the last tiebreaker, so that requests sharing the same dates are neither
+        skipped nor repeated across pages.
+
+        due_after (inclusive) / due_before (exclusive) restrict the list to a due date window,
+        which excludes requests without due date.
+
+        fields only loads the columns of these response fields (see request_load_options).
+        near is a locality hint for sharded databases, ignored here: the whole database is read.
         """
-        with get_db_session() as db:
+        with self._session(read_only=True) as db:
             try:
                 # Build base query
-                query = db.query(Request)
+                query = db.query(Request).options(*request_load_options(fields))
 
                 # Apply type filter if provided
                 if request_type:
                     query = query.filter(Request.type == request_type)
 
+                # Apply due date window if provided (range seek on the due_date indexes)
+                query, windowed = self._apply_due_date_window(query, due_after, due_before)
+
                 # Apply cursor-based pagination
                 if cursor:
                     cursor_data = self._decode_cursor(cursor)
-                    query = self._apply_cursor_filter(query, cursor_data)
-
-                # Order by due_date ASC (earlier first), NULLS LAST, then created_at ASC
-                # No ID ordering since UUIDs are random
-                query = query.order_by(
-                    asc(Request.due_date).nulls_last(),  # Earlier due_dates first, NULLs last
-                    asc(
-                        Request.created_at,
-                    ),  # Older requests first for same due_date AND for NULL due_dates
-                )
+                    query = self._apply_cursor_filter(query, cursor_data, windowed)
+
+                # Order by due_date ASC (earlier first), NULLS LAST, then created_at ASC, then id
+                query = query.order_by(*self._feed_order(windowed))
 
                 # Get one extra item to check if there's more
                 requests = query.limit(limit + 1).all()
@@ -161,78 +582,165 @@ class RequestRepository(RequestRepositoryInterface):
                 exception_msg = f"Error listing requests: {e!r}"
                 raise Exception(exception_msg) from e
 
+    def list_feed(  # noqa: PLR0913
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        near: LocationFilter | None = None,  # noqa: ARG002
+    ) -> dict[str, Any]:
+        """Same page as list_of_requests, read from the feed projection.
+
+        Returns the pre-rendered JSON fragments of the requests (see RequestFeedEntry) instead
+        of Request objects: one range read on the feed_key index, no join. Cursors are the
+        list_of_requests ones, both can be used to resume each other.
+        """
+        rows = self.feed_rows(request_type, limit + 1, cursor, due_after, due_before)
+        return self._feed_page(rows, limit)
+
+    def feed_rows(  # noqa: PLR0913
+        self,
+        request_type: str | None,
+        limit: int,
+        cursor: str | None,
+        due_after: datetime | None,
+        due_before: datetime | None,
+    ) -> list:
+        """Next (feed_key, fragment) rows of the feed after a cursor, in feed_key order."""
+        query = self._feed_rows_query(request_type, limit, cursor, due_after, due_before)
+        with self._session(read_only=True) as db:
+            return db.execute(query).all()
+
+    def search_requests(  # noqa: PLR0913
+        self,
+        query: str,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        near: LocationFilter | None = None,  # noqa: ARG002
+    ) -> dict[str, Any]:
+        """Full-text search over title and description.
+
+        Requests containing every word of the query, best ranked first (see search_matches),
+        newest first for the same score. Keyset paginated on (score, id).
+        Can be restricted to a due date window, as list_of_requests.
+        """
+        rows = self.search_rows(
+            query,
+            request_type,
+            limit + 1,
+            cursor,
+            due_after,
+            due_before,
+            fields,
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = self._generate_search_cursor(rows[-1].score, rows[-1].Request)
+
+        return {
+            "requests": [row.Request for row in rows],
+            "pagination": {
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "limit": limit,
+            },
+        }
+
+    def search_rows(  # noqa: PLR0913
+        self,
+        query: str,
+        request_type: str | None,
+        limit: int,
+        cursor: str | None,
+        due_after: datetime | None,
+        due_before: datetime | None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list:
+        """Next (Request, score) rows of a search after a cursor, in (score DESC, id DESC) order."""
+        matches = search_matches(query_tokens(query))
+        with self._session(read_only=True) as db:
+            db_query = (
+                db.query(Request, matches.c.score)
+                .options(*request_load_options(fields))
+                .join(matches, matches.c.request_id == Request.id)
+            )
+            if request_type:
+                db_query = db_query.filter(Request.type == request_type)
+            db_query, _ = self._apply_due_date_window(db_query, due_after, due_before)
+            if cursor:
+                last_score, last_id = self._decode_search_cursor(cursor)
+                db_query = db_query.filter(
+                    or_(
+                        matches.c.score < last_score,
+                        and_(matches.c.score == last_score, Request.id < last_id),
+                    ),
+                )
+            return db_query.order_by(desc(matches.c.score), desc(Request.id)).limit(limit).all()
+
     def update(self, request_id: UUID, request_update: RequestUpdate) -> Request:
-        with get_db_session() as db:
+        def work(db: Session) -> Request:
             # Apply updates
-            request = db.query(Request).filter(Request.id == request_id).first()
+            request = (
+                db.query(Request)
+                .options(*request_load_options())
+                .filter(Request.id == request_id)
+                .first()
+            )
             if not request:
                 exception_msg = "Workflow should not be happening"
                 raise Exception(exception_msg)
 
-            for attr, value in request_update.model_dump(exclude_unset=True).items():
+            changes = request_update.model_dump(exclude_unset=True)
+            for attr, value in changes.items():
                 setattr(request, attr, value)
+            request.version = request_version(request) + 1
+            get_fragment_cache().invalidate(request.id)
+
+            # Keep the search index and the feed projection in sync, in the same transaction
+            if changes.keys() & {"title", "description"}:
+                db.execute(delete_search_tokens(request.id))
+                db.add_all(build_search_tokens(request))
+            db.execute(refresh_feed_entry(request))
             return request
 
+        return self._transaction(work)
+
     def delete(self, request_id: UUID) -> bool:
-        with get_db_session() as db:
-            req = db.query(Request).filter(Request.id == request_id).first()
+        def work(db: Session) -> bool:
+            req = (
+                db.query(Request)
+                .options(*request_load_options())
+                .filter(Request.id == request_id)
+                .first()
+            )
             if not req:
                 return True
+            db.execute(delete_search_tokens(req.id))
+            db.execute(delete_feed_entry(req.id))
+            db.execute(update_counters(db, req, -1))
             db.delete(req)
+            get_fragment_cache().invalidate(req.id)
             return True
 
-    def _generate_next_cursor(self, last_request: Request) -> str:
-        """Generate Next Cursor For List Pagination.
-
-        Generate cursor from the last request in the current page.
-        Only uses date fields since IDs are random UUIDs.
-        """
-        cursor_data = {
-            "due_date": last_request.due_date.isoformat() if last_request.due_date else None,
-            "created_at": last_request.created_at.isoformat(),
-        }
-
-        cursor_json = json.dumps(cursor_data)
-        return base64.b64encode(cursor_json.encode()).decode()
+        return self._transaction(work)
 
-    def _decode_cursor(self, cursor: str) -> dict[str, Any]:
-        """Decode and parse cursor data."""
-        try:
-            cursor_json = base64.b64decode(cursor.encode()).decode()
-            cursor_data: dict = json.loads(cursor_json)
+    def get_stats(self) -> dict[str, Any]:
+        """Feed facets counts: total, per type and per due date bucket (see request_stats)."""
+        today = utc_today()
+        return stats_from_counts(self.counters(stats_keys(today)), today)
 
-            # Parse dates back to datetime objects
-            if cursor_data.get("due_date"):
-                cursor_data["due_date"] = datetime.fromisoformat(cursor_data["due_date"])
-            cursor_data["created_at"] = datetime.fromisoformat(cursor_data["created_at"])
+    def counters(self, keys: list[str]) -> dict[str, int]:
+        """Sums of the feed stats counters of keys."""
+        with self._session(read_only=True) as db:
+            return read_counters(db, keys)
 
-            return cursor_data
-        except (ValueError, json.JSONDecodeError) as e:
-            exception_msg = "Invalid cursor"
-            raise ValueError(exception_msg) from e
-
-    def _apply_cursor_filter(self, query, cursor_data):  # noqa
-        """Apply cursor filter using only date fields.
-
-        Since UUIDs are random, we accept that items with identical dates might have minor
-        pagination issues.
-        """
-        due_date = cursor_data["due_date"]
-        created_at = cursor_data["created_at"]
-
-        if due_date:
-            # Case 1: due_date is not NULL in cursor
-            condition = or_(
-                # Requests with later due_date (should come after)
-                Request.due_date > due_date,
-                # Requests with same due_date but newer created_at (should come after)
-                and_(Request.due_date == due_date, Request.created_at > created_at),
-                # Requests with NULL due_date (these come last)
-                Request.due_date.is_(None),
-            )
-        else:
-            # Case 2: cursor had NULL due_date (we're in the NULL section)
-            # Simply get requests with newer created_at
-            condition = Request.created_at > created_at
-
-        return query.filter(condition)
+    def reconcile_stats(self) -> CounterReconcileReport:
+        return reconcile_request_counters(self.engine or engine)
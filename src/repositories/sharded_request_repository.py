@@ -0,0 +1,218 @@
+"""Request Repository Over Regional Shards.
+
+One RequestRepository per shard (see src/db/shards.py), routed:
+- create by the anchor point of the request
+- get_by_id / update / delete by the shard carried by the id, then the main database (requests
+  created before sharding)
+- lists and searches on every shard, or on the shards a radius may overlap (near)
+
+Keyset pages of the shards are merged: every shard returns its next page after the same cursor
+(the cursor is a position in the global order, not in a shard), the pages are merged in that order
+and cut at the limit. A request of the merged page is always in the page of its own shard, so
+nothing is skipped, and the cursor of the last request resumes every shard.
+
+NOTE: Favorites stay in the main database. The async request repository runs this one in threads
+(see get_async_request_repository).
+"""
+
+import functools
+import heapq
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any, TypeVar
+from uuid import UUID
+
+from src.db.shards import Shard, ShardRouter, anchor_point
+from src.lib.concurrency import run_concurrently
+from src.lib.feed import feed_key, parse_feed_key
+from src.lib.request_stats import CounterReconcileReport, stats_from_counts, stats_keys, utc_today
+from src.models.request import Request
+from src.repositories.interfaces import RequestRepositoryInterface
+from src.repositories.request_repository import RequestCursorMixin, RequestRepository
+from src.schemas.request import LocationFilter, RequestCreate, RequestUpdate
+
+T = TypeVar("T")
+
+
+def _feed_position(request: Request) -> str:
+    return feed_key(request.due_date, request.created_at, request.id)
+
+
+def _pagination(
+    next_cursor: str | None,
+    has_more: bool,  # noqa: FBT001
+    limit: int,
+) -> dict[str, Any]:
+    return {"next_cursor": next_cursor, "has_more": has_more, "limit": limit}
+
+
+class ShardedRequestRepository(RequestCursorMixin, RequestRepositoryInterface):
+    """Request repository spreading the requests over regional databases."""
+
+    def __init__(self, router: ShardRouter) -> None:
+        self.router = router
+        self.repositories = [
+            RequestRepository(shard.engine, shard.index, shard.read_engine)
+            for shard in router.shards
+        ]
+
+    def _repository(self, shard: Shard) -> RequestRepository:
+        return self.repositories[shard.index]
+
+    def _fan_out(self, shards: list[Shard], call: Callable[[RequestRepository], T]) -> list[T]:
+        """Results of a call on the repositories of shards, run concurrently."""
+        repositories = [self._repository(shard) for shard in shards]
+        return run_concurrently(
+            [functools.partial(call, repository) for repository in repositories],
+        )
+
+    def _shards(self, near: LocationFilter | None) -> list[Shard]:
+        if near is None or near.lat is None:
+            return self.router.shards
+        return self.router.shards_near(near.lat, near.lng, near.radius_km)
+
+    def _repository_of(self, request_id: UUID) -> RequestRepository:
+        """Repository of the shard holding a request (main database when not found elsewhere)."""
+        shard = self.router.shard_for_id(request_id)
+        repository = self._repository(shard)
+        if shard is not self.router.main and repository.get_by_id(request_id, ("id",)):
+            return repository
+        return self._repository(self.router.main)
+
+    def create(self, user_id: UUID, input_request: RequestCreate) -> Request:
+        shard = self.router.shard_for_point(*anchor_point(input_request))
+        return self._repository(shard).create(user_id, input_request)
+
+    def get_by_id(self, request_id: UUID, fields: tuple[str, ...] | None = None) -> Request | None:
+        shard = self.router.shard_for_id(request_id)
+        request = self._repository(shard).get_by_id(request_id, fields)
+        if request is None and shard is not self.router.main:
+            return self._repository(self.router.main).get_by_id(request_id, fields)
+        return request
+
+    def get_user_requests(
+        self,
+        user_id: UUID,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[Request]:
+        pages = self._fan_out(
+            self.router.shards,
+            lambda repo: repo.get_user_requests(user_id, fields),
+        )
+        return [request for page in pages for request in page]
+
+    def get_batch_from_due_date(self, start_due_date: datetime, limit: int = 20) -> list[Request]:
+        return self.list_of_requests(limit=limit, due_after=start_due_date)["requests"]
+
+    def list_of_requests(  # noqa: PLR0913
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        near: LocationFilter | None = None,
+    ) -> dict[str, Any]:
+        """list_of_requests of the shards (near: only those a radius may overlap), merged."""
+        pages = self._fan_out(
+            self._shards(near),
+            lambda repo: repo.list_of_requests(
+                request_type,
+                limit,
+                cursor,
+                due_after,
+                due_before,
+                fields,
+            ),
+        )
+        merged = list(heapq.merge(*(page["requests"] for page in pages), key=_feed_position))
+        has_more = len(merged) > limit or any(page["pagination"]["has_more"] for page in pages)
+        requests = merged[:limit]
+        next_cursor = self._generate_next_cursor(requests[-1]) if has_more and requests else None
+        return {"requests": requests, "pagination": _pagination(next_cursor, has_more, limit)}
+
+    def list_feed(  # noqa: PLR0913
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        near: LocationFilter | None = None,
+    ) -> dict[str, Any]:
+        """list_feed of the shards, merged on the feed keys."""
+        shard_rows = self._fan_out(
+            self._shards(near),
+            lambda repo: repo.feed_rows(request_type, limit + 1, cursor, due_after, due_before),
+        )
+        rows = list(heapq.merge(*shard_rows, key=lambda row: row.feed_key))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = self._encode_cursor(*parse_feed_key(rows[-1].feed_key))
+        return {
+            "fragments": [row.fragment for row in rows],
+            "pagination": _pagination(next_cursor, has_more, limit),
+        }
+
+    def search_requests(  # noqa: PLR0913
+        self,
+        query: str,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        near: LocationFilter | None = None,
+    ) -> dict[str, Any]:
+        """search_requests of the shards, merged on (score DESC, id DESC)."""
+        shard_rows = self._fan_out(
+            self._shards(near),
+            lambda repo: repo.search_rows(
+                query,
+                request_type,
+                limit + 1,
+                cursor,
+                due_after,
+                due_before,
+                fields,
+            ),
+        )
+        rows = list(heapq.merge(*shard_rows, key=lambda row: (-row.score, -row.Request.id.int)))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = self._generate_search_cursor(rows[-1].score, rows[-1].Request)
+        return {
+            "requests": [row.Request for row in rows],
+            "pagination": _pagination(next_cursor, has_more, limit),
+        }
+
+    def update(self, request_id: UUID, request_update: RequestUpdate) -> Request:
+        return self._repository_of(request_id).update(request_id, request_update)
+
+    def delete(self, request_id: UUID) -> bool:
+        return self._repository_of(request_id).delete(request_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Feed facets counts: the counters sums of every shard."""
+        today = utc_today()
+        keys = stats_keys(today)
+        counts: Counter = Counter()
+        for shard_counts in self._fan_out(self.router.shards, lambda repo: repo.counters(keys)):
+            counts.update(shard_counts)
+        return stats_from_counts(counts, today)
+
+    def reconcile_stats(self) -> CounterReconcileReport:
+        report = CounterReconcileReport()
+        for repository in self.repositories:
+            shard_report = repository.reconcile_stats()
+            report.keys += shard_report.keys
+            report.corrected += shard_report.corrected
+            report.expired += shard_report.expired
+        return report
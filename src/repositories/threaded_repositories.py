@@ -0,0 +1,128 @@
+"""Async Adapters Of Synchronous Repositories.
+
+Backends without an asyncio driver (DynamoDB through boto3) serve the async repository
+interfaces by running their synchronous calls in the default thread pool: independent calls
+awaited with asyncio.gather still overlap their round trips.
+
+NOTE: boto3 resources are not meant to be shared across threads: every repository holds its own
+resources, and one adapter call never runs concurrently with another call of the same repository
+in the handlers (gather is always over different repositories).
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from src.models.favorite import Favorite
+from src.models.request import Request
+from src.repositories.interfaces import (
+    AsyncFavoriteRepositoryInterface,
+    AsyncRequestRepositoryInterface,
+    FavoriteRepositoryInterface,
+)
+from src.schemas.request import RequestCreate, RequestUpdate
+
+
+class ThreadedAsyncRequestRepository(AsyncRequestRepositoryInterface):
+    """Async request repository running a synchronous one in threads."""
+
+    def __init__(self, repository: Any) -> None:  # noqa: ANN401
+        self.repository = repository
+
+    async def create(self, user_id: UUID, input_request: RequestCreate) -> Request:
+        return await asyncio.to_thread(self.repository.create, user_id, input_request)
+
+    async def get_by_id(self, request_id: UUID) -> Request | None:
+        return await asyncio.to_thread(self.repository.get_by_id, request_id)
+
+    async def get_user_requests(self, user_id: UUID) -> list[Request]:
+        return await asyncio.to_thread(self.repository.get_user_requests, user_id)
+
+    async def page_of_user_requests(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        return await asyncio.to_thread(
+            self.repository.page_of_user_requests,
+            user_id,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def list_of_requests(  # noqa: PLR0913
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+    ) -> dict[str, Any]:
+        return await asyncio.to_thread(
+            self.repository.list_of_requests,
+            request_type=request_type,
+            limit=limit,
+            cursor=cursor,
+            due_after=due_after,
+            due_before=due_before,
+        )
+
+    async def list_feed(
+        self,
+        request_type: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+        due_after: datetime | None = None,
+        due_before: datetime | None = None,
+    ) -> dict[str, Any]:
+        return await asyncio.to_thread(
+            self.repository.list_feed,
+            request_type=request_type,
+            limit=limit,
+            cursor=cursor,
+            due_after=due_after,
+            due_before=due_before,
+        )
+
+    async def update(self, request_id: UUID, request_update: RequestUpdate) -> Request:
+        return await asyncio.to_thread(self.repository.update, request_id, request_update)
+
+    async def delete(self, request_id: UUID) -> bool:
+        return await asyncio.to_thread(self.repository.delete, request_id)
+
+
+class ThreadedAsyncFavoriteRepository(AsyncFavoriteRepositoryInterface):
+    """Async favorite repository running a synchronous one in threads."""
+
+    def __init__(self, repository: FavoriteRepositoryInterface) -> None:
+        self.repository = repository
+
+    async def create(self, user_id: UUID, request_id: UUID) -> Favorite:
+        return await asyncio.to_thread(self.repository.create, user_id, request_id)
+
+    async def get_by_id(self, favorite_id: UUID) -> Favorite | None:
+        return await asyncio.to_thread(self.repository.get_by_id, favorite_id)
+
+    async def delete(self, favorite_id: UUID) -> bool:
+        return await asyncio.to_thread(self.repository.delete, favorite_id)
+
+    async def get_user_favorite(self, user_id: UUID, request_id: UUID) -> Favorite | None:
+        return await asyncio.to_thread(self.repository.get_user_favorite, user_id, request_id)
+
+    async def list_user_favorites(self, user_id: UUID) -> list[Favorite]:
+        return await asyncio.to_thread(self.repository.list_user_favorites, user_id)
+
+    async def page_of_user_favorites(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        return await asyncio.to_thread(
+            self.repository.page_of_user_favorites,
+            user_id,
+            limit=limit,
+            cursor=cursor,
+        )
@@ -1,11 +1,12 @@
 """Pydantic schemas for service request validation and serialization."""
 
+import json
 from datetime import UTC, datetime
 from enum import Enum
-from typing import Self
+from typing import Annotated, Any, ClassVar, Literal, NamedTuple, Self
 from uuid import UUID
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, model_validator
 
 
 class RequestType(str, Enum):
@@ -56,66 +57,147 @@ class RequestCreate(BaseModel):
     # -------------------------------
     @model_validator(mode="after")
     def check_location(self) -> Self:
-        """Check location structure.
+        """Check location structure with the rules of the input model of the type.
 
-        - BUY_AND_DELIVER: dropoff location required
-        - PICKUP_AND_DELIVER: pickup + dropoff locations both required
-        - ONLINE_SERVICE: meetup location required
+        Only for RequestCreate built directly: the input models of every type (below) replace this
+        validator with their own rules.
         """
-        r_type = self.type
-
-        pickup_lat = self.pickup_latitude
-        pickup_lon = self.pickup_longitude
-        drop_off_lat = self.dropoff_latitude
-        drop_off_lon = self.dropoff_longitude
-        meetup_lat = self.meetup_latitude
-        meetup_lon = self.meetup_longitude
-
-        # buy & deliver check
-        if r_type == RequestType.BUY_AND_DELIVER:
-            if drop_off_lat is None or drop_off_lon is None:
-                exception_msg = (
-                    "dropoff_latitude and dropoff_longitude must be set for "
-                    "BUY_AND_DELIVER requests"
-                )
-                raise ValueError(exception_msg)
-            if any(v is not None for v in (pickup_lat, pickup_lon, meetup_lat, meetup_lon)):
-                exception_msg = (
-                    "pickup_latitude, pickup_longitude, meetup_latitude and "
-                    "meetup_longitude all must be None for BUY_AND_DELIVER requests"
-                )
-                raise ValueError(exception_msg)
+        return CREATE_MODELS[self.type].LOCATION_RULES.check(self)
 
-        # pickup & deliver check
-        elif r_type == RequestType.PICKUP_AND_DELIVER:
-            if any(v is None for v in (pickup_lat, pickup_lon, drop_off_lat, drop_off_lon)):
-                exception_msg = (
-                    "pickup_latitude, pickup_longitude, dropoff_latitude and "
-                    "dropoff_longitude all must be set for PICKUP_AND_DELIVER requests"
-                )
-                raise ValueError(exception_msg)
-            if any(v is not None for v in (meetup_lat, meetup_lon)):
-                exception_msg = (
-                    "meetup_latitude and meetup_longitude must not be set for "
-                    "PICKUP_AND_DELIVER requests"
-                )
-                raise ValueError(exception_msg)
 
-        # online service check
-        else:
-            if any(v is None for v in (meetup_lat, meetup_lon)):
-                exception_msg = (
-                    "meetup_latitude and meetup_longitude must be set for ONLINE_SERVICE requests"
-                )
-                raise ValueError(exception_msg)
-            if any(v is not None for v in (pickup_lat, pickup_lon, drop_off_lat, drop_off_lon)):
-                exception_msg = (
-                    "pickup_latitude, pickup_longitude, dropoff_latitude and "
-                    "dropoff_longitude all must be None for ONLINE_SERVICE requests"
-                )
-                raise ValueError(exception_msg)
+class LocationRules(NamedTuple):
+    """Location fields of a request type."""
 
-        return self
+    required: tuple[str, ...]
+    forbidden: tuple[str, ...]
+    missing_msg: str
+    forbidden_msg: str
+
+    def check(self, request: RequestCreate) -> RequestCreate:
+        """Ensure the required locations are set and the forbidden ones are not."""
+        if any(getattr(request, field) is None for field in self.required):
+            raise ValueError(self.missing_msg)
+        if any(getattr(request, field) is not None for field in self.forbidden):
+            raise ValueError(self.forbidden_msg)
+        return request
+
+
+# -------------------------------
+# Request creation fast path: one input model per type, selected by its "type" tag
+# -------------------------------
+class BuyAndDeliverCreate(RequestCreate):
+    """RequestCreate of a BUY_AND_DELIVER request: dropoff location required."""
+
+    type: Literal[RequestType.BUY_AND_DELIVER]
+
+    LOCATION_RULES: ClassVar[LocationRules] = LocationRules(
+        required=("dropoff_latitude", "dropoff_longitude"),
+        forbidden=("pickup_latitude", "pickup_longitude", "meetup_latitude", "meetup_longitude"),
+        missing_msg="dropoff_latitude and dropoff_longitude must be set for "
+        "BUY_AND_DELIVER requests",
+        forbidden_msg="pickup_latitude, pickup_longitude, meetup_latitude and "
+        "meetup_longitude all must be None for BUY_AND_DELIVER requests",
+    )
+
+    @model_validator(mode="after")
+    def check_location(self) -> Self:
+        """Check the BUY_AND_DELIVER locations."""
+        return self.LOCATION_RULES.check(self)
+
+
+class PickupAndDeliverCreate(RequestCreate):
+    """RequestCreate of a PICKUP_AND_DELIVER request: pickup + dropoff locations both required."""
+
+    type: Literal[RequestType.PICKUP_AND_DELIVER]
+
+    LOCATION_RULES: ClassVar[LocationRules] = LocationRules(
+        required=("pickup_latitude", "pickup_longitude", "dropoff_latitude", "dropoff_longitude"),
+        forbidden=("meetup_latitude", "meetup_longitude"),
+        missing_msg="pickup_latitude, pickup_longitude, dropoff_latitude and "
+        "dropoff_longitude all must be set for PICKUP_AND_DELIVER requests",
+        forbidden_msg="meetup_latitude and meetup_longitude must not be set for "
+        "PICKUP_AND_DELIVER requests",
+    )
+
+    @model_validator(mode="after")
+    def check_location(self) -> Self:
+        """Check the PICKUP_AND_DELIVER locations."""
+        return self.LOCATION_RULES.check(self)
+
+
+class OnlineServiceCreate(RequestCreate):
+    """RequestCreate of an ONLINE_SERVICE request: meetup location required."""
+
+    type: Literal[RequestType.ONLINE_SERVICE]
+
+    LOCATION_RULES: ClassVar[LocationRules] = LocationRules(
+        required=("meetup_latitude", "meetup_longitude"),
+        forbidden=("pickup_latitude", "pickup_longitude", "dropoff_latitude", "dropoff_longitude"),
+        missing_msg="meetup_latitude and meetup_longitude must be set for ONLINE_SERVICE requests",
+        forbidden_msg="pickup_latitude, pickup_longitude, dropoff_latitude and "
+        "dropoff_longitude all must be None for ONLINE_SERVICE requests",
+    )
+
+    @model_validator(mode="after")
+    def check_location(self) -> Self:
+        """Check the ONLINE_SERVICE locations."""
+        return self.LOCATION_RULES.check(self)
+
+
+CREATE_MODELS: dict[RequestType, type[RequestCreate]] = {
+    RequestType.BUY_AND_DELIVER: BuyAndDeliverCreate,
+    RequestType.PICKUP_AND_DELIVER: PickupAndDeliverCreate,
+    RequestType.ONLINE_SERVICE: OnlineServiceCreate,
+}
+
+
+# NOTE: Built once per container: the JSON body is parsed and validated in pydantic-core, the
+# "type" tag picks the input model directly instead of a Python branch over every type
+_request_create_adapter: TypeAdapter[RequestCreate] = TypeAdapter(
+    Annotated[
+        BuyAndDeliverCreate | PickupAndDeliverCreate | OnlineServiceCreate,
+        Field(discriminator="type"),
+    ],
+)
+_TYPE_TAGS = [f"'{request_type.value}'" for request_type in RequestType]
+# As in the enum error of RequestCreate: "'a', 'b' or 'c'"
+_EXPECTED_TYPES = f"{', '.join(_TYPE_TAGS[:-1])} or {_TYPE_TAGS[-1]}"
+
+
+def _as_request_create_error(error: dict[str, Any]) -> dict[str, Any]:
+    """Error of the tagged union, as RequestCreate.model_validate reports it."""
+    if error["type"] == "union_tag_not_found":
+        return {"type": "missing", "loc": ("type",), "input": error["input"]}
+    if error["type"] == "union_tag_invalid":
+        return {
+            "type": "enum",
+            "loc": ("type",),
+            "input": error["ctx"]["tag"],
+            "ctx": {"expected": _EXPECTED_TYPES},
+        }
+    loc = error["loc"]
+    if loc and f"'{loc[0]}'" in _TYPE_TAGS:
+        loc = loc[1:]  # tag of the union member
+    untagged = {"type": error["type"], "loc": loc, "input": error["input"]}
+    if "ctx" in error:
+        untagged["ctx"] = error["ctx"]
+    return untagged
+
+
+def parse_request_create(body: str | bytes) -> RequestCreate:
+    """Validate a raw JSON request body into the RequestCreate of its type.
+
+    Same validation, same errors as RequestCreate.model_validate(json.loads(body)).
+    """
+    try:
+        return _request_create_adapter.validate_json(body)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        if any(not error["loc"] for error in errors):
+            # Not a JSON object (invalid JSON, a list, ...): raise the very errors of the slow path
+            return RequestCreate.model_validate(json.loads(body))
+        line_errors = [_as_request_create_error(error) for error in errors]
+        raise ValidationError.from_exception_data(RequestCreate.__name__, line_errors) from None
 
 
 class BaseRequest(BaseModel):
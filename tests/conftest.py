@@ -11,6 +11,25 @@ env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
 
+class FakeClock:
+    """Manually advanced clock (time.time, time.monotonic), sleeping moves it forward."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Fake clock of the components under test (see FakeClock)."""
+    return FakeClock()
+
+
 @pytest.fixture(scope="session")
 def stage() -> str:
     """Get the deployment stage (dev, staging, prod)."""
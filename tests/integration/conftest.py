@@ -0,0 +1,31 @@
+"""Integration test fixtures - local SQLite database."""
+
+import os
+import tempfile
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+# src.config reads its settings at import time: point it to a throwaway SQLite database before
+# any src module gets imported by the tests.
+_DB_DIR = tempfile.mkdtemp(prefix="nwassik-tests-")
+os.environ["RUN_ENV"] = "local"
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_DB_DIR) / 'integration.db'}"
+os.environ.setdefault("STAGE", "test")
+os.environ.setdefault("BASE_DOMAIN", "http://localhost:3000")
+os.environ.setdefault("MAX_USER_CREATED_REQUESTS", "20")
+os.environ.setdefault("MAX_USER_CREATED_FAVORITES", "100")
+
+from src.db.session import engine  # noqa: E402
+from src.models.base import Base  # noqa: E402
+from src.models.favorite import Favorite  # noqa: E402, F401 # register all tables
+from src.models.request import Request  # noqa: E402, F401
+
+
+@pytest.fixture(autouse=True)
+def db_tables() -> Generator[None, None, None]:
+    """Create all tables before each test and drop them afterwards."""
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
@@ -0,0 +1,159 @@
+"""Async repositories integration tests (aiosqlite)."""
+
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.async_session import async_database_url, get_async_engine
+from src.handlers.favorites.create import create_favorite
+from src.lib.handler import run_async
+from src.repositories.async_favorite_repository import get_async_favorite_repository
+from src.repositories.async_request_repository import get_async_request_repository
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+
+pytestmark = pytest.mark.integration
+
+
+def _input_request(title: str = "Bring me a charger") -> RequestCreate:
+    return RequestCreate(
+        type=RequestType.BUY_AND_DELIVER,
+        title=title,
+        description="USB-C",
+        dropoff_latitude=36.8,
+        dropoff_longitude=10.1,
+    )
+
+
+@pytest.fixture(autouse=True)
+async def dispose_async_engine() -> AsyncGenerator[None, None]:
+    """Pooled async connections are bound to the event loop of the test that opened them."""
+    yield
+    await get_async_engine().dispose()
+
+
+async def test_crud_matches_sync_repository() -> None:
+    """Rows written by the async repository are read back the same by the sync one."""
+    repo = get_async_request_repository()
+    user_id = uuid.uuid4()
+
+    created = await repo.create(user_id, _input_request())
+    fetched = await repo.get_by_id(created.id)
+    assert fetched.to_dict() == get_request_repository().get_by_id(created.id).to_dict()
+    assert fetched.buy_and_deliver.dropoff_latitude == 36.8
+
+    updated = await repo.update(created.id, RequestUpdate(title="Bring me two chargers"))
+    assert updated.title == "Bring me two chargers"
+    assert [r.id for r in await repo.get_user_requests(user_id)] == [created.id]
+
+    assert await repo.delete(created.id)
+    assert await repo.get_by_id(created.id) is None
+    assert await repo.delete(created.id)  # idempotent
+
+
+async def test_list_of_requests_pagination() -> None:
+    """Async pagination walks the same pages as the sync one."""
+    repo = get_async_request_repository()
+    for i in range(7):
+        await repo.create(uuid.uuid4(), _input_request(f"Request {i}"))
+
+    seen, cursor = [], None
+    while True:
+        page = await repo.list_of_requests(limit=3, cursor=cursor)
+        sync_page = get_request_repository().list_of_requests(limit=3, cursor=cursor)
+        assert [r.id for r in page["requests"]] == [r.id for r in sync_page["requests"]]
+        seen.extend(r.id for r in page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert len(set(seen)) == 7
+
+
+async def test_gather_runs_queries_concurrently() -> None:
+    """Independent reads awaited with gather hold several connections at the same time."""
+    request_repo = get_async_request_repository()
+    favorite_repo = get_async_favorite_repository()
+    user_id = uuid.uuid4()
+    request = await request_repo.create(user_id, _input_request())
+    await favorite_repo.create(user_id, request.id)
+
+    checked_out = {"current": 0, "max": 0}
+    sync_engine = get_async_engine().sync_engine
+
+    def _checkout(*_) -> None:  # noqa: ANN002
+        checked_out["current"] += 1
+        checked_out["max"] = max(checked_out["max"], checked_out["current"])
+
+    def _checkin(*_) -> None:  # noqa: ANN002
+        checked_out["current"] -= 1
+
+    event.listen(sync_engine, "checkout", _checkout)
+    event.listen(sync_engine, "checkin", _checkin)
+    try:
+        fetched, favorites, requests = await asyncio.gather(
+            request_repo.get_by_id(request.id),
+            favorite_repo.list_user_favorites(user_id),
+            request_repo.get_user_requests(user_id),
+        )
+    finally:
+        event.remove(sync_engine, "checkout", _checkout)
+        event.remove(sync_engine, "checkin", _checkin)
+
+    assert fetched.id == request.id
+    assert [f.request_id for f in favorites] == [request.id]
+    assert [r.id for r in requests] == [request.id]
+    assert checked_out["max"] > 1
+
+
+async def test_favorite_create_is_idempotent() -> None:
+    """A duplicate insert resolves to the existing favorite."""
+    favorite_repo = get_async_favorite_repository()
+    request = await get_async_request_repository().create(uuid.uuid4(), _input_request())
+    user_id = uuid.uuid4()
+
+    first = await favorite_repo.create(user_id, request.id)
+    second = await favorite_repo.create(user_id, request.id)
+    assert first.id == second.id
+    assert (await favorite_repo.get_user_favorite(user_id, request.id)).id == first.id
+    assert (await favorite_repo.get_by_id(first.id)).request_id == request.id
+    assert await favorite_repo.delete(first.id)
+    assert await favorite_repo.list_user_favorites(user_id) == []
+
+
+def test_async_handler() -> None:
+    """Async handlers run on the container event loop through lambda_handler."""
+    user_id = uuid.uuid4()
+    request = get_request_repository().create(uuid.uuid4(), _input_request())
+
+    def _event(request_id: uuid.UUID) -> dict:
+        return {
+            "requestContext": {"authorizer": {"jwt": {"claims": {"sub": str(user_id)}}}},
+            "body": json.dumps({"request_id": str(request_id)}),
+        }
+
+    try:
+        first = create_favorite(_event(request.id), None)
+        second = create_favorite(_event(request.id), None)
+        missing = create_favorite(_event(uuid.uuid4()), None)
+    finally:
+        run_async(get_async_engine().dispose())
+
+    assert first["statusCode"] == 200
+    assert json.loads(first["body"]) == json.loads(second["body"])
+    assert missing["statusCode"] == 404
+
+
+def test_async_database_urls() -> None:
+    """Sync URLs map to their async drivers, DSQL keeps its dialect."""
+    assert async_database_url("sqlite:///a.db").drivername == "sqlite+aiosqlite"
+    postgresql_url = async_database_url("postgresql+psycopg://u@h/db")
+    assert postgresql_url.drivername == "postgresql+psycopg_async"
+    engine = create_async_engine(async_database_url("auroradsql+psycopg://admin@host/postgres"))
+    assert engine.dialect.name == "auroradsql"
+    assert engine.dialect.is_async
+    assert not engine.dialect.supports_native_enum
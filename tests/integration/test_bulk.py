@@ -0,0 +1,72 @@
+"""Bulk generation / loading integration tests."""
+
+import io
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from src.db.bulk import BulkLoader, generate_records, read_ndjson, write_ndjson
+from src.db.session import engine
+from src.models.favorite import Favorite
+from src.models.request import Request
+from src.repositories.request_repository import get_request_repository
+
+pytestmark = pytest.mark.integration
+
+
+def _count(model: type) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_ndjson_round_trip_load() -> None:
+    """Generated NDJSON is loaded in several transactions and readable through the ORM."""
+    stream = io.StringIO()
+    records = generate_records(250, users_count=10, favorites_count=40, seed=1)
+    written = write_ndjson(records, stream)
+    assert written == 290
+    stream.seek(0)
+
+    reports = []
+    loader = BulkLoader(
+        engine,
+        batch_size=64,
+        max_rows_per_transaction=100,
+        progress=reports.append,
+    )
+    report = loader.load(read_ndjson(stream))
+
+    assert report.records == 290
+    assert report.rows_per_table["requests"] == 250
+    assert report.rows_per_table["favorites"] == 40
+    # 250 requests * 2 rows + 40 favorites, committed by chunks of at most 100 rows
+    assert report.transactions >= 6
+    assert reports[-1] is report
+    assert _count(Request) == 250
+    assert _count(Favorite) == 40
+
+    with engine.connect() as connection:
+        request_id = connection.execute(select(Request.id).limit(1)).scalar_one()
+    request = get_request_repository().get_by_id(request_id)
+    assert request is not None
+    data = request.to_dict()
+    assert any(key.endswith("_latitude") for key in data)
+
+
+def test_generation_is_reproducible() -> None:
+    """Same seed and clock produce the same records."""
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    first = list(generate_records(20, favorites_count=5, seed=7, now=now))
+    second = list(generate_records(20, favorites_count=5, seed=7, now=now))
+    assert [r["id"] for r in first] == [r["id"] for r in second]
+
+
+def test_invalid_record_rolls_back_current_transaction() -> None:
+    """A broken record aborts the load without leaving a partial batch behind."""
+    records = list(generate_records(5, seed=3))
+    records.append({"kind": "unknown"})
+
+    with pytest.raises(ValueError, match="Unknown record kind"):
+        BulkLoader(engine).load(records)
+    assert _count(Request) == 0
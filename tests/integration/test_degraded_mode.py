@@ -0,0 +1,135 @@
+"""Degraded mode integration tests: circuit breaker, stale responses and load shedding.
+
+The database is a SQLite file behind a fault-injecting engine, the circuit breaker runs on a fake
+clock.
+"""
+
+import json
+import uuid
+from collections.abc import Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from src.db import session as db_session
+from src.db.fault_injection import FaultInjector, install_fault_injection
+from src.db.session import create_app_engine, create_session_factory
+from src.handlers.requests.get import get_request
+from src.handlers.requests.list import list_requests
+from src.handlers.requests.stats import get_request_stats
+from src.lib import circuit_breaker, stale_responses
+from src.lib.circuit_breaker import CLOSED, OPEN, CircuitBreaker
+from src.lib.metrics import metrics
+from src.lib.stale_responses import STALE_WARNING, StaleResponseCache
+from src.models.base import Base
+from src.repositories import request_repository
+from src.repositories.circuit_breaking_repository import CircuitBreakingRepository
+from src.repositories.request_repository import RequestRepository
+from src.schemas.request import RequestCreate, RequestType
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.integration
+
+
+@dataclass
+class Degradable:
+    faults: FaultInjector
+    breaker: CircuitBreaker
+    clock: FakeClock
+
+
+@pytest.fixture
+def degradable(
+    tmp_path: Path,
+    monkeypatch,  # noqa: ANN001
+    clock: FakeClock,
+) -> Generator[Degradable, None, None]:
+    faults = FaultInjector(sleep=clock.sleep)
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'faulty.db'}")
+    Base.metadata.create_all(engine)
+    install_fault_injection(engine, faults)
+    session_factory = create_session_factory(engine)
+    monkeypatch.setattr(db_session, "SessionLocal", session_factory)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", session_factory)
+
+    breaker = CircuitBreaker(window_size=4, min_calls=4, open_seconds=10, clock=clock)
+    monkeypatch.setattr(circuit_breaker, "_circuit_breaker", breaker)
+    monkeypatch.setattr(stale_responses, "_stale_response_cache", StaleResponseCache(clock=clock))
+    repository = CircuitBreakingRepository(RequestRepository(), breaker)
+    monkeypatch.setattr(request_repository, "_request_repo_instance", repository)
+    yield Degradable(faults, breaker, clock)
+    engine.dispose()
+
+
+def _create_request() -> uuid.UUID:
+    request = request_repository.get_request_repository().create(
+        uuid.uuid4(),
+        RequestCreate(
+            type=RequestType.ONLINE_SERVICE,
+            title="Title",
+            description="d",
+            meetup_latitude=36.8,
+            meetup_longitude=10.1,
+        ),
+    )
+    return request.id
+
+
+def test_stale_responses_while_the_database_fails(degradable: Degradable) -> None:
+    event = {"pathParameters": {"request_id": str(_create_request())}}
+    fresh = get_request(event, None)
+    assert fresh["statusCode"] == 200
+    assert "Warning" not in fresh["headers"]
+
+    # Failing calls are answered with the last good response, or 503 without one
+    degradable.faults.error_rate = 1.0
+    stale = get_request(event, None)
+    assert (stale["statusCode"], stale["body"]) == (200, fresh["body"])
+    assert stale["headers"]["Warning"] == STALE_WARNING
+    unavailable = list_requests({}, None)
+    assert unavailable["statusCode"] == 503
+    assert unavailable["headers"]["Retry-After"] == "1"
+
+    for _ in range(2):
+        get_request(event, None)
+    assert degradable.breaker.state == OPEN
+
+    # Open: served stale without any round trip, low priority reads are shed
+    degradable.clock.now += 4
+    stale = get_request(event, None)
+    assert stale["headers"]["Age"] == "4"
+    assert metrics.get("db.statement") == 0
+    search = {"queryStringParameters": {"q": "title"}}
+    for shed in (get_request_stats({}, None), list_requests(search, None)):
+        assert shed["statusCode"] == 503
+        assert shed["headers"]["Retry-After"] == "6"
+        assert metrics.get("degraded.shed") == 1
+
+    # Half-open: the probe revalidates the database, fresh responses again
+    degradable.clock.now += 6
+    degradable.faults.error_rate = 0.0
+    fresh = get_request(event, None)
+    assert fresh["statusCode"] == 200
+    assert "Warning" not in fresh["headers"]
+    assert degradable.breaker.state == CLOSED
+    listed = json.loads(list_requests({}, None)["body"])["requests"]
+    assert [request["id"] for request in listed] == [event["pathParameters"]["request_id"]]
+
+
+def test_slow_database_opens_the_circuit(degradable: Degradable) -> None:
+    event = {"pathParameters": {"request_id": str(_create_request())}}
+    degradable.faults.latency_seconds = 5
+    for _ in range(4):
+        # Slow, but successful
+        assert get_request(event, None)["statusCode"] == 200
+    assert degradable.breaker.state == OPEN
+    assert get_request(event, None)["headers"]["Warning"] == STALE_WARNING
+
+
+def test_fault_settings() -> None:
+    faults = FaultInjector.parse("error_rate=0.5, latency_ms=800")
+    assert (faults.error_rate, faults.latency_seconds) == (0.5, 0.8)
+    assert FaultInjector.parse("") == FaultInjector()
+    with pytest.raises(ValueError, match="Invalid database fault"):
+        FaultInjector.parse("errors=1")
@@ -0,0 +1,120 @@
+"""Due date window queries integration tests."""
+
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from src.db.bulk import BulkLoader, generate_records
+from src.db.session import engine
+from src.handlers.requests.list import list_requests
+from src.repositories.request_repository import get_request_repository
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime.now(UTC)
+
+
+@pytest.fixture
+def records() -> list[dict]:
+    """200 bulk loaded requests, due between 1 hour and 60 days from now (70%) or never."""
+    records = list(generate_records(200, seed=11, now=NOW))
+    BulkLoader(engine).load(records)
+    return records
+
+
+def _expected(records: list[dict], after: datetime, before: datetime, request_type=None) -> list:  # noqa: ANN001
+    selected = [
+        record
+        for record in records
+        if record["due_date"]
+        and after <= datetime.fromisoformat(record["due_date"]) < before
+        and request_type in (None, record["type"])
+    ]
+    selected.sort(key=lambda r: (r["due_date"], r["created_at"], r["id"]))
+    return [uuid.UUID(record["id"]) for record in selected]
+
+
+def _walk(limit: int, **kwargs) -> list[uuid.UUID]:  # noqa: ANN003
+    repo = get_request_repository()
+    seen, cursor = [], None
+    while True:
+        page = repo.list_of_requests(limit=limit, cursor=cursor, **kwargs)
+        seen.extend(request.id for request in page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            return seen
+
+
+def test_window_pages_in_feed_order(records: list[dict]) -> None:
+    """Every request of the window, once, in feed order, across pages."""
+    after, before = NOW + timedelta(days=5), NOW + timedelta(days=20)
+    expected = _expected(records, after, before)
+    assert expected
+    assert _walk(4, due_after=after, due_before=before) == expected
+
+
+def test_window_per_type(records: list[dict]) -> None:
+    """The type filter combines with the window."""
+    before = NOW + timedelta(days=30)
+    expected = _expected(records, NOW, before, "pickup_and_deliver")
+    assert expected
+    assert _walk(5, request_type="pickup_and_deliver", due_after=NOW, due_before=before) == expected
+
+
+def test_get_batch_from_due_date(records: list[dict]) -> None:
+    """Requests due from a date on, earliest first."""
+    start = NOW + timedelta(days=50)
+    expected = _expected(records, start, datetime.max.replace(tzinfo=UTC))
+    batch = get_request_repository().get_batch_from_due_date(start, 5)
+    assert [r.id for r in batch] == expected[:5]
+
+
+def test_invalid_window() -> None:
+    """An empty window is rejected."""
+    with pytest.raises(Exception, match="due_after must be before due_before"):  # noqa: PT011
+        get_request_repository().list_of_requests(due_after=NOW, due_before=NOW)
+
+
+@pytest.mark.parametrize("type_filter", ["", " AND type = :type"])
+def test_window_is_an_index_range_seek(type_filter: str) -> None:
+    """The window reads the due_date indexes in order: no full scan, no sort."""
+    sql = (
+        "EXPLAIN QUERY PLAN SELECT * FROM requests WHERE due_date >= :after AND due_date < :before"
+        f"{type_filter} ORDER BY due_date, created_at, id LIMIT 21"
+    )
+    params = {"after": NOW, "before": NOW + timedelta(days=2), "type": "ONLINE_SERVICE"}
+    with engine.connect() as connection:
+        plan = " ".join(row[-1] for row in connection.execute(text(sql), params))
+    assert "USING INDEX ix_requests_" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_expiring_soon_handler(records: list[dict]) -> None:
+    """expiring_within=<hours> lists requests due within the next hours."""
+    query_params = {"expiring_within": "72", "limit": "100"}
+    response = list_requests({"queryStringParameters": query_params}, None)
+    assert response["statusCode"] == 200
+    due_dates = [r["due_date"] for r in json.loads(response["body"])["requests"]]
+    expected = _expected(records, NOW, NOW + timedelta(hours=72))
+    assert len(due_dates) == len(expected)
+    assert due_dates == sorted(due_dates)
+
+    for params, message in (
+        ({"expiring_within": "0"}, "expiring_within must be between"),
+        ({"expiring_within": "5", "due_after": NOW.isoformat()}, "cannot be combined"),
+        ({"due_after": "2030-01-01T00:00:00"}, "timezone-aware"),
+        ({"due_before": "tomorrow"}, "ISO 8601"),
+    ):
+        response = list_requests({"queryStringParameters": params}, None)
+        assert response["statusCode"] == 400
+        assert message in json.loads(response["body"])["error"]
+
+    # "+" of the UTC offset decoded as a space
+    response = list_requests(
+        {"queryStringParameters": {"due_after": "2030-01-01T00:00:00 00:00"}},
+        None,
+    )
+    assert response["statusCode"] == 200
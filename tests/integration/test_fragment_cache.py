@@ -0,0 +1,83 @@
+"""Fragment cache integration tests (handlers responses)."""
+
+import json
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from src.db.session import engine
+from src.handlers.requests.get import get_request
+from src.handlers.requests.list import list_requests
+from src.handlers.requests.list_user_requests import list_user_requests
+from src.lib.fragment_cache import get_fragment_cache
+from src.lib.metrics import metrics
+from src.models.request import Request
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> None:
+    get_fragment_cache().clear()
+
+
+def _create(user_id: uuid.UUID, title: str):  # noqa: ANN202
+    return get_request_repository().create(
+        user_id,
+        RequestCreate(
+            type=RequestType.BUY_AND_DELIVER,
+            title=title,
+            description="USB-C",
+            dropoff_latitude=36.8,
+            dropoff_longitude=10.1,
+        ),
+    )
+
+
+def _get(request_id: uuid.UUID) -> dict:
+    response = get_request({"pathParameters": {"request_id": str(request_id)}}, None)
+    assert response["statusCode"] == 200
+    return json.loads(response["body"])["request"]
+
+
+def test_responses_are_assembled_from_cached_fragments() -> None:
+    user_id = uuid.uuid4()
+    created = [_create(user_id, f"Request {i}") for i in range(3)]
+
+    first = json.loads(list_requests({"queryStringParameters": {"limit": "2"}}, None)["body"])
+    assert [r["title"] for r in first["requests"]] == ["Request 0", "Request 1"]
+    assert first["pagination"]["has_more"] is True
+    assert metrics.get("fragment_cache.miss") == 2
+
+    # Same requests again: no serialization at all
+    list_requests({"queryStringParameters": {"limit": "2"}}, None)
+    assert (metrics.get("fragment_cache.hit"), metrics.get("fragment_cache.miss")) == (2, 0)
+    assert metrics.get("fragment_cache.saved_us") > 0
+
+    response = list_user_requests({"pathParameters": {"user_id": str(user_id)}}, None)
+    body = json.loads(response["body"])
+    assert (body["user_id"], body["total"]) == (str(user_id), 3)
+    assert metrics.get("fragment_cache.hit") == 2
+    assert _get(created[2].id)["dropoff_latitude"] == 36.8
+    assert metrics.get("fragment_cache.hit") == 1
+
+
+def test_updates_are_never_served_stale() -> None:
+    request = _create(uuid.uuid4(), "Charger")
+    assert _get(request.id)["title"] == "Charger"
+
+    get_request_repository().update(request.id, RequestUpdate(title="Two chargers"))
+    assert _get(request.id)["title"] == "Two chargers"
+
+    # Written by another container (no local invalidation): the version bump alone is enough
+    with engine.begin() as connection:
+        connection.execute(
+            update(Request)
+            .where(Request.id == request.id)
+            .values(description="Fast charging", version=Request.version + 1),
+        )
+    assert _get(request.id)["description"] == "Fast charging"
+    assert len(get_fragment_cache()) == 1
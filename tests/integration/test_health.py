@@ -0,0 +1,87 @@
+"""Health check integration tests."""
+
+import json
+import subprocess
+import sys
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from src.db import health
+from src.handlers.health.check import health_check
+from src.lib.metrics import metrics
+
+pytestmark = pytest.mark.integration
+
+DEEP = {"queryStringParameters": {"deep": "true"}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> Generator[None, None, None]:
+    health.clear_cache()
+    yield
+    health.clear_cache()
+
+
+def test_shallow_check_imports_nothing_heavy() -> None:
+    script = (
+        "import sys\n"
+        "from src.handlers.health.check import health_check\n"
+        "assert health_check({}, None)['statusCode'] == 200\n"
+        "print(sorted(m for m in ('src.config', 'sqlalchemy', 'boto3') if m in sys.modules))\n"
+    )
+    # No environment needed either: importing src.config would fail without RUN_ENV
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parents[2],
+        env={"PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_deep_check_reports_probes() -> None:
+    response = health_check(DEEP, None)
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert body["status"] == "ok"
+    assert body["cached"] is False
+    assert body["probes"]["database"]["status"] == "ok"
+    assert body["probes"]["database"]["query_ms"] >= 0
+    # Local SQLite: no reader, DSQL token, Secrets Manager or DynamoDB
+    skipped = ("database_reader", "dsql_token", "secrets_manager", "dynamodb")
+    assert {body["probes"][name]["status"] for name in skipped} == {"skipped"}
+
+
+def test_polls_within_the_ttl_reuse_the_probes() -> None:
+    clock = iter([100.0, 105.0, 100.0 + health.HEALTH_PROBE_TTL_SECONDS]).__next__
+    assert health.deep_health(clock)["cached"] is False
+
+    metrics.reset("db.")
+    cached = health.deep_health(clock)
+    assert (cached["cached"], cached["age_seconds"]) == (True, 5.0)
+    assert metrics.get("db.statement") == 0
+
+    assert health.deep_health(clock)["cached"] is False
+    assert metrics.get("db.statement") == 1
+
+
+def test_failing_probe_degrades(monkeypatch, caplog) -> None:  # noqa: ANN001
+    def unreachable() -> dict:
+        exception_msg = "connection to db.internal:5432 refused"
+        raise ConnectionError(exception_msg)
+
+    monkeypatch.setitem(health.PROBES, "database", unreachable)
+    response = health_check(DEEP, None)
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 503
+    assert body["status"] == "degraded"
+    # No exception details on the public endpoint, they are logged
+    assert body["probes"]["database"] == {"status": "error"}
+    assert "db.internal" not in response["body"]
+    assert "Health probe database failed" in caplog.text
+    assert "db.internal:5432" in caplog.text
+    assert body["probes"]["dsql_token"]["status"] == "skipped"
@@ -0,0 +1,183 @@
+"""Home endpoint integration tests."""
+
+import asyncio
+import json
+import uuid
+from collections.abc import Generator
+
+import pytest
+
+from src.db.async_session import get_async_engine
+from src.handlers.me import home
+from src.handlers.me.home import get_home
+from src.lib.handler import run_async
+from src.repositories.async_favorite_repository import AsyncFavoriteRepository
+from src.repositories.async_request_repository import AsyncRequestRepository
+from src.repositories.favorite_repository import FavoriteRepository, get_favorite_repository
+from src.repositories.interfaces import (
+    AsyncFavoriteRepositoryInterface,
+    AsyncRequestRepositoryInterface,
+    FavoriteRepositoryInterface,
+    RequestRepositoryInterface,
+)
+from src.repositories.request_repository import RequestRepository, get_request_repository
+from src.schemas.request import RequestCreate, RequestType
+
+pytestmark = pytest.mark.integration
+
+
+def _create_request(user_id: uuid.UUID, title: str) -> str:
+    request = get_request_repository().create(
+        user_id,
+        RequestCreate(
+            type=RequestType.ONLINE_SERVICE,
+            title=title,
+            description="d",
+            meetup_latitude=36.8,
+            meetup_longitude=10.1,
+        ),
+    )
+    return str(request.id)
+
+
+def _home(user_id: uuid.UUID, **query_params: str) -> dict:
+    response = get_home(
+        {
+            "requestContext": {"authorizer": {"jwt": {"claims": {"sub": str(user_id)}}}},
+            "queryStringParameters": query_params or None,
+        },
+        None,
+    )
+    assert response["statusCode"] == 200, response["body"]
+    return json.loads(response["body"])
+
+
+@pytest.fixture(autouse=True)
+def dispose_async_engine() -> Generator[None, None, None]:
+    """Close the aiosqlite connections of the async sections after each test."""
+    yield
+    run_async(get_async_engine().dispose())
+
+
+@pytest.fixture
+def user_id() -> uuid.UUID:
+    user_id = uuid.uuid4()
+    own = [_create_request(user_id, f"Mine {index}") for index in range(3)]
+    others = [_create_request(uuid.uuid4(), f"Other {index}") for index in range(2)]
+    for request_id in (others[0], own[0], others[1]):
+        get_favorite_repository().create(user_id, uuid.UUID(request_id))
+    return user_id
+
+
+def test_home_sections(user_id: uuid.UUID) -> None:
+    body = _home(user_id)
+
+    assert body["user_id"] == str(user_id)
+    # Newest first
+    assert [r["title"] for r in body["requests"]["requests"]] == ["Mine 2", "Mine 1", "Mine 0"]
+    assert len(body["favorites"]["favorites"]) == 3
+    assert all(favorite["user_id"] == str(user_id) for favorite in body["favorites"]["favorites"])
+    assert len(body["feed"]["requests"]) == 5
+    for section in ("requests", "favorites", "feed"):
+        assert body[section]["pagination"]["has_more"] is False
+
+
+def test_section_limits_and_cursors(user_id: uuid.UUID) -> None:
+    body = _home(user_id, requests_limit="2", favorites_limit="1", feed_limit="4")
+    assert [r["title"] for r in body["requests"]["requests"]] == ["Mine 2", "Mine 1"]
+    assert body["requests"]["pagination"]["limit"] == 2
+    assert len(body["feed"]["requests"]) == 4
+    favorites = body["favorites"]["favorites"]
+
+    # Paging one section does not fetch the others
+    cursor = body["favorites"]["pagination"]["next_cursor"]
+    while cursor:
+        page = _home(user_id, sections="favorites", favorites_limit="1", favorites_cursor=cursor)
+        assert set(page) == {"user_id", "favorites"}
+        favorites += page["favorites"]["favorites"]
+        cursor = page["favorites"]["pagination"]["next_cursor"]
+    assert len({favorite["id"] for favorite in favorites}) == 3
+
+    page = _home(
+        user_id,
+        sections="requests,feed",
+        requests_cursor=body["requests"]["pagination"]["next_cursor"],
+    )
+    assert [r["title"] for r in page["requests"]["requests"]] == ["Mine 0"]
+    assert page["feed"]["pagination"]["has_more"] is False
+
+
+def test_keyset_pages_match_the_default_pages(user_id: uuid.UUID) -> None:
+    """SQL keyset pages and the in memory pages of the other backends agree, cursors included."""
+    for repository, interface, page_of in (
+        (RequestRepository(), RequestRepositoryInterface, "page_of_user_requests"),
+        (FavoriteRepository(), FavoriteRepositoryInterface, "page_of_user_favorites"),
+    ):
+        cursor = None
+        while True:
+            keyset = getattr(repository, page_of)(user_id, limit=2, cursor=cursor)
+            in_memory = getattr(interface, page_of)(repository, user_id, limit=2, cursor=cursor)
+            items = next(key for key in keyset if key != "pagination")
+            assert [item.id for item in keyset[items]] == [item.id for item in in_memory[items]]
+            assert keyset["pagination"] == in_memory["pagination"]
+            cursor = keyset["pagination"]["next_cursor"]
+            if not cursor:
+                break
+
+
+def test_async_keyset_pages_match_the_default_pages(user_id: uuid.UUID) -> None:
+    """Same agreement for the async repositories the home sections read from."""
+    for repository, interface, page_of in (
+        (AsyncRequestRepository(), AsyncRequestRepositoryInterface, "page_of_user_requests"),
+        (AsyncFavoriteRepository(), AsyncFavoriteRepositoryInterface, "page_of_user_favorites"),
+    ):
+        cursor = None
+        while True:
+            keyset = run_async(getattr(repository, page_of)(user_id, limit=2, cursor=cursor))
+            in_memory = run_async(
+                getattr(interface, page_of)(repository, user_id, limit=2, cursor=cursor),
+            )
+            items = next(key for key in keyset if key != "pagination")
+            assert [item.id for item in keyset[items]] == [item.id for item in in_memory[items]]
+            assert keyset["pagination"] == in_memory["pagination"]
+            cursor = keyset["pagination"]["next_cursor"]
+            if not cursor:
+                break
+
+
+def test_sections_are_awaited_concurrently(user_id: uuid.UUID, monkeypatch) -> None:  # noqa: ANN001
+    """Every section starts before any of them ends."""
+    events = []
+
+    def section(name: str):  # noqa: ANN202
+        async def render(*_: object) -> str:
+            events.append(f"start {name}")
+            await asyncio.sleep(0)
+            events.append(f"end {name}")
+            return "{}"
+
+        return render
+
+    monkeypatch.setattr(home, "SECTION_RENDERERS", {name: section(name) for name in home.SECTIONS})
+    assert set(_home(user_id)) == {"user_id", *home.SECTIONS}
+    assert events[:3] == [f"start {name}" for name in home.SECTIONS]
+
+
+def test_feed_section_from_the_feed_projection(user_id: uuid.UUID, monkeypatch) -> None:  # noqa: ANN001
+    """The feed section pages the same requests from the feed projection."""
+    from_requests = _home(user_id, sections="feed", feed_limit="3")["feed"]
+    monkeypatch.setattr(home, "REQUEST_FEED_READS", True)
+    from_feed = _home(user_id, sections="feed", feed_limit="3")["feed"]
+    assert from_feed["requests"] == from_requests["requests"]
+    assert from_feed["pagination"]["has_more"] is True
+
+
+def test_invalid_parameters(user_id: uuid.UUID) -> None:
+    claims = {"requestContext": {"authorizer": {"jwt": {"claims": {"sub": str(user_id)}}}}}
+    for query_params in (
+        {"sections": "requests,unknown"},
+        {"feed_limit": "0"},
+        {"favorites_cursor": "nope"},
+    ):
+        response = get_home({**claims, "queryStringParameters": query_params}, None)
+        assert response["statusCode"] == 400
@@ -0,0 +1,108 @@
+"""Idle-aware liveness checks integration tests."""
+
+import uuid
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from src.db.liveness import (
+    install_first_statement_retry,
+    install_idle_ping,
+    install_round_trip_metrics,
+)
+from src.lib.metrics import metrics
+from src.models.base import Base
+from src.models.favorite import Favorite
+from src.models.request import Request
+
+pytestmark = pytest.mark.integration
+
+
+def _make_engine(path: Path, idle_threshold_seconds: float) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+    install_idle_ping(engine, idle_threshold_seconds)
+    install_round_trip_metrics(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics() -> Generator[None, None, None]:
+    metrics.reset("db.")
+    yield
+    metrics.reset("db.")
+
+
+def _run_sessions(session_factory: sessionmaker, count: int) -> None:
+    for _ in range(count):
+        with session_factory() as session:
+            session.execute(select(Request).limit(1)).all()
+
+
+def test_recently_used_connections_are_not_pinged(tmp_path: Path) -> None:
+    """Back to back sessions reuse the pooled connection without any extra round trip."""
+    engine = _make_engine(tmp_path / "a.db", idle_threshold_seconds=3600)
+    metrics.reset("db.")
+    _run_sessions(sessionmaker(bind=engine), 5)
+
+    assert metrics.get("db.ping") == 0
+    assert metrics.get("db.statement") == 5
+
+
+def test_idle_connections_are_pinged(tmp_path: Path) -> None:
+    """Connections idle past the threshold are pinged once per checkout."""
+    engine = _make_engine(tmp_path / "b.db", idle_threshold_seconds=0)
+    metrics.reset("db.")
+    _run_sessions(sessionmaker(bind=engine), 5)
+
+    assert metrics.get("db.ping") == 5
+    assert metrics.get("db.statement") == 5
+
+
+def test_first_statement_retried_on_dead_connection(tmp_path: Path) -> None:
+    """A connection dying under the session is invalidated and the first statement replayed."""
+    engine = _make_engine(tmp_path / "c.db", idle_threshold_seconds=3600)
+    session_factory = sessionmaker(bind=engine)
+    install_first_statement_retry(session_factory)
+
+    with session_factory() as session:
+        session.connection().connection.dbapi_connection.close()
+        assert session.execute(select(Request)).all() == []
+
+    assert metrics.get("db.retry") == 1
+
+
+def test_later_statements_are_not_retried(tmp_path: Path) -> None:
+    """Only the first statement of a session is replayed."""
+    engine = _make_engine(tmp_path / "d.db", idle_threshold_seconds=3600)
+    session_factory = sessionmaker(bind=engine)
+    install_first_statement_retry(session_factory)
+
+    with session_factory() as session:
+        session.execute(select(Request)).all()
+        session.connection().connection.dbapi_connection.close()
+        with pytest.raises(Exception, match="closed database"):
+            session.execute(select(Request)).all()
+
+    assert metrics.get("db.retry") == 0
+
+
+def test_first_statement_not_retried_with_pending_changes(tmp_path: Path) -> None:
+    """The rollback before a replay would drop the pending objects: the error is raised instead."""
+    engine = _make_engine(tmp_path / "e.db", idle_threshold_seconds=3600)
+    session_factory = sessionmaker(bind=engine)
+    install_first_statement_retry(session_factory)
+
+    with session_factory() as session:
+        session.add(Favorite(user_id=uuid.uuid4(), request_id=uuid.uuid4()))
+        session.connection().connection.dbapi_connection.close()
+        # Core statement: no autoflush, the pending favorite is not sent before it
+        with pytest.raises(Exception, match="closed database"):
+            session.execute(text("SELECT 1"))
+
+    assert metrics.get("db.retry") == 0
+    with session_factory() as session:
+        assert session.execute(select(Favorite)).all() == []
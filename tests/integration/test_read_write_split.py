@@ -0,0 +1,120 @@
+"""Read / write engines split integration tests.
+
+The reader is a second SQLite file that never receives the writes: a replica lagging forever.
+"""
+
+import json
+import uuid
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from src.db import session as db_session
+from src.db.async_session import get_async_engine
+from src.db.session import create_app_engine, create_session_factory
+from src.handlers.favorites.create import create_favorite
+from src.handlers.favorites.list import list_user_favorites
+from src.handlers.requests.create import create_request
+from src.handlers.requests.get import get_request
+from src.lib import read_your_writes
+from src.lib.handler import run_async
+from src.lib.read_your_writes import ReadYourWrites, bind_user
+from src.models.base import Base
+from src.repositories.favorite_repository import FavoriteRepository
+from src.repositories.request_repository import RequestRepository
+from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(autouse=True)
+def lagging_reader(
+    tmp_path: Path,
+    monkeypatch,  # noqa: ANN001
+    clock: FakeClock,
+) -> Generator[None, None, None]:
+    reader = create_app_engine(f"sqlite:///{tmp_path / 'reader.db'}")
+    Base.metadata.create_all(reader)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", create_session_factory(reader))
+    monkeypatch.setattr(read_your_writes, "_read_your_writes", ReadYourWrites(5, clock))
+    yield
+    bind_user(None)
+
+
+@pytest.fixture
+def async_engine() -> Generator[None, None, None]:
+    """Close the aiosqlite connections of the async handlers after the test."""
+    yield
+    run_async(get_async_engine().dispose())
+
+
+def _input(title: str = "Title") -> RequestCreate:
+    return RequestCreate(
+        type=RequestType.ONLINE_SERVICE,
+        title=title,
+        description="d",
+        meetup_latitude=36.8,
+        meetup_longitude=10.1,
+    )
+
+
+def test_reads_go_to_the_reader_outside_the_window(clock: FakeClock) -> None:
+    repo = RequestRepository()
+    bind_user("alice")
+    request = repo.create(uuid.uuid4(), _input())
+
+    # Alice just wrote: her reads go to the writer
+    assert repo.get_by_id(request.id) is not None
+    clock.now += 4
+    assert [r.id for r in repo.list_of_requests()["requests"]] == [request.id]
+
+    # Other users, and anonymous calls, read from the reader
+    bind_user("bob")
+    assert repo.get_by_id(request.id) is None
+    bind_user(None)
+    assert repo.list_of_requests()["requests"] == []
+
+    # Window over
+    bind_user("alice")
+    clock.now += 1
+    assert repo.get_by_id(request.id) is None
+
+    # Any write opens it again, favorites included
+    FavoriteRepository().create(uuid.uuid4(), request.id)
+    assert repo.get_by_id(request.id) is not None
+    clock.now += 5
+    repo.update(request.id, RequestUpdate(title="Renamed"))
+    assert repo.get_by_id(request.id).title == "Renamed"
+
+
+def test_handlers_bind_the_caller() -> None:
+    user_id = str(uuid.uuid4())
+    claims = {"requestContext": {"authorizer": {"jwt": {"claims": {"sub": user_id}}}}}
+    created = create_request({**claims, "body": json.dumps(_input().model_dump(mode="json"))}, None)
+    assert created["statusCode"] == 201
+    request_id = json.loads(created["body"])["request_id"]
+
+    path = {"pathParameters": {"request_id": request_id}}
+    assert get_request({**claims, **path}, None)["statusCode"] == 200
+    assert get_request(path, None)["statusCode"] == 404
+
+
+@pytest.mark.usefixtures("async_engine")
+def test_async_writes_open_the_window(clock: FakeClock) -> None:
+    """Writes of the async handlers open the window of the sync reads."""
+    request = RequestRepository().create(uuid.uuid4(), _input())
+    user_id = str(uuid.uuid4())
+    claims = {"requestContext": {"authorizer": {"jwt": {"claims": {"sub": user_id}}}}}
+    clock.now += 5
+
+    # The favorite is created on the async path, the list is read on the sync one
+    body = json.dumps({"request_id": str(request.id)})
+    assert create_favorite({**claims, "body": body}, None)["statusCode"] == 200
+    listed = json.loads(list_user_favorites(claims, None)["body"])["favorites"]
+    assert [favorite["request_id"] for favorite in listed] == [str(request.id)]
+
+    # Window over: the reader has not caught up
+    clock.now += 5
+    assert json.loads(list_user_favorites(claims, None)["body"])["favorites"] == []
@@ -0,0 +1,206 @@
+"""Repositories behaviour tests, run against SQLAlchemy on SQLite and DynamoDB on moto."""
+
+import uuid
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.db.dynamodb_tables import create_tables
+from src.repositories.dynamodb_favorite_repository import DynamoDBFavoriteRepository
+from src.repositories.dynamodb_request_repository import DynamoDBRequestRepository
+from src.repositories.favorite_repository import FavoriteRepository
+from src.repositories.request_repository import RequestRepository
+from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime.now(UTC)
+
+
+@pytest.fixture(params=["sql", "dynamodb"])
+def repos(request, monkeypatch) -> Generator[tuple, None, None]:  # noqa: ANN001
+    """(request repository, favorite repository) of a backend."""
+    if request.param == "sql":
+        yield RequestRepository(), FavoriteRepository()
+        return
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-3")
+    with mock_aws():
+        requests_table, favorites_table = create_tables(
+            boto3.resource("dynamodb"),
+            "test-requests",
+            "test-favorites",
+        )
+        yield (
+            DynamoDBRequestRepository(requests_table, favorites_table),
+            DynamoDBFavoriteRepository(favorites_table),
+        )
+
+
+def _input_request(
+    title: str = "Bring me a charger",
+    due_in_days: int | None = None,
+    request_type: RequestType = RequestType.BUY_AND_DELIVER,
+) -> RequestCreate:
+    locations = {
+        RequestType.BUY_AND_DELIVER: {"dropoff_latitude": 36.8, "dropoff_longitude": 10.1},
+        RequestType.ONLINE_SERVICE: {"meetup_latitude": 48.85, "meetup_longitude": 2.35},
+    }[request_type]
+    due_date = NOW + timedelta(days=due_in_days) if due_in_days is not None else None
+    return RequestCreate(
+        type=request_type,
+        title=title,
+        description="USB-C",
+        due_date=due_date,
+        **locations,
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def _walk(repo, **kwargs) -> list[str]:  # noqa: ANN001
+    titles, cursor = [], None
+    while True:
+        page = repo.list_of_requests(limit=2, cursor=cursor, **kwargs)
+        titles.extend(r.title for r in page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            return titles
+
+
+def test_request_crud(repos) -> None:  # noqa: ANN001
+    request_repo, _ = repos
+    user_id = uuid.uuid4()
+
+    created = request_repo.create(user_id, _input_request(due_in_days=3))
+    fetched = request_repo.get_by_id(created.id)
+    data = fetched.to_dict()
+    assert data["title"] == "Bring me a charger"
+    assert data["type"] == "buy_and_deliver"
+    assert (data["dropoff_latitude"], data["dropoff_longitude"]) == (36.8, 10.1)
+    assert abs(_as_utc(fetched.due_date) - (NOW + timedelta(days=3))) < timedelta(milliseconds=1)
+
+    updated = request_repo.update(created.id, RequestUpdate(title="Bring me two chargers"))
+    assert updated.title == "Bring me two chargers"
+    assert updated.description == "USB-C"
+    assert request_repo.get_by_id(created.id).title == "Bring me two chargers"
+    assert [r.id for r in request_repo.get_user_requests(user_id)] == [created.id]
+    assert request_repo.get_user_requests(uuid.uuid4()) == []
+
+    assert request_repo.delete(created.id)
+    assert request_repo.get_by_id(created.id) is None
+    assert request_repo.delete(created.id)  # idempotent
+
+
+def test_update_missing_request(repos) -> None:  # noqa: ANN001
+    request_repo, _ = repos
+    with pytest.raises(Exception, match="Workflow should not be happening"):  # noqa: PT011
+        request_repo.update(uuid.uuid4(), RequestUpdate(title="Nope"))
+
+
+def test_list_order_and_pagination(repos) -> None:  # noqa: ANN001
+    request_repo, _ = repos
+    for title, due_in_days in [("c", 3), ("none-1", None), ("a", 1), ("b", 2), ("none-2", None)]:
+        request_repo.create(uuid.uuid4(), _input_request(title, due_in_days))
+
+    # Due dates first (earliest first), then requests without due date (oldest first)
+    assert _walk(request_repo) == ["a", "b", "c", "none-1", "none-2"]
+    page = request_repo.list_of_requests(limit=10)
+    assert page["pagination"] == {"next_cursor": None, "has_more": False, "limit": 10}
+
+
+def test_list_filters(repos) -> None:  # noqa: ANN001
+    request_repo, _ = repos
+    request_repo.create(uuid.uuid4(), _input_request("buy", 1))
+    request_repo.create(
+        uuid.uuid4(),
+        _input_request("online", 2, request_type=RequestType.ONLINE_SERVICE),
+    )
+    request_repo.create(uuid.uuid4(), _input_request("later", 10))
+    request_repo.create(uuid.uuid4(), _input_request("undated"))
+
+    assert _walk(request_repo, request_type="online_service") == ["online"]
+    assert _walk(request_repo, due_after=NOW + timedelta(days=2)) == ["online", "later"]
+    assert _walk(request_repo, due_before=NOW + timedelta(days=2)) == ["buy"]
+    window = {"due_after": NOW, "due_before": NOW + timedelta(days=5)}
+    assert _walk(request_repo, **window) == ["buy", "online"]
+    assert [r.title for r in request_repo.get_batch_from_due_date(NOW, limit=10)] == [
+        "buy",
+        "online",
+        "later",
+    ]
+    with pytest.raises(Exception, match="due_after must be before due_before"):  # noqa: PT011
+        request_repo.list_of_requests(due_after=NOW, due_before=NOW)
+
+
+def test_favorites(repos) -> None:  # noqa: ANN001
+    request_repo, favorite_repo = repos
+    user_id = uuid.uuid4()
+    first = request_repo.create(uuid.uuid4(), _input_request("first"))
+    second = request_repo.create(uuid.uuid4(), _input_request("second"))
+
+    favorite = favorite_repo.create(user_id, first.id)
+    assert favorite_repo.create(user_id, first.id).id == favorite.id  # idempotent
+    assert favorite_repo.get_user_favorite(user_id, first.id).id == favorite.id
+    assert favorite_repo.get_user_favorite(user_id, second.id) is None
+    assert favorite_repo.get_by_id(favorite.id).request_id == first.id
+
+    later = favorite_repo.create(user_id, second.id)
+    listed = favorite_repo.list_user_favorites(user_id)
+    assert [f.id for f in listed] == [later.id, favorite.id]  # most recent first
+    assert favorite_repo.list_user_favorites(uuid.uuid4()) == []
+
+    assert favorite_repo.delete(later.id)
+    assert favorite_repo.get_by_id(later.id) is None
+    assert favorite_repo.delete(later.id)  # idempotent
+
+    # Deleting a request deletes its favorites
+    request_repo.delete(first.id)
+    assert favorite_repo.get_by_id(favorite.id) is None
+    assert favorite_repo.list_user_favorites(user_id) == []
+
+
+def test_stats_follow_writes(repos) -> None:  # noqa: ANN001
+    request_repo, _ = repos
+    user_id = uuid.uuid4()
+    request_repo.create(user_id, _input_request("this week", due_in_days=3))
+    later = request_repo.create(user_id, _input_request("later", due_in_days=10))
+    request_repo.create(user_id, _input_request("no date", request_type=RequestType.ONLINE_SERVICE))
+    request_repo.delete(later.id)
+    request_repo.delete(later.id)  # a repeated delete is not counted twice
+
+    stats = request_repo.get_stats()
+    assert stats["total"] == 2
+    assert stats["by_type"] == {"buy_and_deliver": 1, "pickup_and_deliver": 0, "online_service": 1}
+    assert stats["by_due_date"] == {"today": 0, "this_week": 1, "no_date": 1}
+    # Nothing to correct after regular writes
+    assert request_repo.reconcile_stats().corrected == 0
+
+
+def test_dynamodb_requests_quota(monkeypatch) -> None:  # noqa: ANN001
+    """The quota is enforced by the creation transaction, and released on delete."""
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-3")
+    monkeypatch.setattr("src.repositories.dynamodb_request_repository.MAX_USER_CREATED_REQUESTS", 2)
+    with mock_aws():
+        requests_table, favorites_table = create_tables(boto3.resource("dynamodb"), "r", "f")
+        request_repo = DynamoDBRequestRepository(requests_table, favorites_table)
+        user_id = uuid.uuid4()
+
+        first = request_repo.create(user_id, _input_request("first"))
+        request_repo.create(user_id, _input_request("second"))
+        with pytest.raises(Exception, match="Too many requests created"):  # noqa: PT011
+            request_repo.create(user_id, _input_request("third"))
+        request_repo.create(uuid.uuid4(), _input_request("other user"))
+
+        request_repo.delete(first.id)
+        request_repo.delete(first.id)  # a repeated delete does not release the quota twice
+        request_repo.create(user_id, _input_request("third"))
+        with pytest.raises(Exception, match="Too many requests created"):  # noqa: PT011
+            request_repo.create(user_id, _input_request("fourth"))
+        # Quota items never show in the feed
+        assert len(request_repo.list_of_requests(limit=10)["requests"]) == 3
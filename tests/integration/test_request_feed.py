@@ -0,0 +1,147 @@
+"""Feed projection integration tests."""
+
+import base64
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, update
+
+from src.db.bulk import BulkLoader, generate_records
+from src.db.request_feed import check_request_feed, rebuild_request_feed
+from src.db.session import engine
+from src.handlers.requests import list as list_handler
+from src.models.request import RequestFeedEntry
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime.now(UTC)
+
+
+def _create(title: str, due_in_days: int | None = None, request_type=RequestType.ONLINE_SERVICE):  # noqa: ANN001, ANN202
+    location = (
+        {"meetup_latitude": 36.8, "meetup_longitude": 10.1}
+        if request_type == RequestType.ONLINE_SERVICE
+        else {"dropoff_latitude": 36.8, "dropoff_longitude": 10.1}
+    )
+    due_date = NOW + timedelta(days=due_in_days) if due_in_days is not None else None
+    return get_request_repository().create(
+        uuid.uuid4(),
+        RequestCreate(
+            type=request_type,
+            title=title,
+            description="d",
+            due_date=due_date,
+            **location,
+        ),
+    )
+
+
+def _normalized(data: dict) -> dict:
+    """Request dict with UTC aware dates (SQLite returns naive datetimes)."""
+    data = dict(data)
+    for name in ("due_date", "created_at"):
+        if data[name]:
+            value = datetime.fromisoformat(data[name])
+            data[name] = (value if value.tzinfo else value.replace(tzinfo=UTC)).isoformat()
+    return data
+
+
+def _cursor_id(cursor: str) -> str:
+    return json.loads(base64.b64decode(cursor))["id"]
+
+
+def _walk_both(**kwargs) -> list[str]:  # noqa: ANN003
+    """Walk the feed and list_of_requests side by side, return the feed titles."""
+    repo = get_request_repository()
+    titles, cursor = [], None
+    while True:
+        feed_page = repo.list_feed(limit=2, cursor=cursor, **kwargs)
+        page = repo.list_of_requests(limit=2, cursor=cursor, **kwargs)
+        fragments = [json.loads(fragment) for fragment in feed_page["fragments"]]
+        assert fragments == [_normalized(request.to_dict()) for request in page["requests"]]
+        assert feed_page["pagination"]["has_more"] == page["pagination"]["has_more"]
+        titles.extend(fragment["title"] for fragment in fragments)
+        # Cursors of both are interchangeable: resume list_of_requests from the feed cursor
+        cursor = feed_page["pagination"]["next_cursor"]
+        if not cursor:
+            return titles
+
+
+def test_feed_pages_match_list_of_requests() -> None:
+    _create("c", 3)
+    _create("none-1")
+    _create("a", 1, RequestType.BUY_AND_DELIVER)
+    _create("b", 2)
+    _create("none-2", request_type=RequestType.BUY_AND_DELIVER)
+
+    assert _walk_both() == ["a", "b", "c", "none-1", "none-2"]
+    assert _walk_both(request_type="buy_and_deliver") == ["a", "none-2"]
+    assert _walk_both(due_after=NOW + timedelta(days=2)) == ["b", "c"]
+    assert _walk_both(due_before=NOW + timedelta(days=2)) == ["a"]
+    assert _walk_both(due_after=NOW, due_before=NOW + timedelta(days=3)) == ["a", "b"]
+
+
+def test_writes_maintain_the_projection() -> None:
+    repo = get_request_repository()
+    kept = _create("Kept", 1)
+    removed = _create("Removed")
+    repo.update(kept.id, RequestUpdate(title="Renamed"))
+    repo.delete(removed.id)
+
+    fragments = [json.loads(f) for f in repo.list_feed()["fragments"]]
+    assert [f["title"] for f in fragments] == ["Renamed"]
+    assert check_request_feed(engine).consistent
+
+
+def test_bulk_loader_writes_the_projection() -> None:
+    BulkLoader(engine, batch_size=7).load(generate_records(15, 0, seed=3))
+    report = check_request_feed(engine, batch_size=4)
+    assert (report.checked, report.consistent) == (15, True)
+    assert len(get_request_repository().list_feed(limit=100)["fragments"]) == 15
+
+
+def test_check_and_rebuild() -> None:
+    requests = [_create(f"Request {i}", i + 1) for i in range(5)]
+    feed = RequestFeedEntry.__table__
+    with engine.begin() as connection:
+        connection.execute(delete(feed).where(feed.c.request_id == requests[0].id))
+        connection.execute(
+            update(feed).where(feed.c.request_id == requests[1].id).values(fragment="{}"),
+        )
+        connection.execute(
+            insert(feed).values(
+                request_id=uuid.uuid4(),
+                feed_key="~#orphan",
+                type=RequestType.ONLINE_SERVICE,
+                fragment="{}",
+            ),
+        )
+
+    report = check_request_feed(engine, batch_size=2)
+    assert (report.checked, report.missing, report.stale, report.orphaned) == (5, 1, 1, 1)
+    assert str(requests[0].id) in report.sample_ids
+
+    rebuilt = rebuild_request_feed(engine, batch_size=2)
+    assert (rebuilt.requests, rebuilt.removed) == (5, 1)
+    assert check_request_feed(engine).consistent
+
+
+def test_list_handler_serves_the_projection(monkeypatch) -> None:  # noqa: ANN001
+    for i in range(3):
+        _create(f"Request {i}", i + 1)
+    event = {"queryStringParameters": {"limit": "2"}}
+    expected = json.loads(list_handler.list_requests(event, None)["body"])
+
+    monkeypatch.setattr(list_handler, "REQUEST_FEED_READS", True)
+    response = list_handler.list_requests(event, None)
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert body["requests"] == [_normalized(r) for r in expected["requests"]]
+    # Same position (cursor dates are only naive on SQLite in the list_of_requests one)
+    pagination, expected_pagination = body.pop("pagination"), expected.pop("pagination")
+    assert pagination["has_more"] == expected_pagination["has_more"]
+    assert _cursor_id(pagination["next_cursor"]) == _cursor_id(expected_pagination["next_cursor"])
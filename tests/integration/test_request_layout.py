@@ -0,0 +1,125 @@
+"""Requests storage layouts integration tests."""
+
+import io
+import json
+import uuid
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import func, select
+
+from src.db.bulk import BulkLoader, generate_records
+from src.db.export import export_ndjson, iter_request_records
+from src.db.request_layout import migrate_request_layout
+from src.db.session import engine, get_db_session
+from src.models.layout import JOINED, SINGLE, set_request_storage_layout
+from src.models.request import (
+    BuyAndDeliverRequest,
+    OnlineServiceRequest,
+    PickupAndDeliverRequest,
+    Request,
+)
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+
+pytestmark = pytest.mark.integration
+
+_SUBTYPES = (BuyAndDeliverRequest, PickupAndDeliverRequest, OnlineServiceRequest)
+
+
+@pytest.fixture
+def single_table() -> Generator[None, None, None]:
+    """Run a test with the single table layout."""
+    set_request_storage_layout(SINGLE)
+    yield
+    set_request_storage_layout(JOINED)
+
+
+def _subtype_rows() -> int:
+    with get_db_session() as db:
+        return sum(db.scalar(select(func.count()).select_from(model)) for model in _SUBTYPES)
+
+
+def _export() -> list[dict]:
+    stream = io.StringIO()
+    export_ndjson(iter_request_records(engine), stream)
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.mark.usefixtures("single_table")
+def test_single_table_repository() -> None:
+    """Requests are one row each, and read back exactly as in the joined layout."""
+    repo = get_request_repository()
+    request = repo.create(
+        uuid.uuid4(),
+        RequestCreate(
+            type=RequestType.PICKUP_AND_DELIVER,
+            title="Move a box",
+            description="Small box",
+            pickup_latitude=36.8,
+            pickup_longitude=10.1,
+            dropoff_latitude=35.8,
+            dropoff_longitude=10.6,
+        ),
+    )
+    assert _subtype_rows() == 0
+
+    data = repo.get_by_id(request.id).to_dict()
+    assert data["pickup_latitude"] == 36.8
+    assert data["dropoff_longitude"] == 10.6
+    assert "meetup_latitude" not in data
+
+    repo.update(request.id, RequestUpdate(title="Move two boxes"))
+    assert [r.title for r in repo.list_of_requests()["requests"]] == ["Move two boxes"]
+    assert [r.id for r in repo.search_requests("boxes")["requests"]] == [request.id]
+    assert repo.delete(request.id)
+    assert repo.get_by_id(request.id) is None
+
+
+def test_migration_round_trip() -> None:
+    """Joined -> single -> joined keeps every request identical."""
+    BulkLoader(engine).load(generate_records(120, seed=4))
+    before = _export()
+    assert _subtype_rows() == 120
+
+    report = migrate_request_layout(engine, SINGLE, batch_size=25)
+    assert report.total == 120
+    assert report.transactions >= 120 // 25
+    assert _subtype_rows() == 0
+    # Migrated requests are still read correctly in the joined layout (before switching)
+    assert _export() == before
+    request_id = uuid.UUID(before[0]["id"])
+    # NOTE: dates left out, SQLite hands them back timezone naive to the ORM
+    expected = {k: v for k, v in before[0].items() if k not in ("kind", "due_date", "created_at")}
+    assert get_request_repository().get_by_id(request_id).to_dict().items() >= expected.items()
+
+    set_request_storage_layout(SINGLE)
+    try:
+        data = get_request_repository().get_by_id(request_id).to_dict()
+        assert data.items() >= expected.items()
+    finally:
+        set_request_storage_layout(JOINED)
+
+    # Idempotent
+    assert migrate_request_layout(engine, SINGLE).total == 0
+
+    assert migrate_request_layout(engine, JOINED).total == 120
+    assert _subtype_rows() == 120
+    with get_db_session() as db:
+        assert db.scalar(select(func.count()).where(Request.dropoff_latitude.is_not(None))) == 0
+    assert _export() == before
+
+
+@pytest.mark.usefixtures("single_table")
+def test_bulk_load_single_table() -> None:
+    """The bulk loader writes one row per request in the single table layout."""
+    report = BulkLoader(engine).load(generate_records(30, seed=2))
+    assert report.rows_per_table["requests"] == 30
+    assert _subtype_rows() == 0
+    assert len(_export()) == 30
+
+
+def test_invalid_layout() -> None:
+    """Only known layouts are accepted."""
+    with pytest.raises(ValueError, match="not valid"):
+        set_request_storage_layout("documents")
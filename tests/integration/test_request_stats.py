@@ -0,0 +1,124 @@
+"""Feed stats counters integration tests."""
+
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+from itertools import count
+
+import boto3
+import pytest
+from moto import mock_aws
+from sqlalchemy import func, insert, select
+
+from src.db.bulk import BulkLoader, generate_records
+from src.db.dynamodb_tables import create_tables
+from src.db.request_counters import reconcile_request_counters
+from src.db.session import engine
+from src.handlers.requests import stats as stats_handler
+from src.lib.request_stats import TOTAL_KEY, due_key, stats_from_counts, utc_today
+from src.models.request import RequestCounter
+from src.repositories.dynamodb_request_repository import DynamoDBRequestRepository, counter_item_id
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime.now(UTC)
+
+
+def _input_request(due_in_days: int | None = None) -> RequestCreate:
+    return RequestCreate(
+        type=RequestType.ONLINE_SERVICE,
+        title="Need a plane ticket",
+        description="d",
+        due_date=NOW + timedelta(days=due_in_days) if due_in_days is not None else None,
+        meetup_latitude=36.8,
+        meetup_longitude=10.1,
+    )
+
+
+@pytest.fixture
+def round_robin_shards(monkeypatch) -> None:  # noqa: ANN001
+    """Writes spread over the shards in turn instead of at random."""
+    shards = count()
+    monkeypatch.setattr("src.lib.request_stats.random.randrange", lambda n: next(shards) % n)
+
+
+@pytest.mark.usefixtures("round_robin_shards")
+def test_counters_are_sharded() -> None:
+    repo = get_request_repository()
+    for _ in range(3):
+        repo.create(uuid.uuid4(), _input_request())
+
+    with engine.connect() as connection:
+        total_rows = connection.execute(
+            select(func.count()).select_from(RequestCounter).where(RequestCounter.key == TOTAL_KEY),
+        ).scalar_one()
+    assert total_rows == 3
+    assert repo.get_stats()["total"] == 3
+
+
+def test_reconcile_corrects_drift_and_expires_days() -> None:
+    repo = get_request_repository()
+    for due_in_days in (1, 2, None):
+        repo.create(uuid.uuid4(), _input_request(due_in_days))
+    with engine.begin() as connection:
+        connection.execute(insert(RequestCounter).values(key=TOTAL_KEY, shard=99, count=39))
+    assert repo.get_stats()["total"] == 42
+
+    report = reconcile_request_counters(engine)
+    assert (report.corrected, report.expired) == (1, 0)
+    assert repo.get_stats()["total"] == 3
+
+    # Three days later, both day counters are over
+    report = reconcile_request_counters(engine, today=utc_today() + timedelta(days=3))
+    assert (report.corrected, report.expired) == (0, 2)
+    with engine.connect() as connection:
+        keys = set(connection.execute(select(RequestCounter.key)).scalars())
+    assert not any(key.startswith("due:2") for key in keys)
+
+
+def test_bulk_loader_counts_its_requests() -> None:
+    BulkLoader(engine, batch_size=7).load(generate_records(15, 5, seed=3))
+    assert get_request_repository().get_stats()["total"] == 15
+    assert reconcile_request_counters(engine).corrected == 0
+
+
+def test_dynamodb_reconcile(monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-3")
+    with mock_aws():
+        requests_table, favorites_table = create_tables(boto3.resource("dynamodb"), "r", "f")
+        repo = DynamoDBRequestRepository(requests_table, favorites_table)
+        repo.create(uuid.uuid4(), _input_request(2))
+        repo.create(uuid.uuid4(), _input_request())
+        requests_table.put_item(Item={"id": counter_item_id(TOTAL_KEY, 5), "count": 7})
+        expired_day = due_key(utc_today() - timedelta(days=1))
+        requests_table.put_item(Item={"id": counter_item_id(expired_day, 0), "count": 1})
+
+        report = repo.reconcile_stats()
+        assert (report.corrected, report.expired) == (1, 1)
+        assert repo.get_stats()["total"] == 2
+        assert "Item" not in requests_table.get_item(Key={"id": counter_item_id(expired_day, 0)})
+
+
+def test_stats_handler() -> None:
+    get_request_repository().create(uuid.uuid4(), _input_request(3))
+    response = stats_handler.get_request_stats({}, None)
+    assert response["statusCode"] == 200
+    stats = json.loads(response["body"])["stats"]
+    assert stats["total"] == 1
+    assert stats["by_due_date"] == {"today": 0, "this_week": 1, "no_date": 0}
+
+    summary = stats_handler.reconcile_request_stats({}, None)
+    assert summary["corrected"] == 0
+
+
+def test_buckets_from_day_counters() -> None:
+    today = utc_today()
+    counts = {
+        due_key(today): 2,
+        due_key(today + timedelta(days=6)): 1,
+        due_key(today + timedelta(days=7)): 5,
+    }
+    by_due_date = stats_from_counts(counts, today)["by_due_date"]
+    assert by_due_date == {"today": 2, "this_week": 3, "no_date": 0}
@@ -0,0 +1,117 @@
+"""Requests full-text search integration tests."""
+
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from src.db.bulk import BulkLoader, generate_records
+from src.db.search_index import rebuild_search_index
+from src.db.session import engine, get_db_session
+from src.handlers.requests.list import list_requests
+from src.models.request import RequestSearchToken
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType, RequestUpdate
+
+pytestmark = pytest.mark.integration
+
+
+def _create(title: str, description: str, request_type: RequestType = RequestType.ONLINE_SERVICE):  # noqa: ANN202
+    location = (
+        {"meetup_latitude": 36.8, "meetup_longitude": 10.1}
+        if request_type == RequestType.ONLINE_SERVICE
+        else {"dropoff_latitude": 36.8, "dropoff_longitude": 10.1}
+    )
+    return get_request_repository().create(
+        uuid.uuid4(),
+        RequestCreate(type=request_type, title=title, description=description, **location),
+    )
+
+
+def _titles(result: dict) -> list[str]:
+    return [request.title for request in result["requests"]]
+
+
+def test_search_ranks_and_filters() -> None:
+    """All words must match, title matches rank first, type filter applies."""
+    repo = get_request_repository()
+    _create("Phone charger", "Any USB-C charger", RequestType.BUY_AND_DELIVER)
+    _create("Cable", "USB-C charger cable for my phone", RequestType.BUY_AND_DELIVER)
+    _create("Phone repair", "Screen is broken")
+    _create("Charger", "Laptop")
+
+    assert _titles(repo.search_requests("phone charger")) == ["Phone charger", "Cable"]
+    assert _titles(repo.search_requests("PHONE")) == ["Phone repair", "Phone charger", "Cable"]
+    assert _titles(repo.search_requests("phone", request_type="online_service")) == [
+        "Phone repair",
+    ]
+    assert _titles(repo.search_requests("bicycle")) == []
+    with pytest.raises(ValueError, match="at least one word"):
+        repo.search_requests("a")
+
+
+def test_search_keyset_pagination() -> None:
+    """Pages neither skip nor repeat requests sharing the same score."""
+    repo = get_request_repository()
+    created = {_create(f"Guitar lesson {i}", "guitar " * (i % 3)).id for i in range(11)}
+
+    seen, cursor = [], None
+    while True:
+        page = repo.search_requests("guitar", limit=4, cursor=cursor)
+        seen.extend(request.id for request in page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 11
+    assert set(seen) == created
+
+
+def test_index_follows_updates_and_deletes() -> None:
+    """Updating title / description re-indexes the request, deleting it removes its tokens."""
+    repo = get_request_repository()
+    request = _create("Old sofa", "Pick up a sofa")
+
+    repo.update(request.id, RequestUpdate(title="Wooden table"))
+    assert _titles(repo.search_requests("table")) == ["Wooden table"]
+    assert _titles(repo.search_requests("old")) == []
+    assert _titles(repo.search_requests("sofa")) == ["Wooden table"]  # still in the description
+
+    repo.delete(request.id)
+    with get_db_session() as db:
+        assert db.scalar(select(func.count()).select_from(RequestSearchToken)) == 0
+
+
+def test_bulk_load_indexes_and_rebuild() -> None:
+    """Bulk loaded requests are searchable, a rebuild produces the same index."""
+    BulkLoader(engine).load(generate_records(60, seed=3))
+    with get_db_session() as db:
+        before = db.execute(select(RequestSearchToken.token, RequestSearchToken.request_id)).all()
+        db.query(RequestSearchToken).delete()
+    assert before
+
+    report = rebuild_search_index(engine, batch_size=7, max_rows_per_transaction=40)
+    assert report.requests == 60
+    assert report.transactions > 60 // 7
+    with get_db_session() as db:
+        after = db.execute(select(RequestSearchToken.token, RequestSearchToken.request_id)).all()
+    assert sorted(after) == sorted(before)
+
+
+def test_list_requests_handler_search() -> None:
+    """GET /v0/requests?q= returns ranked results with the usual pagination."""
+    _create("Math tutoring", "Algebra")
+    _create("Physics tutoring", "Mechanics")
+
+    response = list_requests({"queryStringParameters": {"q": "tutoring", "limit": "1"}}, None)
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert len(body["requests"]) == 1
+    assert body["pagination"]["has_more"]
+
+    cursor = body["pagination"]["next_cursor"]
+    response = list_requests(
+        {"queryStringParameters": {"q": "tutoring", "limit": "1", "cursor": cursor}},
+        None,
+    )
+    assert len(json.loads(response["body"])["requests"]) == 1
@@ -0,0 +1,238 @@
+"""Regional shards integration tests (one SQLite database per shard)."""
+
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from src.db.async_session import get_async_engine
+from src.db.session import create_app_engine, engine
+from src.db.shards import Region, Shard, ShardRouter, build_shard_router, parse_shards_config
+from src.handlers.favorites.create import create_favorite
+from src.handlers.requests import list as list_handler
+from src.handlers.requests.list import list_requests
+from src.lib import read_your_writes
+from src.lib.handler import run_async
+from src.lib.ids import uuid7_shard
+from src.lib.read_your_writes import ReadYourWrites, bind_user
+from src.models.base import Base
+from src.models.request import Request
+from src.repositories import async_request_repository, request_repository
+from src.repositories.request_repository import RequestRepository
+from src.repositories.sharded_request_repository import ShardedRequestRepository
+from src.schemas.request import LocationFilter, RequestCreate, RequestType, RequestUpdate
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime.now(UTC)
+NORTH = (36.8, 10.2)  # Tunis
+SOUTH = (34.7, 10.8)  # Sfax
+ELSEWHERE = (48.9, 2.3)  # Paris: main database
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> ShardedRequestRepository:
+    shards = [Shard(0, "main", engine)]
+    regions = {
+        "north": {"cell": [36.0, 8.0, 37.6, 11.6]},
+        "south": {"polygon": [[33.0, 8.0], [35.9, 8.0], [35.9, 11.6], [33.0, 11.6]]},
+    }
+    for index, (name, region) in enumerate(regions.items(), start=1):
+        shard_engine = create_app_engine(f"sqlite:///{tmp_path / f'{name}.db'}")
+        Base.metadata.create_all(shard_engine)
+        shards.append(Shard(index, name, shard_engine, Region.from_config(region)))
+    return ShardedRequestRepository(ShardRouter(shards))
+
+
+def _input(title: str, point: tuple[float, float], due_in_days: int | None = None) -> RequestCreate:
+    due_date = NOW + timedelta(days=due_in_days) if due_in_days is not None else None
+    return RequestCreate(
+        type=RequestType.ONLINE_SERVICE,
+        title=title,
+        description="d",
+        due_date=due_date,
+        meetup_latitude=point[0],
+        meetup_longitude=point[1],
+    )
+
+
+def _count(shard: Shard) -> int:
+    with shard.engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(Request)).scalar_one()
+
+
+def test_region_contains_and_overlaps() -> None:
+    triangle = Region.from_config({"polygon": [[0, 0], [10, 0], [0, 10]]})
+    assert triangle.contains(2, 2)
+    assert not triangle.contains(6, 6)
+    assert triangle.may_overlap(-0.5, -0.5, radius_km=100)
+    assert not triangle.may_overlap(-5, -5, radius_km=100)
+    with pytest.raises(ValueError, match="cell must be"):
+        Region.from_config({"cell": [10, 0, 0, 10]})
+    with pytest.raises(ValueError, match="unique name"):
+        parse_shards_config('[{"name": "main", "url": "sqlite://"}]')
+
+
+def test_writes_are_routed_by_location(repo: ShardedRequestRepository) -> None:
+    north = repo.create(uuid.uuid4(), _input("north", NORTH))
+    south = repo.create(uuid.uuid4(), _input("south", SOUTH))
+    elsewhere = repo.create(uuid.uuid4(), _input("elsewhere", ELSEWHERE))
+
+    assert [uuid7_shard(r.id) for r in (elsewhere, north, south)] == [0, 1, 2]
+    assert [_count(shard) for shard in repo.router.shards] == [1, 1, 1]
+
+    # Reads, updates and deletes follow the id
+    assert repo.get_by_id(south.id).title == "south"
+    assert repo.update(north.id, RequestUpdate(title="renamed")).title == "renamed"
+    assert repo.get_by_id(north.id, ("title",)).title == "renamed"
+    assert repo.delete(south.id)
+    assert repo.get_by_id(south.id) is None
+    assert [_count(shard) for shard in repo.router.shards] == [1, 1, 0]
+
+
+def test_ids_created_before_sharding_are_found_in_the_main_database(
+    repo: ShardedRequestRepository,
+) -> None:
+    # Random bits of a pre-sharding id decoding as the north shard
+    legacy = RequestRepository(engine, shard=1).create(uuid.uuid4(), _input("legacy", NORTH))
+    assert repo.get_by_id(legacy.id).title == "legacy"
+    assert repo.update(legacy.id, RequestUpdate(title="legacy renamed")).title == "legacy renamed"
+    assert repo.delete(legacy.id)
+    assert _count(repo.router.main) == 0
+
+
+def test_keyset_pages_are_merged_across_shards(repo: ShardedRequestRepository) -> None:
+    points = [NORTH, SOUTH, ELSEWHERE]
+    for i in range(10):
+        repo.create(uuid.uuid4(), _input(f"due {i:02d}", points[i % 3], due_in_days=10 - i))
+    for i in range(4):
+        repo.create(uuid.uuid4(), _input(f"none {i}", points[(i + 1) % 3]))
+    expected = [f"due {i:02d}" for i in reversed(range(10))] + [f"none {i}" for i in range(4)]
+
+    titles, cursor = [], None
+    while True:
+        page = repo.list_of_requests(limit=3, cursor=cursor)
+        assert len(page["requests"]) <= 3
+        titles.extend(request.title for request in page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert titles == expected
+
+    feed, cursor = [], None
+    while True:
+        page = repo.list_feed(limit=4, cursor=cursor)
+        feed.extend(page["fragments"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert len(feed) == len(expected)
+
+    # Around Tunis: only the main and north shards are read
+    near = LocationFilter(lat=NORTH[0], lng=NORTH[1], radius_km=20)
+    assert [shard.name for shard in repo.router.shards_near(*NORTH, 20)] == ["main", "north"]
+    page = repo.list_of_requests(limit=20, near=near)
+    assert [r.title for r in page["requests"]] == [
+        "due 09", "due 08", "due 06", "due 05", "due 03", "due 02", "due 00", "none 1", "none 2",
+    ]
+
+
+def test_list_handler_reads_every_shard(
+    repo: ShardedRequestRepository,
+    monkeypatch,  # noqa: ANN001
+) -> None:
+    monkeypatch.setattr(request_repository, "_request_repo_instance", repo)
+    for name, point in (("north", NORTH), ("south", SOUTH), ("elsewhere", ELSEWHERE)):
+        repo.create(uuid.uuid4(), _input(name, point))
+
+    def titles(**query_params: str) -> list[str]:
+        response = list_requests({"queryStringParameters": query_params}, None)
+        assert response["statusCode"] == 200, response["body"]
+        return sorted(request["title"] for request in json.loads(response["body"])["requests"])
+
+    # Same results as unsharded deployments: a location in the query string is not a filter
+    everywhere = ["elsewhere", "north", "south"]
+    assert titles() == everywhere
+    assert titles(lat="36.8", lng="10.2", radius_km="20") == everywhere
+    assert titles(q="north") == ["north"]
+    assert titles(fields="title") == everywhere
+    monkeypatch.setattr(list_handler, "REQUEST_FEED_READS", True)
+    assert titles(lat="36.8", lng="10.2") == everywhere
+
+
+def test_async_handlers_find_the_requests_of_the_shards(
+    repo: ShardedRequestRepository,
+    monkeypatch,  # noqa: ANN001
+) -> None:
+    monkeypatch.setattr(request_repository, "_request_repo_instance", repo)
+    monkeypatch.setattr(async_request_repository, "DATABASE_SHARDS", "[...]")
+    monkeypatch.setattr(async_request_repository, "_async_request_repo_instance", None)
+    north = repo.create(uuid.uuid4(), _input("north", NORTH))
+
+    try:
+        response = create_favorite(
+            {
+                "requestContext": {"authorizer": {"jwt": {"claims": {"sub": str(uuid.uuid4())}}}},
+                "body": json.dumps({"request_id": str(north.id)}),
+            },
+            None,
+        )
+    finally:
+        run_async(get_async_engine().dispose())
+    assert response["statusCode"] == 200, response["body"]
+
+
+def test_search_and_stats_span_the_shards(repo: ShardedRequestRepository) -> None:
+    for i, point in enumerate([NORTH, SOUTH, ELSEWHERE, NORTH]):
+        repo.create(uuid.uuid4(), _input(f"bike repair {i}", point))
+
+    found, cursor = [], None
+    while True:
+        page = repo.search_requests("bike", limit=3, cursor=cursor)
+        found.extend(request.title for request in page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert sorted(found) == [f"bike repair {i}" for i in range(4)]
+
+    stats = repo.get_stats()
+    assert stats["total"] == 4
+    assert stats["by_due_date"]["no_date"] == 4
+
+
+def test_shard_reads_go_to_the_shard_reader(tmp_path: Path, monkeypatch) -> None:  # noqa: ANN001
+    """The reader of the shard never receives the writes: a replica lagging forever."""
+    now = [1000.0]
+    monkeypatch.setattr(read_your_writes, "_read_your_writes", ReadYourWrites(5, lambda: now[0]))
+    entry = {
+        "name": "north",
+        "url": f"sqlite:///{tmp_path / 'north.db'}",
+        "read_url": f"sqlite:///{tmp_path / 'north-reader.db'}",
+        "cell": [36.0, 8.0, 37.6, 11.6],
+    }
+    router = build_shard_router(engine, [entry])
+    north = router.shards[1]
+    for shard_engine in (north.engine, north.read_engine):
+        Base.metadata.create_all(shard_engine)
+    repo = ShardedRequestRepository(router)
+    near = LocationFilter(lat=NORTH[0], lng=NORTH[1], radius_km=20)
+
+    bind_user("alice")
+    request = repo.create(uuid.uuid4(), _input("north", NORTH))
+    try:
+        # Alice just wrote: her reads go to the writer of the shard
+        assert repo.get_by_id(request.id).title == "north"
+        assert [r.id for r in repo.list_of_requests(near=near)["requests"]] == [request.id]
+
+        # Other users, and Alice once the window is over, read from its reader
+        bind_user("bob")
+        assert repo.get_by_id(request.id) is None
+        assert repo.list_of_requests(near=near)["requests"] == []
+        bind_user("alice")
+        now[0] += 5
+        assert repo.get_by_id(request.id) is None
+    finally:
+        bind_user(None)
@@ -0,0 +1,126 @@
+"""Sparse fieldsets (fields=) integration tests."""
+
+import json
+import uuid
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import event
+
+from src.db.session import engine
+from src.handlers.favorites import list as list_favorites_handler
+from src.handlers.requests import get as get_handler
+from src.handlers.requests import list as list_handler
+from src.models.layout import JOINED, SINGLE, set_request_storage_layout
+from src.repositories.favorite_repository import get_favorite_repository
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType
+
+pytestmark = pytest.mark.integration
+
+MAP_FIELDS = "id,type,title,meetup_latitude,meetup_longitude,dropoff_latitude,dropoff_longitude"
+
+
+@pytest.fixture(params=[JOINED, SINGLE])
+def layout(request) -> Generator[str, None, None]:  # noqa: ANN001
+    set_request_storage_layout(request.param)
+    yield request.param
+    set_request_storage_layout(JOINED)
+
+
+@pytest.fixture
+def statements() -> Generator[list[str], None, None]:
+    """SQL statements run on the engine during the test."""
+    executed: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001, ARG001, PLR0913
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+def _create_requests() -> tuple:
+    repo = get_request_repository()
+    user_id = uuid.uuid4()
+    online = repo.create(
+        user_id,
+        RequestCreate(
+            type=RequestType.ONLINE_SERVICE,
+            title="Netflix",
+            description="d" * 500,
+            meetup_latitude=36.8,
+            meetup_longitude=10.1,
+        ),
+    )
+    delivery = repo.create(
+        user_id,
+        RequestCreate(
+            type=RequestType.BUY_AND_DELIVER,
+            title="Perfume",
+            description="d" * 500,
+            dropoff_latitude=48.8,
+            dropoff_longitude=2.3,
+        ),
+    )
+    return online, delivery
+
+
+def test_list_projection(layout, statements) -> None:  # noqa: ANN001, ARG001
+    _create_requests()
+    statements.clear()
+    event = {"queryStringParameters": {"fields": MAP_FIELDS, "limit": "1"}}
+    response = list_handler.list_requests(event, None)
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    # Location fields of the request type only, pagination still works on the sparse page
+    assert body["requests"] == [
+        {
+            "id": body["requests"][0]["id"],
+            "type": "online_service",
+            "title": "Netflix",
+            "meetup_latitude": 36.8,
+            "meetup_longitude": 10.1,
+        },
+    ]
+    assert body["pagination"]["has_more"]
+    assert not any("description" in statement for statement in statements)
+
+    cursor = body["pagination"]["next_cursor"]
+    event = {"queryStringParameters": {"fields": "title", "cursor": cursor}}
+    body = json.loads(list_handler.list_requests(event, None)["body"])
+    assert body["requests"] == [{"title": "Perfume"}]
+
+
+def test_no_location_field_skips_the_subtypes(statements) -> None:  # noqa: ANN001
+    online, _ = _create_requests()
+    statements.clear()
+    event = {
+        "pathParameters": {"request_id": str(online.id)},
+        "queryStringParameters": {"fields": "title,due_date"},
+    }
+    body = json.loads(get_handler.get_request(event, None)["body"])
+
+    assert body == {"request": {"title": "Netflix", "due_date": None}}
+    assert not any("online_service_requests" in statement for statement in statements)
+
+
+def test_unknown_field() -> None:
+    event = {"queryStringParameters": {"fields": "id,password"}}
+    response = list_handler.list_requests(event, None)
+    assert response["statusCode"] == 400
+    assert "Unknown fields: password" in json.loads(response["body"])["error"]
+
+
+def test_favorites_fields() -> None:
+    online, _ = _create_requests()
+    user_id = uuid.uuid4()
+    get_favorite_repository().create(user_id, online.id)
+    event = {
+        "requestContext": {"authorizer": {"jwt": {"claims": {"sub": str(user_id)}}}},
+        "queryStringParameters": {"fields": "request_id"},
+    }
+    body = json.loads(list_favorites_handler.list_user_favorites(event, None)["body"])
+    assert body["favorites"] == [{"request_id": str(online.id)}]
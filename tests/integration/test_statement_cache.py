@@ -0,0 +1,24 @@
+"""Compiled statement cache integration tests."""
+
+import uuid
+
+import pytest
+
+from src.lib.metrics import metrics
+from src.repositories.request_repository import get_request_repository
+
+pytestmark = pytest.mark.integration
+
+
+def test_hot_queries_hit_the_statement_cache() -> None:
+    """Repeated repository queries on UUID columns reuse their compiled SQL."""
+    request_repo = get_request_repository()
+    request_repo.get_by_id(uuid.uuid4())
+    request_repo.list_of_requests()
+    metrics.reset("db.statement_cache.")
+
+    for _ in range(3):
+        request_repo.get_by_id(uuid.uuid4())
+        request_repo.list_of_requests()
+
+    assert metrics.snapshot("db.statement_cache.") == {"db.statement_cache.hit": 6}
@@ -0,0 +1,69 @@
+"""Statements bounded by the invocation deadline integration tests."""
+
+import uuid
+from collections.abc import Generator
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from src.db.session import engine
+from src.db.statement_deadline import statement_timeout_ms
+from src.handlers.requests.get import get_request
+from src.lib.deadline import DeadlineExceededError, start_deadline
+from src.lib.metrics import metrics
+from src.repositories.request_repository import RequestRepository
+
+pytestmark = pytest.mark.integration
+
+# Counts up to a large number: runs for many seconds unless interrupted
+SLOW_QUERY = """
+WITH RECURSIVE counter(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM counter WHERE n < 1000000000)
+SELECT count(*) FROM counter
+"""
+
+
+def _context(remaining_ms: int) -> SimpleNamespace:
+    return SimpleNamespace(get_remaining_time_in_millis=lambda: remaining_ms)
+
+
+@pytest.fixture(autouse=True)
+def _reset() -> Generator[None, None, None]:
+    metrics.reset("db.")
+    yield
+    start_deadline(None)
+
+
+def test_statement_timeout_ms() -> None:
+    assert statement_timeout_ms(None) == 0
+    assert statement_timeout_ms(2.9) == 2000
+    # Never rounded up past a budget under a second
+    assert statement_timeout_ms(0.2) == 200
+    assert statement_timeout_ms(0.0001) == 1
+
+
+def test_slow_statements_are_interrupted() -> None:
+    # DEADLINE_RESERVE_MS (300) kept to answer: 200ms for the database work
+    start_deadline(_context(500))
+    with pytest.raises(DeadlineExceededError), engine.connect() as connection:
+        connection.execute(text(SLOW_QUERY))
+    assert metrics.get("db.deadline_exceeded") == 1
+
+    # The connection is still usable by the next invocation
+    start_deadline(_context(10_000))
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar_one() == 1
+
+
+def test_no_transaction_begins_past_the_budget() -> None:
+    start_deadline(_context(100))
+    with pytest.raises(DeadlineExceededError):
+        RequestRepository().get_by_id(uuid.uuid4())
+    assert metrics.get("db.statement") == 0
+
+
+def test_handlers_answer_503_with_retry_after() -> None:
+    # lambda_handler starts the deadline of the invocation context
+    response = get_request({"pathParameters": {"request_id": str(uuid.uuid4())}}, _context(100))
+    assert response["statusCode"] == 503
+    assert response["headers"]["Retry-After"] == "1"
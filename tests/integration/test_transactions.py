@@ -0,0 +1,213 @@
+"""Optimistic concurrency conflicts retries integration tests.
+
+The fake driver is sqlite3 with a connection class whose commits of writes fail with a
+serialization failure (SQLSTATE 40001, as Aurora DSQL reports OC000 conflicts) while failures are
+left (aiosqlite over the same connection class for the async repositories).
+"""
+
+import json
+import sqlite3
+import uuid
+from collections.abc import Generator
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiosqlite
+import pytest
+from sqlalchemy import Engine, create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.db import async_session, transactions
+from src.db import session as db_session
+from src.db.async_session import AsyncSyncSession
+from src.db.session import create_session_factory
+from src.db.transactions import RetryPolicy, TransactionConflictError, run_transaction
+from src.handlers.favorites.create import create_favorite
+from src.handlers.requests.update import update_request
+from src.lib.deadline import start_deadline
+from src.lib.handler import run_async
+from src.lib.metrics import metrics
+from src.models.base import Base
+from src.models.favorite import Favorite
+from src.models.request import Request, RequestCounter
+from src.repositories.favorite_repository import FavoriteRepository
+from src.repositories.request_repository import RequestRepository
+from src.schemas.request import RequestCreate, RequestType
+
+pytestmark = pytest.mark.integration
+
+
+class SerializationFailure(sqlite3.OperationalError):
+    sqlstate = "40001"
+
+
+class ConflictingConnection(sqlite3.Connection):
+    """sqlite3 connection failing its next commits of writes (read only ones never conflict)."""
+
+    failures_left = 0
+
+    def commit(self) -> None:
+        if self.in_transaction and ConflictingConnection.failures_left > 0:
+            ConflictingConnection.failures_left -= 1
+            super().rollback()
+            exception_msg = "change conflicts with another transaction, please retry: (OC000)"
+            raise SerializationFailure(exception_msg)
+        super().commit()
+
+
+def _conflicting_engine(path: Path) -> Engine:
+    def connect() -> sqlite3.Connection:
+        return sqlite3.connect(path, factory=ConflictingConnection, check_same_thread=False)
+
+    engine = create_engine("sqlite://", creator=connect)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch) -> Generator[Engine, None, None]:  # noqa: ANN001
+    monkeypatch.setattr(transactions, "sleep", lambda _: None)
+    metrics.reset("db.")
+    yield _conflicting_engine(tmp_path / "conflicts.db")
+    ConflictingConnection.failures_left = 0
+    start_deadline(None)
+
+
+def _input() -> RequestCreate:
+    return RequestCreate(
+        type=RequestType.ONLINE_SERVICE,
+        title="Title",
+        description="d",
+        meetup_latitude=36.8,
+        meetup_longitude=10.1,
+    )
+
+
+def _count(engine: Engine, model: type) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_conflicts_are_retried(engine: Engine) -> None:
+    ConflictingConnection.failures_left = 2
+    request = RequestRepository(engine).create(uuid.uuid4(), _input())
+
+    assert RequestRepository(engine).get_by_id(request.id) is not None
+    # The unit of work was replayed as a whole, and applied once
+    assert _count(engine, Request) == 1
+    with engine.connect() as connection:
+        total = connection.execute(
+            select(func.sum(RequestCounter.count)).where(RequestCounter.key == "total"),
+        ).scalar_one()
+    assert total == 1
+    assert (metrics.get("db.conflict"), metrics.get("db.conflict_retry")) == (2, 2)
+    assert metrics.get("db.conflict_exhausted") == 0
+
+
+def test_exhausted_retries_raise_a_conflict(engine: Engine) -> None:
+    ConflictingConnection.failures_left = 10
+    with pytest.raises(TransactionConflictError):
+        RequestRepository(engine).create(uuid.uuid4(), _input())
+
+    assert _count(engine, Request) == 0
+    assert (metrics.get("db.conflict"), metrics.get("db.conflict_exhausted")) == (4, 1)
+
+
+def test_retries_stop_short_of_the_deadline(engine: Engine) -> None:
+    start_deadline(SimpleNamespace(get_remaining_time_in_millis=lambda: 500))
+    ConflictingConnection.failures_left = 1
+    with pytest.raises(TransactionConflictError):
+        RequestRepository(engine).create(uuid.uuid4(), _input())
+    assert metrics.get("db.conflict_retry") == 0
+
+    start_deadline(SimpleNamespace(get_remaining_time_in_millis=lambda: 10_000))
+    ConflictingConnection.failures_left = 1
+    RequestRepository(engine).create(uuid.uuid4(), _input())
+    assert metrics.get("db.conflict_retry") == 1
+
+
+def test_other_errors_are_not_retried(engine: Engine) -> None:
+    repo = RequestRepository(engine)
+    request = repo.create(uuid.uuid4(), _input())
+
+    def work(db: Session) -> None:
+        db.add(Request(id=request.id, user_id=uuid.uuid4(), type=request.type, title="Duplicate"))
+
+    with pytest.raises(IntegrityError):
+        run_transaction(repo._session, work, RetryPolicy())
+    assert (metrics.get("db.transaction"), metrics.get("db.conflict")) == (2, 0)
+
+
+def test_favorite_creation_replay_is_idempotent(engine: Engine, monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(db_session, "SessionLocal", create_session_factory(engine))
+    request = RequestRepository(engine).create(uuid.uuid4(), _input())
+    user_id = uuid.uuid4()
+
+    ConflictingConnection.failures_left = 1
+    favorite = FavoriteRepository().create(user_id, request.id)
+    assert FavoriteRepository().create(user_id, request.id).id == favorite.id
+    assert _count(engine, Favorite) == 1
+
+
+def test_handlers_answer_conflicts_with_409(engine: Engine, monkeypatch) -> None:  # noqa: ANN001
+    session_factory = create_session_factory(engine)
+    monkeypatch.setattr(db_session, "SessionLocal", session_factory)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", session_factory)
+    user_id = uuid.uuid4()
+    request = RequestRepository().create(user_id, _input())
+
+    ConflictingConnection.failures_left = 10
+    response = update_request(
+        {
+            "requestContext": {"authorizer": {"jwt": {"claims": {"sub": str(user_id)}}}},
+            "pathParameters": {"request_id": str(request.id)},
+            "body": json.dumps({"title": "Renamed"}),
+        },
+        None,
+    )
+    assert response["statusCode"] == 409
+    assert response["headers"]["Retry-After"] == "1"
+
+
+async def _no_sleep(_: float) -> None:
+    pass
+
+
+def test_async_handlers_retry_conflicts(
+    engine: Engine,
+    tmp_path: Path,
+    monkeypatch,  # noqa: ANN001
+) -> None:
+    async def connect() -> aiosqlite.Connection:
+        return await aiosqlite.connect(tmp_path / "conflicts.db", factory=ConflictingConnection)
+
+    async_engine = create_async_engine("sqlite+aiosqlite://", async_creator=connect)
+    monkeypatch.setattr(transactions, "async_sleep", _no_sleep)
+    monkeypatch.setattr(async_session, "_async_engine", async_engine)
+    monkeypatch.setattr(
+        async_session,
+        "_async_session_factory",
+        async_sessionmaker(
+            bind=async_engine,
+            expire_on_commit=False,
+            sync_session_class=AsyncSyncSession,
+        ),
+    )
+    request = RequestRepository(engine).create(uuid.uuid4(), _input())
+
+    ConflictingConnection.failures_left = 1
+    try:
+        response = create_favorite(
+            {
+                "requestContext": {"authorizer": {"jwt": {"claims": {"sub": str(uuid.uuid4())}}}},
+                "body": json.dumps({"request_id": str(request.id)}),
+            },
+            None,
+        )
+    finally:
+        run_async(async_engine.dispose())
+    assert response["statusCode"] == 200, response["body"]
+    assert _count(engine, Favorite) == 1
+    assert (metrics.get("db.conflict"), metrics.get("db.conflict_retry")) == (1, 1)
@@ -0,0 +1,109 @@
+"""UUID storage and time-ordered ids integration tests."""
+
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from src.db.bulk import BulkLoader, generate_records
+from src.db.session import engine
+from src.db.uuid_storage import migrate_uuid_storage
+from src.models.base import Base
+from src.models.types import GUID
+from src.repositories.request_repository import get_request_repository
+from src.schemas.request import RequestCreate, RequestType
+
+pytestmark = pytest.mark.integration
+
+
+def test_created_requests_get_time_ordered_ids() -> None:
+    """New rows default to UUIDv7 ids."""
+    request_repo = get_request_repository()
+    input_request = RequestCreate(
+        type=RequestType.ONLINE_SERVICE,
+        title="Netflix",
+        description="Need a subscription",
+        meetup_latitude=36.8,
+        meetup_longitude=10.1,
+    )
+    first = request_repo.create(uuid.uuid4(), input_request)
+    second = request_repo.create(uuid.uuid4(), input_request)
+
+    assert first.id.version == 7
+    assert first.id < second.id
+
+
+def test_migration_round_trip() -> None:
+    """String UUIDs are converted to 16 bytes values and back, ids are unchanged."""
+    BulkLoader(engine).load(generate_records(30, favorites_count=10, seed=5))
+    with engine.connect() as connection:
+        ids_before = connection.execute(text("SELECT id FROM requests ORDER BY id")).scalars().all()
+
+    report = migrate_uuid_storage(engine, to_binary=True, batch_size=7)
+    assert report.converted["requests.id"] == 30
+    assert report.converted["favorites.request_id"] == 10
+    # Idempotent: nothing left to convert
+    assert migrate_uuid_storage(engine, to_binary=True).total == 0
+
+    binary_guid = GUID(binary=True)
+    with engine.connect() as connection:
+        raw = connection.execute(text("SELECT id, typeof(id) FROM requests ORDER BY id")).all()
+    assert {kind for _, kind in raw} == {"blob"}
+    decoded = [str(binary_guid.process_result_value(value, engine.dialect)) for value, _ in raw]
+    # 16 bytes values sort like the canonical strings
+    assert decoded == ids_before
+
+    migrate_uuid_storage(engine, to_binary=False)
+    assert get_request_repository().get_by_id(uuid.UUID(ids_before[0])) is not None
+
+
+def test_migration_with_enforced_foreign_keys(tmp_path: Path) -> None:
+    """Foreign keys are off for the migration only, the pooled connections keep enforcing them."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'foreign_keys.db'}")
+
+    @event.listens_for(engine, "connect")
+    def _foreign_keys_on(dbapi_connection: Any, _connection_record: Any) -> None:
+        dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+    Base.metadata.create_all(engine)
+    BulkLoader(engine).load(generate_records(10, favorites_count=5, seed=3))
+
+    report = migrate_uuid_storage(engine, to_binary=True)
+    assert report.converted["favorites.request_id"] == 5
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar_one() == 1
+    engine.dispose()
+
+
+def test_binary_guid_binds_bytes() -> None:
+    """Binary mode binds 16 bytes and reads both representations."""
+    guid = GUID(binary=True)
+    value = uuid.uuid4()
+    assert guid.process_bind_param(value, engine.dialect) == value.bytes
+    assert guid.process_result_value(value.bytes, engine.dialect) == value
+    assert guid.process_result_value(str(value), engine.dialect) == value
+
+
+def test_pagination_with_identical_dates() -> None:
+    """Requests sharing due_date and created_at are each listed exactly once."""
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    records = list(generate_records(25, seed=9, now=now))
+    for record in records:
+        record["due_date"] = None if int(record["id"][-1], 16) % 2 else "2030-01-01T00:00:00+00:00"
+        record["created_at"] = now.isoformat()
+    BulkLoader(engine).load(records)
+
+    request_repo = get_request_repository()
+    seen: list[uuid.UUID] = []
+    cursor = None
+    while True:
+        page = request_repo.list_of_requests(limit=4, cursor=cursor)
+        seen.extend(request.id for request in page["requests"])
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 25
@@ -0,0 +1,230 @@
+"""Circuit breaker and stale responses unit tests."""
+
+import boto3
+import pytest
+from moto import mock_aws
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.db.transactions import TransactionConflictError
+from src.lib.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    is_dependency_failure,
+)
+from src.lib.metrics import metrics
+from src.lib.stale_responses import (
+    STALE_WARNING,
+    DynamoDBStaleResponseStore,
+    InMemoryStaleResponseStore,
+    StaleResponseCache,
+    response_key,
+)
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.unit
+
+
+def _database_error() -> OperationalError:
+    return OperationalError("SELECT 1", {}, Exception("connection timed out"))
+
+
+def _fail() -> None:
+    raise _database_error()
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+def _breaker(clock: FakeClock, **settings) -> CircuitBreaker:  # noqa: ANN003
+    return CircuitBreaker(
+        **{"window_size": 4, "min_calls": 4, "open_seconds": 10, "clock": clock, **settings},
+    )
+
+
+def test_opens_on_failure_rate(clock: FakeClock) -> None:
+    breaker = _breaker(clock)
+    assert breaker.call(lambda: 1) == 1
+    for _ in range(2):
+        with pytest.raises(OperationalError):
+            breaker.call(_fail)
+    assert breaker.state == CLOSED  # 3 outcomes, less than min_calls
+
+    with pytest.raises(OperationalError):
+        breaker.call(_fail)
+    assert breaker.state == OPEN
+    assert metrics.get("circuit.opened") == 1
+
+    # Open: calls are rejected without running
+    calls = []
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.call(calls.append, 1)
+    assert calls == []
+    assert rejected.value.status_code == 503
+    assert rejected.value.retry_after_seconds == 10
+    assert metrics.get("circuit.rejected") == 1
+
+
+def test_slow_calls_count_as_failures(clock: FakeClock) -> None:
+    breaker = _breaker(clock, slow_call_seconds=2)
+
+    def slow() -> None:
+        clock.now += 3
+
+    for _ in range(2):
+        breaker.call(lambda: None)
+        breaker.call(slow)
+    assert breaker.state == OPEN
+    assert metrics.get("circuit.slow") == 2
+
+
+def test_other_errors_are_successes(clock: FakeClock) -> None:
+    """The database answered: application errors and constraint violations do not count."""
+    breaker = _breaker(clock)
+
+    def duplicate() -> None:
+        raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+
+    def not_found() -> None:
+        raise ValueError
+
+    for failing in (duplicate, not_found) * 3:
+        with pytest.raises((IntegrityError, ValueError)):
+            breaker.call(failing)
+    assert breaker.state == CLOSED
+    assert metrics.get("circuit.failure") == 0
+
+
+def test_wrapped_database_errors_are_failures() -> None:
+    wrapped = Exception("Error listing requests")
+    wrapped.__cause__ = _database_error()
+    assert is_dependency_failure(wrapped)
+    assert not is_dependency_failure(Exception("Request not found"))
+
+    conflict = TransactionConflictError("Conflicting concurrent update, please retry")
+    conflict.__cause__ = OperationalError("COMMIT", {}, Exception("change conflicts (OC000)"))
+    assert not is_dependency_failure(conflict)
+
+
+def test_half_open_probes(clock: FakeClock) -> None:
+    breaker = _breaker(clock)
+    for _ in range(4):
+        with pytest.raises(OperationalError):
+            breaker.call(_fail)
+
+    # A failed probe opens the circuit again, for a whole period
+    clock.now += 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allows()
+    with pytest.raises(OperationalError):
+        breaker.call(_fail)
+    assert breaker.state == OPEN
+    clock.now += 9
+    assert not breaker.allows()
+    assert breaker.retry_after() == pytest.approx(1)
+
+    # Only one probe at a time, a successful one closes the circuit
+    clock.now += 1
+
+    def probe() -> str:
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+        return "probed"
+
+    assert breaker.call(probe) == "probed"
+    assert breaker.state == CLOSED
+    assert (metrics.get("circuit.probe"), metrics.get("circuit.closed")) == (2, 1)
+    # The window starts over
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            breaker.call(_fail)
+    assert breaker.state == CLOSED
+
+
+def test_stale_responses(clock: FakeClock) -> None:
+    cache = StaleResponseCache(max_entries=2, max_age_seconds=60, clock=clock)
+    first = {"pathParameters": {"request_id": "1"}}
+    key = response_key("get_request", first)
+    assert key == response_key("get_request", {"pathParameters": {"request_id": "1"}})
+    assert key != response_key("get_request", {"pathParameters": {"request_id": "2"}})
+    assert key != response_key("list_requests", first)
+    assert cache.get(key) is None
+
+    cache.put(
+        key,
+        {"statusCode": 200, "headers": {"Content-Type": "application/json"}, "body": "{}"},
+    )
+    clock.now += 30
+    assert cache.get(key) == {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Warning": STALE_WARNING, "Age": "30"},
+        "body": "{}",
+    }
+    # Too old
+    clock.now += 31
+    assert cache.get(key) is None
+
+    # LRU
+    cache.put(key, {"body": "1"})
+    cache.put("second", {"body": "2"})
+    cache.put("third", {"body": "3"})
+    assert cache.get(key) is None
+    assert cache.get("third")["body"] == "3"
+    assert (metrics.get("stale.served"), metrics.get("stale.miss")) == (2, 3)
+
+
+def test_stale_responses_are_shared(clock: FakeClock) -> None:
+    store = InMemoryStaleResponseStore()
+    writer = StaleResponseCache(store=store, share_interval_seconds=60, clock=clock)
+    reader = StaleResponseCache(store=store, clock=clock)
+    first, second = (
+        response_key("get_request", {"pathParameters": {"request_id": request_id}})
+        for request_id in ("1", "2")
+    )
+
+    # At most one shared write per route and interval, whatever the keys
+    writer.put(first, {"body": "1"})
+    writer.put(first, {"body": "2"})
+    writer.put(second, {"body": "3"})
+    writer.put(response_key("list_requests", {}), {"body": "4"})
+    assert reader.get(first)["body"] == "1"
+    assert reader.get(second) is None
+    assert reader.get(response_key("list_requests", {}))["body"] == "4"
+    assert writer.get(second)["body"] == "3"  # kept per container all the same
+
+    clock.now += 60
+    writer.put(second, {"body": "5"})
+    assert reader.get(second)["body"] == "5"
+    assert metrics.get("stale.shared_write") == 3
+
+
+@mock_aws
+def test_dynamodb_store(clock: FakeClock, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-3")
+    table = boto3.resource("dynamodb").create_table(
+        TableName="stale-responses",
+        KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    writer = StaleResponseCache(
+        max_age_seconds=600,
+        store=DynamoDBStaleResponseStore(table),
+        clock=clock,
+    )
+    reader = StaleResponseCache(store=DynamoDBStaleResponseStore(table), clock=clock)
+
+    writer.put(
+        "key",
+        {"statusCode": 200, "headers": {"Content-Type": "application/json"}, "body": "{}"},
+    )
+    clock.now += 5
+    stale = reader.get("key")
+    assert stale["body"] == "{}"
+    assert stale["headers"]["Age"] == "5"
+    assert int(table.get_item(Key={"pk": "key"})["Item"]["expires_at"]) == int(clock.now - 5 + 600)
+    assert reader.get("other") is None
@@ -0,0 +1,99 @@
+"""DSQL IAM token cache unit tests."""
+
+import pytest
+
+from src.db.dsql_token import DsqlTokenCache
+from src.lib.metrics import metrics
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.unit
+
+
+class FakeDsqlClient:
+    """Fake boto3 DSQL client counting signed tokens."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, str, int]] = []
+
+    def _sign(self, kind: str, hostname: str, region: str, expires_in: int) -> str:
+        self.calls.append((kind, hostname, region, expires_in))
+        return f"{kind}-token-{len(self.calls)}"
+
+    def generate_db_connect_admin_auth_token(self, hostname, region, expires_in):  # noqa: ANN001, ANN201, D102
+        return self._sign("admin", hostname, region, expires_in)
+
+    def generate_db_connect_auth_token(self, hostname, region, expires_in):  # noqa: ANN001, ANN201, D102
+        return self._sign("custom", hostname, region, expires_in)
+
+
+@pytest.fixture
+def client() -> FakeDsqlClient:
+    return FakeDsqlClient()
+
+
+@pytest.fixture
+def cache(client: FakeDsqlClient, clock: FakeClock) -> DsqlTokenCache:
+    metrics.reset("dsql_token.")
+    return DsqlTokenCache(
+        lambda _region: client,
+        ttl_seconds=900,
+        safety_margin_seconds=120,
+        refresh_ahead_seconds=300,
+        clock=clock,
+    )
+
+
+def test_token_reused_until_safety_margin(
+    cache: DsqlTokenCache,
+    client: FakeDsqlClient,
+    clock: FakeClock,
+) -> None:
+    """Connects reuse the cached token and only sign again close to its expiry."""
+    first = cache.get_token("host", "eu-west-3", "admin")
+    clock.now += 700
+    assert cache.get_token("host", "eu-west-3", "admin") == first
+    assert len(client.calls) == 1
+
+    clock.now += 100  # 100s left, below the 120s safety margin
+    assert cache.get_token("host", "eu-west-3", "admin") != first
+    assert len(client.calls) == 2
+    assert metrics.snapshot("dsql_token.") == {"dsql_token.hit": 1, "dsql_token.miss": 2}
+
+
+def test_tokens_keyed_by_host_region_and_role(
+    cache: DsqlTokenCache,
+    client: FakeDsqlClient,
+) -> None:
+    """Each (host, region, role) gets its own token, roles use the matching signing API."""
+    cache.get_token("host", "eu-west-3", "admin")
+    cache.get_token("host", "eu-west-3", "app_user")
+    cache.get_token("other", "eu-west-3", "app_user")
+    cache.get_token("host", "eu-west-3", "app_user")
+
+    assert [call[0] for call in client.calls] == ["admin", "custom", "custom"]
+    assert all(call[3] == 900 for call in client.calls)
+
+
+def test_refresh_due_renews_ahead_of_expiry(
+    cache: DsqlTokenCache,
+    client: FakeDsqlClient,
+    clock: FakeClock,
+) -> None:
+    """Tokens within the refresh-ahead window are renewed so connects keep hitting the cache."""
+    first = cache.get_token("host", "eu-west-3", "app_user")
+    assert cache.refresh_due() == 0
+
+    clock.now += 650  # 250s left: inside the 300s refresh-ahead window
+    assert cache.refresh_due() == 1
+    assert cache.seconds_to_expiry("host", "eu-west-3", "app_user") == 900
+
+    clock.now += 700
+    assert cache.get_token("host", "eu-west-3", "app_user") != first
+    assert len(client.calls) == 2
+    assert metrics.get("dsql_token.miss") == 1
+
+
+def test_invalid_margin_rejected() -> None:
+    """The safety margin must leave some usable validity."""
+    with pytest.raises(ValueError, match="safety_margin_seconds"):
+        DsqlTokenCache(lambda _region: None, ttl_seconds=60, safety_margin_seconds=60)
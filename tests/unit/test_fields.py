@@ -0,0 +1,24 @@
+"""Sparse fieldsets parsing unit tests."""
+
+import pytest
+
+from src.lib.fields import parse_fields
+
+pytestmark = pytest.mark.unit
+
+ALLOWED = ("id", "type", "title", "description")
+
+
+def test_parse_fields() -> None:
+    """Allow-list order, duplicates and blanks ignored, no parameter means every field."""
+    assert parse_fields("title, id,,title", ALLOWED) == ("id", "title")
+    assert parse_fields(None, ALLOWED) is None
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [("", "at least one"), ("id,secret", "Unknown fields: secret")],
+)
+def test_invalid_fields(value: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        parse_fields(value, ALLOWED)
@@ -0,0 +1,70 @@
+"""Fragment cache unit tests."""
+
+import json
+import uuid
+from dataclasses import dataclass, field
+
+import pytest
+
+from src.lib.fragment_cache import FragmentCache
+from src.lib.metrics import metrics
+
+pytestmark = pytest.mark.unit
+
+
+@dataclass
+class _Request:
+    title: str
+    version: int | None = 1
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    renders: int = 0
+
+    def to_json_fragment(self) -> str:
+        self.renders += 1
+        return json.dumps({"id": str(self.id), "title": self.title})
+
+
+def test_renders_once_per_version() -> None:
+    metrics.reset()
+    cache = FragmentCache()
+    request = _Request("Charger")
+    assert cache.fragment(request) == cache.fragment(request)
+    assert request.renders == 1
+
+    request.title, request.version = "Two chargers", 2
+    assert json.loads(cache.fragment(request))["title"] == "Two chargers"
+    assert request.renders == 2
+    assert len(cache) == 1  # the previous version was dropped
+    assert (metrics.get("fragment_cache.hit"), metrics.get("fragment_cache.miss")) == (1, 2)
+    assert metrics.get("fragment_cache.saved_us") > 0
+
+
+def test_unversioned_requests_and_invalidation() -> None:
+    cache = FragmentCache()
+    request = _Request("Legacy", version=None)
+    cache.fragment(request)
+    cache.invalidate(request.id)
+    cache.fragment(request)
+    assert request.renders == 2
+
+
+def test_lru_eviction_and_join() -> None:
+    cache = FragmentCache(max_entries=2)
+    first, second, third = _Request("a"), _Request("b"), _Request("c")
+    assert json.loads(cache.join([first, second])) == [
+        {"id": str(first.id), "title": "a"},
+        {"id": str(second.id), "title": "b"},
+    ]
+    cache.fragment(first)  # most recently used
+    cache.fragment(third)  # evicts second
+    cache.fragment(second)
+    assert (first.renders, second.renders, third.renders) == (1, 2, 1)
+    assert cache.join([]) == "[]"
+
+
+def test_disabled_cache() -> None:
+    cache = FragmentCache(max_entries=0)
+    request = _Request("a")
+    cache.fragment(request)
+    cache.fragment(request)
+    assert (request.renders, len(cache)) == (2, 0)
@@ -0,0 +1,48 @@
+"""Identifiers generation unit tests."""
+
+import time
+import uuid
+
+import pytest
+
+from src.lib.ids import MAX_SHARDS, uuid7, uuid7_at, uuid7_shard, uuid7_timestamp_ms
+
+pytestmark = pytest.mark.unit
+
+
+def test_uuid7_layout() -> None:
+    """Version 7, RFC variant, current timestamp."""
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert before <= uuid7_timestamp_ms(value) <= after + 1
+
+
+def test_uuid7_strictly_increasing() -> None:
+    """Ids generated in a burst (same milliseconds) keep increasing."""
+    values = [uuid7() for _ in range(20_000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    # String and binary representations sort the same way
+    assert [str(v) for v in values] == sorted(str(v) for v in values)
+    assert [v.bytes for v in values] == sorted(v.bytes for v in values)
+
+
+def test_uuid7_at_is_deterministic() -> None:
+    """Seeded ids only depend on their inputs and embed the given time."""
+    assert uuid7_at(1_700_000_000_000, 12345) == uuid7_at(1_700_000_000_000, 12345)
+    assert uuid7_timestamp_ms(uuid7_at(1_700_000_000_000, 12345)) == 1_700_000_000_000
+    assert uuid7_at(1_700_000_000_000, 2**74 - 1).version == 7
+
+
+def test_uuid7_carries_a_shard() -> None:
+    """Sharded ids keep their layout and ordering, and give their shard back."""
+    values = [uuid7(shard=i % MAX_SHARDS) for i in range(5_000)]
+    assert [uuid7_shard(v) for v in values] == [i % MAX_SHARDS for i in range(5_000)]
+    assert values == sorted(values)
+    assert {(v.version, v.variant) for v in values} == {(7, uuid.RFC_4122)}
+    with pytest.raises(ValueError, match="shard must be between"):
+        uuid7(shard=MAX_SHARDS)
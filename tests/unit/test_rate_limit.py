@@ -0,0 +1,147 @@
+"""Per-user rate limiting unit tests."""
+
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.lib import rate_limit
+from src.lib.metrics import metrics
+from src.lib.rate_limit import (
+    DynamoDBRateLimitStore,
+    InMemoryRateLimitStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitStore,
+    rate_limited,
+)
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.unit
+
+
+class CountingStore(InMemoryRateLimitStore):
+    """In memory store counting round trips."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def acquire(self, key, rate_limit, requested, now):  # noqa: ANN001, ANN201, D102
+        self.calls += 1
+        return super().acquire(key, rate_limit, requested, now)
+
+
+def test_parse() -> None:
+    """Limits are "<capacity>/<period_seconds>"."""
+    assert RateLimit.parse("10/60") == RateLimit(10, 60.0)
+    for invalid in ("10", "a/60", "0/60", "10/0"):
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            RateLimit.parse(invalid)
+
+
+def test_bucket_limits_and_refills(clock: FakeClock) -> None:
+    """Capacity calls go through, then one more per refill interval."""
+    limiter = RateLimiter(InMemoryRateLimitStore(), {"create": RateLimit(20, 60)}, clock=clock)
+
+    assert all(limiter.check("create", "alice").allowed for _ in range(20))
+    decision = limiter.check("create", "alice")
+    assert not decision.allowed
+    assert decision.retry_after == pytest.approx(3.0)
+    # Other users and routes have their own buckets
+    assert limiter.check("create", "bob").allowed
+    assert limiter.check("delete", "alice").allowed  # no limit configured, no default
+
+    clock.now += 3
+    assert limiter.check("create", "alice").allowed
+    assert not limiter.check("create", "alice").allowed
+
+
+def test_local_bucket_absorbs_checks(clock: FakeClock) -> None:
+    """Only one shared store round trip per lease, and none while rejected."""
+    store = CountingStore()
+    limiter = RateLimiter(store, {"default": RateLimit(100, 60)}, clock=clock)
+    metrics.reset()
+
+    for _ in range(100):
+        limiter.check("list", "alice")
+    assert store.calls == 10  # leases of 10 tokens
+    for _ in range(1000):
+        assert not limiter.check("list", "alice").allowed
+    assert store.calls == 11  # the rejection is remembered until tokens come back
+    assert metrics.get("rate_limit.rejected") == 1000
+    assert metrics.get("rate_limit.local") == 90 + 999
+
+
+def test_containers_share_the_limit(clock: FakeClock) -> None:
+    """Several containers (limiters) on the same store never grant more than the capacity."""
+    store = InMemoryRateLimitStore()
+    limiters = [RateLimiter(store, {"default": RateLimit(30, 60)}, clock=clock) for _ in range(4)]
+
+    allowed = sum(limiter.check("list", "alice").allowed for _ in range(50) for limiter in limiters)
+    assert allowed == 30
+
+
+class FailingStore(RateLimitStore):
+    """Shared store that cannot be reached."""
+
+    def acquire(self, key, rate_limit, requested, now):  # noqa: ANN001, ANN201, ARG002
+        exception_msg = f"Rate limit bucket {key} is too contended"
+        raise RuntimeError(exception_msg)
+
+
+def test_store_failures_fail_open(clock: FakeClock) -> None:
+    """Calls go through when the shared store fails, and the failures are counted."""
+    limiter = RateLimiter(FailingStore(), {"default": RateLimit(1, 60)}, clock=clock)
+    metrics.reset()
+
+    assert all(limiter.check("list", "alice").allowed for _ in range(3))
+    assert metrics.get("rate_limit.store_error") == 3
+    assert metrics.get("rate_limit.rejected") == 0
+
+
+@mock_aws
+def test_dynamodb_store(clock: FakeClock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Buckets persist in DynamoDB and are shared between stores."""
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-3")
+    table = boto3.resource("dynamodb").create_table(
+        TableName="rate-limits",
+        KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    limit = {"default": RateLimit(10, 10)}
+    first = RateLimiter(DynamoDBRateLimitStore(table), limit, clock=clock)
+    second = RateLimiter(DynamoDBRateLimitStore(table), limit, clock=clock)
+
+    assert sum(first.check("list", "alice").allowed for _ in range(6)) == 6
+    assert sum(second.check("list", "alice").allowed for _ in range(6)) == 4
+    item = table.get_item(Key={"pk": "list#alice"})["Item"]
+    assert float(item["tokens"]) == 0
+    assert int(item["expires_at"]) > clock.now
+
+    clock.now += 1
+    assert second.check("list", "alice").allowed
+
+
+def test_decorator(clock: FakeClock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Over the limit calls get a 429 with Retry-After, without running the handler."""
+    limiter = RateLimiter(InMemoryRateLimitStore(), {"create": RateLimit(1, 30)}, clock=clock)
+    monkeypatch.setattr(rate_limit, "_rate_limiter", limiter)
+    calls = []
+
+    @rate_limited("create")
+    def handler(event, _):  # noqa: ANN001, ANN202
+        calls.append(event)
+        return {"statusCode": 201}
+
+    event = {"requestContext": {"authorizer": {"jwt": {"claims": {"sub": "alice"}}}}}
+    assert handler(event, None)["statusCode"] == 201
+    response = handler(event, None)
+    assert response["statusCode"] == 429
+    assert response["headers"]["Retry-After"] == "30"
+    assert json.loads(response["body"]) == {"error": "Rate limit exceeded"}
+    assert len(calls) == 1
+    # Anonymous calls are not limited here
+    assert handler({}, None)["statusCode"] == 201
@@ -0,0 +1,97 @@
+"""RequestCreate validation tests: parse_request_create vs RequestCreate.model_validate."""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from src.schemas import request as request_schemas
+from src.schemas.request import (
+    BuyAndDeliverCreate,
+    OnlineServiceCreate,
+    RequestCreate,
+    RequestType,
+    parse_request_create,
+)
+
+pytestmark = pytest.mark.unit
+
+_FUTURE = (datetime.now(UTC) + timedelta(days=3)).isoformat()
+_BASE = {"title": "Bring me a charger", "description": "USB-C"}
+_BUY = {**_BASE, "type": "buy_and_deliver", "dropoff_latitude": 36.8, "dropoff_longitude": 10.1}
+_ONLINE = {**_BASE, "type": "online_service", "meetup_latitude": 36.8, "meetup_longitude": 10.1}
+
+PAYLOADS = [
+    pytest.param(_BUY, id="valid"),
+    pytest.param({**_ONLINE, "due_date": _FUTURE}, id="valid-due-date"),
+    pytest.param(
+        {**_BASE, "type": "pickup_and_deliver", "pickup_latitude": 1, "pickup_longitude": 2},
+        id="missing-locations",
+    ),
+    pytest.param({**_BUY, "meetup_latitude": 1}, id="forbidden-location"),
+    pytest.param({**_ONLINE, "meetup_latitude": 91}, id="out-of-range"),
+    pytest.param({**_ONLINE, "due_date": "2020-01-01T00:00:00Z"}, id="past-due-date"),
+    pytest.param({**_ONLINE, "due_date": "2030-01-01T00:00:00"}, id="naive-due-date"),
+    pytest.param({**_ONLINE, "title": "x" * 101, "description": None}, id="several-errors"),
+    pytest.param({**_BASE, "type": "unknown"}, id="unknown-type"),
+    pytest.param(_BASE, id="missing-type"),
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_same_outcome_as_model_validate(payload: dict) -> None:
+    body = json.dumps(payload)
+    try:
+        expected = RequestCreate.model_validate(json.loads(body))
+    except ValidationError:
+        expected = None
+    if expected is not None:
+        assert parse_request_create(body).model_dump() == expected.model_dump()
+        return
+
+    with pytest.raises(ValidationError) as expected_error:
+        RequestCreate.model_validate(json.loads(body))
+    with pytest.raises(ValidationError) as raised:
+        parse_request_create(body)
+    # Without the context: it holds the raised exception objects
+    assert raised.value.errors(include_context=False) == expected_error.value.errors(
+        include_context=False,
+    )
+
+
+def test_input_model_of_the_type() -> None:
+    request = parse_request_create(json.dumps(_ONLINE))
+    assert isinstance(request, OnlineServiceCreate)
+    assert isinstance(request, RequestCreate)
+    assert request.type == RequestType.ONLINE_SERVICE
+    assert isinstance(parse_request_create(json.dumps(_BUY).encode()), BuyAndDeliverCreate)
+
+
+def test_input_models_check_their_own_locations(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The input models do not go through the RequestCreate validator looking up the type."""
+    monkeypatch.setattr(request_schemas, "CREATE_MODELS", {})
+    assert isinstance(parse_request_create(json.dumps(_BUY)), BuyAndDeliverCreate)
+    with pytest.raises(ValidationError, match="must be set for ONLINE_SERVICE requests"):
+        parse_request_create(json.dumps({**_BASE, "type": "online_service"}))
+
+
+@pytest.mark.parametrize("body", ["{not json", "", '{"title": "a",}'])
+def test_invalid_json(body: str) -> None:
+    """Same error as json.loads."""
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(body)
+    with pytest.raises(json.JSONDecodeError) as raised:
+        parse_request_create(body)
+    assert str(raised.value) == str(expected.value)
+
+
+@pytest.mark.parametrize("body", ["[]", "1", "null", '"text"', json.dumps([_BUY])])
+def test_not_an_object(body: str) -> None:
+    """Same error as RequestCreate.model_validate."""
+    with pytest.raises(ValidationError) as expected:
+        RequestCreate.model_validate(json.loads(body))
+    with pytest.raises(ValidationError) as raised:
+        parse_request_create(body)
+    assert str(raised.value) == str(expected.value)
+    assert "Input should be a valid dictionary or instance of RequestCreate" in str(raised.value)
@@ -0,0 +1,29 @@
+"""Search tokenization unit tests."""
+
+import pytest
+
+from src.lib.search import MAX_TOKEN_WEIGHT, query_tokens, token_weights, tokenize
+
+pytestmark = pytest.mark.unit
+
+
+def test_tokenize_normalizes() -> None:
+    """Case, accents, punctuation and stop words do not matter."""
+    assert tokenize("Need a CAFÉ-crème, près de l'Avenue!") == ["cafe", "creme", "pres", "avenue"]
+    assert tokenize("iPhone_15 x 2") == ["iphone15"]
+    assert tokenize(None) == []
+
+
+def test_token_weights() -> None:
+    """Title words weigh more, repeated words are capped."""
+    weights = token_weights("Charger wanted", "A USB-C charger " + "usb " * 50)
+    assert weights == {"charger": 4, "wanted": 3, "usb": MAX_TOKEN_WEIGHT}
+
+
+def test_query_tokens() -> None:
+    """Queries are distinct tokens, and must contain at least one."""
+    assert query_tokens("charger Charger usb") == ["charger", "usb"]
+    with pytest.raises(ValueError, match="at least one word"):
+        query_tokens("a de !")
+    with pytest.raises(ValueError, match="at most 2 words"):
+        query_tokens("one two three", max_tokens=2)